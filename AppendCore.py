@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+19 October 2026
+
+ArcGIS Pro compatible
+
+The AppendCore function appends the shapefiles of one SSURGO feature class
+into its own staging file geodatabase, so that Generate Regional
+Transactional FGDB can append all six feature classes at once in a
+multiprocessing pool. Environments are not inherited by a spawned worker,
+so the geographic transformation, XY tolerance and XY resolution are set
+explicitly before anything is projected, and the first feature appended is
+compared with the same feature projected with the transformation to
+confirm it was applied. The parent appends the staged feature class, which
+is already in the coordinate system of the RTSD, into the RTSD.
+"""
+
+import arcpy, os, sys
+import numpy as np
+from SSURGO_order import curveOrder
+
+def insertOrdered(shp_l, feat_p, tm=None):
+    """Inserts the features of each shapefile into feat_p ordered along a
+    Hilbert curve through their centroids (SSURGO_order), so that
+    neighboring features of a survey are stored together. Features are
+    projected by the cursor with the geographic transformation tm, the
+    environment's if None, as Append does.
+
+    Returns
+    -------
+    tuple
+        shapefile and FID of the first feature inserted
+    """
+    sr = arcpy.Describe(feat_p).spatialReference
+    tm = tm or arcpy.env.geographicTransformations
+    first = None
+    fld_l = [
+        fld.name for fld in arcpy.ListFields(feat_p)
+        if fld.type not in ('OID', 'Geometry')
+        and fld.name.upper() not in ('SHAPE_LENGTH', 'SHAPE_AREA')
+    ]
+    with arcpy.da.InsertCursor(feat_p, ['SHAPE@'] + fld_l) as iCur:
+        for shp in shp_l:
+            shp_flds = {fld.name.upper() for fld in arcpy.ListFields(shp)}
+            read_l = [fld for fld in fld_l if fld.upper() in shp_flds]
+            with arcpy.da.SearchCursor(
+                    shp, ['SHAPE@XY', 'SHAPE@', 'OID@'] + read_l,
+                    spatial_reference=sr, datum_transformation=tm
+                ) as sCur:
+                rows = [row for row in sCur]
+            xy = np.array(
+                [row[0] for row in rows], dtype=np.float64
+            ).reshape((-1, 2))
+            for i in curveOrder(xy):
+                if first is None:
+                    first = (shp, rows[i][2])
+                values = dict(zip(read_l, rows[i][3:]))
+                iCur.insertRow(
+                    [rows[i][1]] + [values.get(fld) for fld in fld_l]
+                )
+    return first
+
+def transformApplied(shp, fid, stageFC, sr, tm, xyTol):
+    """Compares the first feature of stageFC with feature fid of shp
+    projected to sr with the transformation tm.
+
+    Returns
+    -------
+    bool
+        True if their first vertices are within xyTol, False otherwise
+    """
+    oid = arcpy.Describe(shp).OIDFieldName
+    with arcpy.da.SearchCursor(shp, 'SHAPE@', f"{oid} = {fid}") as sCur:
+        src = next(sCur)[0]
+    with arcpy.da.SearchCursor(
+            stageFC, 'SHAPE@', sql_clause=(None, 'ORDER BY OBJECTID')
+        ) as sCur:
+        staged = next(sCur)[0]
+    expected = src.projectAs(sr, tm) if tm else src.projectAs(sr)
+    dx = expected.firstPoint.X - staged.firstPoint.X
+    dy = expected.firstPoint.Y - staged.firstPoint.Y
+    return (dx * dx + dy * dy) ** 0.5 <= xyTol
+
+def AppendCore(shp_l, stageGDB, feat_p, fcName, tm, xyTol, xyRes,
+               sort=False):
+    """Returns
+    -------
+    tuple
+        feature class name, staged feature class path, feature count and
+        whether the transformation was applied. An error string if the
+        append failed.
+    """
+    try:
+        # environments are not inherited by the worker
+        sr = arcpy.Describe(feat_p).spatialReference
+        arcpy.env.overwriteOutput = True
+        arcpy.env.outputCoordinateSystem = sr
+        arcpy.env.geographicTransformations = tm
+        arcpy.env.XYTolerance = str(xyTol)
+        arcpy.env.XYResolution = str(xyRes)
+
+        arcpy.CreateFileGDB_management(
+            os.path.dirname(stageGDB), os.path.basename(stageGDB)
+        )
+        arcpy.CreateFeatureclass_management(
+            stageGDB, fcName, arcpy.Describe(feat_p).shapeType,
+            feat_p, spatial_reference=sr
+        )
+        stageFC = os.path.join(stageGDB, fcName)
+
+        if sort:
+            shp, fid = insertOrdered(shp_l, stageFC, tm)
+        else:
+            arcpy.Append_management(shp_l, stageFC, "NO_TEST")
+            shp, fid = shp_l[0], 0
+
+        count = int(arcpy.GetCount_management(stageFC).getOutput(0))
+        applied = transformApplied(shp, fid, stageFC, sr, tm, xyTol)
+        return fcName, stageFC, count, applied
+    except:
+        s1 =  sys.exc_info()[-1].tb_lineno
+        s2 = sys.exc_info()[0]
+        s3 = sys.exc_info()[1]
+        return(f"AppendCore {fcName}: {s1}\n{s2}\n{s3}")
@@ -12,8 +12,13 @@ Created on: 10/12/2018
 
 @modified 1/12/2026
     @by: Alexnder Stum
-@version: 3.4.1
+@version: 3.4.2
 
+# ---
+Update 3.4.2; 10/19/2026
+- The topology is validated once, with SSURGO_topology, which records the 
+    validation of each survey tile so that SSURGO_topology run as a tool 
+    later validates only the surveys edited since. It was validated twice.
 # ---
 Update 3.4.1; 1/12/2026
 - Had a hard coded reference to 0.0002 XY Tolerance, amended to 0.2
@@ -42,7 +47,7 @@ Changed Feature Dataset XYResolution to 0.1 m and Cluster Tolerance to 0.2 m
 Added MUNAME field and modified MUSYM values to be themselves
 
 """
-v = '3.4.1'
+v = '3.4.2'
 
 import os
 import arcpy
@@ -54,6 +59,8 @@ import socket
 import traceback
 import winsound
 
+from SSURGO_topology import scheduleValidation
+
 
 def pyErr(func: str) -> str:
     """When a python exception is raised, this funciton formats the traceback
@@ -509,13 +516,12 @@ try:
     # Topology
     if createTopology(fds_p, topo_n):
         arcpy.SetProgressorLabel("Validating Topology")
-        arcpy.ValidateTopology_management(topo_p)
+        scheduleValidation(topo_p, full=True)
         arcpy.AddMessage("\tValidated Topology at 0.2 meters")
     else:
         arcpy.AddError(
             "\n\tFailed to Create Topology. Create Topology Manually"
         )
-    arcpy.ValidateTopology_management(topo_p)
     arcpy.Compact_management(gdb_p)
 
     # Enable Editor Tracking (under Fields)
@@ -23,6 +23,13 @@ All inputs must have the same field name for the AREASYMBOL
     2) Removed arcpy.env.parallelProcessingFactor from BCore function
     3) mp.set_executable now calls python.exe
     4) Capped number of processes to no more than number of survey areas
+1.2
+    1) Optional in-process seam comparison (parameter 6). Boundary nodes of
+    the target and neighboring surveys are read once with SHAPE@WKB,
+    quantized to the xy resolution and matched across seams with a single
+    KD-tree query (SSURGO_seams.py). Errors are bulk written to
+    QA_EdgeMatch_Errors_p. Parameter 7 is the match tolerance, it defaults
+    to the xy tolerance of the soil polygons.
 """
 
 import arcpy
@@ -113,6 +120,75 @@ def BNodes2(MU, nodes, areas):
         raise
 
 
+def SeamCheck(MUin, SAin, MUcomp, SAcomp, AREASYMBOL, areas, mismatch, sr,
+              tol, reach):
+    """In-process edge match check, see SSURGO_seams.py"""
+    try:
+        import numpy as np
+        import SSURGO_seams
+        importlib.reload(SSURGO_seams)
+
+        res = sr.XYResolution
+        code = {}       # AREASYMBOL: survey code
+        saPolys = []
+        q = AREASYMBOL + " IN ('"+"','".join(areas)+"')"
+        q2 = AREASYMBOL + " NOT IN ('"+"','".join(areas)+"')"
+        with arcpy.da.SearchCursor(SAin, [AREASYMBOL, 'SHAPE@WKB'], q) as sCur:
+            for a, wkb in sCur:
+                saPolys.append((code.setdefault(a, len(code)), wkb))
+        targets = set(code.values())
+        with arcpy.da.SearchCursor(SAcomp, [AREASYMBOL, 'SHAPE@WKB'], q2) \
+                as sCur:
+            for a, wkb in sCur:
+                saPolys.append((code.setdefault(a, len(code)), wkb))
+        seams = SSURGO_seams.surveySeams(saPolys, res, targets)
+        del saPolys
+        sym = {c: a for a, c in code.items()}
+        rNeigh = {sym[c] for c in seams[2]}
+        if rNeigh:
+            arcpy.AddMessage(f"Working with neighbors {rNeigh}")
+        else:
+            arcpy.AddMessage("No external neighbors")
+
+        # Soil polygons, one scan per input
+        soilPolys = {}
+        if MUcomp == MUin:
+            scans = [(MUin, areas | rNeigh)]
+        else:
+            scans = [(MUin, areas), (MUcomp, rNeigh)]
+        for fc, syms in scans:
+            if not syms:
+                continue
+            q3 = AREASYMBOL + " IN ('"+"','".join(syms)+"')"
+            with arcpy.da.SearchCursor(
+                    fc, [AREASYMBOL, 'OID@', 'SHAPE@WKB'], q3) as sCur:
+                for a, oid, wkb in sCur:
+                    if wkb:
+                        soilPolys.setdefault(code[a], []).append((oid, wkb))
+
+        xy, codes, stats = SSURGO_seams.seamErrors(
+            soilPolys, seams, targets, res, tol, reach
+        )
+        arcpy.AddMessage(
+            f"{stats['seamNodes']} of {stats['nodes']} boundary nodes are "
+            "along a survey seam"
+        )
+        if xy.shape[0]:
+            errs = np.zeros(xy.shape[0], dtype=[('X', '<f8'), ('Y', '<f8'),
+                                                (AREASYMBOL, '<U20')])
+            errs['X'] = xy[:, 0]
+            errs['Y'] = xy[:, 1]
+            errs[AREASYMBOL] = [sym[c] for c in codes]
+            arcpy.da.NumPyArrayToFeatureClass(errs, mismatch, ('X', 'Y'), sr)
+        return xy.shape[0]
+
+    except:
+        arcpy.AddError("Error in SeamCheck function: " + str(sys.exc_info()[-1].tb_lineno))
+        arcpy.AddError("\n" + str(sys.exc_info()[0]))
+        arcpy.AddError("\n" + str(sys.exc_info()[1]))
+        raise
+
+
 ##############################
 # %% Main
 try:
@@ -124,10 +200,13 @@ try:
     areas_L = arcpy.GetParameter(3)
     MUcomp = arcpy.GetParameter(4)
     SAcomp = arcpy.GetParameter(5)
+    argc = arcpy.GetArgumentCount()
+    inProcess = arcpy.GetParameter(6) if argc > 6 else False
+    tol = arcpy.GetParameter(7) if argc > 7 else None
 
 
     # %%% Variables
-    arcpy.AddMessage("Edgemath version 1.1")
+    arcpy.AddMessage("Edgemath version 1.2")
     start           = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
     MUin_d          = arcpy.Describe(MUin)
     SAin_d          = arcpy.Describe(SAin)
@@ -235,123 +314,141 @@ except:
     arcpy.AddError("\n" + str(sys.exc_info()[1]))
     
 # %%%Node Discovery
-try:
-    arcpy.env.workspace = inputPath
-    arcpy.SetProgressor('default', 'Creating Boundary Nodes')
-
-    # Surveys being checked
-    q = AREASYMBOL + " IN ('"+"','".join(areas)+"')"
-    arcpy.MakeFeatureLayer_management(SAin, SA_L, q)   # Suveys of interest
-    arcpy.PolygonToLine_management(SA_L, SAin_)
-    with arcpy.da.SearchCursor(SA_L, ['OID@', AREASYMBOL]) as sCur:
-        fid2sym = dict(sCur)
-    arcpy.MakeFeatureLayer_management(SAin_, SAin_Lout, "LEFT_FID = -1")
+if inProcess:
+    try:
+        arcpy.SetProgressor('default', 'Comparing survey seams')
+        if not tol:
+            tol = MUD.XYTolerance
+        errorCount = SeamCheck(MUin, SAin, MUcomp, SAcomp, AREASYMBOL,
+                               areas, mismatch, MUD, tol, tol)
+        if errorCount:
+            arcpy.AddWarning(f"{errorCount} Edge match errors found, see feature {mismatch_n}")
+        else:
+            arcpy.AddMessage("No edge match errors found")
+    except:
+        arcpy.AddError("Failed while comparing survey seams")
+        arcpy.AddError("Unexpected error on line: "+str(sys.exc_info()[-1].tb_lineno))
+        arcpy.AddError("\n" + str(sys.exc_info()[0]))
+        arcpy.AddError("\n" + str(sys.exc_info()[1]))
+        raise
+else:
+    try:
+        arcpy.env.workspace = inputPath
+        arcpy.SetProgressor('default', 'Creating Boundary Nodes')
+
+        # Surveys being checked
+        q = AREASYMBOL + " IN ('"+"','".join(areas)+"')"
+        arcpy.MakeFeatureLayer_management(SAin, SA_L, q)   # Suveys of interest
+        arcpy.PolygonToLine_management(SA_L, SAin_)
+        with arcpy.da.SearchCursor(SA_L, ['OID@', AREASYMBOL]) as sCur:
+            fid2sym = dict(sCur)
+        arcpy.MakeFeatureLayer_management(SAin_, SAin_Lout, "LEFT_FID = -1")
     
-    # # Neighboring surveys
-    q2 = AREASYMBOL + " NOT IN ('"+"','".join(areas)+"')"
-    arcpy.MakeFeatureLayer_management(SAcomp, SA_L2, q2)
-    arcpy.SelectLayerByLocation_management(SA_L2, 'BOUNDARY_TOUCHES', SA_L) #,
-    #                                        # selection_type='SUBSET_SELECTION')
-
-    with arcpy.da.SearchCursor(SA_L2, AREASYMBOL) as sCur:
-        rNeigh = {a for a, in sCur}
-    # Soil polygons from neighboring surveys
-    q3 = AREASYMBOL + " IN ('"+"','".join(rNeigh)+"')"  # Neighboirng survey areas
-    arcpy.MakeFeatureLayer_management(MUcomp, MUR_L, q3)
+        # # Neighboring surveys
+        q2 = AREASYMBOL + " NOT IN ('"+"','".join(areas)+"')"
+        arcpy.MakeFeatureLayer_management(SAcomp, SA_L2, q2)
+        arcpy.SelectLayerByLocation_management(SA_L2, 'BOUNDARY_TOUCHES', SA_L) #,
+        #                                        # selection_type='SUBSET_SELECTION')
+
+        with arcpy.da.SearchCursor(SA_L2, AREASYMBOL) as sCur:
+            rNeigh = {a for a, in sCur}
+        # Soil polygons from neighboring surveys
+        q3 = AREASYMBOL + " IN ('"+"','".join(rNeigh)+"')"  # Neighboirng survey areas
+        arcpy.MakeFeatureLayer_management(MUcomp, MUR_L, q3)
     
-    # neighbors = int(arcpy.GetCount_management(MUR_L).getOutput(0))
-    if len(rNeigh):
-        arcpy.AddMessage(f"Working with neighbors {rNeigh}")
+        # neighbors = int(arcpy.GetCount_management(MUR_L).getOutput(0))
+        if len(rNeigh):
+            arcpy.AddMessage(f"Working with neighbors {rNeigh}")
         
-        # All surveys
-        allSurvs = areas | rNeigh
-        q4 = AREASYMBOL + " IN ('"+"','".join(allSurvs)+"')"
-        arcpy.MakeFeatureLayer_management(SAcomp, SA_L3, q4)
-        arcpy.PolygonToLine_management(SA_L3, SA_)
+            # All surveys
+            allSurvs = areas | rNeigh
+            q4 = AREASYMBOL + " IN ('"+"','".join(allSurvs)+"')"
+            arcpy.MakeFeatureLayer_management(SAcomp, SA_L3, q4)
+            arcpy.PolygonToLine_management(SA_L3, SA_)
         
-        with arcpy.da.SearchCursor(SA_, ['RIGHT_FID'], "LEFT_FID = -1") as sCur:
-            outFids = {f for f, in sCur}  
+            with arcpy.da.SearchCursor(SA_, ['RIGHT_FID'], "LEFT_FID = -1") as sCur:
+                outFids = {f for f, in sCur}  
          
-        # Find the Nodes
-        setDict = BNodes2(MUin, nNodes, areas)
-        setDict['zext'] = BNodes(SAin_Lout, MUR_L, kNodes) #SAcommon
-        # arcpy.AddMessage(f"neighbor nodes: {len(setDict['zext'])}")
-        # Set up survey proximity matrix
-        fid2sym[-1] = 'zext'
-        neighSet = set()
-        inFids = set()
-        with arcpy.da.SearchCursor(SAin_, ['RIGHT_FID', 'LEFT_FID']) as sCur:
-            for right, left in sCur:
-                inFids.add(right)
-                inFids.add(left)
-                Neigh = [fid2sym[right], fid2sym[left]]
-                Neigh.sort()
-                neighSet.add(tuple(Neigh))
-        inFids.remove(-1)
-        nakedFids = inFids & outFids
-        if nakedFids:
-            arcpy.AddMessage("Outward facing boundary")
-            nakedSyms = {fid2sym[f] for f in nakedFids}
-            q5 = AREASYMBOL + " IN ('"+"','".join(nakedSyms)+"')"
-            arcpy.MakeFeatureLayer_management(MUin, MUin_L, q5)
-            arcpy.PolygonToLine_management(SA_L2, SA_2, "IGNORE_NEIGHBORS")
-            arcpy.PairwiseErase_analysis(SAin_, SA_2, SA_out)
+            # Find the Nodes
+            setDict = BNodes2(MUin, nNodes, areas)
+            setDict['zext'] = BNodes(SAin_Lout, MUR_L, kNodes) #SAcommon
+            # arcpy.AddMessage(f"neighbor nodes: {len(setDict['zext'])}")
+            # Set up survey proximity matrix
+            fid2sym[-1] = 'zext'
+            neighSet = set()
+            inFids = set()
+            with arcpy.da.SearchCursor(SAin_, ['RIGHT_FID', 'LEFT_FID']) as sCur:
+                for right, left in sCur:
+                    inFids.add(right)
+                    inFids.add(left)
+                    Neigh = [fid2sym[right], fid2sym[left]]
+                    Neigh.sort()
+                    neighSet.add(tuple(Neigh))
+            inFids.remove(-1)
+            nakedFids = inFids & outFids
+            if nakedFids:
+                arcpy.AddMessage("Outward facing boundary")
+                nakedSyms = {fid2sym[f] for f in nakedFids}
+                q5 = AREASYMBOL + " IN ('"+"','".join(nakedSyms)+"')"
+                arcpy.MakeFeatureLayer_management(MUin, MUin_L, q5)
+                arcpy.PolygonToLine_management(SA_L2, SA_2, "IGNORE_NEIGHBORS")
+                arcpy.PairwiseErase_analysis(SAin_, SA_2, SA_out)
             
-            outside = BNodes(SA_out, MUin_L, oNodes)
-            arcpy.AddMessage("outward done")
+                outside = BNodes(SA_out, MUin_L, oNodes)
+                arcpy.AddMessage("outward done")
+            else:
+                outside = set()
         else:
-            outside = set()
-    else:
-        arcpy.AddMessage("No external neighbors")
-        arcpy.MakeFeatureLayer_management(MUin, MUin_L, q)
-        setDict = BNodes2(MUin, nNodes, areas)
-        outside = BNodes(SAin_Lout, MUin_L, oNodes)
-        # Remove vertices 
-        # Set up survey proximity matrix
-        neighSet = set()
-        arcpy.MakeFeatureLayer_management(SAin_, SAin_Lin, "LEFT_FID <> -1")
-        SA_ = SAin_Lin
-        with arcpy.da.SearchCursor(SAin_Lin, ['RIGHT_FID', 'LEFT_FID']) as sCur:
-            for right, left in sCur:
-                Neigh = [fid2sym[right], fid2sym[left]]
-                Neigh.sort()
-                neighSet.add(tuple(Neigh))
+            arcpy.AddMessage("No external neighbors")
+            arcpy.MakeFeatureLayer_management(MUin, MUin_L, q)
+            setDict = BNodes2(MUin, nNodes, areas)
+            outside = BNodes(SAin_Lout, MUin_L, oNodes)
+            # Remove vertices 
+            # Set up survey proximity matrix
+            neighSet = set()
+            arcpy.MakeFeatureLayer_management(SAin_, SAin_Lin, "LEFT_FID <> -1")
+            SA_ = SAin_Lin
+            with arcpy.da.SearchCursor(SAin_Lin, ['RIGHT_FID', 'LEFT_FID']) as sCur:
+                for right, left in sCur:
+                    Neigh = [fid2sym[right], fid2sym[left]]
+                    Neigh.sort()
+                    neighSet.add(tuple(Neigh))
     
-    # (a | b | c) - ((a & b) | (a & c) | (b & c))
-    exclusive = set()
-    inclusive = set()
-    inclusive = inclusive.union(*setDict.values())
+        # (a | b | c) - ((a & b) | (a & c) | (b & c))
+        exclusive = set()
+        inclusive = set()
+        inclusive = inclusive.union(*setDict.values())
     
-    for aSet, bSet in neighSet:
-        exclusive.update(setDict[aSet] & setDict[bSet])
-
-    offSet = inclusive - exclusive
-
-    #Find survey area intersections
-    SA_d = arcpy.analysis.PairwiseDissolve(SA_, Geom(), None, None, "SINGLE_PART")
-    if SA_d:
-        SA_ends = arcpy.management.FeatureVerticesToPoints(SA_d, Geom(), "BOTH_ENDS")
-        setSA = {(p.X, p.Y) 
-                    for G in SA_ends   # for each point geometry
-                    for p in G}     # for point each in point geometry
-        #Exclude survey area intersections
-        offSet.difference_update(setSA | outside)
-
-    Point       = arcpy.Point
-    PG          = arcpy.PointGeometry
-    if offSet:
-        misSet = tuple(PG(Point(x, y)) for x, y in offSet)
-        arcpy.CopyFeatures_management(misSet, mismatch) # allNodes)
-
-        errorCount = len(misSet)
-        if errorCount:
-            arcpy.AddWarning(f"{errorCount} Edge match errors found, see feature {mismatch_n}")
-    else:
-        arcpy.AddMessage("No edge match errors found")
+        for aSet, bSet in neighSet:
+            exclusive.update(setDict[aSet] & setDict[bSet])
+
+        offSet = inclusive - exclusive
+
+        #Find survey area intersections
+        SA_d = arcpy.analysis.PairwiseDissolve(SA_, Geom(), None, None, "SINGLE_PART")
+        if SA_d:
+            SA_ends = arcpy.management.FeatureVerticesToPoints(SA_d, Geom(), "BOTH_ENDS")
+            setSA = {(p.X, p.Y) 
+                        for G in SA_ends   # for each point geometry
+                        for p in G}     # for point each in point geometry
+            #Exclude survey area intersections
+            offSet.difference_update(setSA | outside)
+
+        Point       = arcpy.Point
+        PG          = arcpy.PointGeometry
+        if offSet:
+            misSet = tuple(PG(Point(x, y)) for x, y in offSet)
+            arcpy.CopyFeatures_management(misSet, mismatch) # allNodes)
+
+            errorCount = len(misSet)
+            if errorCount:
+                arcpy.AddWarning(f"{errorCount} Edge match errors found, see feature {mismatch_n}")
+        else:
+            arcpy.AddMessage("No edge match errors found")
     
-except:
-    arcpy.AddError("Failed while creating Boundary Nodes")
-    arcpy.AddError("Unexpected error on line: "+str(sys.exc_info()[-1].tb_lineno))
-    arcpy.AddError("\n" + str(sys.exc_info()[0]))
-    arcpy.AddError("\n" + str(sys.exc_info()[1]))
-    raise
\ No newline at end of file
+    except:
+        arcpy.AddError("Failed while creating Boundary Nodes")
+        arcpy.AddError("Unexpected error on line: "+str(sys.exc_info()[-1].tb_lineno))
+        arcpy.AddError("\n" + str(sys.exc_info()[0]))
+        arcpy.AddError("\n" + str(sys.exc_info()[1]))
+        raise
\ No newline at end of file
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+19 October 2026
+
+ArcGIS Pro compatible
+
+The ExportCore function exports one soil survey to shapefiles with
+QA_ExportShapefiles.ProcessSurveyArea in a worker process. Tool messages
+can not be sent from a worker, so they are collected and returned with the
+result for the parent to report in survey order. The output coordinate
+system and transformation set in the parent by SetOutputCoordinateSystem
+are passed in, as environments are not inherited. Like BCore it is kept in
+its own module so it can be handed to a multiprocessing pool.
+"""
+
+import arcpy, sys
+import QA_ExportShapefiles
+
+class MessageLog:
+    """Stands in for arcpy within QA_ExportShapefiles in a worker process
+    while one survey is exported.
+    AddMessage, AddWarning and AddError are kept as (severity, message),
+    everything else is passed through to arcpy."""
+    def __init__(self):
+        self.msgs = []
+
+    def __getattr__(self, name):
+        return getattr(arcpy, name)
+
+    def AddMessage(self, msg):
+        self.msgs.append((0, msg))
+
+    def AddWarning(self, msg):
+        self.msgs.append((1, msg))
+
+    def AddError(self, msg):
+        self.msgs.append((2, msg))
+
+
+def ExportCore(inLoc, exportList, outLoc, theAS, ssurgoFields, msg,
+               outputSR, transformation):
+    """Parameters
+    ----------
+    outputSR : str
+        Output coordinate system as a string from exportToString
+    transformation : str
+        Geographic transformation(s)
+
+    Returns
+    -------
+    tuple
+        areasymbol, True if the survey exported, list of (severity, message)
+    """
+    log = MessageLog()
+    try:
+        QA_ExportShapefiles.arcpy = log
+        # environments are not inherited by the worker
+        arcpy.env.overwriteOutput = True
+        arcpy.env.workspace = inLoc
+        sr = arcpy.SpatialReference()
+        sr.loadFromString(outputSR)
+        arcpy.env.outputCoordinateSystem = sr
+        arcpy.env.geographicTransformations = transformation
+        bProcessed = QA_ExportShapefiles.ProcessSurveyArea(
+            inLoc, exportList, outLoc, theAS, ssurgoFields, msg
+        )
+        return theAS, bProcessed, log.msgs
+    except:
+        s1 =  sys.exc_info()[-1].tb_lineno
+        s2 = sys.exc_info()[0]
+        s3 = sys.exc_info()[1]
+        log.AddError(f"ExportCore {theAS}: {s1}\n{s2}\n{s3}")
+        return theAS, False, log.msgs
+    finally:
+        # the worker is reused by later jobs
+        QA_ExportShapefiles.arcpy = arcpy
@@ -47,6 +47,13 @@
 #   used as independent library.
 # - Normal messages are no longer Warnings unnecessarily.
 
+# ==========================================================================================
+# Updated  10/19/2026
+#
+# - The feature files of a featdesc table are written in one pass by SSURGO_featdesc.writeFeatdesc
+#   instead of through FEATDESC.txt, which was read again for every areasymbol and matched
+#   lines containing the areasymbol anywhere.
+
 #-------------------------------------------------------------------------------
 
 
@@ -458,6 +465,7 @@ def fileGenerator():
 
 #========================================================================================================
 import sys, os, arcpy, time, getpass, fnmatch, shutil, traceback
+from SSURGO_featdesc import writeFeatdesc
 
 #Parameters
 inSpatialDir = sys.argv[1]
@@ -540,21 +548,6 @@ try:
 
 
             elif txtType == 'DEWORKSPACE':
-                #create a textfile of the featdesc table whose format mimics a feature file
-                #accumulate the areasymbols in a list
-                aSymLst = list()
-
-                with open(os.path.dirname(inTxtDir) + os.sep + 'FEATDESC.txt', 'w') as ff:
-                    with arcpy.da.SearchCursor(inTxtDir + os.sep + 'featdesc', ["*"]) as rows:
-                        for row in rows:
-                            ff.write('"' + str(row[1]) + '"|' +  str(row[0]) + '|"' + str(row[2]) + '"|"' + str(row[3]) + '"|"' + str(row[4]) +'"|"ZZZ"' + '\n')
-                            aSymLst.append(str(row[1]).lower())
-
-                #create a unique list of areasymbols
-                uLst = list(set(aSymLst))
-                uLst.sort()
-                ff.close()
-
                 #make temp location to write files to
                 sfTmpDir = os.path.dirname(inTxtDir) + os.sep + 'sfTmpDir'
 
@@ -565,15 +558,10 @@ try:
                 else:
                     os.mkdir(sfTmpDir)
 
-                #for each areasymbol iterate over the featdesc.txt file, grab the corresponding features and make a new special features file
-                for eVal in uLst:
-                    with open(os.path.dirname(inTxtDir) + os.sep + 'FEATDESC.txt', 'r') as ff:
-                        with open(sfTmpDir + os.sep + 'soilsf_t_' + eVal.lower() + '.txt', 'w') as o:
-                            for line in ff.readlines():
-                                if line.find(eVal.upper()) != -1:
-                                    o.write(line)
-                        o.close()
-                    ff.close()
+                #write a feature file of the featdesc table for each areasymbol in one pass (SSURGO_featdesc)
+                #the objectid stands in for spatialver as before
+                with arcpy.da.SearchCursor(inTxtDir + os.sep + 'featdesc', ['OID@', 'areasymbol', 'featsym', 'featname', 'featdesc']) as rows:
+                    writeFeatdesc(((row[1], row[0]) + row[2:] for row in rows), sfTmpDir)
 
                 for dirpath, dirnames, filenames in os.walk(sfTmpDir):
                     for filename in filenames:
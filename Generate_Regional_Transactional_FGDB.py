@@ -14,8 +14,52 @@ Created on: 1/16/2014
 
 @modified 9/23/2025
     @by: Alexnder Stum
-@version: 2.5
+@version: 2.5.2
 
+# ---
+Update 2.5.2; 10/19/2026
+- appendFeatures reads shapefile feature counts from the .dbf header 
+    (SSURGO_shapefile.shapefileInfo) instead of running GetCount on each 
+    shapefile.
+- Surveys are appended in Hilbert curve order of their SAPOLYGON shapefile 
+    extents (SSURGO_order) instead of copying SAPOLYGON to memory and 
+    sorting it "UR". The survey order is now also used for the other 
+    features, it was computed but ssa_l was passed on.
+- Optional parameter 4 inserts the features of each survey in Hilbert 
+    curve order of their centroids.
+- appendFeatures returns an 'error' dictionary when SAPOLYGON or MUPOLYGON 
+    have no features, a list was returned.
+- Spatial and AREASYMBOL indexes are built from the SSURGO_indexes plan once 
+    all features are appended rather than after each append. The unused 
+    addAttributeIndex function was removed.
+- Optional parameter 5, number of processes. With more than 1 each feature 
+    is appended in its own spawned process (AppendCore) that sets the 
+    geographic transformation and XY tolerance and resolution itself and 
+    projects into a staging geodatabase, then appended into the RTSD. The 
+    transformation is checked on the first feature of each. insertOrdered 
+    moved to AppendCore.
+- Optional parameter 6 refreshes the RTSD of the fiscal year instead of 
+    building a new one. The SAVEREST date of each survey appended is 
+    recorded in a sacatalog table; surveys whose download has another date 
+    have their features and featdesc rows deleted and appended again, and 
+    the topology is validated within their extents only. Index, gold 
+    features, topology and relationship class are left as they are. The 
+    dates of the surveys refreshed are nulled before they are deleted, so 
+    a failed refresh is retried, and sorted features are staged in the 
+    scratch geodatabase and appended, as the topology's features can not 
+    be edited by a cursor.
+- appendFeatures and appendParallel check the number of features added 
+    rather than the total, which includes those of other surveys when 
+    refreshing.
+- importFeatdesc reads the soilsf_t files with SSURGO_featdesc: survey 
+    folders from one listing of the download folder instead of eval'd 
+    paths, files read in parallel with parameter 5, duplicate (areasymbol, 
+    featsym) rows skipped and all rows inserted with one cursor. It returned 
+    None rather than its error message on an exception.
+- The topology is validated by survey tile with SSURGO_topology: in full 
+    once created, recording every tile, and on a refresh only the tiles of 
+    the refreshed surveys, before and after, and of surveys edited since 
+    their last validation. The unused surveysExtent function was removed.
 # ---
 Update 2.5.1; 11/13/2025
 - if soil survey layer not provided parameter 3 still returns a geoprocessing 
@@ -119,10 +163,8 @@ never be used as independent library.
 import arcpy
 import sys
 import os
-import datetime
 import re
 import traceback
-import csv
 import requests
 import json
 import pandas as pd
@@ -131,6 +173,13 @@ from datetime import datetime
 from urllib.request import urlopen
 from importlib import reload
 import query_download
+from SSURGO_shapefile import shapefileInfo
+from SSURGO_order import spatialOrder
+from SSURGO_indexes import applyIndexPlan, spatialIndexes
+from AppendCore import insertOrdered
+from SSURGO_mmap import readRows
+from SSURGO_featdesc import FIELDS, loadFeatdesc, surveyFolders
+from SSURGO_topology import scheduleValidation, surveyTiles
 reload(query_download)
 
 
@@ -377,6 +426,31 @@ def getSSARegionList(ssurgo_p: str, region_opt: str) -> list[str]:
         return []
 
 
+def rtsdName(region_opt: str) -> str:
+    """Name of the RTSD File Geodatabase of a Region for the current fiscal 
+    year.
+
+    Parameters
+    ----------
+    region_opt : str
+        The Region, spaces removed.
+
+    Returns
+    -------
+    str
+        The FGDB name, i.e. RTSD_Southwest_HI_FY27.gdb
+    """
+    # New fiscal year if month October, November and December
+    month = int(datetime.now().strftime("%m"))
+    if month > 9 and month < 13:
+        FY = f"FY{int(datetime.now().strftime('%y')) + 1}"
+    else:
+        FY = f"FY{datetime.now().strftime('%y')}"
+    # {datetime.strftime(datetime.now(),'%Y%m%d%H%M%S')}
+
+    return f"RTSD_{region_opt.replace(':', '_')}_{FY}.gdb"
+
+
 def createFGDB(region_opt: str, output_p: str) -> str:
     """Create the RTSD File Geodatabase for Regional GIS Specialist
 
@@ -401,15 +475,7 @@ def createFGDB(region_opt: str, output_p: str) -> str:
     """
 
     try:
-        # New fiscal year if month October, November and December
-        month = int(datetime.now().strftime("%m"))
-        if month > 9 and month < 13:
-            FY = f"FY{int(datetime.now().strftime('%y')) + 1}"
-        else:
-            FY = f"FY{datetime.now().strftime('%y')}"
-        # {datetime.strftime(datetime.now(),'%Y%m%d%H%M%S')}
-
-        newName = f"RTSD_{region_opt.replace(':', '_')}_{FY}.gdb"
+        newName = rtsdName(region_opt)
         # Space ' ' in region_opt was removed in main
         # Alaska =  NAD83 / Alaska Albers (EPSG 3338)
         if region_opt == 'Alaska':
@@ -467,10 +533,14 @@ def createFGDB(region_opt: str, output_p: str) -> str:
         return ''
 
 
-def importFeatdesc(ssa_l: list[str], input_p: str, gdb_p: str) -> str:
-    """Runs through each SSURGO download folder and imports the rows into the 
-    specified ``table`` . These tables have unique information from each 
-    survey area.
+def importFeatdesc(
+        ssa_l: list[str], input_p: str, gdb_p: str, nproc: int=1
+    ) -> str:
+    """Imports the special feature descriptions of each SSURGO download into 
+    the featdesc table. Survey folders are found from a single listing of 
+    input_p, the soilsf_t files are read nproc at a time (SSURGO_featdesc) 
+    and all rows are inserted with one cursor. Duplicate (areasymbol, 
+    featsym) rows are skipped with a warning.
 
     Parameters
     ----------
@@ -480,6 +550,8 @@ def importFeatdesc(ssa_l: list[str], input_p: str, gdb_p: str) -> str:
         Path to the SSRUGO downloads
     gdb_p : str
         Path of the SSURGO geodatabase
+    nproc : int
+        Number of processes reading the soilsf_t files.
 
     Returns
     -------
@@ -487,51 +559,31 @@ def importFeatdesc(ssa_l: list[str], input_p: str, gdb_p: str) -> str:
         An empty string if successful, otherwise and error message.
     """
     try:
-        txt = txt = 'soilsf_t_{ssa}'
-        cols = ['areasymbol', 'featsym', 'featname', 'featdesc']
-        iCur = arcpy.da.InsertCursor(f'{gdb_p}/featdesc', cols)
-
-        for ssa in ssa_l:
-            txt_p = f"'{input_p}/{ssa.upper()}/spatial/{txt}.txt'"
-            # in some instances // can create special charaters with eval
-            txt_p = txt_p.replace('\\', '/')
-            # convert latent f strings
-            txt_p = eval("f" + txt_p)
-            
-            if not os.path.exists(txt_p):
-                # Try SDM labeling
-                txt_p = f"'{input_p}/soil_{ssa.lower()}/spatial/{txt}.txt'"
-                # in some instances // can create special charaters with eval
-                txt_p = txt_p.replace('\\', '/')
-                # convert latent f strings
-                txt_p = eval("f" + txt_p)
-                if not os.path.exists(txt_p):
-                    return f"{txt_p} does not exist"
-            csvReader = csv.reader(
-                open(txt_p, 'r'), delimiter='|', quotechar='"'
+        if nproc > 1:
+            import multiprocessing as mp
+            mp.set_executable(os.path.join(sys.exec_prefix, 'python.exe'))
+        output = loadFeatdesc(ssa_l, surveyFolders(input_p), nproc)
+        if output['missing']:
+            return (f"soilsf_t files do not exist in {input_p} for: "
+                    f"{', '.join(output['missing'])}")
+        if output['errors']:
+            return '\n'.join(output['errors'])
+        if output['duplicates']:
+            arcpy.AddWarning(
+                f"\tSkipped {len(output['duplicates'])} duplicate featdesc "
+                f"rows: {output['duplicates'][:10]}"
             )
-            for row in csvReader:
-                # replace empty sets with None; exclude feature key
-                row = list(None if not v else v for v in row)[:-1]
-                row.pop(1)
+        with arcpy.da.InsertCursor(f'{gdb_p}/featdesc', FIELDS) as iCur:
+            for row in output['rows']:
                 iCur.insertRow(row)
-        del iCur
         return ''
 
     except arcpy.ExecuteError:
-        try:
-            del iCur
-        except:
-            pass
         func = sys._getframe().f_code.co_name
-        return arcpy.AddError(arcpyErr(func))
+        return arcpyErr(func)
     except:
-        try:
-            del iCur
-        except:
-            pass
         func = sys._getframe().f_code.co_name
-        return arcpy.AddError(pyErr(func))
+        return pyErr(func)
 
 
 def createTopology(RTSD_p: str) -> bool:
@@ -672,17 +724,60 @@ def createTopology(RTSD_p: str) -> bool:
         return False
 
 
+def featureShapefiles(
+        feat_shp: str, input_f: str, ssa_l: list[str]
+    ) -> dict:
+    """Finds the shapefiles of a SSURGO feature
+
+    Parameters
+    ----------
+    feat_shp : str
+        The shapefile name, i.e. soilmu_a.
+    input_f str
+        Folder with the unzipped SSURGO donwloads.
+    ssa_l : list[str]
+        List of soil survey areas.
+
+    Returns
+    -------
+    dict
+        'shapefiles' with {ssa: shapefile path} of the surveys with features 
+        and 'count' with their total number of features read from the .dbf 
+        headers. If a shapefile is missing, a dictionary with the 'error' 
+        key with an error message.
+    """
+    count = 0 # total count of features
+    shp_d = {} # {ssa: shapefile path} of surveys with features
+    for ssa in ssa_l:
+        shp = (f"{input_f}/{ssa.upper()}/spatial/"
+               f"{feat_shp}_{ssa.lower()}.shp")
+        if not os.path.exists(shp):
+            # Try SDM labeling
+            shp = (f"{input_f}/soil_{ssa.lower()}/spatial/"
+                   f"{feat_shp}_{ssa}.shp")
+            if not os.path.exists(shp):
+                return {'error': f"{shp} does not exist."}
+        # feature count from the .dbf header
+        cnt = shapefileInfo(shp)[2]
+        count += cnt
+        if cnt > 0:
+            shp_d[ssa] = shp
+    return {'shapefiles': shp_d, 'count': count}
+
+
 def appendFeatures(
-        fd_p: str, feat: tuple[str], input_f: str, ssa_l: list[str]
+        fd_p: str, feat: tuple[str], input_f: str, ssa_l: list[str],
+        sort_features: bool=False
     )-> dict[list[str]]:
     """Appends SSURGO spatial features 
     
-    Appends from each SSURGO download to the respective SSURGO feature. Note 
-    that SAPOLYGON should be appeneded first to aid with spatial indexing by 
-    setting append order from NW extent of survey set. While this function 
-    could be run in parallel, the arcpy environmental setting for 
-    Geographic Transformations is not honored and could not be set within the 
-    indiviudal instances.
+    Appends from each SSURGO download to the respective SSURGO feature in 
+    the order of ssa_l. SAPOLYGON should be appended first: its surveys are 
+    ordered along a Hilbert curve through their shapefile extents and that 
+    order is returned for appending the other features, so that neighboring 
+    surveys are stored together. The arcpy environmental setting for 
+    Geographic Transformations is not honored by concurrent instances of this 
+    function, appendParallel runs each feature in its own process instead.
 
     Parameters
     ----------
@@ -695,6 +790,13 @@ def appendFeatures(
         Folder with the unzipped SSURGO donwloads.
     ssa_l : list[str]
         List of soil survey areas to be appended.
+    sort_features : bool
+        If True the features of each survey are inserted in Hilbert curve 
+        order (insertOrdered) rather than appended in shapefile order.
+        SAPOLYGON is always appended. When refreshing, the features already 
+        participate in the topology, which cursors cannot edit outside an 
+        edit session, so they are inserted into a staging feature class in 
+        the scratch geodatabase and appended from it.
 
     Returns
     -------
@@ -709,65 +811,54 @@ def appendFeatures(
         feat_gdb = feat[0]
         feat_shp = feat[1]
         env.geographicTransformations = 'WGS_1984_(ITRF00)_To_NAD_1983'
-
-        # if SAPOLYGON, set up temp file to append a spatially indexed version
-        if (feat_gdb != 'SAPOLYGON') or (len(ssa_l) == 1):
-            feat_p = f"{fd_p}/{feat_gdb}"
-        else:
-            feat_p = "memory/SAPOLYGON"
-        count = 0 # total count of features
-        # feat_d = {} # path, count; for log file
-        feat_l = []
-        for ssa in ssa_l:
-            shp = (f"{input_f}/{ssa.upper()}/spatial/"
-                   f"{feat_shp}_{ssa.lower()}.shp")
-            if not os.path.exists(shp):
-                # Try SDM labeling
-                shp = (f"{input_f}/soil_{ssa.lower()}/spatial/"
-                       f"{feat_shp}_{ssa}.shp")
-                if not os.path.exists(shp):
-                    arcpy.AddError()
-                    return {'error': f"{shp} does not exist."}
-            cnt = int(arcpy.GetCount_management(shp).getOutput(0))
-            count += cnt
-            if cnt > 0:
-                feat_l.append(shp)
+        feat_p = f"{fd_p}/{feat_gdb}"
+        output = featureShapefiles(feat_shp, input_f, ssa_l)
+        if 'error' in output:
+            return output
+        shp_d = output['shapefiles']
+        count = output['count']
+
+        if feat_gdb == 'SAPOLYGON':
+            # Order surveys along a Hilbert curve through their extents, 
+            # surveys without a boundary keep their place at the end
+            sort_l = spatialOrder(
+                {ssa: shapefileInfo(shp)[1] for ssa, shp in shp_d.items()}
+            )
+            ssa_l = sort_l + [ssa for ssa in ssa_l if ssa not in shp_d]
+        feat_l = [shp_d[ssa] for ssa in ssa_l if ssa in shp_d]
 
         if feat_l:
             # arcpy.SetProgressorLabel(f"\tAppending features to {feat_gdb}")
-            if feat_p != "memory/SAPOLYGON":
-                arcpy.Append_management(feat_l, feat_p, "NO_TEST")
-                cnt = int(arcpy.GetCount_management(feat_p).getOutput(0))
+            # features already in the RTSD, when refreshing
+            before = int(arcpy.GetCount_management(feat_p).getOutput(0))
+            if (sort_features and feat_gdb != 'SAPOLYGON'
+                    and arcpy.Exists(f"{fd_p}/FD_RTSD_Topology")):
+                desc = arcpy.Describe(feat_p)
+                stage_fc = arcpy.CreateFeatureclass_management(
+                    env.scratchGDB, f"{feat_gdb}_sorted", desc.shapeType, 
+                    feat_p, spatial_reference=desc.spatialReference
+                ).getOutput(0)
+                try:
+                    insertOrdered(feat_l, stage_fc)
+                    arcpy.Append_management(stage_fc, feat_p, "NO_TEST")
+                finally:
+                    arcpy.Delete_management(stage_fc)
+            elif sort_features and feat_gdb != 'SAPOLYGON':
+                insertOrdered(feat_l, feat_p)
             else:
-                # Make virtual copy of template SAPOLYOGN to preserve metadata
-                arcpy.CopyFeatures_management(f"{fd_p}/{feat_gdb}", feat_p)
                 arcpy.Append_management(feat_l, feat_p, "NO_TEST")
-                feat_temp = feat_p
-                feat_p = f"{fd_p}/{feat_gdb}"
-                feat_desc = arcpy.Describe(feat_p)
-                shp_fld = feat_desc.shapeFieldName
-                # Spatially sort fron NW extent
-                arcpy.management.Sort(feat_temp, feat_p, shp_fld, "UR")
-                sCur = arcpy.da.SearchCursor(feat_p, "areasymbol", )
-                sort_l = tuple(ssa for ssa, in sCur)
-                del sCur
-                arcpy.Delete_management(feat_temp)
-                arcpy.Delete_management("memory")
-                return {'surveys': sort_l}
-
-            if cnt == count:
-                arcpy.management.AddSpatialIndex(feat_p)
-                arcpy.management.AddIndex(
-                    feat_p, "AREASYMBOL", "Indx_MupolyAreasymbol"
-                )
-            else:
+            cnt = (int(arcpy.GetCount_management(feat_p).getOutput(0))
+                   - before)
+
+            # indexes are built once all features are appended
+            if cnt != count:
                 msg = (f"\tOnly {cnt} of {count} features were "
                        f"appended to {feat_gdb}")
                 return {'error': msg}
         
         elif (feat_gdb == 'SAPOLYGON') or (feat_gdb == 'MUPOLYGON'):
             msg = f"\tThere were no features appended to {feat_gdb}"
-            return [msg]
+            return {'error': msg}
         else: # No MUPOINT, MULINE, or special features
             pass
         return {'surveys': ssa_l}
@@ -782,6 +873,285 @@ def appendFeatures(
         return {'error': msg}
 
 
+def appendParallel(
+        fd_p: str, features: list[tuple[str]], input_f: str, 
+        ssa_l: list[str], stage_p: str, nproc: int, 
+        sort_features: bool=False
+    )-> dict[list[str]]:
+    """Appends SSURGO spatial features in parallel
+    
+    Each SSURGO feature is appended by an AppendCore worker in its own 
+    spawned process into a staging geodatabase in stage_p. The worker sets 
+    the geographic transformation and the XY tolerance and resolution of 
+    the RTSD feature itself and confirms the transformation was applied to 
+    the first feature. Surveys are ordered along a Hilbert curve through 
+    their SAPOLYGON shapefile extents before the workers start, MUPOLYGON 
+    first as it takes longest. As each worker finishes its staged feature, 
+    already projected, is appended into the RTSD.
+
+    Parameters
+    ----------
+    fd_p : str
+        The path of the RTSD feature dataset.
+    features : list[tuple(str)]
+        SSURGO feature name and shapefile name of each feature, SAPOLYGON 
+        included.
+    input_f str
+        Folder with the unzipped SSURGO donwloads.
+    ssa_l : list[str]
+        List of soil survey areas to be appended.
+    stage_p : str
+        Folder for the staging geodatabases, removed afterwards.
+    nproc : int
+        Number of processes.
+    sort_features : bool
+        As in appendFeatures.
+
+    Returns
+    -------
+    dict[list[str]]
+        As appendFeatures, the 'surveys' are spatially sorted.
+    """
+    import time
+    import multiprocessing as mp
+    from AppendCore import AppendCore
+
+    pool = None
+    try:
+        tm = 'WGS_1984_(ITRF00)_To_NAD_1983'
+        shp_dd = {}
+        for feat_gdb, feat_shp in features:
+            output = featureShapefiles(feat_shp, input_f, ssa_l)
+            if 'error' in output:
+                return output
+            shp_dd[feat_gdb] = output
+
+        # Order surveys along a Hilbert curve through their extents, 
+        # surveys without a boundary keep their place at the end
+        sa_d = shp_dd['SAPOLYGON']['shapefiles']
+        sort_l = spatialOrder(
+            {ssa: shapefileInfo(shp)[1] for ssa, shp in sa_d.items()}
+        )
+        ssa_l = sort_l + [ssa for ssa in ssa_l if ssa not in sa_d]
+
+        if not os.path.exists(stage_p):
+            os.mkdir(stage_p)
+        mp.set_executable(os.path.join(sys.exec_prefix, 'python.exe'))
+        pool = mp.Pool(min(nproc, len(features)))
+        jobs = []
+        for feat_gdb, feat_shp in sorted(
+                features, key=lambda feat: feat[0] != 'MUPOLYGON'):
+            shp_d = shp_dd[feat_gdb]['shapefiles']
+            feat_l = [shp_d[ssa] for ssa in ssa_l if ssa in shp_d]
+            if not feat_l:
+                if feat_gdb in ('SAPOLYGON', 'MUPOLYGON'):
+                    msg = f"\tThere were no features appended to {feat_gdb}"
+                    return {'error': msg}
+                # No MUPOINT, MULINE, or special features
+                continue
+            feat_p = f"{fd_p}/{feat_gdb}"
+            sr = arcpy.Describe(feat_p).spatialReference
+            sort = sort_features and feat_gdb != 'SAPOLYGON'
+            job = pool.apply_async(
+                AppendCore, 
+                args=(feat_l, f"{stage_p}/{feat_gdb}.gdb", feat_p, feat_gdb, 
+                      tm, sr.XYTolerance, sr.XYResolution, sort)
+            )
+            jobs.append((feat_gdb, shp_dd[feat_gdb]['count'], job))
+            arcpy.AddMessage(
+                f"\tAppending {len(feat_l)} {feat_shp} shapefiles to "
+                f"{feat_gdb} in a separate process"
+            )
+        pool.close()
+
+        while jobs:
+            done = [job for job in jobs if job[2].ready()]
+            if not done:
+                time.sleep(1)
+                continue
+            for feat_gdb, count, job in done:
+                jobs.remove((feat_gdb, count, job))
+                result = job.get()
+                if isinstance(result, str):
+                    return {'error': result}
+                fc, stage_fc, cnt, applied = result
+                if not applied:
+                    msg = (f"\tThe {tm} transformation was not applied to "
+                           f"{feat_gdb}")
+                    return {'error': msg}
+                if cnt != count:
+                    msg = (f"\tOnly {cnt} of {count} features were "
+                           f"appended to {feat_gdb}")
+                    return {'error': msg}
+                # same coordinate system, nothing is projected
+                feat_p = f"{fd_p}/{feat_gdb}"
+                before = int(arcpy.GetCount_management(feat_p).getOutput(0))
+                arcpy.Append_management(stage_fc, feat_p, "NO_TEST")
+                cnt = (int(arcpy.GetCount_management(feat_p).getOutput(0))
+                       - before)
+                if cnt != count:
+                    msg = (f"\tOnly {cnt} of {count} features were "
+                           f"appended to {feat_gdb}")
+                    return {'error': msg}
+                arcpy.AddMessage(f"Successfully appended {feat_gdb}")
+        return {'surveys': ssa_l}
+
+    except arcpy.ExecuteError:
+        func = sys._getframe().f_code.co_name
+        msg = arcpyErr(func)
+        return {'error': msg}
+    except:
+        func = sys._getframe().f_code.co_name
+        msg = pyErr(func)
+        return {'error': msg}
+    finally:
+        if pool:
+            pool.terminate()
+            pool.join()
+        for feat_gdb, feat_shp in features:
+            if arcpy.Exists(f"{stage_p}/{feat_gdb}.gdb"):
+                arcpy.Delete_management(f"{stage_p}/{feat_gdb}.gdb")
+        try:
+            os.rmdir(stage_p)
+        except:
+            pass
+
+
+def surveyDates(ssa_l: list[str], input_f: str) -> dict:
+    """Reads the SAVEREST date of each SSURGO download from the first record 
+    of its tabular/sacatlog.txt file.
+
+    Parameters
+    ----------
+    ssa_l : list[str]
+        List of soil survey areas.
+    input_f str
+        Folder with the unzipped SSURGO donwloads.
+
+    Returns
+    -------
+    dict
+        {ssa: datetime} of the surveys with a sacatlog.txt file, None if 
+        its date could not be read, so that the survey is treated as 
+        changed.
+    """
+    date_d = {}
+    for ssa in ssa_l:
+        txt_p = f"{input_f}/{ssa.upper()}/tabular/sacatlog.txt"
+        if not os.path.exists(txt_p):
+            # Try SDM labeling
+            txt_p = f"{input_f}/soil_{ssa.lower()}/tabular/sacatlog.txt"
+            if not os.path.exists(txt_p):
+                continue
+        for row in readRows(txt_p):
+            # i.e. 9/23/2014 6:49:27
+            try:
+                date_d[ssa] = datetime.strptime(
+                    row[3], "%m/%d/%Y %H:%M:%S"
+                )
+            except (ValueError, IndexError):
+                arcpy.AddWarning(
+                    f"{ssa}: SAVEREST date of {txt_p} could not be read, "
+                    "it will be appended"
+                )
+                date_d[ssa] = None
+            break
+    return date_d
+
+
+def readSurveyDates(gdb_p: str) -> dict:
+    """Reads the SAVEREST dates of the surveys appended to the RTSD from its 
+    sacatalog table.
+
+    Parameters
+    ----------
+    gdb_p : str
+        Path of the RTSD geodatabase
+
+    Returns
+    -------
+    dict
+        {ssa: datetime}, empty if the RTSD has no sacatalog table, i.e. it 
+        was built before the dates were recorded.
+    """
+    tab_p = f"{gdb_p}/sacatalog"
+    if not arcpy.Exists(tab_p):
+        return {}
+    with arcpy.da.SearchCursor(tab_p, ['areasymbol', 'saverest']) as sCur:
+        return {ssa: saverest for ssa, saverest in sCur}
+
+
+def recordSurveyDates(gdb_p: str, date_d: dict) -> None:
+    """Records the SAVEREST dates of surveys appended to the RTSD in its 
+    sacatalog table, created if missing, replacing their previous dates.
+
+    Parameters
+    ----------
+    gdb_p : str
+        Path of the RTSD geodatabase
+    date_d : dict
+        {ssa: datetime}
+    """
+    tab_p = f"{gdb_p}/sacatalog"
+    if not arcpy.Exists(tab_p):
+        arcpy.CreateTable_management(gdb_p, 'sacatalog')
+        arcpy.AddField_management(tab_p, 'areasymbol', 'TEXT', field_length=20)
+        arcpy.AddField_management(tab_p, 'saverest', 'DATE')
+    with arcpy.da.UpdateCursor(tab_p, ['areasymbol']) as uCur:
+        for ssa, in uCur:
+            if ssa in date_d:
+                uCur.deleteRow()
+    with arcpy.da.InsertCursor(tab_p, ['areasymbol', 'saverest']) as iCur:
+        for ssa, saverest in sorted(date_d.items()):
+            iCur.insertRow([ssa, saverest])
+
+
+def deleteSurveys(gdb_p: str, feat_l: list[str], ssa_l: list[str]) -> bool:
+    """Deletes the features and featdesc rows of soil survey areas from the 
+    RTSD. Geoprocessing tools are used as the features participate in the 
+    topology, which cursors cannot edit outside an edit session.
+
+    Parameters
+    ----------
+    gdb_p : str
+        Path of the RTSD geodatabase
+    feat_l : list[str]
+        SSURGO feature names
+    ssa_l : list[str]
+        List of soil survey areas to delete
+
+    Returns
+    -------
+    bool
+        Returns True if successful, otherwise False
+    """
+    try:
+        q = "AREASYMBOL IN ({})".format(
+            ", ".join(f"'{ssa}'" for ssa in ssa_l)
+        )
+        for feat in feat_l:
+            lyr = arcpy.MakeFeatureLayer_management(
+                f"{gdb_p}/FD_RTSD/{feat}", f"{feat}_refresh", q
+            )
+            arcpy.DeleteFeatures_management(lyr)
+            arcpy.Delete_management(lyr)
+        view = arcpy.MakeTableView_management(
+            f"{gdb_p}/featdesc", "featdesc_refresh", q
+        )
+        arcpy.DeleteRows_management(view)
+        arcpy.Delete_management(view)
+        return True
+
+    except arcpy.ExecuteError:
+        func = sys._getframe().f_code.co_name
+        arcpy.AddError(arcpyErr(func))
+        return False
+    except:
+        func = sys._getframe().f_code.co_name
+        arcpy.AddError(pyErr(func))
+        return False
+
+
 def updateAliasNames(region: str, gdb_p: str) -> bool:
     """Create and Region specific alieas for each spatial feature
 
@@ -805,7 +1175,6 @@ def updateAliasNames(region: str, gdb_p: str) -> bool:
             'Southwest: HI': 'HI', 'Southwest: AmSamoa':'AS',
             'Southwest: PacBasin': 'PB', 'South Central': 'SC'
         }
-        aliasUpdate = 0
         if region == 'CONUS':
             alias_n = "CONUS"
         else:
@@ -846,116 +1215,9 @@ def updateAliasNames(region: str, gdb_p: str) -> bool:
         return False
 
 
-def addAttributeIndex(table: str, fieldList: list[str], verbose=True) -> bool:
-    """Creates attribute indices for all feature classes and tables
-
-Attribute indexes can speed up attribute queries on feature classes and tables.
-This function adds an attribute indices for the fields passed to the table that
-is passed in.
-  1) Table - 
-  2) 
-This function will make sure an existing index is not associated with that field.
-Does not return anything.
-
-    Parameters
-    ----------
-    table : _type_
-        Full path to an existing table or feature class
-    fieldList : _type_
-        List of fields that exist in table
-    verbose : bool, optional
-        Whether to print out all messages, by default True
-
-    Returns
-    -------
-    bool
-        Returns True if successful, otherwise False.
-    """
-# 
-
-    try:
-        # Make sure table exists. - Just in case
-        if not arcpy.Exists(table):
-            arcpy.AddError(
-                "Attribute index cannot be created for: "
-                f"{os.path.basename(table)} TABLE DOES NOT EXIST")
-            return False
-
-        else:
-            if verbose: 
-                arcpy.AddMessage(
-                    "Adding Indexes to Table: " + os.path.basename(table))
-
-        # iterate through every field
-        for fieldToIndex in fieldList:
-            # Make sure field exists in table - Just in case
-            if not len(arcpy.ListFields(table,"*" + fieldToIndex))>0:
-                if verbose:
-                    arcpy.AddError(
-                        "\tAttribute index cannot be created for: "
-                        f"{fieldToIndex}. FIELD DOES NOT EXIST"
-                    )
-                    continue
-
-            # list of indexes (attribute and spatial) within the table that are
-            # associated with the field or a field that has the field name in 
-            # it. Important to inspect all associated fields b/c they could be 
-            # using a differently named index
-            existingIndexes = arcpy.ListIndexes(table,"*" + fieldToIndex)
-            bFieldIndexExists = False
-
-            # check existing indexes to see if fieldToIndex is already 
-            # associated with an index
-            if len(existingIndexes) > 0:
-
-                # iterate through the existing indexes looking for a field match
-                for index in existingIndexes:
-                    associatedFlds = index.fields
-                    # iterate through the fields associated with existing index.
-                    # Should only be 1 field since multiple fields are not 
-                    # allowed in a single FGDB.
-                    for fld in associatedFlds:
-                        # Field is already part of an existing index
-                        if fld.name == fieldToIndex:
-                            if verbose:
-                                arcpy.AddWarning(
-                                    f"\tAttribute Index for {fieldToIndex} "
-                                    "field already exists"
-                                )
-                                bFieldIndexExists = True
-
-                    # Field is already part of an existing index
-                    # Proceed to next field
-                    if bFieldIndexExists:
-                        break
-
-            # Attribute field index does not exist.  Add one.
-            if not bFieldIndexExists:
-                newIndex = "IDX_" + fieldToIndex
-                # UNIQUE setting is not used in FGDBs - comment out
-                arcpy.AddIndex_management(
-                    table,fieldToIndex,newIndex,"#","ASCENDING"
-                )
-
-                if verbose:
-                    arcpy.AddMessage(
-                        "\tSuccessfully added attribute index for "
-                        f"{fieldToIndex}"
-                    )
-
-    except arcpy.ExecuteError:
-        func = sys._getframe().f_code.co_name
-        arcpy.AddError(arcpyErr(func))
-        return False
-    except:
-        func = sys._getframe().f_code.co_name
-        arcpy.AddError(pyErr(func))
-        return False
-
-
 # --- Main Body
 if __name__ == '__main__':
-    v = '2.5.1'
+    v = '2.5.2'
     arcpy.AddMessage(f'Version: {v}')
     env.parallelProcessingFactor = "85%"
     env.overwriteOutput = True
@@ -969,6 +1231,24 @@ if __name__ == '__main__':
     # original SDM spatial and tabular data exist.
     ssurgo_p = arcpy.GetParameterAsText(2)
     sa_lyr = arcpy.GetParameter(3)
+    # Parameter 4: (Optional) Insert the features of each survey in Hilbert 
+    # curve order
+    if arcpy.GetArgumentCount() > 4:
+        sort_features = arcpy.GetParameter(4)
+    else:
+        sort_features = False
+    # Parameter 5: (Optional) Number of processes. With more than 1 each 
+    # feature is appended in its own process
+    if arcpy.GetArgumentCount() > 5 and arcpy.GetParameterAsText(5):
+        nproc = int(arcpy.GetParameterAsText(5))
+    else:
+        nproc = 1
+    # Parameter 6: (Optional) Refresh the existing RTSD of the fiscal year, 
+    # only surveys with a new SAVEREST date are deleted and appended again
+    if arcpy.GetArgumentCount() > 6:
+        refresh = arcpy.GetParameter(6)
+    else:
+        refresh = False
     startTime = datetime.now()
 
     try:
@@ -985,79 +1265,151 @@ if __name__ == '__main__':
         if not ssa_l:
             exit()
         arcpy.AddMessage(f"{len(ssa_l)} surveys are in {region_opt}")
+        # SAVEREST dates of the downloads
+        date_d = surveyDates(ssa_l, ssurgo_p)
+        features = [('SAPOLYGON', 'soilsa_a'),
+                    ('MUPOLYGON', 'soilmu_a'),
+                    ('MULINE', 'soilmu_l'),
+                    ('MUPOINT', 'soilmu_p'),
+                    ('FEATLINE', 'soilsf_l'),
+                    ('FEATPOINT', 'soilsf_p')]
 
-        # Create Empty Regional Transactional File Geodatabase
-        RTSD_n = createFGDB(region_opt.replace(' ', ''), output_p)
-        if not RTSD_n:
-            exit()
-        # Path to Regional FGDB
-        gdb_p = f"{output_p}/{RTSD_n}"
-        fd_p = f"{gdb_p}/FD_RTSD"
+        if refresh:
+            RTSD_n = rtsdName(region_opt.replace(' ', ''))
+            gdb_p = f"{output_p}/{RTSD_n}"
+            fd_p = f"{gdb_p}/FD_RTSD"
+            if not arcpy.Exists(gdb_p):
+                arcpy.AddError(f"{gdb_p} does not exist to refresh")
+                exit()
+            # Surveys whose download is newer than the one appended, or 
+            # whose date could not be read
+            rtsd_d = readSurveyDates(gdb_p)
+            ssa_l = [
+                ssa for ssa in ssa_l
+                if ssa in date_d and (
+                    date_d[ssa] is None or date_d[ssa] != rtsd_d.get(ssa)
+                )
+            ]
+            if not ssa_l:
+                arcpy.AddMessage(f"All surveys of {RTSD_n} are current")
+                exit()
+            arcpy.AddMessage(
+                f"Refreshing {len(ssa_l)} surveys of {RTSD_n}:\n{ssa_l}"
+            )
+            # tiles to validate: the surveys before and after the refresh
+            old_tiles = surveyTiles(fd_p, ssa_l)
+            # Null the dates of the surveys before they are deleted so a 
+            # refresh that fails before they are appended again and 
+            # recorded retries them
+            recordSurveyDates(gdb_p, dict.fromkeys(ssa_l))
+            if not deleteSurveys(gdb_p, [f for f, shp in features], ssa_l):
+                exit()
+        else:
+            # Create Empty Regional Transactional File Geodatabase
+            RTSD_n = createFGDB(region_opt.replace(' ', ''), output_p)
+            if not RTSD_n:
+                exit()
+            # Path to Regional FGDB
+            gdb_p = f"{output_p}/{RTSD_n}"
+            fd_p = f"{gdb_p}/FD_RTSD"
 
         # --- Import Feature descriptions
-        msg = importFeatdesc(ssa_l, ssurgo_p, gdb_p)
+        msg = importFeatdesc(ssa_l, ssurgo_p, gdb_p, nproc)
         if msg:
             arcpy.AddError(msg)
         else:
             arcpy.AddMessage('\nThe featdesc table has been populated.')
         arcpy.SetProgressorLabel('Appending spatial features')
-        # Path to feature dataset that contains SSURGO feature classes
-        features = [('SAPOLYGON', 'soilsa_a'),
-                    ('MUPOLYGON', 'soilmu_a'),
-                    ('MULINE', 'soilmu_l'),
-                    ('MUPOINT', 'soilmu_p'),
-                    ('FEATLINE', 'soilsf_l'),
-                    ('FEATPOINT', 'soilsf_p')]
-        # for feat in features:
-        # SAPOLYGON must be run first to sort `survey_l`
-        output = appendFeatures(fd_p, features[0], ssurgo_p, ssa_l)
-        if 'surveys' in output:
+        if nproc > 1:
+            output = appendParallel(
+                fd_p, features, ssurgo_p, ssa_l, 
+                f"{os.path.splitext(gdb_p)[0]}_stage", nproc, sort_features
+            )
+            if 'error' in output:
+                arcpy.AddError("Failed to append spatial features")
+                arcpy.AddError(output['error'])
+                exit()
             survey_l = output['surveys']
-            arcpy.AddMessage("\nSuccessfully appended SAPOLYGON")
         else:
-            arcpy.AddError("Failed to append SAPOLYGON")
-            arcpy.AddError(output['error'])
-            exit()
-        for feat in features[1:]:
-            msg = appendFeatures(fd_p, feat, ssurgo_p, ssa_l)
-            if 'surveys' in msg:
-                arcpy.AddMessage(f"Successfully appended {feat[0]}")
+            # SAPOLYGON must be run first to sort `survey_l`
+            output = appendFeatures(fd_p, features[0], ssurgo_p, ssa_l)
+            if 'surveys' in output:
+                survey_l = output['surveys']
+                arcpy.AddMessage("\nSuccessfully appended SAPOLYGON")
             else:
-                arcpy.AddError(f"Failed to append {feat[0]}")
-                arcpy.AddError(msg['error'])
+                arcpy.AddError("Failed to append SAPOLYGON")
+                arcpy.AddError(output['error'])
                 exit()
-        
-        # Create sapoint_gold feature
-        arcpy.management.FeatureVerticesToPoints(
-            fd_p + '/SAPOLYGON', gdb_p + '/ProjectRecord/sapoint_gold', "ALL"
-        )
-        arcpy.analysis.PairwiseDissolve(
-            fd_p + '/SAPOLYGON', gdb_p + '/ProjectRecord/saregional_gold'
+            for feat in features[1:]:
+                msg = appendFeatures(
+                    fd_p, feat, ssurgo_p, survey_l, sort_features
+                )
+                if 'surveys' in msg:
+                    arcpy.AddMessage(f"Successfully appended {feat[0]}")
+                else:
+                    arcpy.AddError(f"Failed to append {feat[0]}")
+                    arcpy.AddError(msg['error'])
+                    exit()
+
+        # SAVEREST dates of the appended surveys, compared by a refresh
+        recordSurveyDates(
+            gdb_p, {ssa: date_d[ssa] for ssa in survey_l if ssa in date_d}
         )
 
-        # Topology
-        if createTopology(gdb_p):
+        if refresh:
+            # Validate the topology only within the refreshed surveys, 
+            # before and after, and surveys edited since validated
             arcpy.SetProgressorLabel("Validating Topology")
-            arcpy.ValidateTopology_management(fd_p + "/FD_RTSD_Topology")
-            arcpy.AddMessage("\tValidated Topology at 0.2 meters")
+            scheduleValidation(
+                fd_p + "/FD_RTSD_Topology", ssa_l, old_tiles,
+                msg=arcpy.AddMessage
+            )
+            arcpy.AddMessage(
+                "\tValidated Topology within the refreshed surveys"
+            )
         else:
-            arcpy.AddError(
-                "\n\tFailed to Create Topology. Create Topology Manually"
+            # Spatial and AREASYMBOL indexes, built after all appends
+            arcpy.SetProgressorLabel('Adding indexes')
+            arcpy.AddMessage('\nAdding indexes')
+            applyIndexPlan(
+                gdb_p, {feat: ['AREASYMBOL'] for feat in spatialIndexes}
+            )
+        
+            # Create sapoint_gold feature
+            arcpy.management.FeatureVerticesToPoints(
+                fd_p + '/SAPOLYGON', gdb_p + '/ProjectRecord/sapoint_gold', 
+                "ALL"
+            )
+            arcpy.analysis.PairwiseDissolve(
+                fd_p + '/SAPOLYGON', gdb_p + '/ProjectRecord/saregional_gold'
             )
 
-        # --- Create Relationship class between project_record and SAPOLYGON
-        arcpy.SetProgressorLabel(
-            "Creating Relationship Class between Project_Record & SAPOLYGON"
-        )
-        pr_p = f"{gdb_p}/ProjectRecord/Project_Record"
-        sa_p = f"{fd_p}/SAPOLYGON"
-        rel_n = "xProjectRecord_SAPOLYGON"
-        env.workspace = gdb_p
-        arcpy.CreateRelationshipClass_management(
-            pr_p, sa_p, rel_n, "SIMPLE", "> SAPOLYGON", "< Project_Record",
-            "NONE", "ONE_TO_ONE", "NONE", "AREASYMBOL", "AREASYMBOL", "", ""
-        )
-        arcpy.AddMessage("\nSuccessfully Created Relationship Class")
+            # Topology
+            if createTopology(gdb_p):
+                arcpy.SetProgressorLabel("Validating Topology")
+                scheduleValidation(fd_p + "/FD_RTSD_Topology", full=True)
+                arcpy.AddMessage("\tValidated Topology at 0.2 meters")
+            else:
+                arcpy.AddError(
+                    "\n\tFailed to Create Topology. Create Topology Manually"
+                )
+
+            # --- Create Relationship class between project_record and 
+            # SAPOLYGON
+            arcpy.SetProgressorLabel(
+                "Creating Relationship Class between Project_Record & "
+                "SAPOLYGON"
+            )
+            pr_p = f"{gdb_p}/ProjectRecord/Project_Record"
+            sa_p = f"{fd_p}/SAPOLYGON"
+            rel_n = "xProjectRecord_SAPOLYGON"
+            env.workspace = gdb_p
+            arcpy.CreateRelationshipClass_management(
+                pr_p, sa_p, rel_n, "SIMPLE", "> SAPOLYGON", 
+                "< Project_Record", "NONE", "ONE_TO_ONE", "NONE", "AREASYMBOL", 
+                "AREASYMBOL", "", ""
+            )
+            arcpy.AddMessage("\nSuccessfully Created Relationship Class")
 
         arcpy.SetProgressorLabel("Compacting " + RTSD_n)
         arcpy.Compact_management(gdb_p)
@@ -1074,13 +1426,14 @@ if __name__ == '__main__':
             )
 
         arcpy.AddMessage('***************************************************')
-        # --- Enable Tracking
+        # --- Enable Tracking, a refreshed RTSD has it already
         for fc in features[1:]:
             fc_p = f"{fd_p}/{fc[0]}"
-            arcpy.EnableEditorTracking_management(
-                fc_p, 'Creator', 'Creation_Date', 'Editor',
-                'Last_Edit_Date', 'ADD_FIELDS'
-            )
+            if not refresh:
+                arcpy.EnableEditorTracking_management(
+                    fc_p, 'Creator', 'Creation_Date', 'Editor',
+                    'Last_Edit_Date', 'ADD_FIELDS'
+                )
             count = int(arcpy.GetCount_management(fc_p)[0])
             arcpy.AddMessage(
                 f"Total number of {fc[0]} features: "
@@ -154,6 +154,37 @@
 #
 # - Added csv.field_size_limit(min(sys.maxsize, 2147483646)) to the importTabularData function
 
+# ==========================================================================================
+# Updated  10/19/2026
+#
+# - Added an optional number of processes (parameter 8). With more than 1, each SSURGO
+#   feature class is merged by MergeCore.py in its own worker into a staging FGDB while the
+#   tabular data is imported. The staged feature classes, already indexed, are copied into
+#   the output FGDB before relationships are established. Feature classes whose worker failed
+#   are merged again in the tool's process; if that fails the tool stops.
+# - The six merge blocks were replaced by a single loop over mergeList.
+# - Survey extents and shapefile feature counts are read from the .shp and .dbf headers
+#   (SSURGO_shapefile.shapefileInfo) instead of Describe and GetCount.
+# - Surveys are merged in Hilbert curve order of their extents (SSURGO_order.py) instead of
+#   sorted by the product of their center coordinates, which did not keep neighbors together.
+# - Attribute indexes are declared in SSURGO_indexes.py and built once all data is loaded,
+#   with one Describe per table to find those missing. addAttributeIndex was removed.
+# - Table aliases, column types and lengths and relationships are read from the SSURGO schema
+#   catalog (SSURGO_catalog.py), cached as JSON beside the template. GetTableAliases was removed,
+#   importTabularData no longer describes every table of every survey and CreateTableRelationships
+#   no longer builds a MakeQueryTable join on the template.
+# - The tabular text files of all surveys are checked against the schema catalog before the merge,
+#   in parallel with more than 1 process (SSURGO_preflight.py). Surveys with malformed records or
+#   non-numeric values are skipped instead of half loaded and the record counts of the check
+#   replace the second read of each text file in importTabularData.
+# - Added an optional columnar output folder (parameter 9). The tabular data of each survey is
+#   written to Parquet files partitioned by survey (SSURGO_columnar.py), whose query helpers
+#   join mapunit, component, chorizon and cointerp outside ArcGIS.
+# - The text files are read through a memory map (SSURGO_mmap.py) instead of a csv reader on an
+#   open file, and counted without parsing when there is no pre-flight count. The pre-flight
+#   check of a single survey splits its largest tables across processes by byte range. The
+#   files are still decoded with the platform default encoding (cp1252 in ArcGIS Pro).
+
 ## ================================================================================================================
 def errorMsg():
     try:
@@ -356,66 +387,13 @@ def createFeatureClasses(newFGDBpath,spatialRef):
         errorMsg()
         return False
 ## ===============================================================================================================
-def GetTableAliases(ssurgoTemplateLoc, tblAliases):
-    """ Retrieve physical and alias names from MDSTATTABS table and assigns them to a blank dictionary.
-        Stores physical names (key) and aliases (value) in a Python dictionary i.e. {chasshto:'Horizon AASHTO,chaashto'}
-        Fieldnames are Physical Name = AliasName,IEfilename"""
-
-    try:
-
-        # Open mdstattabs table containing information for other SSURGO tables
-        theMDTable = "mdstattabs"
-        env.workspace = ssurgoTemplateLoc
-
-        # Establishes a cursor for searching through field rows. A search cursor can be used to retrieve rows.
-        # This method will return an enumeration object that will, in turn, hand out row objects
-        if arcpy.Exists(ssurgoTemplateLoc + os.sep + theMDTable):
-
-            nameOfFields = ["tabphyname","tablabel","iefilename"]
-            rows = arcpy.da.SearchCursor(ssurgoTemplateLoc + os.sep + theMDTable,nameOfFields)
-
-            for row in rows:
-                # read each table record and assign 'tabphyname' and 'tablabel' to 2 variables
-                physicalName = row[0]
-                aliasName = row[1]
-                importFileName = row[2]
-
-                # i.e. {chaashto:'Horizon AASHTO',chaashto}; will create a one-to-many dictionary
-                # As long as the physical name doesn't exist in dict() add physical name
-                # as Key and alias as Value.
-                if not physicalName in tblAliases:
-                    tblAliases[physicalName] = (aliasName,importFileName)
-
-                del physicalName
-                del aliasName
-                del importFileName
-
-            del theMDTable
-            del nameOfFields
-            del rows
-            del row
-
-            return tblAliases
-
-        else:
-            # The mdstattabs table was not found
-            AddMsgAndPrint("\nMissing \"mdstattabs\" table", 2)
-            return tblAliases
-
-    except arcpy.ExecuteError:
-        AddMsgAndPrint(arcpy.GetMessages(2),2)
-        return tblAliases
-
-    except:
-        AddMsgAndPrint("Unhandled exception (GetTableAliases)", 2)
-        errorMsg()
-        return tblAliases
-
-## ===============================================================================================================
-def importTabularData(tabularFolder, tblAliases, queue):
+def importTabularData(tabularFolder, tblAliases, catalog, queue, report=None):
     """ This function will import the SSURGO .txt files from the tabular folder.
         tabularFolder is the absolute path to the tabular folder.
         tblAliases is a list of the physical name of the .txt file along with the Alias name.
+        catalog is the SSURGO schema catalog (SSURGO_catalog.py) that supplies the columns of each table.
+        report is the pre-flight report of the survey (SSURGO_preflight.py); its record counts are
+        used instead of reading each text file an extra time.
         Return False if error occurs, true otherwise.  there is a list of files that will not be
         imported under "doNotImport".  If the tabular folder is empty or there are no text files
         the survey will be skipped."""
@@ -491,35 +469,34 @@ def importTabularData(tabularFolder, tblAliases, queue):
                     if os.path.getsize(txtPath) > 0:
 
                         # Put all the field names in a list; used to initiate insertCursor object
-                        fieldList = arcpy.Describe(GDBtable).fields
+                        # The columns come from the schema catalog instead of a Describe for every table of every survey
                         nameOfFields = []
                         fldLengths = list()
 
-                        for field in fieldList:
-
-                            if field.type != "OID":
-                                nameOfFields.append(field.name)
-                                if field.type.lower() == "string":
-                                    fldLengths.append(field.length)
-                                else:
-                                    fldLengths.append(0)
+                        for fldName, fldType, fldLength in catalog['tables'][GDBtable]['columns']:
 
-                        del fieldList, field
+                            nameOfFields.append(fldName)
+                            if fldType.lower() == "string":
+                                fldLengths.append(fldLength)
+                            else:
+                                fldLengths.append(0)
 
-                        # The csv file might contain very huge fields, therefore increase the field_size_limit:
-                        # Exception thrown with IL177 in legend.txt.  Not sure why, only 1 record was present
-                        #csv.field_size_limit(sys.maxsize)
-                        csv.field_size_limit(min(sys.maxsize, 2147483646))
+                        # The text file is read through a memory map (SSURGO_mmap.py), which also raises the
+                        # csv field_size_limit for the very huge fields of some files, i.e. IL177 legend.txt
+                        txtTable = MappedTable(txtPath)
 
-                        # Number of records in the SSURGO text file
-                        textFileRecords = sum(1 for row in csv.reader(open(txtPath, 'r'), delimiter='|', quotechar='"'))
+                        # Number of records in the SSURGO text file, counted by the pre-flight check
+                        if report and GDBtable in report['tables']:
+                            textFileRecords = report['tables'][GDBtable]['rows']
+                        else:
+                            textFileRecords = txtTable.count()
 
                         # Initiate Cursor to add rows
                         cursor = arcpy.da.InsertCursor(GDBtable,nameOfFields)
 
                         # counter for number of records successfully added; used for reporting
                         numOfRowsAdded = 0
-                        reader = csv.reader(open(txtPath, 'r'), delimiter='|', quotechar='"')
+                        reader = txtTable.rows()
 
                         try:
                             # Return a reader object which will iterate over lines in txtPath
@@ -556,6 +533,9 @@ def importTabularData(tabularFolder, tblAliases, queue):
                             AddMsgAndPrint("\t\t\tValue: " + str(newRow),2)
                             errorMsg()
 
+                        finally:
+                            txtTable.close()
+
                         AddMsgAndPrint("\t\t--> " + iefileName + theAlias + theRecLength + " Records Added: " + str(splitThousands(numOfRowsAdded)),0)
 
                         # compare the # of rows inserted with the number of valid rows in the text file.
@@ -564,7 +544,7 @@ def importTabularData(tabularFolder, tblAliases, queue):
                             AddMsgAndPrint("\t\t\t\t TextFile records: " + str(textFileRecords),2)
                             AddMsgAndPrint("\t\t\t\t Records Inserted: " + str(numOfRowsAdded),2)
 
-                        del GDBtable, x, aliasName, iefileName, txtPath, theAlias, theRecLength, nameOfFields, textFileRecords, rowInFile, numOfRowsAdded, cursor, reader
+                        del GDBtable, x, aliasName, iefileName, txtPath, theAlias, theRecLength, nameOfFields, textFileRecords, rowInFile, numOfRowsAdded, cursor, reader, txtTable
 
                     else:
                         AddMsgAndPrint("\t\t--> " + iefileName + theAlias + theRecLength + " Records Added: 0",0)
@@ -588,7 +568,7 @@ def importTabularData(tabularFolder, tblAliases, queue):
         return False
 
     except csv.Error as e:
-        AddMsgAndPrint('\nfile %s, line %d: %s' % (txtPath, reader.line_num, e))
+        AddMsgAndPrint('\nfile %s: %s' % (txtPath, e))
         AddMsgAndPrint("\tImporting Tabular Data Failed for: " + SSA,2)
         errorMsg()
         return False
@@ -607,155 +587,103 @@ def importTabularData(tabularFolder, tblAliases, queue):
         return False
 
 ## ===============================================================================================================
-def CreateTableRelationships(tblAliases):
+def CreateTableRelationships(tblAliases, relationships):
     """ Create relationship classes between standalone attribute tables.
-        Relate parameters are pulled from the mdstatrhipdet and mdstatrshipmas tables,
-        thus it is required that the tables must have been copied from the template database.
-
-        Test option of getting aliases from original template database vs. output database
-        set workspace to original template database
-        env.workspace = InputDB
-        or
-        set workspace to output database.....This script uses output database as workspace
-        WAIT, take that back.  Using the GDB as a workspace creates locks.  Specifically, the
-        MakeQueryTable tool creates .rd and .sr locks that are only deleted if Arc is restarted.
-        Currently use the ssurgoTemplate to create a query table so that it doesn't lock the .GDB
+        Relate parameters come from the mdstatrshipdet and mdstatrshipmas tables of the
+        ssurgoTemplate, joined once when the SSURGO schema catalog (SSURGO_catalog.py) was built.
+        The catalog replaced the MakeQueryTable join of the two tables, which created .rd and .sr
+        locks that were only deleted if Arc was restarted.
+        relationships is a list of [ltabphyname, ltabcolphyname, rtabphyname, rtabcolphyname,
+        relationshipname, cardinality].
         Subfunction is written by Steve Peaslee and modified by Adolfo Diaz. """
     #
     #Modified From Steve Peaslee's Setup_UpdateSurvey
-    env.workspace = ssurgoTemplate
-
     AddMsgAndPrint("\n------------------------------------------------------------------------------------------------------- ")
     AddMsgAndPrint("Verifying relationships:\n")
 
-    # set progressor object which allows progress information to be passed for every relationship complete
-
-    if arcpy.Exists(ssurgoTemplate + os.sep + "mdstatrshipdet") and arcpy.Exists(ssurgoTemplate + os.sep + "mdstatrshipmas"):
+    if len(relationships) > 0:
         try:
-        # Create new Table View to contain results of join between relationship metadata tables
-
-            fld1 = "mdstatrshipmas.ltabphyname"
-            fld2 = "mdstatrshipdet.ltabphyname"
-            fld3 = "mdstatrshipmas.rtabphyname"
-            fld4 = "mdstatrshipdet.rtabphyname"
-            fld5 = "mdstatrshipmas.relationshipname"
-            fld6 = "mdstatrshipdet.relationshipname"
-
-            # GDB format
-            SQLtxt = "" + fld1 + " = " + fld2 + " AND " + fld3 + " = " + fld4 + " AND " + fld5 + " = " + fld6 + ""
-
-            # ssurgoTemplate Format (.mdb)
-            #SQLtxt = "[" + fld1 + "] = [" + fld2 + "] AND [" + fld3 + "] = [" + fld4 + "] AND [" + fld5 + "] = [" + fld6 + "]"
-
-            # Create in-memory table view to supply parameters for each relationshipclasses (using SSURGO 2.0 mdstatrshipdet and mdstatrshipmas tables)
-            inputTables = [ssurgoTemplate + os.sep + "mdstatrshipdet", ssurgoTemplate + os.sep + "mdstatrshipmas"]
-            queryTableName = "RelshpInfo"
-
-            # Use this one for env.workspace = FGDBpath: includes objectID but I don't think it is needed
-            #fieldsList = "mdstatrshipdet.OBJECTID OBJECTID;mdstatrshipdet.ltabphyname LTABPHYNAME;mdstatrshipdet.rtabphyname RTABPHYNAME;mdstatrshipdet.relationshipname RELATIONSHIPNAME;mdstatrshipdet.ltabcolphyname LTABCOLPHYNAME;mdstatrshipdet.rtabcolphyname RTABCOLPHYNAME;mdstatrshipmas.cardinality CARDINALITY"
-            #fieldsList = "mdstatrshipdet.ltabphyname LTABPHYNAME;mdstatrshipdet.ltabcolphyname LTABCOLPHYNAME;mdstatrshipdet.rtabphyname RTABPHYNAME;mdstatrshipdet.rtabcolphyname RTABCOLPHYNAME;mdstatrshipdet.relationshipname RELATIONSHIPNAME;mdstatrshipmas.cardinality CARDINALITY"
-            fieldsList = [["mdstatrshipdet.ltabphyname", 'LTABPHYNAME'],
-                          ["mdstatrshipdet.ltabcolphyname", 'LTABCOLPHYNAME'],
-                          ["mdstatrshipdet.rtabphyname", 'RTABPHYNAME'],
-                          ["mdstatrshipdet.rtabcolphyname", 'RTABCOLPHYNAME'],
-                          ["mdstatrshipdet.relationshipname", 'RELATIONSHIPNAME'],
-                          ["mdstatrshipmas.cardinality", 'CARDINALITY']]
-
-            arcpy.MakeQueryTable_management(inputTables, queryTableName, "NO_KEY_FIELD", "", fieldsList, SQLtxt)
-
-            if not arcpy.Exists(queryTableName):
-                AddMsgAndPrint("\nFailed to create metadata table required for creation of relationshipclasses",2)
-                return False
-
-            # Fields in RelshpInfo table view
-            # OBJECTID, LTABPHYNAME, RTABPHYNAME, RELATIONSHIPNAME, LTABCOLPHYNAME, RTABCOLPHYNAME, CARDINALITY
-            # Open table view and step through each record to retrieve relationshipclass parameters
-
-            arcpy.SetProgressor("step", "Verifying Tabular Relationships", 0, int(arcpy.GetCount_management(ssurgoTemplate + os.sep + "mdstatrshipdet").getOutput(0)), 1)
+            # set progressor object which allows progress information to be passed for every relationship complete
+            arcpy.SetProgressor("step", "Verifying Tabular Relationships", 0, len(relationships), 1)
             arcpy.SetProgressorLabel("Verifying Tabular Relationships")
 
             recNum = 0
             env.workspace = FGDBpath
 
-            #['mdstatrshipdet_ltabphyname', 'mdstatrshipdet_ltabcolphyname', 'mdstatrshipdet_rtabphyname', 'mdstatrshipdet_rtabcolphyname', 'mdstatrshipdet_relationshipname', 'mdstatrshipmas_cardinality']
-            queryTableFlds = [f.name for f in arcpy.ListFields(queryTableName)]
-            #queryTableFlds.remove('OBJECTID')
-
-            with arcpy.da.SearchCursor(queryTableName, queryTableFlds) as cursor:
-                for row in cursor:
+            for row in relationships:
 
-                    # Get relationshipclass parameters from current table row
-                    # Syntax for CreateRelationshipClass_management (origin_table, destination_table,
-                    # out_relationship_class, relationship_type, forward_label, backward_label,
-                    # message_direction, cardinality, attributed, origin_primary_key,
-                    # origin_foreign_key, destination_primary_key, destination_foreign_key)
-                    #
-                    #AddMsgAndPrint("Reading record " + str(recNum), 1)
-                    originTable = row[0]
-                    destinationTable = row[2]
+                # Get relationshipclass parameters from current table row
+                # Syntax for CreateRelationshipClass_management (origin_table, destination_table,
+                # out_relationship_class, relationship_type, forward_label, backward_label,
+                # message_direction, cardinality, attributed, origin_primary_key,
+                # origin_foreign_key, destination_primary_key, destination_foreign_key)
+                #
+                #AddMsgAndPrint("Reading record " + str(recNum), 1)
+                originTable = row[0]
+                destinationTable = row[2]
 
-                    originTablePath = FGDBpath + os.sep + originTable
-                    destinationTablePath = FGDBpath + os.sep + destinationTable
+                originTablePath = FGDBpath + os.sep + originTable
+                destinationTablePath = FGDBpath + os.sep + destinationTable
 
-                    # Use table aliases for relationship labels
-                    relName = "x" + originTable.capitalize() + "_" + destinationTable.capitalize()
+                # Use table aliases for relationship labels
+                relName = "x" + originTable.capitalize() + "_" + destinationTable.capitalize()
 
-                    originPKey = row[1]
-                    originFKey = row[3]
+                originPKey = row[1]
+                originFKey = row[3]
 
-                    # create Forward Label i.e. "> Horizon AASHTO Table"
-                    if destinationTable in tblAliases:
-                        fwdLabel = "> " + tblAliases.get(destinationTable)[0] + " Table"
-                    else:
-                        fwdLabel = destinationTable + " Table"
-                        AddMsgAndPrint("Missing key: " + destinationTable, 2)
+                # create Forward Label i.e. "> Horizon AASHTO Table"
+                if destinationTable in tblAliases:
+                    fwdLabel = "> " + tblAliases.get(destinationTable)[0] + " Table"
+                else:
+                    fwdLabel = destinationTable + " Table"
+                    AddMsgAndPrint("Missing key: " + destinationTable, 2)
 
-                    # create Backward Label i.e. "< Horizon Table"
-                    if originTable in tblAliases:
-                        backLabel = "<  " + tblAliases.get(originTable)[0] + " Table"
+                # create Backward Label i.e. "< Horizon Table"
+                if originTable in tblAliases:
+                    backLabel = "<  " + tblAliases.get(originTable)[0] + " Table"
 
-                    else:
-                        backLabel = "<  " + originTable + " Table"
-                        AddMsgAndPrint("Missing key: " + originTable, 2)
+                else:
+                    backLabel = "<  " + originTable + " Table"
+                    AddMsgAndPrint("Missing key: " + originTable, 2)
 
-                    theCardinality = row[5].upper().replace(" ", "_")
+                theCardinality = row[5].upper().replace(" ", "_")
 
-                    # Check if origin and destination tables exist
-                    if arcpy.Exists(originTablePath) and arcpy.Exists(destinationTablePath):
+                # Check if origin and destination tables exist
+                if arcpy.Exists(originTablePath) and arcpy.Exists(destinationTablePath):
 
-                        # The following 6 lines are for formatting only
-                        formatTab1 = 15 - len(originTable)
-                        formatTabLength1 = " " * formatTab1 + "--> "
+                    # The following 6 lines are for formatting only
+                    formatTab1 = 15 - len(originTable)
+                    formatTabLength1 = " " * formatTab1 + "--> "
 
-                        formatTab2 = 19 - len(destinationTable)
-                        formatTabLength2 = " " * formatTab2 + "--> "
+                    formatTab2 = 19 - len(destinationTable)
+                    formatTabLength2 = " " * formatTab2 + "--> "
 
-                        formatTab3 = 12 - len(str(theCardinality))
-                        formatTabLength3 = " " * formatTab3 + "--> "
+                    formatTab3 = 12 - len(str(theCardinality))
+                    formatTabLength3 = " " * formatTab3 + "--> "
 
-                        # relationship already exists; print out the relationship name
-                        if arcpy.Exists(relName):
-                            AddMsgAndPrint("\t" + originTable +  formatTabLength1 + destinationTable + formatTabLength2 + theCardinality + formatTabLength3 + relName, 0)
+                    # relationship already exists; print out the relationship name
+                    if arcpy.Exists(relName):
+                        AddMsgAndPrint("\t" + originTable +  formatTabLength1 + destinationTable + formatTabLength2 + theCardinality + formatTabLength3 + relName, 0)
 
-                        # relationship does not exist; create it and print out
-                        else:
-                            arcpy.CreateRelationshipClass_management(originTablePath, destinationTablePath, relName, "SIMPLE", fwdLabel, backLabel, "NONE", theCardinality, "NONE", originPKey, originFKey, "","")
-                            AddMsgAndPrint("\t" + originTable +  formatTabLength1 + destinationTable + formatTabLength2 + theCardinality + formatTabLength3 + relName, 0)
-
-                        # delete formatting variables
-                        del formatTab1, formatTabLength1, formatTab2, formatTabLength2, formatTab3, formatTabLength3
+                    # relationship does not exist; create it and print out
                     else:
-                        AddMsgAndPrint("        <-- " + relName + ": Missing input tables (" + originTable + " or " + destinationTable + ")", 0)
+                        arcpy.CreateRelationshipClass_management(originTablePath, destinationTablePath, relName, "SIMPLE", fwdLabel, backLabel, "NONE", theCardinality, "NONE", originPKey, originFKey, "","")
+                        AddMsgAndPrint("\t" + originTable +  formatTabLength1 + destinationTable + formatTabLength2 + theCardinality + formatTabLength3 + relName, 0)
+
+                    # delete formatting variables
+                    del formatTab1, formatTabLength1, formatTab2, formatTabLength2, formatTab3, formatTabLength3
+                else:
+                    AddMsgAndPrint("        <-- " + relName + ": Missing input tables (" + originTable + " or " + destinationTable + ")", 0)
 
-                    del originTable, destinationTable, originTablePath, destinationTablePath, relName, originPKey, originFKey, fwdLabel, backLabel, theCardinality
+                del originTable, destinationTable, originTablePath, destinationTablePath, relName, originPKey, originFKey, fwdLabel, backLabel, theCardinality
 
-                    recNum = recNum + 1
-                    arcpy.SetProgressorPosition() # Update the progressor position
+                recNum = recNum + 1
+                arcpy.SetProgressorPosition() # Update the progressor position
 
             arcpy.ResetProgressor()  # Resets the progressor back to is initial state
             arcpy.SetProgressorLabel(" ")
 
-            #del fld2, fld1, fld3, fld4, fld5, fld6, SQLtxt, inputTables, fieldsList, queryTableName, recNum
+            del recNum
 
             # Establish Relationship between tables and Spatial layers
             # The following lines are for formatting only
@@ -814,7 +742,7 @@ def CreateTableRelationships(tblAliases):
             return False
 
     else:
-        AddMsgAndPrint("\tMissing at least one of the relationship metadata tables", 2)
+        AddMsgAndPrint("\tNo relationships found in the SSURGO schema catalog", 2)
         return False
 
 ## ===============================================================================================================
@@ -869,90 +797,172 @@ def updateAliasNames(fgdbPath, GDBname):
         return False
 
 ## ===============================================================================================================
-def addAttributeIndex(table,fieldList,verbose=True):
-    """ Attribute indexes can speed up attribute queries on feature classes and tables.
-        This function adds an attribute index(es) for the fields passed to the table that
-        is passed in. This function takes in 2 parameters:
-           1) Table - full path to an existing table or feature class
-           2) List of fields that exist in table
-        This function will make sure an existing index is not associated with that field.
-        Does not return anything."""
+def tabularSurveys(soilShpDict):
+    """ Tabular folder of every survey in soilShpDict that has one, with the special feature
+        description file of its spatial folder, which is imported as the featdesc table.
+        Returns a dictionary of SSA (key) and (tabular folder, {'featdesc': file}) (value)."""
+
+    surveys = dict()
+    for SSA, survey in soilShpDict.items():
+        spatialFolder = os.path.dirname(survey)
+        tabularFolder = os.path.join(os.path.dirname(spatialFolder), "tabular")
+
+        if os.path.exists(tabularFolder):
+            specFeatDescFile = os.path.join(spatialFolder, "soilsf_t_" + SSA.lower() + ".txt")
+            surveys[SSA] = (tabularFolder, {'featdesc': specFeatDescFile})
+
+    return surveys
+
+## ===============================================================================================================
+def preflightTabular(soilShpDict, catalog, nProc):
+    """ Checks the tabular text files of every survey in soilShpDict against the schema catalog
+        (SSURGO_preflight.py), nProc surveys at a time.  Surveys without a tabular folder are
+        left to the import.
+        Returns a dictionary of SSA (key) and pre-flight report (value)."""
+
+    surveys = tabularSurveys(soilShpDict)
+
+    AddMsgAndPrint("\nChecking tabular data of " + str(len(surveys)) + " surveys...",0)
+    arcpy.SetProgressorLabel("Checking tabular data")
+
+    if nProc > 1:
+        import multiprocessing as mp
+        mp.set_executable(os.path.join(sys.exec_prefix, 'python.exe'))
+
+    return checkSurveys(surveys, catalog, nProc)
+
+## ===============================================================================================================
+def exportColumnar(soilShpDict, catalog, columnarFolder, nProc):
+    """ Writes the tabular data of every survey in soilShpDict to Parquet files in columnarFolder,
+        one folder per table partitioned by survey (SSURGO_columnar.py), parsed again from
+        the text files nProc surveys at a time.  The national metadata tables are not exported.
+        Return False if pyarrow is missing or any survey failed, True otherwise."""
 
     try:
-        # Make sure table exists. - Just in case
-        if not arcpy.Exists(table):
-            AddMsgAndPrint("\nAttribute index cannot be created for: " + os.path.basename(table) + " TABLE DOES NOT EXIST",2)
+        import SSURGO_columnar
+
+        if SSURGO_columnar.pa is None:
+            AddMsgAndPrint("\npyarrow is not installed; the columnar export was skipped",2)
             return False
 
-        else:
-            if verbose:
-                AddMsgAndPrint("\n\tAdding Attribute Indexes to Table: " + os.path.basename(table))
-                numOfFields = len(fieldList)
-                arcpy.SetProgressor("step", "Adding Attribute Indexes to Table: " + os.path.basename(table), 0, numOfFields, 1)
-
-        # iterate through every field
-        for fieldToIndex in fieldList:
-
-            if verbose:
-                arcpy.SetProgressorLabel("Adding Attribute Indexes to Table: " + os.path.basename(table) + " - Field: " + fieldToIndex)
-
-            # Make sure field exists in table - Just in case
-            if not len(arcpy.ListFields(table,"*" + fieldToIndex))>0:
-                if verbose:
-                    AddMsgAndPrint("\t\tAttribute index cannot be created for: " + fieldToIndex + ". FIELD DOES NOT EXIST",2)
-                    arcpy.SetProgressorPosition()
-                    continue
+        surveys = {SSA.upper(): tabular for SSA, tabular in tabularSurveys(soilShpDict).items()}
+        tables = [tab for tab in catalog['tables'] if not tab.startswith('mdstat')]
 
-            # list of indexes (attribute and spatial) within the table that are
-            # associated with the field or a field that has the field name in it.
-            # Important to inspect all associated fields b/c they could be using
-            # a differently named index
-            existingIndexes = arcpy.ListIndexes(table,"*" + fieldToIndex)
-            bFieldIndexExists = False
+        AddMsgAndPrint("\nWriting tabular data of " + str(len(surveys)) + " surveys to " + columnarFolder,0)
+        arcpy.SetProgressor("step", "Writing columnar tabular data...", 0, len(surveys), 1)
 
-            # check existing indexes to see if fieldToIndex is already associated
-            # with an index
-            if len(existingIndexes) > 0:
+        if nProc > 1:
+            import multiprocessing as mp
+            mp.set_executable(os.path.join(sys.exec_prefix, 'python.exe'))
 
-                # iterate through the existing indexes looking for a field match
-                for index in existingIndexes:
-                    associatedFlds = index.fields
+        bExported = True
+        for SSA, counts, msg in SSURGO_columnar.exportSurveys(surveys, catalog, columnarFolder, nProc, tables):
+            if msg:
+                AddMsgAndPrint("\tFailed to write " + SSA + ": " + msg,2)
+                bExported = False
+            else:
+                AddMsgAndPrint("\t" + SSA + ": " + str(len(counts)) + " tables, " + splitThousands(sum(counts.values())) + " records",0)
+            arcpy.SetProgressorPosition()
 
-                    # iterate through the fields associated with existing index.
-                    # Should only be 1 field since multiple fields are not allowed
-                    # in a single FGDB.
-                    for fld in associatedFlds:
+        arcpy.ResetProgressor()
+        return bExported
 
-                        # Field is already part of an existing index - Notify User
-                        if fld.name == fieldToIndex:
-                            if verbose:
-                                AddMsgAndPrint("\t\tAttribute Index for " + fieldToIndex + " field already exists",1)
-                                arcpy.SetProgressorPosition()
-                                bFieldIndexExists = True
+    except:
+        AddMsgAndPrint("Unhandled exception (exportColumnar)", 2)
+        errorMsg()
+        return False
 
-                    # Field is already part of an existing index - Proceed to next field
-                    if bFieldIndexExists:
-                        break
+## ===============================================================================================================
+def startMerges(mergeList, stageFolder, nProc, outSR, geoTransform):
+    """ Hands the merge of each SSURGO feature class in mergeList to a MergeCore worker.  Each
+        worker writes to its own FGDB in stageFolder so that the merges can run while the tabular
+        data is imported into the output FGDB.  mergeList holds (feature class, shapefile list,
+        label) for the feature classes that have shapefiles to merge.
+        Returns the pool and a list of (feature class, async result)."""
+
+    import multiprocessing as mp
+    from MergeCore import MergeCore
+
+    if not os.path.exists(stageFolder):
+        os.mkdir(stageFolder)
+
+    mp.set_executable(os.path.join(sys.exec_prefix, 'python.exe'))
+    pool = mp.Pool(min(nProc, len(mergeList)))
+
+    jobs = list()
+    for fc, shpList, label in mergeList:
+        stageGDB = os.path.join(stageFolder, fc + ".gdb")
+        jobs.append((fc, pool.apply_async(MergeCore, args=(shpList, stageGDB, fc, ssurgoIndexes[fc], outSR, geoTransform))))
+        AddMsgAndPrint("\tMerging " + str(len(shpList)) + " SSURGO " + label + " Layers in a separate process",0)
+
+    pool.close()
+    return pool, jobs
+
+## ===============================================================================================================
+def attachMerges(pool, jobs, FGDBpath, stageFolder):
+    """ Waits for the MergeCore workers started by startMerges and replaces the empty feature classes
+        in the output FGDB with the staged ones.  Staging FGDBs are deleted afterwards.
+        Returns the list of feature classes that were not merged and attached, empty if all were."""
+
+    attached = list()
+    try:
+        AddMsgAndPrint("\nAttaching merged SSURGO Spatial Datasets:")
+        arcpy.SetProgressor("step", "Attaching merged feature classes...", 0, len(jobs), 1)
+
+        for fc, job in jobs:
+            arcpy.SetProgressorLabel("Waiting for " + fc + " merge")
+            result = job.get()
+
+            if isinstance(result, str):
+                AddMsgAndPrint("\tFailed to merge " + fc + "\n" + result,2)
+
+            else:
+                fcName, stageFC, count = result
+                arcpy.SetProgressorLabel("Attaching " + fc)
 
-            # Attribute field index does not exist.  Add one.
-            if not bFieldIndexExists:
-                newIndex = "IDX_" + fieldToIndex
+                fcPath = os.path.join(FGDBpath, fc)
+                if arcpy.Exists(fcPath):
+                    arcpy.Delete_management(fcPath)
 
-                # UNIQUE setting is not used in FGDBs - comment out
-                arcpy.AddIndex_management(table,fieldToIndex,newIndex,"#","ASCENDING")
+                arcpy.Copy_management(stageFC, fcPath)
+                attached.append(fc)
+                AddMsgAndPrint("\tSuccessfully merged " + splitThousands(count) + " features into " + fc,0)
 
-                if verbose:
-                    AddMsgAndPrint("\t\tSuccessfully added attribute index for " + fieldToIndex)
-                    arcpy.SetProgressorPosition()
+            arcpy.SetProgressorPosition()
+
+    except arcpy.ExecuteError:
+        AddMsgAndPrint(arcpy.GetMessages(2),2)
 
     except:
+        AddMsgAndPrint("Unhandled exception (attachMerges)", 2)
         errorMsg()
-        return False
+
+    finally:
+        pool.terminate()
+        pool.join()
+
+        for fc, job in jobs:
+            stageGDB = os.path.join(stageFolder, fc + ".gdb")
+            if arcpy.Exists(stageGDB):
+                arcpy.Delete_management(stageGDB)
+
+        try:
+            os.rmdir(stageFolder)
+        except:
+            pass
+
+    return [fc for fc, job in jobs if fc not in attached]
 
 ## ================================================================ Main Body ===========================================================
 # Import modules
-import arcpy, sys, string, os, time, datetime, re, csv, traceback, shutil
+import arcpy, sys, string, os, time, re, csv, traceback, shutil
 from arcpy import env
+from SSURGO_shapefile import shapefileInfo
+from SSURGO_order import spatialOrder
+from SSURGO_indexes import ssurgoIndexes, applyIndexPlan
+from SSURGO_catalog import loadCatalog, tableAliases
+from SSURGO_preflight import checkSurveys, summary
+from SSURGO_mmap import MappedTable
 
 if __name__ == '__main__':
 
@@ -990,6 +1000,20 @@ if __name__ == '__main__':
     bSTATSGO = arcpy.GetParameter(6)
     #bSTATSGO = True
 
+    # Parameter # 8 - (Optional) Number of processes.  If more than 1 the feature classes are merged
+    # in separate processes while the tabular data is imported.
+    if arcpy.GetArgumentCount() > 7 and arcpy.GetParameterAsText(7):
+        nProc = int(arcpy.GetParameter(7))
+    else:
+        nProc = 1
+
+    # Parameter # 9 - (Optional) Folder for a columnar (Parquet) copy of the tabular data, partitioned
+    # by areasymbol, for aggregations outside ArcGIS.  Requires pyarrow.
+    if arcpy.GetArgumentCount() > 8 and arcpy.GetParameterAsText(8):
+        columnarFolder = arcpy.GetParameterAsText(8)
+    else:
+        columnarFolder = ""
+
     # SSURGO FGDB template that contains empty SSURGO Tables and relationships
     # and will be copied over to the output location
     ssurgoTemplate = os.path.dirname(sys.argv[0]) + os.sep + "SSURGO_Table_Template.gdb"
@@ -1008,9 +1032,7 @@ if __name__ == '__main__':
 
     # The entire Main code in a try statement....Let the fun begin!
     try:
-        import datetime
-
-        textFilePath = outputFolder + os.sep + GDBname + "_" + str(datetime.date.today()).replace("-","") + "_Log.txt"
+        textFilePath = outputFolder + os.sep + GDBname + "_" + startTime.strftime("%Y%m%d") + "_Log.txt"
 
         # process each selected soil survey
         AddMsgAndPrint("\nValidating " + str(len(surveyList)) + " selected surveys...", 0)
@@ -1041,8 +1063,9 @@ if __name__ == '__main__':
                 AddMsgAndPrint("\nFailed to Initiate File Geodatabase. Exiting!",2)
                 exit()
 
-            tblAliases = dict()
-            tblAliases = GetTableAliases(ssurgoTemplate, tblAliases)
+            # table aliases, columns and relationships from the cached SSURGO schema catalog
+            ssurgoCatalog = loadCatalog(ssurgoTemplate, msg=AddMsgAndPrint)
+            tblAliases = tableAliases(ssurgoCatalog)
             #AddMsgAndPrint(str(tblAliases),1)
 
         # import Tabular was not selected; Create Empty FileGDB and create feature classes
@@ -1069,9 +1092,12 @@ if __name__ == '__main__':
         AddMsgAndPrint("\n\tOutput Coordinate System: " + sr.name,0)
         AddMsgAndPrint("\tOutput Datum: " + userDatum,0)
 
+        geoTransform = ""
+
         if userDatum == "D_North_American_1983":
             AddMsgAndPrint("\tGeographic Transformation: WGS_1984_(ITRF00)_To_NAD_1983",0 )
-            env.geographicTransformations = "WGS_1984_(ITRF00)_To_NAD_1983"  # WKID 108190
+            geoTransform = "WGS_1984_(ITRF00)_To_NAD_1983"  # WKID 108190
+            env.geographicTransformations = geoTransform
         elif userDatum == "D_WGS_1984":
             AddMsgAndPrint("\tCoordinate System: GCS_WGS_1984",0 )
             #env.geographicTransformations = "WGS_1984_(ITRF00)_To_NAD_1983"  # WKID 108190
@@ -1081,15 +1107,15 @@ if __name__ == '__main__':
 
         """ ----------------------------------------------------------------------------------------------------------------------------- Setup the Merging Process"""
 
-        # Dictionary containing approx center of SSA (key) and the SSURGO layer path (value)
-        soilShpDict = dict() # {-4002.988250799742: 'K:\\FY2014_SSURGO_R10_download\\soils_wi063\\spatial\\soilmu_a_wi063.shp'}
+        # Dictionary containing SSA (key) and the SSURGO layer path (value)
+        soilShpDict = dict() # {'wi063': 'K:\\FY2014_SSURGO_R10_download\\soils_wi063\\spatial\\soilmu_a_wi063.shp'}
         muLineShpDict = dict()
         muPointShpDict = dict()
         soilSaShpDict = dict()
         featPointShpDict = dict()
         featLineShpDict = dict()
 
-        # lists containing SSURGO layer paths sorted according to the survey center key
+        # lists containing SSURGO layer paths sorted according to the Hilbert order of the surveys
         # This list will be passed over to the Merge command
         soilShpList = list() #['G:\\2014_SSURGO_Region10\\soils_ia005\\spatial\\soilmu_a_ia005.shp']
         muLineShpList = list()
@@ -1098,8 +1124,8 @@ if __name__ == '__main__':
         featPointShpList = list()
         featLineShpList = list()
 
-        # list containing the (Xcenter * Ycenter) for every SSURGO soil layer
-        extentList = list()
+        # Dictionary containing SSA (key) and the extent of its soil layer (value)
+        surveyBoxes = dict()
 
         # set progressor object which allows progress information to be passed for every merge complete
         arcpy.SetProgressor("step", "Validating Each Survey", 0, len(surveyList), 1)
@@ -1171,27 +1197,19 @@ if __name__ == '__main__':
                 # compare datum and make sure no Datum Transformation is needed
                 if compareDatum(soilSaShpPath):
 
-                    # Calculate the approximate center of a given survey
-                    desc = arcpy.Describe(soilShpPath)
-                    shpExtent = desc.extent
-                    XCntr = (shpExtent.XMin + shpExtent.XMax) / 2.0
-                    YCntr = (shpExtent.YMin + shpExtent.YMax) / 2.0
-                    surveyCenter = XCntr * YCntr
+                    # Extent of a given survey from the .shp header
+                    surveyBoxes[SSA] = shapefileInfo(soilShpPath)[1]
 
-                    # Assign {-4002.988250799742: 'K:\\FY2014_SSURGO_R10_download\\soils_wi063\\spatial\\soilmu_a_wi063.shp'}
-                    soilShpDict[surveyCenter] = soilShpPath
+                    # Assign {'wi063': 'K:\\FY2014_SSURGO_R10_download\\soils_wi063\\spatial\\soilmu_a_wi063.shp'}
+                    soilShpDict[SSA] = soilShpPath
 
                     # statsgo does not have any of these extra features
                     if not bSTATSGO:
-                        muLineShpDict[surveyCenter] = muLineShpPath
-                        muPointShpDict[surveyCenter] = muPointShpPath
-                        soilSaShpDict[surveyCenter] = soilSaShpPath
-                        featPointShpDict[surveyCenter] = featPointShpPath
-                        featLineShpDict[surveyCenter] = featLineShpPath
-
-                    extentList.append(surveyCenter)
-
-                    del desc, shpExtent, XCntr, YCntr, surveyCenter
+                        muLineShpDict[SSA] = muLineShpPath
+                        muPointShpDict[SSA] = muPointShpPath
+                        soilSaShpDict[SSA] = soilSaShpPath
+                        featPointShpDict[SSA] = featPointShpPath
+                        featLineShpDict[SSA] = featLineShpPath
 
                 else:
                     # Doesn't properly break out of this! FIX THIS Add boolean if importing shapefile worked.
@@ -1209,34 +1227,55 @@ if __name__ == '__main__':
 
             arcpy.SetProgressorPosition()
 
+        """ ----------------------------------------------------------------------------------------------------------------------------- Pre-flight check of the Tabular Data"""
+        # Check the text files of every survey against the schema catalog before anything is written.
+        # Surveys with malformed records are dropped here instead of being half loaded.
+        preflight = dict()
+        if b_importTabularData and len(soilShpDict) > 0:
+            preflight = preflightTabular(soilShpDict, ssurgoCatalog, nProc)
+
+            for SSA, report in sorted(preflight.items()):
+                if not report['ok']:
+                    AddMsgAndPrint("\nTabular data of " + SSA.upper() + " failed the pre-flight check....SKIPPING SSURGO Dataset",2)
+                    for line in summary(report):
+                        AddMsgAndPrint("\t" + line,2)
+
+                    for surveyDict in (soilShpDict, muLineShpDict, muPointShpDict, soilSaShpDict, featPointShpDict, featLineShpDict, surveyBoxes):
+                        surveyDict.pop(SSA, None)
+
+                else:
+                    for line in summary(report):
+                        AddMsgAndPrint("\t" + SSA.upper() + " " + line,1)
+
         """ ----------------------------------------------------------------------------------------------------------------------------- Begin the Merging Process"""
-        # Sort shapefiles by extent so that the drawing order is continous
-        extentList.sort()
+        # Order surveys along a Hilbert curve through their extents so that the drawing order is continous
+        # and neighboring surveys are stored together
+        extentList = spatialOrder(surveyBoxes)
 
         # There should be at least 1 survey to merge into the MUPOLYGON
         if len(soilShpDict) > 0:
 
-            # Add SSURGO paths to their designated lists according to the survey's center so that they draw continously
+            # Add SSURGO paths to their designated lists according to the survey order so that they draw continously
             # If the layer has features then add it to the merge list otherwise skip it.  This was added b/c it turns
             # out that empty mapunit point .shp are in line geometry and not point geometry
-            for surveyCenter in extentList:
+            for surveyKey in extentList:
 
-                soilShpList.append(soilShpDict[surveyCenter])
+                soilShpList.append(soilShpDict[surveyKey])
 
                 if not bSTATSGO:
-                    soilSaShpList.append(soilSaShpDict[surveyCenter])
+                    soilSaShpList.append(soilSaShpDict[surveyKey])
 
-                    if int(arcpy.GetCount_management(muLineShpDict[surveyCenter]).getOutput(0)) > 0:
-                        muLineShpList.append(muLineShpDict[surveyCenter])
+                    if shapefileInfo(muLineShpDict[surveyKey])[2] > 0:
+                        muLineShpList.append(muLineShpDict[surveyKey])
 
-                    if int(arcpy.GetCount_management(muPointShpDict[surveyCenter]).getOutput(0)) > 0:
-                        muPointShpList.append(muPointShpDict[surveyCenter])
+                    if shapefileInfo(muPointShpDict[surveyKey])[2] > 0:
+                        muPointShpList.append(muPointShpDict[surveyKey])
 
-                    if int(arcpy.GetCount_management(featPointShpDict[surveyCenter]).getOutput(0)) > 0:
-                        featPointShpList.append(featPointShpDict[surveyCenter])
+                    if shapefileInfo(featPointShpDict[surveyKey])[2] > 0:
+                        featPointShpList.append(featPointShpDict[surveyKey])
 
-                    if int(arcpy.GetCount_management(featLineShpDict[surveyCenter]).getOutput(0)) > 0:
-                        featLineShpList.append(featLineShpDict[surveyCenter])
+                    if shapefileInfo(featLineShpDict[surveyKey])[2] > 0:
+                        featLineShpList.append(featLineShpDict[surveyKey])
 
         # No surveys to merge
         else:
@@ -1246,108 +1285,47 @@ if __name__ == '__main__':
             AddMsgAndPrint("\n\n No Soil Surveys found to merge.....Exiting!",2)
             exit()
 
-        # set progressor object which allows progress information to be passed for every merge complete
-        if bSTATSGO:
-            arcpy.SetProgressor("step", "Beginning the merge process...", 0, 1, 1)
-        else:
-            arcpy.SetProgressor("step", "Beginning the merge process...", 0, 6, 1)
-
-        # ---------------------------------------------------------------------------------------------------- Merge Soil Mapunit Polygons
-        AddMsgAndPrint("\nMerging SSURGO Spatial Datasets:")
-
-        arcpy.SetProgressorLabel("Merging " + str(len(soilShpList)) + " SSURGO Soil Mapunit Polygon Layers")
-
-        soilFCpath = os.path.join(FGDBpath, soilFC)
-        arcpy.Merge_management(soilShpList, soilFCpath)
-        AddMsgAndPrint("\tSuccessfully merged SSURGO Soil Mapunit Polygons",0)
-
-        if not addAttributeIndex(soilFCpath,["AREASYMBOL","MUSYM"],False): pass
-
-        arcpy.SetProgressorPosition()
-
-        # --------------------------------------------------------------------------------------------------- Merge Soil Mapunit Lines
-        if not bSTATSGO:
-            if len(muLineShpList) > 0:
-
-                arcpy.SetProgressorLabel("Merging " + str(len(muLineShpList)) + " SSURGO Soil Mapunit Line Layers")
-
-                muLineFCpath = os.path.join(FGDBpath, muLineFC)
-                arcpy.Merge_management(muLineShpList,muLineFCpath)
-                #arcpy.Append_management(muLineShpList, os.path.join(FGDBpath, muLineFC), "NO_TEST")
-
-                AddMsgAndPrint("\tSuccessfully merged SSURGO Soil Mapunit Lines",0)
-
-                if not addAttributeIndex(muLineFCpath,["AREASYMBOL","MUSYM"],False): pass
-
-            else:
-                AddMsgAndPrint("\tNo SSURGO Soil Mapunit Lines to merge",0)
-
-            arcpy.SetProgressorPosition()
-
-        # --------------------------------------------------------------------------------------------------- Merge Soil Mapunit Points
-        if not bSTATSGO:
-            if len(muPointShpList) > 0:
-
-                arcpy.SetProgressorLabel("Merging " + str(len(muPointShpList)) + " SSURGO Soil Mapunit Point Layers")
-
-                muPointFCpath = os.path.join(FGDBpath, muPointFC)
-                arcpy.Merge_management(muPointShpList, muPointFCpath)
-                #arcpy.Append_management(muPointShpList, os.path.join(FGDBpath, muPointFC), "NO_TEST", muPointFM)
-
-                AddMsgAndPrint("\tSuccessfully merged SSURGO Soil Mapunit Points",0)
-
-                if not addAttributeIndex(muPointFCpath,["AREASYMBOL","MUSYM"],False): pass
-
-            else:
-                AddMsgAndPrint("\tNo SSURGO Soil Mapunit Points to merge",0)
-
-            arcpy.SetProgressorPosition()
-
-        # ---------------------------------------------------------------------------------------------------- Merge Soil Survey Area
-        if not bSTATSGO:
-            arcpy.SetProgressorLabel("Merging " + str(len(soilSaShpList)) + " SSURGO Soil Survey Area Layers")
-
-            soilSaFCpath = os.path.join(FGDBpath, soilSaFC)
-            arcpy.Merge_management(soilSaShpList,soilSaFCpath)
-
-            AddMsgAndPrint("\tSuccessfully merged SSURGO Soil Survey Area Polygons",0)
-            if not addAttributeIndex(soilSaFCpath,["AREASYMBOL"],False): pass
-
-            arcpy.SetProgressorPosition()
+        # (feature class, shapefile list, label) in merge order.  STATSGO
+        # only has mapunit polygons.
+        mergeList = [(soilFC, soilShpList, "Soil Mapunit Polygon")]
 
-        # ---------------------------------------------------------------------------------------------------- Merge Special Point Features
         if not bSTATSGO:
-            if len(featPointShpList) > 0:
+            mergeList.append((muLineFC, muLineShpList, "Soil Mapunit Line"))
+            mergeList.append((muPointFC, muPointShpList, "Soil Mapunit Point"))
+            mergeList.append((soilSaFC, soilSaShpList, "Soil Survey Area"))
+            mergeList.append((featPointFC, featPointShpList, "Special Point Feature"))
+            mergeList.append((featLineFC, featLineShpList, "Special Line Feature"))
 
-                arcpy.SetProgressorLabel("Merging " + str(len(featPointShpList)) + " SSURGO Special Point Feature Layers")
+        AddMsgAndPrint("\nMerging SSURGO Spatial Datasets:")
 
-                featPointFCpath = os.path.join(FGDBpath, featPointFC)
-                arcpy.Merge_management(featPointShpList, featPointFCpath)
+        # Merge each feature class in a separate process; results are attached after the tabular import
+        mergeJobs = None
+        if nProc > 1:
+            stageFolder = os.path.join(outputFolder, GDBname + "_staging")
+            mergePool, mergeJobs = startMerges([merge for merge in mergeList if len(merge[1]) > 0], stageFolder, nProc, spatialRef, geoTransform)
 
-                AddMsgAndPrint("\tSuccessfully merged SSURGO Special Point Features",0)
-                if not addAttributeIndex(featPointFCpath,["AREASYMBOL", "FEATSYM"],False): pass
+            for fc, shpList, label in mergeList:
+                if len(shpList) == 0:
+                    AddMsgAndPrint("\tNo SSURGO " + label + "s to merge",0)
 
-            else:
-                AddMsgAndPrint("\tNo SSURGO Soil Special Point Features to merge",0)
+        else:
+            # set progressor object which allows progress information to be passed for every merge complete
+            arcpy.SetProgressor("step", "Beginning the merge process...", 0, len(mergeList), 1)
 
-            arcpy.SetProgressorPosition()
+            for fc, shpList, label in mergeList:
 
-        # ---------------------------------------------------------------------------------------------------- Merge Special Line Features
-        if not bSTATSGO:
-            if len(featLineShpList) > 0:
+                if len(shpList) > 0:
+                    arcpy.SetProgressorLabel("Merging " + str(len(shpList)) + " SSURGO " + label + " Layers")
 
-                arcpy.SetProgressorLabel("Merging " + str(len(featLineShpList)) + " SSURGO Special Line Feature Layers")
+                    fcPath = os.path.join(FGDBpath, fc)
+                    arcpy.Merge_management(shpList, fcPath)
 
-                featLineFCpath = os.path.join(FGDBpath, featLineFC)
-                arcpy.Merge_management(featLineShpList, featLineFCpath)
+                    AddMsgAndPrint("\tSuccessfully merged SSURGO " + label + "s",0)
 
-                AddMsgAndPrint("\tSuccessfully merged SSURGO Special Line Features",0)
-                if not addAttributeIndex(featLineFCpath,["AREASYMBOL", "FEATSYM"],False): pass
-
-            else:
-                AddMsgAndPrint("\tNo SSURGO Special Line Features to merge",0)
+                else:
+                    AddMsgAndPrint("\tNo SSURGO " + label + "s to merge",0)
 
-            arcpy.SetProgressorPosition()
+                arcpy.SetProgressorPosition()
 
         # Strictly Formatting
         AddMsgAndPrint("\n-------------------------------------------------------------------------------------------------------")
@@ -1386,20 +1364,20 @@ if __name__ == '__main__':
 
                     # The next 6 lines will report the # of SSURGO features in each SSA dataset
                     if bSTATSGO:
-                        AddMsgAndPrint("\tImported " + os.path.basename(survey)[:-4] + ".....# of Features: " + str(splitThousands(int(arcpy.GetCount_management(survey).getOutput(0)))),0)
+                        AddMsgAndPrint("\tImported " + os.path.basename(survey)[:-4] + ".....# of Features: " + str(splitThousands(shapefileInfo(survey)[2])),0)
 
                     else:
-                        AddMsgAndPrint("\tImported " + os.path.basename(survey)[:-4] + ".....# of Features: " + str(splitThousands(int(arcpy.GetCount_management(survey).getOutput(0)))),0)
-                        AddMsgAndPrint("\tImported soilmu_l_" + SSA + ".....# of Features: " + str(splitThousands(int(arcpy.GetCount_management(os.path.join(spatialFolder,"soilmu_l_" + SSA +".shp")).getOutput(0)))),0)
-                        AddMsgAndPrint("\tImported soilmu_p_" + SSA + ".....# of Features: " + str(splitThousands(int(arcpy.GetCount_management(os.path.join(spatialFolder,"soilmu_p_" + SSA +".shp")).getOutput(0)))),0)
-                        AddMsgAndPrint("\tImported soilsa_a_" + SSA + ".....# of Features: " + str(splitThousands(int(arcpy.GetCount_management(os.path.join(spatialFolder,"soilsa_a_" + SSA +".shp")).getOutput(0)))),0)
-                        AddMsgAndPrint("\tImported soilsf_p_" + SSA + ".....# of Features: " + str(splitThousands(int(arcpy.GetCount_management(os.path.join(spatialFolder,"soilsf_p_" + SSA +".shp")).getOutput(0)))),0)
-                        AddMsgAndPrint("\tImported soilsf_l_" + SSA + ".....# of Features: " + str(splitThousands(int(arcpy.GetCount_management(os.path.join(spatialFolder,"soilsf_l_" + SSA +".shp")).getOutput(0)))),0)
+                        AddMsgAndPrint("\tImported " + os.path.basename(survey)[:-4] + ".....# of Features: " + str(splitThousands(shapefileInfo(survey)[2])),0)
+                        AddMsgAndPrint("\tImported soilmu_l_" + SSA + ".....# of Features: " + str(splitThousands(shapefileInfo(os.path.join(spatialFolder,"soilmu_l_" + SSA +".shp"))[2])),0)
+                        AddMsgAndPrint("\tImported soilmu_p_" + SSA + ".....# of Features: " + str(splitThousands(shapefileInfo(os.path.join(spatialFolder,"soilmu_p_" + SSA +".shp"))[2])),0)
+                        AddMsgAndPrint("\tImported soilsa_a_" + SSA + ".....# of Features: " + str(splitThousands(shapefileInfo(os.path.join(spatialFolder,"soilsa_a_" + SSA +".shp"))[2])),0)
+                        AddMsgAndPrint("\tImported soilsf_p_" + SSA + ".....# of Features: " + str(splitThousands(shapefileInfo(os.path.join(spatialFolder,"soilsf_p_" + SSA +".shp"))[2])),0)
+                        AddMsgAndPrint("\tImported soilsf_l_" + SSA + ".....# of Features: " + str(splitThousands(shapefileInfo(os.path.join(spatialFolder,"soilsf_l_" + SSA +".shp"))[2])),0)
 
                     importFailed = 0
 
                     # Import the text files into the FGDB tables
-                    if not importTabularData(tabularFolder,tblAliases,i):
+                    if not importTabularData(tabularFolder,tblAliases,ssurgoCatalog,i,preflight.get(SSA.lower())):
                         importFailed += 1
 
                     # remove the featdesc file from the tabular folder regardless of import success or not
@@ -1417,6 +1395,28 @@ if __name__ == '__main__':
                 i += 1
             del i
 
+        # Optional columnar copy of the tabular data
+        if b_importTabularData and columnarFolder:
+            if not exportColumnar(soilShpDict, ssurgoCatalog, columnarFolder, nProc):
+                AddMsgAndPrint("\nColumnar export of the tabular data is incomplete",1)
+
+        # Merges running in separate processes have to be in place before relationships are established
+        if mergeJobs:
+            failedList = attachMerges(mergePool, mergeJobs, FGDBpath, stageFolder)
+
+            # Fall back to merging the failed feature classes in this process. An error here ends
+            # the tool before relationships and indexes are built on partial feature classes.
+            if failedList:
+                AddMsgAndPrint("\nMerging " + ", ".join(failedList) + " in this process",1)
+
+                for fc, shpList, label in mergeList:
+                    if fc in failedList:
+                        arcpy.SetProgressorLabel("Merging " + str(len(shpList)) + " SSURGO " + label + " Layers")
+                        arcpy.Merge_management(shpList, os.path.join(FGDBpath, fc))
+                        AddMsgAndPrint("\tSuccessfully merged SSURGO " + label + "s",0)
+
+        if b_importTabularData:
+
             # establish relationships if mapunit Table is not empty
             if int(arcpy.GetCount_management(FGDBpath + os.sep + "mapunit").getOutput(0)) > 0:
 
@@ -1424,7 +1424,7 @@ if __name__ == '__main__':
                 if not importFailed == len(soilShpDict):
 
                     # establish Relationships
-                    if not CreateTableRelationships(tblAliases):
+                    if not CreateTableRelationships(tblAliases, ssurgoCatalog['relationships']):
                         AddMsgAndPrint("\tCreateTableRelationships failed", 2)
 
                 else:
@@ -1449,14 +1449,14 @@ if __name__ == '__main__':
                 AddMsgAndPrint("\nMerge Results: " + SSA.upper(),1)
 
                 # The next 6 lines will report the # of SSURGO features in each SSA dataset
-                AddMsgAndPrint("\tImported " + os.path.basename(survey)[:-4] + ".....# of Features: " + str(splitThousands(int(arcpy.GetCount_management(survey).getOutput(0)))),0)
+                AddMsgAndPrint("\tImported " + os.path.basename(survey)[:-4] + ".....# of Features: " + str(splitThousands(shapefileInfo(survey)[2])),0)
 
                 if not bSTATSGO:
-                    AddMsgAndPrint("\tImported soilmu_l_" + SSA + ".....# of Features: " + str(splitThousands(int(arcpy.GetCount_management(os.path.join(spatialFolder,"soilmu_l_" + SSA +".shp")).getOutput(0)))),0)
-                    AddMsgAndPrint("\tImported soilmu_p_" + SSA + ".....# of Features: " + str(splitThousands(int(arcpy.GetCount_management(os.path.join(spatialFolder,"soilmu_p_" + SSA +".shp")).getOutput(0)))),0)
-                    AddMsgAndPrint("\tImported soilsa_a_" + SSA + ".....# of Features: " + str(splitThousands(int(arcpy.GetCount_management(os.path.join(spatialFolder,"soilsa_a_" + SSA +".shp")).getOutput(0)))),0)
-                    AddMsgAndPrint("\tImported soilsf_p_" + SSA + ".....# of Features: " + str(splitThousands(int(arcpy.GetCount_management(os.path.join(spatialFolder,"soilsf_p_" + SSA +".shp")).getOutput(0)))),0)
-                    AddMsgAndPrint("\tImported soilsf_l_" + SSA + ".....# of Features: " + str(splitThousands(int(arcpy.GetCount_management(os.path.join(spatialFolder,"soilsf_l_" + SSA +".shp")).getOutput(0)))),0)
+                    AddMsgAndPrint("\tImported soilmu_l_" + SSA + ".....# of Features: " + str(splitThousands(shapefileInfo(os.path.join(spatialFolder,"soilmu_l_" + SSA +".shp"))[2])),0)
+                    AddMsgAndPrint("\tImported soilmu_p_" + SSA + ".....# of Features: " + str(splitThousands(shapefileInfo(os.path.join(spatialFolder,"soilmu_p_" + SSA +".shp"))[2])),0)
+                    AddMsgAndPrint("\tImported soilsa_a_" + SSA + ".....# of Features: " + str(splitThousands(shapefileInfo(os.path.join(spatialFolder,"soilsa_a_" + SSA +".shp"))[2])),0)
+                    AddMsgAndPrint("\tImported soilsf_p_" + SSA + ".....# of Features: " + str(splitThousands(shapefileInfo(os.path.join(spatialFolder,"soilsf_p_" + SSA +".shp"))[2])),0)
+                    AddMsgAndPrint("\tImported soilsf_l_" + SSA + ".....# of Features: " + str(splitThousands(shapefileInfo(os.path.join(spatialFolder,"soilsf_l_" + SSA +".shp"))[2])),0)
 
                 i += 1
                 del SSA, spatialFolder
@@ -1468,13 +1468,14 @@ if __name__ == '__main__':
         else:
             AddMsgAndPrint("\nUnable to update alias names for feature classes within " + os.path.basename(FGDBpath),2)
 
-        # ----------------------------------------------------------------------------- Add Attribute Index to specific tables
-        if not bSTATSGO:
-            arcpy.SetProgressorLabel("Adding Attribute Indexes")
-            AddMsgAndPrint("\nAdding Attribute Indexes")
-            if not addAttributeIndex(os.path.join(FGDBpath,"mapunit"),["musym", "muname","mukind","farmlndcl"],False): pass
-            if not addAttributeIndex(os.path.join(FGDBpath,"component"),["comppct_r","compname", "compkind","majcompflag","slope_r","taxorder","taxsuborder","taxgrtgroup","taxsubgrp","taxpartsize"],False): pass
-            if not addAttributeIndex(os.path.join(FGDBpath,"muaggatt"),["musym","muname","mustatus","flodfreqdcd","drclassdcd","hydgrpdcd","hydclprs"],False):pass
+        # ----------------------------------------------------------------------------- Add Attribute Indexes now that all data is loaded
+        # STATSGO only indexes the mapunit polygons
+        arcpy.SetProgressorLabel("Adding Attribute Indexes")
+        AddMsgAndPrint("\nAdding Attribute Indexes")
+        if bSTATSGO:
+            applyIndexPlan(FGDBpath, {soilFC: ssurgoIndexes[soilFC]}, (), AddMsgAndPrint)
+        else:
+            applyIndexPlan(FGDBpath, ssurgoIndexes, (), AddMsgAndPrint)
 
 #         ----------------------------------------------------------------------------- Use the Following code to Add indexes to ALL fields
 ##            # Add attribute indexes to ALL tables and feature classes in FGDB
@@ -1505,7 +1506,7 @@ if __name__ == '__main__':
 ##                    else:
 ##                        fieldNames.append(field.name)
 ##
-##                if not addAttributeIndex(tablePath,fieldNames,True): continue
+##                applyIndexPlan(FGDBpath, {table: fieldNames})
 ##
 ##            # Report any fields that did not get indexed
 ##            if fieldsNotIndexed:
@@ -1527,7 +1528,6 @@ if __name__ == '__main__':
             AddMsgAndPrint("\tTotal # of Special Feature Points: " + str(splitThousands(arcpy.GetCount_management(FGDBpath + os.sep + featPointFC).getOutput(0))))
             AddMsgAndPrint("\tTotal # of Special Feature Lines: " + str(splitThousands(arcpy.GetCount_management(FGDBpath + os.sep + featLineFC).getOutput(0))))
 
-        from datetime import datetime
         endTime = datetime.now()
         AddMsgAndPrint("\nTotal Time: " + str(endTime - startTime),0)
 
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+19 October 2026
+
+ArcGIS Pro compatible
+
+The MergeCore function merges the shapefiles of one SSURGO feature class
+into its own staging file geodatabase and indexes the result, so that the
+Import SSURGO tools can merge all six feature classes at once in a
+multiprocessing pool. Each worker writes to a separate geodatabase to stay
+clear of the schema locks of the others and of the tabular import. The
+parent copies the staged feature classes into the output geodatabase.
+"""
+
+import arcpy, os, sys
+
+def MergeCore(shpList, stageGDB, fcName, indexFields, outSR, tm):
+    """Returns
+    -------
+    tuple
+        feature class name, staged feature class path and feature count.
+        An error string if the merge failed.
+    """
+    try:
+        # environments are not inherited by the worker
+        arcpy.env.overwriteOutput = True
+        arcpy.env.outputCoordinateSystem = outSR
+        if tm:
+            arcpy.env.geographicTransformations = tm
+
+        arcpy.CreateFileGDB_management(
+            os.path.dirname(stageGDB), os.path.basename(stageGDB)
+        )
+        stageFC = os.path.join(stageGDB, fcName)
+        arcpy.Merge_management(shpList, stageFC)
+
+        for fld in indexFields:
+            arcpy.AddIndex_management(
+                stageFC, fld, "IDX_" + fld, "#", "ASCENDING"
+            )
+
+        count = int(arcpy.GetCount_management(stageFC).getOutput(0))
+        return fcName, stageFC, count
+    except:
+        s1 =  sys.exc_info()[-1].tb_lineno
+        s2 = sys.exc_info()[0]
+        s3 = sys.exc_info()[1]
+        return(f"MergeCore {fcName}: {s1}\n{s2}\n{s3}")
@@ -60,6 +60,16 @@
 #   AREASYMBOL field.  Error occurred with NULL areasymbos so I updated code to find
 #   Nulls to "val in [None, '', ' ', 'Null']:"
 
+# ==========================================================================================
+# Updated  10/19/2026
+#
+# - checkSSURGOAttributesFormat reads the OIDs and fields in one pass with
+#   TableToNumPyArray and checks each distinct value once with compiled regular
+#   expressions instead of every character of every row. The OIDs of each bad value
+#   are gathered with a group-by on the distinct values and reported once per value.
+# - Progress is updated once per field rather than on every row.
+# - The third digit of AREASYMBOL was never checked (val[3] was checked twice).
+
 # ==============================================================================================================================
 def AddMsgAndPrint(msg, severity=0):
     # prints message to screen if run as a python script
@@ -163,143 +173,145 @@ def CheckAreasymbols(asList):
         return False
 
 ## ===================================================================================
-def checkSSURGOAttributesFormat(inLayer, inFields):
-    # inLayer = selected featurelayer or featureclass that will be processed
-    #
-    # length of 5
-    # Check for [0:2] is text and [2:5] is integer
-    # Check for uppercase
-    # Check for spaces or other non-printable characters
-    # string.letters, string.punctuation and string.digits.
+def checkValue(val, fldName):
+    # Returns None if the value is correctly formatted, "NULL" if it is null or blank,
+    # otherwise the value itself
 
-    # valid format
-
-    try:
-        bAreaSymError = False
-        bFldValueErrors = False
+    if val in nullValues or len(val.strip()) == 0:
+        return "NULL"
 
-        validText = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
-        validNum = "0123456789"
-        validMusym = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-+._"
-        fieldList = ["OID@"]
+    if fldName == "AREASYMBOL":
+        # 2 uppercase letters followed by 3 digits
+        if not areaSymPattern.fullmatch(val):
+            return val
 
-        for fld in inFields:
-            if fld not in fieldList:
-                fieldList.append(fld.upper())
+    # Check other attribute (MUSYM or MUKEY)
+    # All we know is it is text field, don't know specifics
+    # Value cannot have spaces and all characters must be valid
+    elif not musymPattern.fullmatch(val):
+        return val
 
-        badAreaSymbolList = list() # list of polygon ids that have erroneous areasymbol
-        badFldValueList = list()   # list of polygon ids that have bad musyms
-        asList = list()       # List of unique areasymbols
+    return None
 
-        iCnt = int(arcpy.GetCount_management(inLayer).getOutput(0))
-        arcpy.SetProgressor("step", "Checking Attributes", 0, iCnt, 1)
+## ===================================================================================
+def badValueGroups(oids, vals, fldName):
+    # Checks each distinct value of a field once
+    # Returns a list of [value, OIDs] of the bad values and the list of correctly
+    # formatted values
+
+    # inverse maps each row to its distinct value
+    uniqueVals, inverse = np.unique(vals, return_inverse=True)
+    inverse = inverse.ravel()
+    checks = [checkValue(val, fldName) for val in uniqueVals.tolist()]
+    goodVals = [val for val, check in zip(uniqueVals.tolist(), checks) if check is None]
+
+    badGroups = list()
+    if len(goodVals) == len(checks):
+        return badGroups, goodVals
+
+    # group-by: OIDs sorted by distinct value, split at each value
+    order = np.argsort(inverse, kind='stable')
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(inverse, minlength=len(checks)))))
+    nullOids = list()
+
+    for i, check in enumerate(checks):
+        if check is None:
+            continue
+        groupOids = oids[order[bounds[i]:bounds[i + 1]]].tolist()
+        if check == "NULL":
+            nullOids.extend(groupOids)
+        else:
+            badGroups.append([check, groupOids])
 
-        with arcpy.da.SearchCursor(inLayer, fieldList) as sCursor:
+    if nullOids:
+        badGroups.insert(0, ["NULL", sorted(nullOids)])
 
-            for row in sCursor:
-                fid = row[0]  # polygon ID
+    return badGroups, goodVals
 
-                # iterate through fields skipping the first field which is OID
-                for i in range(1, len(fieldList)):
+## ===================================================================================
+def reportGroups(fldName, badGroups):
+    # One message per bad value with its number of polygons and their IDs
 
-                    fldName = fieldList[i]
-                    val = row[i]
+    AddMsgAndPrint("\nThe following " + fldName + " values have formatting errors:",2)
+    AddMsgAndPrint(fldName.ljust(13) + "Polygons     Polygon IDs",2)
+    AddMsgAndPrint("----------   ----------   ---------",2)
 
-                    # Handle Areasymbol differently because it has more specific criteria
-                    if fldName == "AREASYMBOL":
+    for val, groupOids in badGroups:
+        ids = ", ".join(str(oid) for oid in groupOids[:maxOids])
+        if len(groupOids) > maxOids:
+            ids += ", ... " + str(len(groupOids) - maxOids) + " more"
+        AddMsgAndPrint(val.ljust(13) + str(len(groupOids)).ljust(13) + ids,1)
 
-                        # Areasymbol record is Null
-                        if val in [None, '', ' ', 'Null']:
-                            badAreaSymbolList.append([fid,"NULL"])
+## ===================================================================================
+def checkSSURGOAttributesFormat(inLayer, inFields):
+    # inLayer = selected featurelayer or featureclass that will be processed
+    #
+    # AREASYMBOL: length of 5
+    # Check for [0:2] is uppercase text and [2:5] is integer
+    # Other fields: check for spaces or other non-printable characters
+    # string.letters, string.digits and -+._
+    #
+    # The fields are read with TableToNumPyArray and each distinct value is checked
+    # once, so a regional MUPOLYGON of millions of polygons is checked in seconds.
 
-                        # Areasymbol is not 5 characters
-                        elif not len(val) == 5:
-                            if len(val.strip()) == 0:
-                                badAreaSymbolList.append([fid,"NULL"])
-                            else:
-                                badAreaSymbolList.append([fid,val])
-                            continue
+    try:
+        fieldList = list()
 
-                        # First 2 characters should be text if not assign Bad Format (BF)
-                        elif not val[0] in validText or not val[1] in validText:
-                            badAreaSymbolList.append([fid,val])
+        for fld in inFields:
+            if fld.upper() not in fieldList:
+                fieldList.append(fld.upper())
 
-                        # Last 3 characters should be integer if not assign Bad Format (BF)
-                        elif not val[2] in validNum or not val[3] in validNum or not val[3] in validNum:
-                            badAreaSymbolList.append([fid,val])
+        asList = list()       # List of unique areasymbols
+        bErrors = False
 
-                        # Must be uppercase if not assign wrong case (C)
-                        elif val.upper() != val:
-                            badAreaSymbolList.append([fid,val])
+        # Nulls are read as empty strings
+        arr = arcpy.da.TableToNumPyArray(inLayer, ["OID@"] + fieldList, skip_nulls=False,
+                                         null_value={fld: '' for fld in fieldList})
+        oids = arr["OID@"]
+        AddMsgAndPrint(".\tChecking " + str(len(oids)) + " records")
 
-                        else:
-                            # areasymbol value is correctly formatted
-                            if not val in asList:
-                                asList.append(val)
+        arcpy.SetProgressor("step", "Checking Attributes", 0, len(fieldList), 1)
 
-                    # Check other attribute (MUSYM or MUKEY)
-                    # All we know is it is text field, don't know specifics
-                    else:
-                        # record is Null
-                        if val in [None, '', ' ', 'Null'] or len(val) < 1:
-                            badFldValueList.append([fid,fldName,"NULL"])
+        for fldName in fieldList:
+            arcpy.SetProgressorLabel("Checking " + fldName)
+            vals = arr[fldName].astype(str)
+            badGroups, goodVals = badValueGroups(oids, vals, fldName)
 
-                        # Value cannot have spaces
-                        elif len(val) > len(val.strip()):
-                            badFldValueList.append([fid,fldName,val])
+            if fldName == "AREASYMBOL":
+                asList = goodVals
 
-                        # All characters must be valid
-                        else:
-                            for char in val:
-                                if not char in validMusym:
-                                    #AddMsgAndPrint("\tBad MUSYM for polygon " + str(fid) + ":  '" + str(muSym) + "'")
-                                    badFldValueList.append([fid,fldName,val])
-                                    break
+            # Report errors with field values
+            if badGroups:
+                bErrors = True
+                reportGroups(fldName, badGroups)
 
-                arcpy.SetProgressorPosition()
+            arcpy.SetProgressorPosition()
 
         arcpy.ResetProgressor()
 
-        # Report errors with Areasymbol values
-        if badAreaSymbolList:
-            AddMsgAndPrint("\nThe following Polygon IDs have AREASYMBOL formatting errors:",2)
-            AddMsgAndPrint("Polygon ID - Areasymbol",2)
-            AddMsgAndPrint("----------   ----------",2)
-
-            # Didn't wound up using
-            col_width = max(len(str(word)) for error in badAreaSymbolList for word in error) + 3
-
-            for row in badAreaSymbolList:
-                AddMsgAndPrint("".join(str(word).ljust(13) for word in row),1)
-
-        # Report errors with bad field values
-        if badFldValueList:
-            AddMsgAndPrint("\nThe following Polygon IDs have invalid characters:",2)
-            AddMsgAndPrint("Polygon ID - Field Name - Attribute",2)
-            AddMsgAndPrint("----------   ----------   ---------",2)
-            for row in badFldValueList:
-                AddMsgAndPrint("".join(str(word).ljust(13) for word in row),1)
-
         # Validate AREASYMBOLs against WSS if it was one of the fields
         # What about Initial Soil Surveys with a new AREASYMBOL?
         if "AREASYMBOL" in fieldList and len(asList):
             AddMsgAndPrint(".\nValidating " + str(len(asList)) + " Areasymbol(s) against Web Soil Survey")
             bValid = CheckAreasymbols(asList)
 
-        if len(badAreaSymbolList) > 0 or len(badFldValueList) > 0:
-            return False
-        else:
-            return True
+        return not bErrors
 
     except:
         errorMsg()
-        bFldValueErrors = False
+        return False
 
 ## ===================================================================================
-import sys, os, traceback, collections, arcpy, json, urllib
+import sys, os, traceback, collections, arcpy, json, urllib, re
+import numpy as np
 from urllib.request import urlopen, URLError, HTTPError
 from arcpy import env
 
+nullValues = ('', ' ', 'Null')
+areaSymPattern = re.compile(r"[A-Z]{2}[0-9]{3}")
+musymPattern = re.compile(r"[A-Za-z0-9+._-]+")
+maxOids = 100   # polygon IDs listed per bad value
+
 if __name__ == '__main__':
 
     try:
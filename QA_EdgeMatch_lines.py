@@ -33,6 +33,15 @@
 #   used as independent library.
 # - Normal messages are no longer Warnings unnecessarily.
 #
+# ==========================================================================================
+# Updated  10/19/2026
+#
+# - Added an optional in-process mode (parameter 4) that does not dissolve or write to the
+#   scratch GDB. The survey boundary is the set of soil polygon edges used only once within
+#   each survey and the seams are the boundary edges shared by two surveys, found with a
+#   hash join on coordinates quantized to the XY resolution (SSURGO_seams.py). Dangling
+#   vertices are written straight to QA_EdgeMatch_Errors_p.
+#
 # Beginning of Functions
 
 # ============================================================================================================
@@ -282,6 +291,49 @@ def setScratchWorkspace():
 
     except:
         errorMsg()
+# ===================================================================================
+def danglingVertices(inputFC, fldName, sQuery, outFC):
+    """ Dissolve-free equivalent of the PolygonToLine/FeatureVerticesToPoints workflow.
+        Soil polygons of the selected surveys are read once as WKB and the dangling
+        vertices along survey seams are written to outFC with the AREASYMBOL and Status
+        fields. Returns the number of dangling vertices."""
+
+    try:
+        import numpy as np
+        import SSURGO_seams
+
+        sr = arcpy.Describe(inputFC).spatialReference
+        res = sr.XYResolution
+
+        codes = dict()      # AREASYMBOL: survey code
+        soilPolys = dict()
+        with arcpy.da.SearchCursor(inputFC, [fldName, "OID@", "SHAPE@WKB"], sQuery) as cursor:
+            for areasym, oid, wkb in cursor:
+                if wkb:
+                    code = codes.setdefault(areasym, len(codes))
+                    soilPolys.setdefault(code, []).append((oid, wkb))
+
+        AddMsgAndPrint("Read " + splitThousands(sum(len(v) for v in soilPolys.values())) + " soil polygons")
+        xy, surveys, stats = SSURGO_seams.danglingNodes(soilPolys, res)
+        AddMsgAndPrint("Found " + splitThousands(stats['seams']) + " seam edges in " + splitThousands(stats['boundary']) + " survey boundary edges")
+
+        if arcpy.Exists(outFC):
+            arcpy.Delete_management(outFC)
+
+        if xy.shape[0]:
+            symbols = {v: k for k, v in codes.items()}
+            errs = np.zeros(xy.shape[0], dtype=[('X', '<f8'), ('Y', '<f8'), (fldName, '<U20'), ('Status', '<U10')])
+            errs['X'] = xy[:, 0]
+            errs['Y'] = xy[:, 1]
+            errs[fldName] = [symbols[c] for c in surveys]
+            arcpy.da.NumPyArrayToFeatureClass(errs, outFC, ('X', 'Y'), sr)
+
+        return xy.shape[0]
+
+    except:
+        errorMsg()
+        raise
+
 ## ===================================================================================
 
 # Import system modules
@@ -296,6 +348,10 @@ if __name__ == '__main__':
         inField = arcpy.GetParameterAsText (1)      # The field containing AREASYMBOL values
         ssaList = arcpy.GetParameter(2)             # List of AREASYMBOLs from Tool Validation code
         layerName = arcpy.GetParameter(3)           # output featurelayer containing dangling points (not required)
+        if arcpy.GetArgumentCount() > 4:
+            bInProcess = arcpy.GetParameter(4)      # compare seams in memory without the scratch GDB
+        else:
+            bInProcess = False
 
         # Check out ArcInfo license for PolygonToLine
         arcpy.SetProduct("ArcInfo")
@@ -330,7 +386,7 @@ if __name__ == '__main__':
         arcpy.env.workspace = theWorkspace
 
         # Set scratchworkspace and then proceed with processing
-        if setScratchWorkspace():
+        if bInProcess or setScratchWorkspace():
 
             # get the first input field object
             chkFields = arcpy.ListFields(inputFC, inField + "*")
@@ -345,15 +401,17 @@ if __name__ == '__main__':
                 exit()
 
             # set name and location for temporary and permanent output features
-            diss_Bound = os.path.join(arcpy.env.scratchGDB, "xxDissBound") # temporary featureclass containing survey areas derived from soil poly dissolve
-            soil_lines = os.path.join(arcpy.env.scratchGDB, "xxSoilLines") # temporary featureclass containing soil polys converted to lines
-            misMatch = os.path.join(arcpy.env.scratchGDB, "Survey_Join_Error_p") # temporary output featureclass containing dangling vertices (join errors)
+            if not bInProcess:
+                diss_Bound = os.path.join(arcpy.env.scratchGDB, "xxDissBound") # temporary featureclass containing survey areas derived from soil poly dissolve
+                soil_lines = os.path.join(arcpy.env.scratchGDB, "xxSoilLines") # temporary featureclass containing soil polys converted to lines
+                misMatch = os.path.join(arcpy.env.scratchGDB, "Survey_Join_Error_p") # temporary output featureclass containing dangling vertices (join errors)
             misMatch2 = os.path.join(arcpy.env.workspace, "QA_EdgeMatch_Errors_p")
             finalFL = "QA_EdgeMatch_Errors_p"
 
             # set final output to shapefile if input is shapefile and make the new field name compatible with the database type
             if inputFC.endswith(".shp"):
-                misMatch = misMatch + ".shp"
+                if not bInProcess:
+                    misMatch = misMatch + ".shp"
                 fldName = fldName[0:10]
 
             # set output map layer name
@@ -383,61 +441,70 @@ if __name__ == '__main__':
 
             # Edge Matching checks start here
             try:
-                # Dissolve soils to create boundaries
-                arcpy.Dissolve_management(selSoilsFL, diss_Bound, inField)
-                AddMsgAndPrint("Dissolved input to create boundary", 0)
+                if bInProcess:
+                    iProblems = danglingVertices(inputFC, fldName, sQuery, misMatch2)
+                    AddMsgAndPrint("Errors found: " + str(iProblems),1)
 
-                # Convert Soil polys to line for Selected surveys
-                arcpy.PolygonToLine_management(selSoilsFL, soil_lines, "IDENTIFY_NEIGHBORS")
-                AddMsgAndPrint("Converted Soils to lines", 0)
+                else:
+                    # Dissolve soils to create boundaries
+                    arcpy.Dissolve_management(selSoilsFL, diss_Bound, inField)
+                    AddMsgAndPrint("Dissolved input to create boundary", 0)
 
-                # Make soil_lines a Feature Layer
-                arcpy.MakeFeatureLayer_management(soil_lines, "soil_linesFL")
+                    # Convert Soil polys to line for Selected surveys
+                    arcpy.PolygonToLine_management(selSoilsFL, soil_lines, "IDENTIFY_NEIGHBORS")
+                    AddMsgAndPrint("Converted Soils to lines", 0)
 
-                # Build whereclause for Select by Attribute
-                whereclause = """%s = -1""" % arcpy.AddFieldDelimiters("soil_linesFL", 'LEFT_FID')
-                AddMsgAndPrint("Built where clause " + whereclause)
+                    # Make soil_lines a Feature Layer
+                    arcpy.MakeFeatureLayer_management(soil_lines, "soil_linesFL")
 
-                # Select soil_lines cooincident with dissolved boundary layer
-                arcpy.SelectLayerByLocation_management("soil_linesFL", "SHARE_A_LINE_SEGMENT_WITH", diss_Bound)
-                AddMsgAndPrint("Selected lines based on boundary", 0)
+                    # Build whereclause for Select by Attribute
+                    whereclause = """%s = -1""" % arcpy.AddFieldDelimiters("soil_linesFL", 'LEFT_FID')
+                    AddMsgAndPrint("Built where clause " + whereclause)
 
-                selBoundaryLines = arcpy.GetCount_management("soil_linesFL").getOutput(0)
+                    # Select soil_lines cooincident with dissolved boundary layer
+                    arcpy.SelectLayerByLocation_management("soil_linesFL", "SHARE_A_LINE_SEGMENT_WITH", diss_Bound)
+                    AddMsgAndPrint("Selected lines based on boundary", 0)
 
-                AddMsgAndPrint("Select by location selected " + str(selBoundaryLines) + " features")
+                    selBoundaryLines = arcpy.GetCount_management("soil_linesFL").getOutput(0)
 
-                if int(selBoundaryLines) > 0 :
-                    arcpy.SelectLayerByAttribute_management("soil_linesFL","REMOVE_FROM_SELECTION", whereclause)
-                    AddMsgAndPrint("Removed perimeter lines from selection")
+                    AddMsgAndPrint("Select by location selected " + str(selBoundaryLines) + " features")
 
-                    # Delete interior soil survey boundaries in soil_lines feature layer
-                    arcpy.DeleteFeatures_management("soil_linesFL")
-                    AddMsgAndPrint("Deleted features",0)
+                    if int(selBoundaryLines) > 0 :
+                        arcpy.SelectLayerByAttribute_management("soil_linesFL","REMOVE_FROM_SELECTION", whereclause)
+                        AddMsgAndPrint("Removed perimeter lines from selection")
 
-                    # Convert only dangling vertices to permanent feature class
-                    arcpy.FeatureVerticesToPoints_management(soil_lines, misMatch,"DANGLE")
-                    AddMsgAndPrint("Converted dangling vertices to points")
+                        # Delete interior soil survey boundaries in soil_lines feature layer
+                        arcpy.DeleteFeatures_management("soil_linesFL")
+                        AddMsgAndPrint("Deleted features",0)
 
-                else:
-                    AddMsgAndPrint("Trouble selecting boundaries in soil lines layer",2)
-                    exit()
+                        # Convert only dangling vertices to permanent feature class
+                        arcpy.FeatureVerticesToPoints_management(soil_lines, misMatch,"DANGLE")
+                        AddMsgAndPrint("Converted dangling vertices to points")
 
-                iProblems = int(arcpy.GetCount_management(misMatch).getOutput(0))
-                AddMsgAndPrint("Errors found: " + str(iProblems),1)
+                    else:
+                        AddMsgAndPrint("Trouble selecting boundaries in soil lines layer",2)
+                        exit()
 
-                if iProblems > 0:
-                    # Found at least one dangling node problem.
-                    # Report finding, create MisMatch featureclass and display in ArcMap
-                    arcpy.CopyFeatures_management(misMatch, misMatch2)
-                    AddMsgAndPrint("copied to misMatch2")
+                    iProblems = int(arcpy.GetCount_management(misMatch).getOutput(0))
+                    AddMsgAndPrint("Errors found: " + str(iProblems),1)
+
+                    if iProblems > 0:
+                        # Found at least one dangling node problem.
+                        # Report finding, create MisMatch featureclass and display in ArcMap
+                        arcpy.CopyFeatures_management(misMatch, misMatch2)
+                        AddMsgAndPrint("copied to misMatch2")
 
-                    # Add new field to track 'fixes'
-                    arcpy.Delete_management(misMatch)
-                    AddMsgAndPrint("Deleted misMatch", 0)
+                        # Add new field to track 'fixes'
+                        arcpy.Delete_management(misMatch)
+                        AddMsgAndPrint("Deleted misMatch", 0)
 
-                    arcpy.AddField_management(misMatch2, "Status", "TEXT", "", "", 10, "Status")
-                    AddMsgAndPrint("Added Fields")
+                        arcpy.AddField_management(misMatch2, "Status", "TEXT", "", "", 10, "Status")
+                        AddMsgAndPrint("Added Fields")
 
+                    else:
+                        arcpy.Delete_management(misMatch)
+
+                if iProblems > 0:
                     try:
                         #arcpy.mapping.MapDocument("Current")
                         arcpy.MakeFeatureLayer_management(misMatch2, finalFL)
@@ -460,7 +527,6 @@ if __name__ == '__main__':
 
                 else:
                     AddMsgAndPrint(" \nNo common-attribute line problems found for " + inputName, 1)
-                    arcpy.Delete_management(misMatch)
 
             except:
                 errorMsg()
@@ -14,7 +14,22 @@ e-mail: adolfo.diaz@usda.gov
     @email: alexander.stum@usda.gov
 @modified 03/30/2026
     @by: Alexnder Stum
-@Version: 1.2
+@Version: 1.3
+
+# --- Update v 1.3, 10/19/2026
+- Added optional process pool export (parameter 3, number of processes).
+Surveys are exported by ExportCore workers, each survey writes to its own
+folder. Messages of each survey are collected in the worker and reported in
+survey order, problemSurveys reporting is unchanged.
+- Added optional partition-once export (parameter 4). Each feature class is
+read once ordered by AREASYMBOL and its rows are routed to per survey
+shapefiles (SSURGO_export.py) instead of an ExportFeatures query per survey
+and feature class. The checks following the export were moved to
+CheckExport and SummarizeSurvey, shared by both paths.
+- Partition-once export writes shapefiles with the pure python ShapeWriter
+(SSURGO_shapefile.py) from SHAPE@WKB. Feature counts, schema, blank
+attribute values and special feature symbols are tallied while writing so
+the _a, _c, _d, _l and _p shapefiles are not opened again to be checked.
 
 # --- Update v 1.2, 03/30/2026
 - Revamped GetExportLayers function to explicitly look for specifically named
@@ -71,7 +86,7 @@ v 1.1 (aks)
     3) added arcpyErr and pyErr functions, but didn't replace references
         of AddMsgAndPrint
 """
-v = '1.2'
+v = '1.3'
 
 
 def arcpyErr(func):
@@ -763,6 +778,140 @@ def GetFolderSize(start_path):
         arcpy.AddError(pyErr(func))
         return 0
 
+## =============================================================================
+def CheckExport(
+        outFC, surveyLoc, theAS, ssurgoType, ssurgoFields, iCnt, 
+        uniquefeatList, stats=None
+    ):
+    # Check an exported shapefile of iCnt features: schema and primary 
+    # attribute field. Unique special feature symbols are gathered in
+    # uniquefeatList. The survey boundary is dissolved from the _a layer.
+    # stats are the tallies of a ShapeWriter, if given only the .dbf header
+    # of the shapefile is read.
+    # Return False if any check failed.
+
+    try:
+        if iCnt > 0 and stats is not None:
+            from SSURGO_shapefile import dbfSchema
+
+            ssurgoSchema = ssurgoFields[ssurgoType]
+            nRec, outSchema = dbfSchema(os.path.splitext(outFC)[0] + ".dbf")
+            if outSchema != ssurgoSchema:
+                arcpy.AddError(
+                    "Schema mismatch problem with " + outFC 
+                    + " attribute table")
+                arcpy.AddError(
+                    "--------------------------------------------------")
+                arcpy.AddError("\tOutput ShapeFile: " + str(outSchema))
+                arcpy.AddError("\n\tSSURGO Standard: " + str(ssurgoSchema))
+                return False
+
+            if nRec != iCnt:
+                arcpy.AddError(
+                    f"\t{os.path.basename(outFC)} has {nRec} records, "
+                    f"{iCnt:.0f} features were exported"
+                )
+                return False
+
+            # the primary attribute field ends each SSURGO schema
+            fldName = ssurgoSchema[-1][0]
+            values = stats['blanks'][fldName]
+            if len(values) > 0:
+                arcpy.AddError(
+                    f"\tMissing {len(values)} {fldName} value(s) in "
+                    f"{os.path.basename(outFC)} layer:"
+                )
+
+                for value in values:
+                    arcpy.AddError("\t\tObjectID: {0}".format(value))
+
+                return False
+
+            for feat in stats['values'].get("FEATSYM", ()):
+                if not feat in uniquefeatList:
+                    uniquefeatList.append(feat)
+
+        elif iCnt > 0:
+
+            # Check output shapefile schema
+            if not CheckFieldInfo(outFC, ssurgoFields[ssurgoType]):
+                return False
+
+            # Check primary attribute field for missing values
+            if not CheckAttributes(outFC, ssurgoType):
+                return False
+
+            # Tally and gather unique special feature points and line
+            if(ssurgoType == "Feature points" 
+               or ssurgoType == "Feature lines"):
+
+                with arcpy.da.SearchCursor(outFC, ["FEATSYM"]) as cursor:
+
+                    for row in cursor:
+                        if not row[0] in uniquefeatList:
+                            uniquefeatList.append(row[0])
+
+        arcpy.AddMessage(f"\t{ssurgoType} exported: {iCnt:.0f}")
+
+        # Create survey boundary if _a layer by dissolving it
+        if(ssurgoType == "Map unit polygons" 
+           and not CreateSSA(outFC,surveyLoc,theAS)):
+            return False
+
+        return True
+
+    except arcpy.ExecuteError:
+        func = sys._getframe(  ).f_code.co_name
+        arcpy.AddError(arcpyErr(func))
+        return False
+    except:
+        func = sys._getframe(  ).f_code.co_name
+        arcpy.AddError(pyErr(func))
+        return False
+
+## =============================================================================
+def SummarizeSurvey(surveyLoc, theAS, uniquefeatList):
+    # Report the unique special features, extent and folder size of an
+    # exported survey and remove the .xml files.
+
+    try:
+        # Report the # of unique features and list them if there are any
+        uniquefeatList.sort()
+
+        if len(uniquefeatList) > 0:
+            arcpy.AddMessage(
+                f"\tUnique Special Feature Count: {len(uniquefeatList):.0f}"
+            )
+
+            for feat in uniquefeatList:
+                arcpy.AddMessage("\t" + feat)
+
+        # Report out extent of SAPOLYGON layer
+        layer = os.path.join(surveyLoc, theAS.lower() + "_b.shp")
+        if not GetLayerExtent(layer):
+            arcpy.AddError(
+                f"\n\tCould not determine Spatial Domain of {theAS}\n"
+            )
+
+        folderSize = GetFolderSize(surveyLoc)
+        arcpy.AddMessage("\t" + "Directory Size: " + str(folderSize) + " MB")
+
+        # remove all .xml files
+        for file in os.listdir(surveyLoc):
+            if file.endswith('.xml'):
+                os.remove(os.path.join(surveyLoc, file))
+
+        return True
+
+    except arcpy.ExecuteError:
+        func = sys._getframe(  ).f_code.co_name
+        arcpy.AddError(arcpyErr(func))
+        return False
+    except:
+        func = sys._getframe(  ).f_code.co_name
+        arcpy.AddError(pyErr(func))
+        return False
+
 ## =============================================================================
 def ProcessSurveyArea(inLoc, exportList, outLoc, theAS, ssurgoFields, msg):
     # Check each layer in the workspace. If it's a valid SSURGO layer, export it
@@ -786,8 +935,7 @@ def ProcessSurveyArea(inLoc, exportList, outLoc, theAS, ssurgoFields, msg):
         surveyLoc = os.path.join(outLoc, theAS.lower())
         sQuery = '"AREASYMBOL" = ' + "'" + theAS + "'"
 
-        # How many unique point and linear features exist
-        uniqueSpecFeatureCount = 0
+        # Unique point and linear features
         uniquefeatList = list()
 
         # for each valid SSURGO layer in workspace export the 
@@ -854,42 +1002,10 @@ def ProcessSurveyArea(inLoc, exportList, outLoc, theAS, ssurgoFields, msg):
                 # if there are features in layer check the schema 
                 # and attribute field
                 iCnt = int(arcpy.GetCount_management(outFC).getOutput(0))
-                if iCnt > 0:
-
-                    # Check output shapefile schema
-                    if not CheckFieldInfo(outFC, ssurgoFields[ssurgoType]):
-                        # arcpy.Delete_management(surveyLoc)
-                        return False
-
-
-                    # Check primary attribute field for missing values
-                    if not CheckAttributes(outFC, ssurgoType):
-                        # arcpy.Delete_management(surveyLoc)
-                        return False
-
-                    # Tally and gather unique special feature points and line
-                    if(ssurgoType == "Feature points" 
-                       or ssurgoType == "Feature lines"):
-
-                        fields = ["FEATSYM"]
-
-                        with arcpy.da.SearchCursor(outFC,fields) as cursor:
-
-                            for row in cursor:
-                                if not row[0] in uniquefeatList:
-                                    uniquefeatList.append(row[0])
-                                    uniqueSpecFeatureCount += 1
-
-                        del fields
-
-                    arcpy.AddMessage(f"\t{ssurgoType} exported: {iCnt:.0f}")
-
-                else:
-                    arcpy.AddMessage(f"\t{ssurgoType} exported: {iCnt:.0f}")
-
-                # Create survey boundary if _a layer by dissolving it
-                if(ssurgoType == "Map unit polygons" 
-                   and not CreateSSA(outFC,surveyLoc,theAS)):
+                if not CheckExport(
+                    outFC, surveyLoc, theAS, ssurgoType, ssurgoFields, iCnt,
+                    uniquefeatList
+                ):
                     # arcpy.Delete_management(surveyLoc)
                     return False
 
@@ -909,42 +1025,225 @@ def ProcessSurveyArea(inLoc, exportList, outLoc, theAS, ssurgoFields, msg):
 
         arcpy.ResetProgressor()
 
-        # Report the # of unique features and list them if there are any
-        uniquefeatList.sort()
+        return SummarizeSurvey(surveyLoc, theAS, uniquefeatList)
 
-        if uniqueSpecFeatureCount > 0:
-            arcpy.AddMessage(
-                f"\tUnique Special Feature Count: {uniqueSpecFeatureCount:.0f}"
-            )
+    except arcpy.ExecuteError:
+        func = sys._getframe(  ).f_code.co_name
+        arcpy.AddError(arcpyErr(func))
+        return False
+    except:
+        func = sys._getframe(  ).f_code.co_name
+        arcpy.AddError(pyErr(func))
+        return False
 
-            for feat in uniquefeatList:
-                arcpy.AddMessage("\t" + feat)
+## =============================================================================
+def PartitionExport(
+        inLoc, exportList, outLoc, asList, ssurgoFields, maxOpen=32
+    ):
+    """Exports all surveys reading each feature class once. Rows are read 
+    ordered by AREASYMBOL, projected in the cursor and routed to the 
+    shapefile of their survey by SSURGO_export.partitionRows. The exported 
+    shapefiles are then checked survey by survey as in ProcessSurveyArea.
 
-        # Report out extent of SAPOLYGON layer
-        layer = os.path.join(surveyLoc, theAS.lower() + "_b.shp")
-        if not GetLayerExtent(layer):
-            arcpy.AddError(
-                f"\n\tCould not determine Spatial Domain of {theAS}\n"
-            )
+    Parameters
+    ----------
+    inLoc : str
+        Input feature dataset
+    exportList : list
+        SSURGO feature class names
+    outLoc : str
+        Output folder
+    asList : list
+        Areasymbols to export
+    ssurgoFields : dict
+        SSURGO shapefile schemas from SSURGOFieldInfo
+    maxOpen : int
+        Maximum number of shapefiles open at once
+
+    Yields
+    ------
+    tuple
+        areasymbol and whether it exported, in the order of asList
+    """
+    from SSURGO_export import partitionRows
+    from SSURGO_shapefile import ShapeWriter
+
+    asList = [str(theAS) for theAS in asList]
+    n = len(asList)
+    outSR = arcpy.env.outputCoordinateSystem
+    prj = outSR.exportToString().split(";")[0]
+    tm = arcpy.env.geographicTransformations
+    counts = dict()     # (areasymbol, ssurgoType): features exported
+    tallies = dict()    # (areasymbol, ssurgoType): ShapeWriter stats
+    layers = list()     # (ssurgoType, shapefile suffix)
+    bExported = True
+    try:
+        for theAS in asList:
+            if not arcpy.Exists(os.path.join(outLoc, theAS.lower())):
+                arcpy.CreateFolder_management(outLoc, theAS.lower())
+            else:
+                arcpy.AddWarning(
+                    f"\t{theAS.lower()} Folder Exists; "
+                    "Contents will be overwritten\n"
+                )
 
-        folderSize = GetFolderSize(surveyLoc)
-        arcpy.AddMessage("\t" + "Directory Size: " + str(folderSize) + " MB")
+        sQuery = (
+            '"AREASYMBOL" IN (' 
+            + ", ".join(f"'{theAS}'" for theAS in asList) + ")"
+        )
+        for fc in exportList:
+            fc_path = f"{inLoc}/{fc}"
+            ssurgoType, suffix = GetFCType(fc_path, "")
 
-        # remove all .xml files
-        for file in os.listdir(surveyLoc):
-            if file.endswith('.xml'):
-                os.remove(os.path.join(surveyLoc, file))
+            # The SSA boundary is dissolved from the Mapunit Polygon Layer
+            if ssurgoType == "Survey area polygons":
+                continue
 
-        return True
+            fldInfo = GetFieldInfo(fc_path, ssurgoType, None)
+            if fldInfo.fieldCount == 0:
+                raise ValueError(f"No SSURGO fields found in {fc}")
+            outFields = [fm.outputField.name for fm in fldInfo.fieldMappings]
+            schema = ssurgoFields[ssurgoType]
+            shapeType = arcpy.da.Describe(fc_path)['shapeType']
+            tally = ("FEATSYM",) if "FEATSYM" in outFields else ()
+
+            def factory(theAS, append):
+                path = os.path.join(
+                    outLoc, theAS.lower(), theAS.lower() + suffix
+                )
+                stats = tallies.setdefault((theAS, ssurgoType), dict())
+                return ShapeWriter(
+                    path, schema, shapeType, prj, append, stats, tally
+                )
+
+            arcpy.SetProgressorLabel(f"Exporting {ssurgoType}")
+            arcpy.AddMessage(f"Exporting {ssurgoType} from {fc}")
+            with arcpy.da.SearchCursor(
+                fc_path, ["AREASYMBOL", "SHAPE@WKB"] + outFields, sQuery,
+                spatial_reference=outSR, 
+                sql_clause=(None, "ORDER BY AREASYMBOL"),
+                datum_transformation=tm
+            ) as sCur:
+                fcCounts = partitionRows(
+                    sCur, schema, factory, maxOpen, asList
+                )
+            for theAS in asList:
+                counts[(theAS, ssurgoType)] = fcCounts.get(theAS, 0)
+            layers.append((ssurgoType, suffix))
 
     except arcpy.ExecuteError:
         func = sys._getframe(  ).f_code.co_name
         arcpy.AddError(arcpyErr(func))
-        return False
+        bExported = False
     except:
         func = sys._getframe(  ).f_code.co_name
         arcpy.AddError(pyErr(func))
-        return False
+        bExported = False
+
+    for i, theAS in enumerate(asList, 1):
+        arcpy.SetProgressorLabel(
+            f"Checking Soil Survey: {theAS} ({i} of {n})"
+        )
+        arcpy.AddMessage("\nExporting Soil Survey: " + theAS)
+        arcpy.AddMessage("------------------------------------------------")
+        if not bExported:
+            yield theAS, False
+            continue
+
+        surveyLoc = os.path.join(outLoc, theAS.lower())
+        uniquefeatList = list()
+        bProcessed = all(
+            CheckExport(
+                os.path.join(surveyLoc, theAS.lower() + suffix), surveyLoc, 
+                theAS, ssurgoType, ssurgoFields, 
+                counts[(theAS, ssurgoType)], uniquefeatList,
+                tallies[(theAS, ssurgoType)]
+            )
+            for ssurgoType, suffix in layers
+        )
+        if bProcessed:
+            arcpy.AddMessage("\n")
+            bProcessed = SummarizeSurvey(surveyLoc, theAS, uniquefeatList)
+        yield theAS, bProcessed
+
+
+## =============================================================================
+def ExportSurveys(inLoc, exportList, outLoc, asList, ssurgoFields, nProc):
+    """Exports each survey, in a process pool when nProc is more than 1.
+
+    Parameters
+    ----------
+    inLoc : str
+        Input feature dataset
+    exportList : list
+        SSURGO feature class names
+    outLoc : str
+        Output folder
+    asList : list
+        Areasymbols to export
+    ssurgoFields : dict
+        SSURGO shapefile schemas from SSURGOFieldInfo
+    nProc : int
+        Number of processes
+
+    Yields
+    ------
+    tuple
+        areasymbol and whether it exported, in the order of asList
+    """
+    n = len(asList)
+    if nProc > 1 and n > 1:
+        import multiprocessing as mp
+        from ExportCore import ExportCore
+
+        # as set by SetOutputCoordinateSystem, for the workers
+        outputSR = arcpy.env.outputCoordinateSystem.exportToString()
+        transformation = arcpy.env.geographicTransformations
+        mp.set_executable(os.path.join(sys.exec_prefix, 'python.exe'))
+        pool = mp.Pool(min(nProc, n))
+        jobs = [
+            pool.apply_async(
+                ExportCore, 
+                args=(inLoc, exportList, outLoc, theAS, ssurgoFields, 
+                      f" ({i} of {n})", outputSR, transformation)
+            )
+            for i, theAS in enumerate(asList, 1)
+        ]
+        pool.close()
+        try:
+            report = {0: arcpy.AddMessage, 1: arcpy.AddWarning, 
+                      2: arcpy.AddError}
+            for i, job in enumerate(jobs, 1):
+                theAS, bProcessed, msgs = job.get()
+                arcpy.SetProgressorLabel(
+                    f"Exported Soil Survey: {theAS} ({i} of {n})"
+                )
+                arcpy.AddMessage("\nExporting Soil Survey: " + theAS)
+                arcpy.AddMessage(
+                    "------------------------------------------------"
+                )
+                for severity, msg in msgs:
+                    report[severity](msg)
+                yield theAS, bProcessed
+        finally:
+            pool.terminate()
+            pool.join()
+
+    else:
+        for i, theAS in enumerate(asList, 1):
+            arcpy.SetProgressorLabel(
+                f"Exporting Soil Survey: {theAS} ({i} of {n})"
+            )
+            msgString = " (" + str(i) + " of " + str(n) + ")"
+
+            arcpy.AddMessage("\nExporting Soil Survey: " + theAS)
+            arcpy.AddMessage("------------------------------------------------")
+
+            bProcessed = ProcessSurveyArea(
+                inLoc, exportList, outLoc, theAS, ssurgoFields, msgString
+            )
+            yield theAS, bProcessed
+
 
 # ========================================= Main Body ==========================
 import os
@@ -964,6 +1263,16 @@ if __name__ == '__main__':
         outLoc = arcpy.GetParameterAsText(1) 
         # List of Areasymbol values to beexported from the geodatabase       
         asList = arcpy.GetParameter(2)              
+        # Number of processes, surveys are exported in parallel if more than 1
+        if arcpy.GetArgumentCount() > 3 and arcpy.GetParameter(3):
+            nProc = int(arcpy.GetParameter(3))
+        else:
+            nProc = 1
+        # Read each feature class once for all surveys
+        if arcpy.GetArgumentCount() > 4:
+            bPartition = arcpy.GetParameter(4)
+        else:
+            bPartition = False
 
         arcpy.env.parallelProcessingFactor = "75%"
         arcpy.env.overwriteOutput = True
@@ -1057,24 +1366,17 @@ if __name__ == '__main__':
             len(asList)
         )
 
-        # Process each soil survey, one at a time.  If a problem occurs,
-        # it will be reported but nothing will be deleted
-
-        iCnt = 1
-        for theAS in asList:
-
-            arcpy.SetProgressorLabel(
-                f"Exporting Soil Survey: {theAS} ({iCnt} of {len(asList)})"
+        # Process each soil survey, one at a time or nProc at a time.  
+        # If a problem occurs, it will be reported but nothing will be deleted
+        if bPartition:
+            surveys = PartitionExport(
+                inLoc, exportList, outLoc, asList, ssurgoFields
             )
-            msgString = " (" + str(iCnt) + " of " + str(len(asList)) + ")"
-
-            arcpy.AddMessage("\nExporting Soil Survey: " + theAS)
-            arcpy.AddMessage("------------------------------------------------")
-
-            bProcessed = ProcessSurveyArea(
-                inLoc, exportList, outLoc, theAS, ssurgoFields, msgString
+        else:
+            surveys = ExportSurveys(
+                inLoc, exportList, outLoc, asList, ssurgoFields, nProc
             )
-            del msgString
+        for theAS, bProcessed in surveys:
 
             if bProcessed == False:
                 arcpy.AddError(
@@ -1082,12 +1384,9 @@ if __name__ == '__main__':
                 )
                 problemSurveys.append(theAS)
 
-            iCnt += 1
-
             arcpy.SetProgressorPosition()
 
         arcpy.ResetProgressor()
-        del iCnt
 
         arcpy.AddMessage("\n==================================================")
 
@@ -37,6 +37,13 @@
 #   used as independent library.
 # - Normal messages are no longer Warnings unnecessarily.
 
+# ==========================================================================================
+# Updated  10/19/2026
+#
+# - Added an optional one-scan mode (parameter 2). CensusLayer reads OID@, AREASYMBOL and
+#   SHAPE@WKB once for all surveys and takes the part count from the WKB header instead of
+#   opening a cursor and building SHAPE@ geometries for every survey.
+
 
 # ==============================================================================================================================
 def AddMsgAndPrint(msg, severity=0):
@@ -127,6 +134,51 @@ def ProcessLayer(inLayer, areaSym):
         errorMsg()
         return -1, idList
 
+# ===================================================================================
+def CensusLayer(inLayer, asList):
+    # One pass alternative to ProcessLayer for all surveys at once. The number of parts
+    # is read from the WKB header so no geometry objects are built.
+    #
+    # inLayer = selected featurelayer or featureclass that will be processed
+    # Returns a dictionary of AREASYMBOL: [number of multipart polygons, list of their IDs]
+    try:
+
+        census = {areaSym: [0, list()] for areaSym in asList}
+
+        fieldList = ["OID@", "AREASYMBOL", "SHAPE@WKB"]
+
+        # where clause
+        sql = '"AREASYMBOL" IN (' + ", ".join("'" + areaSym + "'" for areaSym in asList) + ")"
+
+        desc = arcpy.Describe(inLayer)
+        oidName = desc.OIDFieldName
+
+        with arcpy.da.SearchCursor(inLayer, fieldList, sql) as sCursor:
+            for fid, areaSym, wkb in sCursor:
+
+                if wkb is None:
+                    AddMsgAndPrint("NULL geometry for polygon #" + str(fid),1)
+
+                elif wkbPartCount(wkb) > 1:
+                    saCensus = census[areaSym]
+                    saCensus[0] += 1
+                    saCensus[1].append(fid)
+
+        for areaSym in asList:
+            iMultipart, polyList = census[areaSym]
+
+            if iMultipart > 0:
+                AddMsgAndPrint("\t" + areaSym + " has " + splitThousands(iMultipart) + " multipart polygons: " + '"' + oidName + '"' + " IN (" + str(polyList)[1:-1] + ")",1)
+
+            else:
+                AddMsgAndPrint("\n" + "\t" + areaSym + " has no multipart polygons")
+
+        return census
+
+    except:
+        errorMsg()
+        return {areaSym: [-1, list()] for areaSym in asList}
+
 # ===================================================================================
 def splitThousands(someNumber):
     """will determine where to put a thousands seperator if one is needed. Input is
@@ -208,6 +260,7 @@ def elapsedTime(start):
 ## ===================================================================================
 import sys, string, os, re, locale, time, math, traceback, collections, arcpy
 from arcpy import env
+from SSURGO_geometry import wkbPartCount
 
 if __name__ == '__main__':
 
@@ -221,6 +274,12 @@ if __name__ == '__main__':
         # Target surveys
         asList = arcpy.GetParameter(1)
 
+        # Read all surveys in a single pass
+        if arcpy.GetArgumentCount() > 2:
+            bOneScan = arcpy.GetParameter(2)
+        else:
+            bOneScan = False
+
         # survey id
         inFieldName = "AREASYMBOL"
 
@@ -255,11 +314,18 @@ if __name__ == '__main__':
         goodList = list()    # List of Areasymbols with no errors
         idList = list()      # List of Bad ID's
 
+        if bOneScan:
+            census = CensusLayer(fc, asList)
+
         for areaSym in asList:
 
             #saList = list()
 
-            if theDataType == "FEATURELAYER":
+            if bOneScan:
+                iMultiPart, saList = census[areaSym]
+                idList.extend(saList)
+
+            elif theDataType == "FEATURELAYER":
                 iMultiPart, saList = ProcessLayer(fc, areaSym)
                 idList.extend(saList)
 
@@ -40,6 +40,14 @@
 #   used as independent library.
 # - Normal messages are no longer Warnings unnecessarily.
 
+# ==========================================================================================
+# Updated  10/19/2026
+#
+# - Added an optional header-only counting mode (parameter 2). Vertices and rings are summed
+#   from the ring headers of SHAPE@WKB, or from the .shp record headers for shapefiles,
+#   instead of building a geometry for every feature. The featureclass is split into OID
+#   ranges that are counted in parallel (VCore.py) and totals are reported by AREASYMBOL.
+
 # ===============================================================================================================
 def AddMsgAndPrint(msg, severity=0):
     # prints message to screen if run as a python script
@@ -162,8 +170,108 @@ def ProcessPolygons(theInputLayer, bUseSelected):
         errorMsg()
         return -1
 
+## ===================================================================================
+def CountVertices(theInputLayer, bUseSelected):
+    # Header-only alternative to ProcessPolygons. Also reports totals by AREASYMBOL.
+    # The selected set is counted in this process; the entire featureclass is split into
+    # OID ranges that are counted in parallel by VCore.
+
+    try:
+        from VCore import VCore
+        from SSURGO_shapefile import recordCount
+
+        # Describe input layer
+        desc = arcpy.da.Describe(theInputLayer)
+        theDataType = desc['dataType'].lower()
+
+        if theDataType == "featurelayer":
+            theInputName = desc['nameString']
+
+        else:
+            theInputName = desc['baseName']
+
+        theFC = desc['catalogPath']
+        featureType = desc['shapeType'].lower()
+        AddMsgAndPrint(" \nProcessing input " + featureType + " " + theDataType.lower() + " '" + theInputName + "'")
+
+        if "AREASYMBOL" in [fld.name.upper() for fld in desc['fields']]:
+            field = "AREASYMBOL"
+        else:
+            field = None
+
+        if bUseSelected:
+            AddMsgAndPrint("If selected set or query definition is present, only those features will be processed")
+            results = [VCore(theInputLayer, None, None, field)]
+
+        else:
+            # OID ranges of equal feature counts, several per process
+            pCores = max(min(os.cpu_count() - 2, 8), 1)
+
+            if theFC.lower().endswith(".shp"):
+                nRec = recordCount(theFC)
+                bounds = np.linspace(0, nRec, pCores * 4 + 1).astype(np.int64)
+                chunks = [(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+            else:
+                oids = np.sort(arcpy.da.TableToNumPyArray(theFC, ["OID@"])["OID@"])
+                chunks = [(int(c[0]), int(c[-1]) + 1) for c in np.array_split(oids, pCores * 4) if c.size]
+
+            if len(chunks) > 1:
+                mp.set_executable(os.path.join(sys.exec_prefix, 'python.exe'))
+                pool = mp.Pool(min(pCores, len(chunks)))
+                jobs = [pool.apply_async(VCore, args=(theFC, lo, hi, field)) for lo, hi in chunks]
+                pool.close()
+                pool.join()
+                results = [job.get() for job in jobs]
+
+            else:
+                results = [VCore(theFC, lo, hi, field) for lo, hi in chunks]
+
+        # Merge the chunks
+        counts = dict()
+        nulls = list()
+        for result in results:
+
+            if isinstance(result, str):
+                AddMsgAndPrint(result,2)
+                return -1
+
+            for areaSym, c in result[0].items():
+                total = counts.setdefault(areaSym, [0, 0, 0])
+                for i in range(3):
+                    total[i] += c[i]
+            nulls.extend(result[1])
+
+        if nulls:
+            for fid in sorted(nulls):
+                AddMsgAndPrint("NULL geometry for polygon #" + str(fid),2)
+
+            if bUseSelected:
+                return -1
+
+        if field:
+            for areaSym in sorted(counts):
+                iPolys, iVerts, iRings = counts[areaSym]
+                AddMsgAndPrint("\t" + areaSym + ": " + Number_Format(iVerts, 0, True) + " vertices in " + Number_Format(iPolys, 0, True) + " polygons (" + Number_Format(iRings, 0, True) + " rings)")
+
+        iVertCnt = sum(c[1] for c in counts.values())
+
+        if bUseSelected:
+            AddMsgAndPrint(" \n" + Number_Format(iVertCnt, 0, True) + " vertices in featurelayer \n ")
+
+        else:
+            AddMsgAndPrint(" \n" + Number_Format(iVertCnt, 0, True) + " vertices present in the entire " + theDataType.lower() + " \n ")
+
+        return iVertCnt
+
+    except:
+        errorMsg()
+        return -1
+
 ## ===================================================================================
 import sys, string, os, arcpy, locale, traceback, time, math, operator
+import multiprocessing as mp
+import numpy as np
 
 if __name__ == '__main__':
 
@@ -177,10 +285,20 @@ if __name__ == '__main__':
         # Use all features or selected set? Boolean.
         bUseSelected = arcpy.GetParameter(1)
 
+        # Count from the geometry headers in parallel
+        if arcpy.GetArgumentCount() > 2:
+            bHeaderCount = arcpy.GetParameter(2)
+        else:
+            bHeaderCount = False
+
         arcpy.env.parallelProcessingFactor = "75%"
         arcpy.env.overwriteOutput = True
 
-        iVertCnt = ProcessPolygons(theInputLayer, bUseSelected)
+        if bHeaderCount:
+            iVertCnt = CountVertices(theInputLayer, bUseSelected)
+
+        else:
+            iVertCnt = ProcessPolygons(theInputLayer, bUseSelected)
 
     except:
         AddMsgAndPrint("Error in Setup function",2)
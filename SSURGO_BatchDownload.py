@@ -107,6 +107,25 @@
 #   used as independent library.
 # - Normal messages are no longer Warnings unnecessarily.
 
+# ==========================================================================================
+# Updated  10/19/2026
+#
+# - Table names, aliases and field lengths are read from the SSURGO schema catalog of the
+#   master template database (SSURGO_catalog.py), cached as JSON beside it. GetTableInfo was
+#   removed and tables are no longer described for every survey.
+# - SortMapunits builds the SYSTEM sort tables from the legend, mapunit and cointerp text files
+#   (SSURGO_sortspec.py), joining legend and mapunit in a dictionary and computing each natural
+#   musym sort key once, instead of a MakeQueryTable join and a row by row copy of cointerp.
+# - The text files of a survey are checked against the schema catalog before the template database
+#   is copied (SSURGO_preflight.py). A survey with malformed records or non-numeric values fails
+#   before anything is imported and the record counts of the check are compared with those inserted.
+# - The text files are read through a memory map (SSURGO_mmap.py) instead of csv.reader on a file
+#   opened 'rb', which Python 3 csv does not accept. The csv field_size_limit is no longer 512KB.
+# - The master template database is copied once into template_cache in the output folder and
+#   compacted. Clones of it for the next surveys are made in threads while the current survey is
+#   processed, with a reflink or CopyFileW where the file system can clone blocks
+#   (SSURGO_clone.py). The copy time and the time waited for it are reported for each survey.
+
 # ===============================================================================================================
 def AddMsgAndPrint(msg, severity=0):
     # prints message to screen if run as a python script
@@ -760,78 +779,18 @@ def UnzipDownload(outputFolder, newFolder, importDB, zipName ):
         return False
 
 ## ===============================================================================================================
-def GetTableInfo(newDB):
-    # Adolfo's function
-    #
-    # Retrieve physical and alias names from MDSTATTABS table and assigns them to a blank dictionary.
-    # Stores physical names (key) and aliases (value) in a Python dictionary i.e. {chasshto:'Horizon AASHTO,chaashto'}
-    # Fieldnames are Physical Name = AliasName,IEfilename
-
-    try:
-        tblInfo = dict()
-
-        # Open mdstattabs table containing information for other SSURGO tables
-        theMDTable = "mdstattabs"
-        env.workspace = newDB
-
-
-        # Establishes a cursor for searching through field rows. A search cursor can be used to retrieve rows.
-        # This method will return an enumeration object that will, in turn, hand out row objects
-        if arcpy.Exists(os.path.join(newDB, theMDTable)):
-
-            fldNames = ["tabphyname","tablabel","iefilename"]
-            with arcpy.da.SearchCursor(os.path.join(newDB, theMDTable), fldNames) as rows:
-
-                for row in rows:
-                    # read each table record and assign 'tabphyname' and 'tablabel' to 2 variables
-                    physicalName = row[0]
-                    aliasName = row[1]
-                    importFileName = row[2]
-
-                    # i.e. {chaashto:'Horizon AASHTO',chaashto}; will create a one-to-many dictionary
-                    # As long as the physical name doesn't exist in dict() add physical name
-                    # as Key and alias as Value.
-                    #if not physicalName in tblAliases:
-                    if not importFileName in tblInfo:
-                        #AddMsgAndPrint("\t" + importFileName + ": " + physicalName, 1)
-                        tblInfo[importFileName] = physicalName, aliasName
-
-            del theMDTable
-
-            return tblInfo
-
-        else:
-            # The mdstattabs table was not found
-            AddMsgAndPrint("Missing mdstattabs table",2)
-            return tblInfo
-
-    except:
-        errorMsg()
-        return tblInfo
-
-## ===================================================================================
-def SortMapunits(newDB):
+def SortMapunits(newDB, tabularFolder, catalog):
     # Populate table 'SYSTEM - Mapunit Sort Specifications'. Required for Soil Data Viewer
-    # Looks like an alpha sort on AREASYMBOL, then MUSYM will work to set
-    # lseq and museq values within the "SYSTEM - Mapunit Sort Specifications" table
-    #
-    # Problem, this sort does not handle a mix of alpha and numeric musym values properly
+    # An alpha sort on AREASYMBOL, then a natural sort on MUSYM sets the lseq and museq
+    # values within the "SYSTEM - Mapunit Sort Specifications" table, so that a mix of
+    # alpha and numeric musym values sorts properly
     #
     # Populate table "SYSTEM - INTERP DEPTH SEQUENCE" from COINTERP using cointerpkey and seqnum
     #
+    # Both are built from the legend, mapunit and cointerp text files (SSURGO_sortspec.py)
+    # instead of a query table of the imported tables
+    #
     try:
-        # Make query table using MAPUNIT and LEGEND tables and use it to assemble all
-        # of the data elements required to create the "SYSTEM - Mapunit Sort Specification" table
-        inputTbls = ["legend", "mapunit"]
-
-        fldList = "legend.areasymbol areasymbol;legend.lkey lkey; mapunit.musym musym; mapunit.mukey mukey"
-        sqlJoin = "mapunit.lkey = legend.lkey"
-        queryTbl = "musorted"
-
-        # Cleanup
-        if arcpy.Exists(queryTbl):
-            arcpy.Delete_management(queryTbl)
-
         # Find output SYSTEM table
         sysFields = ["lseq", "museq", "lkey", "mukey"]
         sysTbl = os.path.join(newDB, "SYSTEM - Mapunit Sort Specifications")
@@ -839,72 +798,21 @@ def SortMapunits(newDB):
             AddMsgAndPrint("Could not find " + sysTbl,2)
             return False
 
-        arcpy.MakeQueryTable_management(inputTbls, queryTbl, "ADD_VIRTUAL_KEY_FIELD", "", fldList, sqlJoin)
-
-        # Open the query table, sorting on areasymbol
-        #sqlClause = [None, "order by legend_areasymbol asc"]
-        dMapunitSort = dict()  # dictionary to contain list of musyms for each survey. Will be sorted
-        dMapunitData = dict()  # dictionary for containing all neccessary data for SYSTEM -Map Unit Sort Specification
-        convert = lambda text: int(text) if text.isdigit() else text.lower()
-        alphanum_key = lambda key: [ convert(c) for c in re.split('([0-9]+)', key)]
-
-        with arcpy.da.SearchCursor(queryTbl, ["legend_areasymbol", "legend_lkey", "mapunit_musym", "mapunit_mukey"]) as cur:
-            for rec in cur:
-                areaSym = rec[0].encode('ascii')
-                lkey = rec[1].encode('ascii')
-                musym = rec[2].encode('ascii')
-                mukey = rec[3].encode('ascii')
-
-                # Append muysm values to dictionary by areasymbol key
-                if areaSym in dMapunitSort:
-                    musymList = dMapunitSort[areaSym]
-                    musymList.append(musym)
-                    dMapunitSort[areaSym] = musymList
-
-                else:
-                    dMapunitSort[areaSym] = [musym]
-
-                # store legend and map unit keys by areasymbol and map unit symbol
-                dMapunitData[(areaSym, musym)] = (lkey, mukey)
-
-        # Iterate through dMapunitSort dictionary, sorting muysm values
-        areaList = sorted(dMapunitSort.keys())  # sorted list of areasymbols
-        lseq = 0
-        mseq = 0
-
-        # Now read the dictionary back out in sorted order and populate the SYSTEM - Mapunit Sort Specifications table
-        #
-        with arcpy.da.InsertCursor(sysTbl, "*") as outCur:
-
-            for areaSym in areaList:
-                #AddMsgAndPrint(" \nProcessing survey: " + areaSym, 1)
-                lseq += 1
-                musymList = sorted(dMapunitSort[areaSym], key = alphanum_key)
-
-                for musym in musymList:
-                    mseq += 1
-                    mKey = (areaSym, musym)
-                    lkey, mukey = dMapunitData[(areaSym, musym)]
-                    outrec = lseq, mseq, lkey, mukey
-                    outCur.insertRow(outrec)
-
+        with arcpy.da.InsertCursor(sysTbl, sysFields) as outCur:
+            for outrec in mapunitSort(tabularFolder, catalog):
+                outCur.insertRow(outrec)
 
         # Populate "SYSTEM - INTERP DEPTH SEQUENCE" fields: cointerpkey and depthseq
         # from COINTERP fields: cointerpkey and seqnum
-        # I am assuming that the cointerp table is already sorted. Is that safe??
+        # cointerp.txt is in the same order as the cointerp table
         #
         #AddMsgAndPrint("\tUpdating SYSTEM - Interp Depth Sequence", 1)
-        inTbl = os.path.join(newDB, "cointerp")
-        inFlds = ["cointerpkey", "seqnum"]
         outTbl = os.path.join(newDB, "SYSTEM - INTERP DEPTH SEQUENCE")
         outFlds = ["cointerpkey", "depthseq"]
-        interpSQL = "ruledepth = 1"
-
-        with arcpy.da.SearchCursor(inTbl, inFlds, interpSQL) as sCur:
-            outCur = arcpy.da.InsertCursor(outTbl, outFlds)
 
-            for inRec in sCur:
-                outCur.insertRow(inRec)
+        with arcpy.da.InsertCursor(outTbl, outFlds) as outCur:
+            for outrec in interpDepthSequence(tabularFolder, catalog):
+                outCur.insertRow(outrec)
 
         return True
 
@@ -927,15 +835,6 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT):
         # move to tabular folder
         env.workspace = os.path.join(newFolder, "tabular")
 
-        # copy over master database and run tabular import
-        AddMsgAndPrint("\tCopying selected master template database to tabular folder...", 0)
-
-        # copy user specified database to the new folder
-        shutil.copy2(importDB, newDB)
-
-        # Run Auto_Import routine which will import the tabular data from text files
-        AddMsgAndPrint("\tImporting textfiles into new database " + os.path.basename(newDB) + "...", 0)
-
         # Using Adolfo's csv reader method to import tabular data from text files...
         tabularFolder = os.path.join(newFolder, "tabular")
 
@@ -944,11 +843,10 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT):
             AddMsgAndPrint("No text files found in the tabular folder",2)
             return False
 
-        if not SSURGOVersion(newDB, tabularFolder):
-            return False
-
-        # Create a dictionary with table information
-        tblInfo = GetTableInfo(newDB)
+        # Create a dictionary with table information from the schema catalog of the
+        # master template database, cached beside it after the first survey
+        catalog = loadCatalog(importDB, msg=AddMsgAndPrint)
+        tblInfo = tableInfo(catalog)
 
         if len(tblInfo) == 0:
             AddMsgAndPrint("Failed to get information from mdstattabs table",2)
@@ -968,6 +866,29 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT):
         "chtexmod","sacatlog","sainterp","sdvalgorithm","sdvattribute","sdvfolder","sdvfolderattribute"]
         # Need to add featdesc import as a separate item (ie. spatial\soilsf_t_al001.txt: featdesc)
 
+        # Check the text files against the schema catalog before the template database is copied,
+        # so that a survey with malformed records is rejected instead of half loaded
+        spatialFolder = os.path.join(os.path.dirname(tabularFolder), "spatial")
+        featDescPath = os.path.join(spatialFolder, "soilsf_t_" + areaSym + ".txt")
+        preflight = checkSurvey(tabularFolder, catalog, {"featdesc": featDescPath}, tables=[tblInfo[txtFile][0] for txtFile in txtFiles if txtFile in tblInfo] + ["featdesc"])
+
+        if not preflight['ok']:
+            AddMsgAndPrint("Tabular data failed the pre-flight check",2)
+            for line in summary(preflight):
+                AddMsgAndPrint("\t" + line,2)
+            return False
+
+        # copy over master database and run tabular import
+        # the clone of the master template database was staged while the previous surveys were processed
+        method, cloneTime, waitTime = templateClones.take(os.path.basename(newDB), newDB)
+        AddMsgAndPrint("\tCopied master template database to tabular folder (" + method + ", " + str(round(cloneTime, 1)) + " seconds, waited " + str(round(waitTime, 1)) + " seconds)", 0)
+
+        # Run Auto_Import routine which will import the tabular data from text files
+        AddMsgAndPrint("\tImporting textfiles into new database " + os.path.basename(newDB) + "...", 0)
+
+        if not SSURGOVersion(newDB, tabularFolder):
+            return False
+
         # Static Metadata Table that records the metadata for all columns of all tables
         # that make up the tabular data set.
         mdstattabsTable = os.path.join(env.workspace, "mdstattabs")
@@ -979,8 +900,7 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT):
         # return an error due to table relationships and key violations
 
         # Problem with length of some memo fields, need to allocate more memory
-        #csv.field_size_limit(sys.maxsize)
-        csv.field_size_limit(512000)
+        # The memory mapped reader (SSURGO_mmap.py) sets the csv field_size_limit itself
 
         for txtFile in txtFiles:
 
@@ -1004,17 +924,11 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT):
                 with arcpy.da.InsertCursor(tbl, "*") as cursor:
                     # counter for current record number
                     iRows = 1
-                    fldLengths = list()
-                    fldList = arcpy.da.Describe(tbl)['fields']
-
-                    for fld in fldList:
-                        if fld.type != "OID":
-                            #fldNames.append(fld.name)
-                            fldLengths.append(fld.length)
+                    fldLengths = [fldLength for fldName, fldType, fldLength in catalog['tables'][tbl]['columns']]
 
                     try:
-                        # Use csv reader to read each line in the text file
-                        for row in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
+                        # Read each record of the text file through a memory map
+                        for row in readRows(txtPath):
                             # replace all blank values with 'None' so that the values are properly inserted
                             # into integer values otherwise insertRow fails
                             #newRow = [None if value == '' else value for value in row]
@@ -1044,6 +958,10 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT):
                         AddMsgAndPrint("Error loading line no. " + Number_Format(iRows, 0, True) + " of " + txtFile + ".txt",2)
                         return False
 
+                # compare the # of rows inserted with the number of records counted by the pre-flight check
+                if tbl in preflight['tables'] and iRows - 1 != preflight['tables'][tbl]['rows']:
+                    AddMsgAndPrint("Incorrect # of records inserted into " + tbl + ": " + Number_Format(iRows - 1, 0, True) + " of " + Number_Format(preflight['tables'][tbl]['rows'], 0, True),2)
+
             else:
                 AddMsgAndPrint("Required table '" + tbl + "' not found in " + newDB,2)
                 return False
@@ -1052,7 +970,6 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT):
 
         # Import feature description file
         # soilsf_t_al001.txt
-        spatialFolder = os.path.join(os.path.dirname(tabularFolder), "spatial")
         txtFile ="soilsf_t_" + areaSym
         txtPath = os.path.join(spatialFolder, txtFile + ".txt")
         tbl = "featdesc"
@@ -1064,8 +981,8 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT):
             arcpy.SetProgressorLabel(tbl + "...")
 
             try:
-                # Use csv reader to read each line in the text file
-                for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
+                # Read each record of the text file through a memory map
+                for rowInFile in readRows(txtPath):
                     # replace all blank values with 'None' so that the values are properly inserted
                     # into integer values otherwise insertRow fails
                     newRow = [None if value == '' else value for value in rowInFile]
@@ -1081,7 +998,7 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT):
 
         # Sort map units for Soil Data Viewer SYSTEM table
         arcpy.SetProgressorLabel("Sorting map units ...")
-        bSorted = SortMapunits(newDB)
+        bSorted = SortMapunits(newDB, tabularFolder, catalog)
 
         if bSorted == False:
             return False
@@ -1238,12 +1155,17 @@ def AddMuName(newFolder):
 ## ===================================================================================
 # main
 # Import system modules
-import arcpy, sys, os, locale, string, traceback, shutil, zipfile, subprocess, glob, socket, csv, re
+import arcpy, sys, os, locale, string, traceback, shutil, zipfile, subprocess, glob, socket
 from urllib.request import Request, urlopen, URLError, HTTPError
 #from urllib2 import urlopen, URLError, HTTPError
 from arcpy import env
 from datetime import datetime
 from time import sleep
+from SSURGO_catalog import loadCatalog, tableInfo
+from SSURGO_sortspec import mapunitSort, interpDepthSequence
+from SSURGO_preflight import checkSurvey, summary
+from SSURGO_mmap import readRows
+from SSURGO_clone import TemplateClones
 
 
 if __name__ == '__main__':
@@ -1269,6 +1191,8 @@ if __name__ == '__main__':
         else:
             bImport = True
 
+        templateClones = None
+
         # initialize error and progress trackers
         failedList = list()  # track list of failed downloads
         failedCnt = 0        # track consecutive failures
@@ -1294,6 +1218,10 @@ if __name__ == '__main__':
 
         asList.sort()
 
+        # Clone the master template database for the next surveys while the current one is processed
+        if bImport:
+            templateClones = TemplateClones(importDB, os.path.join(outputFolder, "template_cache"), ["soil_d_" + areaSym.lower() + ".mdb" for areaSym in asList], compact=arcpy.Compact_management, msg=AddMsgAndPrint)
+
         arcpy.SetProgressor("step", "Downloading SSURGO data...",  0, len(asList), 1)
 
         # Proccess list of areasymbols
@@ -1345,6 +1273,9 @@ if __name__ == '__main__':
         errorMsg()
 
     finally:
+        if templateClones is not None:
+            templateClones.close()
+
         if len(failedList) > 0:
             AddMsgAndPrint(" \n\tWSS download failed for: " + ", ".join(failedList), 2)
 
@@ -17,6 +17,16 @@
 # phone: 608.662.4422 ext. 216
 #-------------------------------------------------------------------------------
 
+# ==========================================================================================
+# Updated  10/19/2026
+#
+# - Archives are built by SSURGO_archive.py, several at a time in worker processes
+#   (parameter 3). Archives whose files are unchanged since the last run, according to
+#   the zip_manifest.json kept beside them, are skipped unless parameter 4 is checked.
+# - The compression level is set with parameter 2 (0-9, default 6).
+# - Archives are deterministic and written with ZIP64 records where needed. A new archive
+#   replaces the old one only once it is complete.
+
 
 # ===============================================================================================================
 def AddMsgAndPrint(msg, severity=0):
@@ -61,7 +71,9 @@ def errorMsg():
 
 ## ===================================================================================
 # Import system modules
-import sys, os, traceback, zipfile, arcpy
+import sys, os, traceback, arcpy
+import multiprocessing as mp
+from SSURGO_archive import buildArchives
 
 if __name__ == '__main__':
 
@@ -75,6 +87,24 @@ if __name__ == '__main__':
         ssaList = arcpy.GetParameter(1)
         #ssaList = ['ia005', 'ia015', 'ia059', 'ia061', 'ia151', 'ia187', 'wi113', 'wi119']
 
+        # Deflate compression level, 0 stores files uncompressed
+        if arcpy.GetArgumentCount() > 2 and arcpy.GetParameterAsText(2):
+            level = int(arcpy.GetParameter(2))
+        else:
+            level = 6
+
+        # Number of archives built at a time
+        if arcpy.GetArgumentCount() > 3 and arcpy.GetParameterAsText(3):
+            nProc = int(arcpy.GetParameter(3))
+        else:
+            nProc = max(os.cpu_count() - 1, 1)
+
+        # Rebuild archives even if their files are unchanged
+        if arcpy.GetArgumentCount() > 4:
+            bForce = arcpy.GetParameter(4)
+        else:
+            bForce = False
+
         # Directory Path of valid SSAs to zip up
         ssaToZipUp = list()
 
@@ -107,39 +137,33 @@ if __name__ == '__main__':
 
         arcpy.SetProgressor('step', 'Creating Archives...', 0, len(ssaToZipUp), 1)
 
-        # Iterate through every SSA path and zip up
-        for SSA in ssaToZipUp:
-            AddMsgAndPrint('\n-------- ' + 'Creating zip archive for ' + os.path.basename(SSA) + '\n')
-            arcpy.SetProgressorLabel('Archiving: ' + os.path.basename(SSA))
-
-            try:
-                zipFilePath = SSA.lower() + '.zip'
-
-                if os.path.exists(zipFilePath):
-                    AddMsgAndPrint(os.path.basename(SSA) + ".zip" + " Exists. Overwriting file",1)
+        # Zip up every SSA path, nProc at a time
+        mp.set_executable(os.path.join(sys.exec_prefix, 'python.exe'))
+        jobs = [(SSA, SSA.lower() + '.zip', os.path.basename(SSA.lower())) for SSA in ssaToZipUp]
+        unchangedZips = 0
 
-                with zipfile.ZipFile(zipFilePath, 'w', zipfile.ZIP_DEFLATED) as outZip:
-                    AddMsgAndPrint("Archive Path: " + zipFilePath)
+        for zipFilePath, status, msg in buildArchives(jobs, level, nProc, bForce):
+            zipName = os.path.basename(zipFilePath)
+            arcpy.SetProgressorLabel('Archived: ' + zipName)
 
-                    for dirpath, dirnames, filenames in os.walk(SSA):
-                        #outZip.write(dirpath)
+            if status == 'built':
+                AddMsgAndPrint("Archive Path: " + zipFilePath + " (" + msg + ")")
+                successfulZips+=1
 
-                        for filename in filenames:
-                            outZip.write(os.path.join(dirpath, filename), os.path.basename(SSA.lower()) + os.sep + filename)
-                            #AddMsgAndPrint(os.path.join(dirpath, filename) + "---------" +  os.path.basename(SSA.lower()) + os.sep + filename)
-                        successfulZips+=1
+            elif status == 'unchanged':
+                AddMsgAndPrint(zipName + " is up to date")
+                unchangedZips+=1
 
-                outZip.close()
+            else:
+                AddMsgAndPrint("Problems zipping up " + zipName + "\n\t" + msg,2)
 
-            except:
-                AddMsgAndPrint("Problems zipping up " + SSA,2)
-                errorMsg()
-                continue
+            arcpy.SetProgressorPosition()
 
-            if successfulZips > 0:
-                AddMsgAndPrint("Successfully zipped " + str(successfulZips) + " SSURGO export datasets")
+        if successfulZips > 0:
+            AddMsgAndPrint("\nSuccessfully zipped " + str(successfulZips) + " SSURGO export datasets")
 
-            arcpy.SetProgressorPosition()
+        if unchangedZips > 0:
+            AddMsgAndPrint(str(unchangedZips) + " SSURGO export archives were already up to date")
 
     except:
         errorMsg()
\ No newline at end of file
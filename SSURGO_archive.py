@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO archive builder
+Zips SSURGO export folders and gSSURGO file geodatabases, several archives
+at a time in worker processes. It does not import arcpy so it serves both
+the SSURGO_Zipper tool and the gSSURGO_Zipper console script.
+
+An archive is only rebuilt when its inputs changed. The size, modification
+time and SHA-256 of every file archived are kept in a manifest
+(zip_manifest.json) in the folder of the archives. A file whose size and
+time match is taken as unchanged; one whose time alone changed is hashed
+again and the archive is rebuilt only if a hash differs.
+
+Archives are deterministic: entries are written in sorted order with fixed
+attributes and the time of their file, so the same inputs and compression
+level always give the same archive. ZIP64 records are written for files
+and archives beyond 4 GB.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import os
+import json
+import hashlib
+import zipfile
+
+MANIFEST = 'zip_manifest.json'
+CHUNK = 1 << 20
+
+
+def inventory(src, root):
+    """Files under src, sorted by archive name.
+
+    Parameters
+    ----------
+    src : str
+        Folder to archive, an export folder or a .gdb
+    root : str
+        Folder name the files are archived under
+
+    Returns
+    -------
+    list
+        (archive name, path, size, modification time in ns) per file
+    """
+    files = []
+    for dirpath, dirnames, filenames in os.walk(src):
+        rel = os.path.relpath(dirpath, src)
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            st = os.stat(path)
+            parts = [root] if rel == '.' else [root] + rel.split(os.sep)
+            files.append(
+                ('/'.join(parts + [filename]), path, st.st_size,
+                 st.st_mtime_ns)
+            )
+    files.sort()
+    return files
+
+
+def sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def unchanged(files, zipPath, level, entry):
+    """Checks files against the manifest entry of an existing archive.
+
+    Returns
+    -------
+    dict
+        The entry with refreshed file times if nothing changed, otherwise
+        None.
+    """
+    if not entry or entry.get('level') != level \
+            or not os.path.exists(zipPath):
+        return None
+    st = os.stat(zipPath)
+    if entry.get('zip') != [st.st_size, st.st_mtime_ns]:
+        return None
+    old = entry['files']
+    if [f[0] for f in old] != [f[0] for f in files]:
+        return None
+    new = []
+    for (name, path, size, mtime), (oName, oSize, oTime, oHash) in \
+            zip(files, old):
+        if size != oSize:
+            return None
+        if mtime != oTime and sha256(path) != oHash:
+            return None
+        new.append([name, size, mtime, oHash])
+    return dict(entry, files=new)
+
+
+def zipFolder(src, zipPath, root, level=6, entry=None):
+    """Archives src to zipPath unless the manifest entry shows it unchanged.
+    Each file is hashed and then written by ZipFile.write, which reads it
+    again from the file cache and dates it by its time. The archive is
+    written beside zipPath and swapped in when complete, so a failed run
+    leaves the previous archive in place.
+
+    Parameters
+    ----------
+    src : str
+        Folder to archive
+    zipPath : str
+        Output archive
+    root : str
+        Folder name the files are archived under
+    level : int
+        Deflate compression level, 0 stores the files uncompressed
+    entry : dict
+        Manifest entry of the previous build, if any
+
+    Returns
+    -------
+    tuple
+        zipPath, status ('built', 'unchanged' or 'failed'), the new
+        manifest entry (None if failed) and a message
+    """
+    part = zipPath + '.part'
+    try:
+        files = inventory(src, root)
+        same = unchanged(files, zipPath, level, entry)
+        if same:
+            return zipPath, 'unchanged', same, ''
+
+        manifest = []
+        compression = zipfile.ZIP_DEFLATED if level else zipfile.ZIP_STORED
+        with zipfile.ZipFile(part, 'w', compression, allowZip64=True,
+                             compresslevel=level or None,
+                             strict_timestamps=False) as outZip:
+            for name, path, size, mtime in files:
+                manifest.append([name, size, mtime, sha256(path)])
+                outZip.write(path, name)
+                # central directory attributes, fixed whatever the platform
+                zinfo = outZip.infolist()[-1]
+                zinfo.create_system = 0
+                zinfo.external_attr = 0x20      # MS-DOS archive bit
+        os.replace(part, zipPath)
+        st = os.stat(zipPath)
+        entry = {
+            'level': level, 'zip': [st.st_size, st.st_mtime_ns],
+            'files': manifest
+        }
+        return zipPath, 'built', entry, f"{len(files)} files"
+
+    except Exception as e:
+        if os.path.exists(part):
+            os.remove(part)
+        return zipPath, 'failed', None, f"{type(e).__name__}: {e}"
+
+
+def _zipJob(args):
+    return zipFolder(*args)
+
+
+def readManifest(folder):
+    path = os.path.join(folder, MANIFEST)
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return dict()
+
+
+def writeManifest(folder, manifest):
+    path = os.path.join(folder, MANIFEST)
+    with open(path + '.part', 'w') as f:
+        json.dump(manifest, f, indent=0, sort_keys=True)
+    os.replace(path + '.part', path)
+
+
+def buildArchives(jobs, level=6, nProc=1, force=False):
+    """Builds archives, nProc at a time. The largest inputs are started
+    first so a state-wide gSSURGO is not left running alone at the end.
+    The manifest of each output folder is saved after every archive, so an
+    interrupted run only repeats the archives it had not finished.
+
+    Parameters
+    ----------
+    jobs : list
+        (source folder, archive path, archive root name) tuples
+    level : int
+        Deflate compression level 0-9
+    nProc : int
+        Number of processes, archives are built in the calling process
+        if 1. Tool scripts running in ArcGIS Pro must set the
+        multiprocessing executable first.
+    force : bool
+        Rebuild every archive regardless of the manifest
+
+    Yields
+    ------
+    tuple
+        zipPath, status ('built', 'unchanged' or 'failed') and a message,
+        in the order archives finish
+    """
+    folders = {os.path.dirname(z) for s, z, r in jobs}
+    manifests = {folder: readManifest(folder) for folder in folders}
+
+    def size(job):
+        return sum(f[2] for f in inventory(job[0], job[2]))
+
+    args = [
+        (src, zipPath, root, level,
+         None if force else
+         manifests[os.path.dirname(zipPath)].get(os.path.basename(zipPath)))
+        for src, zipPath, root in sorted(jobs, key=size, reverse=True)
+    ]
+
+    if nProc > 1 and len(args) > 1:
+        import multiprocessing as mp
+        pool = mp.Pool(min(nProc, len(args)))
+        results = pool.imap_unordered(_zipJob, args)
+    else:
+        pool = None
+        results = map(_zipJob, args)
+
+    try:
+        for zipPath, status, entry, msg in results:
+            folder = os.path.dirname(zipPath)
+            name = os.path.basename(zipPath)
+            if entry is None:
+                manifests[folder].pop(name, None)
+            else:
+                manifests[folder][name] = entry
+            writeManifest(folder, manifests[folder])
+            yield zipPath, status, msg
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO schema catalog
+The table names, aliases, import file names, column types and lengths and
+the relationship definitions of a SSURGO template, read once from its
+mdstattabs, mdstatrshipdet and mdstatrshipmas tables and the Describe of
+each table. The catalog is saved as JSON beside the template
+(ssurgo_catalog.json) so later runs read it back instead of opening the
+template. Relationships are joined here rather than with MakeQueryTable,
+which left .rd and .sr locks on the template until ArcGIS restarted.
+
+Catalogs are keyed by the SSURGO version of the template ('SSURGO Version'
+of the SYSTEM - Template Database Information table, when the template has
+one) and a fingerprint of its path and files, so a template swapped for a newer
+SSURGO version is read again. Checking the cache does not need arcpy.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import os
+import json
+import hashlib
+
+CATALOG = 'ssurgo_catalog.json'
+# bump when the layout of a catalog changes
+FORMAT = 1
+
+# catalogs already loaded in this process, by fingerprint
+_loaded = dict()
+
+
+def _normpath(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def fingerprint(template):
+    """SHA-256 of the normalized path of the template and the name, size
+    and modification time of its files, a .gdb folder or a single .mdb
+    file. Two templates of the same size and time are told apart by their
+    path."""
+    h = hashlib.sha256()
+    h.update(f"{_normpath(template)}\n".encode())
+    if os.path.isdir(template):
+        for name in sorted(os.listdir(template)):
+            path = os.path.join(template, name)
+            if os.path.isfile(path) and not name.endswith('.lock'):
+                st = os.stat(path)
+                h.update(f"{name}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+    else:
+        st = os.stat(template)
+        h.update(f"{st.st_size}|{st.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+
+def templateVersion(template):
+    """SSURGO version recorded in the template, None if it has none.
+    The FGDB table template does not carry the SYSTEM tables."""
+    import arcpy
+
+    systemInfo = os.path.join(template, "SYSTEM - Template Database Information")
+    if not arcpy.Exists(systemInfo):
+        return None
+    with arcpy.da.SearchCursor(systemInfo, "*") as sCur:
+        for rec in sCur:
+            if rec[0] == "SSURGO Version":
+                return str(rec[2])
+    return None
+
+
+def buildCatalog(template):
+    """Reads the schema catalog from the template.
+
+    Parameters
+    ----------
+    template : str
+        SSURGO template, the FGDB table template or an Access template
+
+    Returns
+    -------
+    dict
+        'tables': tabphyname: {'label', 'iefilename', 'columns'}, where
+        columns are [name, type, length] of every field but the OID in
+        table order.
+        'relationships': [ltabphyname, ltabcolphyname, rtabphyname,
+        rtabcolphyname, relationshipname, cardinality] in mdstatrshipdet
+        order.
+    """
+    import arcpy
+
+    tables = dict()
+    fields = ["tabphyname", "tablabel", "iefilename"]
+    with arcpy.da.SearchCursor(
+            os.path.join(template, "mdstattabs"), fields) as sCur:
+        for tab, label, iefile in sCur:
+            if tab in tables:
+                continue
+            tbl_p = os.path.join(template, tab)
+            columns = []
+            if arcpy.Exists(tbl_p):
+                columns = [
+                    [fld.name, fld.type, fld.length]
+                    for fld in arcpy.da.Describe(tbl_p)['fields']
+                    if fld.type != 'OID'
+                ]
+            tables[tab] = {
+                'label': label, 'iefilename': iefile, 'columns': columns
+            }
+
+    # master records by relationship, then the column pairs of each
+    cardinality = dict()
+    fields = ["ltabphyname", "rtabphyname", "relationshipname", "cardinality"]
+    with arcpy.da.SearchCursor(
+            os.path.join(template, "mdstatrshipmas"), fields) as sCur:
+        for ltab, rtab, rel, card in sCur:
+            cardinality[(ltab, rtab, rel)] = card
+    relationships = []
+    fields = ["ltabphyname", "ltabcolphyname", "rtabphyname",
+              "rtabcolphyname", "relationshipname"]
+    with arcpy.da.SearchCursor(
+            os.path.join(template, "mdstatrshipdet"), fields) as sCur:
+        for ltab, lcol, rtab, rcol, rel in sCur:
+            card = cardinality.get((ltab, rtab, rel))
+            if card is not None:
+                relationships.append([ltab, lcol, rtab, rcol, rel, card])
+
+    return {
+        'format': FORMAT, 'template': template,
+        'fingerprint': fingerprint(template),
+        'ssurgoVersion': templateVersion(template),
+        'tables': tables, 'relationships': relationships
+    }
+
+
+def readCatalogs(cache):
+    if os.path.exists(cache):
+        try:
+            with open(cache, 'r') as f:
+                catalogs = json.load(f)
+            if catalogs.get('format') == FORMAT:
+                return catalogs
+        except ValueError:
+            pass
+    return {'format': FORMAT, 'catalogs': dict()}
+
+
+def writeCatalogs(cache, catalogs):
+    with open(cache + '.part', 'w') as f:
+        json.dump(catalogs, f, indent=1, sort_keys=True)
+    os.replace(cache + '.part', cache)
+
+
+def loadCatalog(template, cache=None, msg=None):
+    """Schema catalog of the template, from the cache if the template is
+    unchanged, otherwise built and saved to the cache.
+
+    Parameters
+    ----------
+    template : str
+        SSURGO template
+    cache : str
+        JSON cache, ssurgo_catalog.json beside the template if None
+    msg : function
+        Reports a rebuilt catalog, or a cache that could not be saved
+
+    Returns
+    -------
+    dict
+        Catalog as described in buildCatalog
+    """
+    fp = fingerprint(template)
+    if fp in _loaded:
+        return _loaded[fp]
+    if cache is None:
+        cache = os.path.join(os.path.dirname(template), CATALOG)
+
+    catalogs = readCatalogs(cache)
+    for catalog in catalogs['catalogs'].values():
+        if catalog.get('fingerprint') == fp:
+            _loaded[fp] = catalog
+            return catalog
+
+    catalog = buildCatalog(template)
+    key = f"{catalog['ssurgoVersion'] or 'unversioned'} {fp[:12]}"
+    # a template that changed replaces its previous catalog
+    catalogs['catalogs'] = {
+        k: c for k, c in catalogs['catalogs'].items()
+        if _normpath(c.get('template', '')) != _normpath(template)
+    }
+    catalogs['catalogs'][key] = catalog
+    try:
+        writeCatalogs(cache, catalogs)
+        if msg:
+            msg(f"\tSSURGO schema catalog {key} saved to {cache}")
+    except OSError as e:
+        if msg:
+            msg(f"\tUnable to save the SSURGO schema catalog: {e}")
+    _loaded[fp] = catalog
+    return catalog
+
+
+def tableAliases(catalog):
+    """tabphyname: (tablabel, iefilename), i.e. {chaashto: ('Horizon
+    AASHTO', 'chaashto')}"""
+    return {
+        tab: (info['label'], info['iefilename'])
+        for tab, info in catalog['tables'].items()
+    }
+
+
+def tableInfo(catalog):
+    """iefilename: (tabphyname, tablabel), the first table of each file"""
+    info = dict()
+    for tab, tbl in catalog['tables'].items():
+        info.setdefault(tbl['iefilename'], (tab, tbl['label']))
+    return info
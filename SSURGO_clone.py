@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO template clones
+Copies of the master template database for the tabular import of each
+survey. A golden copy of the template is made and compacted once, in the
+output folder so its clones stay on one volume, and is kept for later runs
+until the template changes. Clones for the next surveys in the queue are
+made in threads while the current survey downloads and imports, and are
+moved into the survey's tabular folder when it is ready for them.
+
+Each clone uses the cheapest copy the file system offers: a reflink on
+Linux file systems that support it, CopyFileW on Windows, which clones
+blocks on ReFS and Dev Drive volumes and lets a file server copy shares
+itself, and an ordinary copy otherwise. The template is not hard linked,
+Access updates a database in place and would change the golden copy.
+It does not import arcpy.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import os
+import sys
+import time
+import shutil
+import concurrent.futures as cf
+
+from SSURGO_catalog import fingerprint
+
+# Linux FICLONE ioctl
+FICLONE = 0x40049409
+
+
+def cloneFile(src, dst):
+    """Copies src to dst with the cheapest method available.
+
+    Returns
+    -------
+    str
+        'reflink', 'CopyFile' or 'copy'
+    """
+    if sys.platform == 'win32':
+        import ctypes
+        if ctypes.windll.kernel32.CopyFileW(src, dst, False):
+            return 'CopyFile'
+    else:
+        try:
+            import fcntl
+            with open(src, 'rb') as s, open(dst, 'wb') as d:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            return 'reflink'
+        except (ImportError, OSError):
+            pass
+    shutil.copyfile(src, dst)
+    return 'copy'
+
+
+def _clone(src, dst):
+    t = time.perf_counter()
+    method = cloneFile(src, dst)
+    return method, time.perf_counter() - t
+
+
+class TemplateClones:
+    """Clones of a template database staged ahead of the surveys.
+
+    Parameters
+    ----------
+    importDB : str
+        Master template database
+    stageFolder : str
+        Folder for the golden copy and the staged clones, on the volume of
+        the survey folders
+    names : list
+        File name of the database of each survey, in processing order
+    ahead : int
+        Number of clones kept ready beyond the current survey
+    compact : function
+        Compacts the golden copy, i.e. arcpy.Compact_management
+    msg : function
+        Reports the golden copy
+    """
+
+    def __init__(self, importDB, stageFolder, names, ahead=2, compact=None,
+                 msg=None):
+        self.names = list(names)
+        self.ahead = ahead
+        self.stageFolder = stageFolder
+        if not os.path.exists(stageFolder):
+            os.makedirs(stageFolder)
+
+        # golden copy of this version of the template, older ones removed
+        base, ext = os.path.splitext(os.path.basename(importDB))
+        golden = f"{base}_{fingerprint(importDB)[:12]}{ext}"
+        self.golden = os.path.join(stageFolder, golden)
+        for f in os.listdir(stageFolder):
+            if f.startswith(base + '_') and f.endswith(ext) and f != golden:
+                os.remove(os.path.join(stageFolder, f))
+        if not os.path.exists(self.golden):
+            t = time.perf_counter()
+            cloneFile(importDB, self.golden + '.part')
+            os.replace(self.golden + '.part', self.golden)
+            if compact:
+                try:
+                    compact(self.golden)
+                except Exception as e:
+                    if msg:
+                        msg(f"\tUnable to compact the template copy: {e}")
+            if msg:
+                msg(f"\tPrepared template copy {self.golden} "
+                    f"({time.perf_counter() - t:.1f} seconds)")
+
+        self.executor = cf.ThreadPoolExecutor(max(ahead, 1))
+        self.futures = dict()
+        self._submit(0)
+
+    def _staged(self, name):
+        return os.path.join(self.stageFolder, 'clone_' + name)
+
+    def _submit(self, first):
+        for name in self.names[first:first + self.ahead + 1]:
+            if name not in self.futures:
+                self.futures[name] = self.executor.submit(
+                    _clone, self.golden, self._staged(name)
+                )
+
+    def _discard(self, name):
+        future = self.futures.pop(name)
+        if not future.cancel():
+            try:
+                future.result()
+            except OSError:
+                pass
+            if os.path.exists(self._staged(name)):
+                os.remove(self._staged(name))
+
+    def take(self, name, dst):
+        """Moves the clone for name to dst and starts the clones of the
+        surveys that follow. Clones of surveys passed over, i.e. skipped
+        as current, are discarded.
+
+        Returns
+        -------
+        tuple
+            copy method, seconds the clone took and seconds waited for it
+        """
+        i = self.names.index(name) if name in self.names else len(self.names)
+        for passed in self.names[:i]:
+            if passed in self.futures:
+                self._discard(passed)
+        self._submit(i)
+
+        t = time.perf_counter()
+        if name in self.futures:
+            method, seconds = self.futures.pop(name).result()
+            wait = time.perf_counter() - t
+            os.replace(self._staged(name), dst)
+        else:
+            method, seconds = _clone(self.golden, dst)
+            wait = seconds
+        return method, seconds, wait
+
+    def close(self):
+        """Discards the clones not taken, the golden copy is kept."""
+        for name in list(self.futures):
+            self._discard(name)
+        self.executor.shutdown()
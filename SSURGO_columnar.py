@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO columnar export
+Writes the SSURGO tables of surveys to Parquet (or Arrow IPC) files,
+parsed once from the survey text files with the Arrow CSV reader, so that
+component, horizon and interpretation data of a region can be aggregated
+outside ArcGIS. Each table is a folder partitioned by survey:
+
+    <folder>/component/survey=WI025/part-0.parquet
+
+The partition key is not named areasymbol because legend, sacatalog,
+sainterp and laoverlap have their own areasymbol column, which for
+laoverlap is the symbol of the overlapping area, not of the survey.
+
+Column types follow the schema catalog (SSURGO_catalog.py). Strings are
+dictionary encoded, except the key columns (mukey, cokey, chkey...) which
+are nearly unique and are joined on. Blank values are null, 'NA' and the
+like are kept as text.
+
+The query helpers read the partitions back with pyarrow.dataset and join
+mapunit -> component -> chorizon and cointerp on their keys.
+
+Text files are decoded with the encoding of SSURGO_mmap, the platform
+default. Requires pyarrow, which ships with ArcGIS Pro 3. It does not
+import arcpy.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import os
+import shutil
+
+from SSURGO_mmap import ENCODING
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.dataset as pads
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# file format: (pyarrow.dataset format, file extension)
+formats = {'parquet': ('parquet', '.parquet'), 'arrow': ('ipc', '.arrow')}
+# partition key, the areasymbol of the survey
+PARTITION = 'survey'
+
+
+def arrowType(name, fldType):
+    """Arrow type of a catalog column."""
+    if fldType == 'SmallInteger':
+        return pa.int16()
+    if fldType == 'Integer':
+        return pa.int32()
+    if fldType == 'BigInteger':
+        return pa.int64()
+    if fldType == 'Single':
+        return pa.float32()
+    if fldType == 'Double':
+        return pa.float64()
+    if name.lower().endswith('key'):
+        return pa.string()
+    return pa.dictionary(pa.int32(), pa.string())
+
+
+def readTable(txtPath, columns, encoding=ENCODING):
+    """Parses a SSURGO text file.
+
+    Parameters
+    ----------
+    txtPath : str
+        Pipe delimited text file
+    columns : list
+        [name, type, length] of the table's fields, as in the catalog
+    encoding : str
+        Encoding of the text file
+
+    Returns
+    -------
+    pyarrow.Table
+    """
+    names = [col[0] for col in columns]
+    return pacsv.read_csv(
+        txtPath,
+        read_options=pacsv.ReadOptions(column_names=names, encoding=encoding),
+        parse_options=pacsv.ParseOptions(
+            delimiter='|', quote_char='"', newlines_in_values=True
+        ),
+        convert_options=pacsv.ConvertOptions(
+            column_types={n: arrowType(n, t) for n, t, length in columns},
+            null_values=[''], strings_can_be_null=True,
+            quoted_strings_can_be_null=True
+        )
+    )
+
+
+def writeTable(table, path, fmt='parquet'):
+    if fmt == 'arrow':
+        options = pa.ipc.IpcWriteOptions(compression='zstd')
+        with pa.ipc.new_file(path, table.schema, options=options) as writer:
+            writer.write_table(table)
+    else:
+        pq.write_table(table, path, compression='zstd')
+
+
+def exportSurvey(tabularFolder, catalog, folder, areasymbol, files=None,
+                 tables=None, fmt='parquet', skip=('month',)):
+    """Writes the tables of one survey to their survey partitions,
+    replacing a previous export of the survey. Each file is read back
+    through its partition to confirm its rows can be queried.
+
+    Parameters
+    ----------
+    tabularFolder : str
+        Tabular folder of the survey
+    catalog : dict
+        SSURGO schema catalog
+    folder : str
+        Output folder
+    areasymbol : str
+        Partition of the survey
+    files : dict
+        table: text file, for files outside the tabular folder
+    tables : list
+        Tables to export, every table of the catalog if None
+    fmt : str
+        'parquet' or 'arrow'
+
+    Returns
+    -------
+    tuple
+        areasymbol, table: records written, and an error message ('' if
+        none)
+    """
+    files = files or dict()
+    counts = dict()
+    ext = formats[fmt][1]
+    try:
+        for tab, tbl in catalog['tables'].items():
+            if tbl['iefilename'] in skip or (tables and tab not in tables):
+                continue
+            txtPath = files.get(
+                tab, os.path.join(tabularFolder, tbl['iefilename'] + ".txt")
+            )
+            if not os.path.exists(txtPath):
+                continue
+            part = os.path.join(folder, tab, f"{PARTITION}={areasymbol}")
+            if os.path.exists(part):
+                shutil.rmtree(part)
+            os.makedirs(part)
+            table = readTable(txtPath, tbl['columns'])
+            partFile = os.path.join(part, 'part-0' + ext)
+            writeTable(table, partFile, fmt)
+            n = _dataset(os.path.join(folder, tab), fmt, [partFile]) \
+                .count_rows(filter=pads.field(PARTITION) == areasymbol)
+            if n != table.num_rows:
+                raise ValueError(
+                    f"{tab}: {n} of {table.num_rows} records read back"
+                )
+            counts[tab] = table.num_rows
+        return areasymbol, counts, ''
+    except Exception as e:
+        return areasymbol, counts, f"{type(e).__name__}: {e}"
+
+
+def _exportJob(args):
+    return exportSurvey(*args)
+
+
+def exportSurveys(surveys, catalog, folder, nProc=1, tables=None,
+                  fmt='parquet'):
+    """Exports surveys, nProc at a time.
+
+    Parameters
+    ----------
+    surveys : dict
+        areasymbol: (tabular folder, files as in exportSurvey)
+    nProc : int
+        Number of processes. Tool scripts running in ArcGIS Pro must set
+        the multiprocessing executable first.
+
+    Yields
+    ------
+    tuple
+        areasymbol, table: records written, and an error message, in the
+        order surveys finish
+    """
+    args = [(tabular, catalog, folder, ssa, files, tables, fmt)
+            for ssa, (tabular, files) in surveys.items()]
+    if nProc > 1 and len(args) > 1:
+        import multiprocessing as mp
+        with mp.Pool(min(nProc, len(args))) as pool:
+            yield from pool.imap_unordered(_exportJob, args)
+    else:
+        yield from map(_exportJob, args)
+
+
+def _dataset(tableFolder, fmt='parquet', files=None):
+    """Dataset of an exported table, or of some of its files."""
+    partitioning = pads.partitioning(
+        pa.schema([(PARTITION, pa.string())]), flavor='hive'
+    )
+    if files:
+        return pads.dataset(files, format=formats[fmt][0],
+                            partitioning=partitioning,
+                            partition_base_dir=tableFolder)
+    return pads.dataset(tableFolder, format=formats[fmt][0],
+                        partitioning=partitioning)
+
+
+def openTable(folder, table, columns=None, areasymbols=None, where=None,
+              fmt='parquet'):
+    """Reads an exported table.
+
+    Parameters
+    ----------
+    folder : str
+        Export folder
+    table : str
+        Table name, i.e. component
+    columns : list
+        Columns to read, all if None. 'survey' is the partition.
+    areasymbols : list
+        Surveys to read, all if None
+    where : pyarrow.compute.Expression
+        Further row filter, i.e. pads.field('majcompflag') == 'Yes'
+    fmt : str
+        'parquet' or 'arrow'
+
+    Returns
+    -------
+    pyarrow.Table
+    """
+    ds = _dataset(os.path.join(folder, table), fmt)
+    flt = where
+    if areasymbols:
+        bySurvey = pads.field(PARTITION).isin(list(areasymbols))
+        flt = bySurvey if flt is None else flt & bySurvey
+    return ds.to_table(columns=columns, filter=flt)
+
+
+def _decoded(table):
+    """Table with dictionary columns decoded, for joins."""
+    cols = [
+        col.cast(col.type.value_type)
+        if pa.types.is_dictionary(col.type) else col
+        for col in table.columns
+    ]
+    return pa.table(cols, names=table.column_names)
+
+
+def joinHorizons(folder, areasymbols=None,
+                 mapunitCols=('mukey', 'musym', 'muname'),
+                 componentCols=('cokey', 'mukey', 'compname', 'comppct_r',
+                                'majcompflag'),
+                 horizonCols=('chkey', 'cokey', 'hzdept_r', 'hzdepb_r'),
+                 fmt='parquet'):
+    """mapunit -> component -> chorizon joined on mukey and cokey.
+    Components without horizons are kept.
+
+    Returns
+    -------
+    pyarrow.Table
+    """
+    mu = openTable(folder, 'mapunit', [PARTITION, *mapunitCols],
+                   areasymbols, fmt=fmt)
+    co = openTable(folder, 'component', list(componentCols), areasymbols,
+                   fmt=fmt)
+    ch = openTable(folder, 'chorizon', list(horizonCols), areasymbols,
+                   fmt=fmt)
+    return _decoded(mu).join(_decoded(co), 'mukey').join(
+        _decoded(ch), 'cokey', join_type='left outer'
+    )
+
+
+def dominantComponents(folder, areasymbols=None,
+                       columns=('cokey', 'mukey', 'compname', 'comppct_r'),
+                       fmt='parquet'):
+    """The component of each map unit with the largest comppct_r, the
+    lowest cokey among ties.
+
+    Returns
+    -------
+    pyarrow.Table
+    """
+    import numpy as np
+
+    columns = list(dict.fromkeys(['cokey', 'mukey', 'comppct_r', *columns]))
+    co = _decoded(openTable(folder, 'component', [PARTITION, *columns],
+                            areasymbols, fmt=fmt))
+    co = co.sort_by([('mukey', 'ascending'), ('comppct_r', 'descending'),
+                     ('cokey', 'ascending')])
+    mukey = co['mukey'].to_numpy(zero_copy_only=False)
+    first = np.ones(len(mukey), dtype=bool)
+    first[1:] = mukey[1:] != mukey[:-1]
+    return co.filter(pa.array(first))
+
+
+def dominantInterp(folder, rulename, areasymbols=None, fmt='parquet'):
+    """Rating of an interpretation for the dominant component of each map
+    unit, i.e. dominantInterp(folder, 'ENG - Septic Tank Absorption
+    Fields').
+
+    Returns
+    -------
+    pyarrow.Table
+        survey, mukey, cokey, compname, comppct_r, interphr and
+        interphrc. Map units whose dominant component is not rated have
+        null ratings.
+    """
+    dom = dominantComponents(folder, areasymbols, fmt=fmt)
+    interp = openTable(
+        folder, 'cointerp', ['cokey', 'interphr', 'interphrc'], areasymbols,
+        where=(pads.field('mrulename') == rulename)
+        & (pads.field('ruledepth') == 0),
+        fmt=fmt
+    )
+    return dom.join(_decoded(interp), 'cokey', join_type='left outer')
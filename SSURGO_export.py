@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO export engine
+Partition-once export: a source feature class is read in a single pass,
+ordered by AREASYMBOL, and each row is routed to the writer of its survey.
+Writers are opened lazily and at most maxOpen are open at a time. The
+SSURGO shapefile schema (SSURGOFieldInfo in QA_ExportShapefiles.py) is
+applied to the attributes in the stream.
+
+Writers are made by a factory, factory(areasymbol, append), and need only
+write(shape, values) and close() methods, so the engine runs with arcpy
+insert cursors or a pure python shapefile writer alike. It does not import
+arcpy.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+from collections import OrderedDict
+
+
+class WriterPool:
+    """Writers keyed by survey, opened on first use. When more than maxOpen
+    would be open the least recently used is closed; should its survey come
+    back it is reopened with append=True.
+
+    Parameters
+    ----------
+    factory : function
+        factory(key, append) returns a writer
+    maxOpen : int
+        Maximum number of writers open at once
+    """
+    def __init__(self, factory, maxOpen=32):
+        self.factory = factory
+        self.maxOpen = max(int(maxOpen), 1)
+        self.open = OrderedDict()
+        self.counts = {}    # key: records written
+        self.reopened = 0
+
+    def get(self, key):
+        w = self.open.get(key)
+        if w is not None:
+            self.open.move_to_end(key)
+            return w
+        while len(self.open) >= self.maxOpen:
+            k, old = self.open.popitem(last=False)
+            old.close()
+        append = key in self.counts
+        self.reopened += append
+        w = self.factory(key, append)
+        self.open[key] = w
+        self.counts.setdefault(key, 0)
+        return w
+
+    def write(self, key, shape, values):
+        self.get(key).write(shape, values)
+        self.counts[key] += 1
+
+    def close(self):
+        while self.open:
+            k, w = self.open.popitem(last=False)
+            w.close()
+
+
+def attributeFields(schema):
+    """The attribute fields of a SSURGOFieldInfo schema, OID and Geometry
+    dropped, as (name, length, type)."""
+    return [(name, length, ftype)
+            for name, length, precision, scale, ftype in schema
+            if ftype not in ('OID', 'Geometry')]
+
+
+def conform(values, fields):
+    """Values fit to the schema: text is cut to the field length, NULL text
+    becomes an empty string as dBASE has no NULL."""
+    out = []
+    for v, (name, length, ftype) in zip(values, fields):
+        if ftype == 'String':
+            v = '' if v is None else str(v)[:length]
+        out.append(v)
+    return out
+
+
+def partitionRows(rows, schema, factory, maxOpen=32, keys=()):
+    """Routes each row to the writer of its survey.
+
+    Parameters
+    ----------
+    rows : iterable
+        (areasymbol, shape, value, ...) with the values in the order of
+        the schema's attribute fields, ideally ordered by areasymbol so
+        only one writer is open at a time
+    schema : list
+        SSURGOFieldInfo field descriptions of the output
+    factory : function
+        factory(areasymbol, append) returns a writer
+    maxOpen : int
+        Maximum number of writers open at once
+    keys : iterable
+        Surveys that get an (empty) output even without rows
+
+    Returns
+    -------
+    dict
+        areasymbol: number of records written
+    """
+    fields = attributeFields(schema)
+    pool = WriterPool(factory, maxOpen)
+    try:
+        for key, shape, *values in rows:
+            pool.write(key, shape, conform(values, fields))
+        for key in keys:
+            if key not in pool.counts:
+                pool.get(key)
+    finally:
+        pool.close()
+    return pool.counts
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO featdesc loader
+Reads the special feature description files (spatial/soilsf_t_<ssa>.txt)
+of SSURGO downloads into rows of the featdesc table: areasymbol, featsym,
+featname and featdesc. Survey folders are indexed once with a single
+listing of the download folder, the files are parsed in parallel and
+(areasymbol, featsym) duplicates are dropped, so that the rows of a whole
+region can be inserted in one batch.
+
+The rows can also be written back as soilsf_t files, one per areasymbol,
+i.e. from a featdesc table. It does not import arcpy.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import os
+
+from SSURGO_mmap import readRows
+
+# featdesc table fields, in the order of the rows
+FIELDS = ('areasymbol', 'featsym', 'featname', 'featdesc')
+
+
+def surveyFolders(input_f):
+    """Index of the SSURGO downloads in a folder.
+
+    Parameters
+    ----------
+    input_f : str
+        Folder with the unzipped SSURGO downloads, named by areasymbol
+        (WI025) or with SDM labeling (soil_wi025)
+
+    Returns
+    -------
+    dict
+        AREASYMBOL: survey folder. An areasymbol folder is preferred to a
+        soil_ folder of the same survey.
+    """
+    folders = dict()
+    with os.scandir(input_f) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            if entry.name.lower().startswith('soil_'):
+                folders.setdefault(entry.name[5:].upper(), entry.path)
+            else:
+                folders[entry.name.upper()] = entry.path
+    return folders
+
+
+def featdescPath(folder, ssa):
+    """Path of the special feature description file of a survey folder."""
+    return os.path.join(folder, 'spatial', f"soilsf_t_{ssa.lower()}.txt")
+
+
+def readFeatdesc(txtPath):
+    """Rows of a soilsf_t file, blanks as None. The spatialver and featkey
+    columns are left out.
+
+    Returns
+    -------
+    list
+        (areasymbol, featsym, featname, featdesc) tuples
+    """
+    return [
+        (row[0] or None, row[2] or None, row[3] or None, row[4] or None)
+        for row in readRows(txtPath)
+    ]
+
+
+def _readJob(args):
+    ssa, txtPath = args
+    try:
+        return ssa, readFeatdesc(txtPath), ''
+    except Exception as e:
+        return ssa, [], f"{txtPath}: {type(e).__name__}: {e}"
+
+
+def loadFeatdesc(ssa_l, folders, nProc=1):
+    """Reads the featdesc rows of surveys.
+
+    Parameters
+    ----------
+    ssa_l : list
+        Areasymbols, in the order their rows are wanted
+    folders : dict
+        AREASYMBOL: survey folder, as from surveyFolders
+    nProc : int
+        Number of processes. Tool scripts running in ArcGIS Pro must set
+        the multiprocessing executable first.
+
+    Returns
+    -------
+    dict
+        'rows': (areasymbol, featsym, featname, featdesc) tuples, the first
+        of each (areasymbol, featsym); 'duplicates': (areasymbol, featsym)
+        of the rows dropped; 'missing': surveys without a folder or a
+        soilsf_t file; 'errors': messages of the files that failed
+    """
+    output = {'rows': [], 'duplicates': [], 'missing': [], 'errors': []}
+    args = []
+    for ssa in ssa_l:
+        folder = folders.get(ssa.upper())
+        txtPath = featdescPath(folder, ssa) if folder else None
+        if txtPath and os.path.exists(txtPath):
+            args.append((ssa, txtPath))
+        else:
+            output['missing'].append(ssa)
+
+    if nProc > 1 and len(args) > 1:
+        import multiprocessing as mp
+        with mp.Pool(min(nProc, len(args))) as pool:
+            results = pool.map(_readJob, args,
+                               chunksize=max(len(args) // (nProc * 4), 1))
+    else:
+        results = map(_readJob, args)
+
+    keys = set()
+    for ssa, rows, msg in results:
+        if msg:
+            output['errors'].append(msg)
+        for row in rows:
+            if (row[0], row[1]) in keys:
+                output['duplicates'].append((row[0], row[1]))
+            else:
+                keys.add((row[0], row[1]))
+                output['rows'].append(row)
+    return output
+
+
+def writeFeatdesc(rows, folder, featkey='ZZZ'):
+    """Writes featdesc rows as soilsf_t files, one per areasymbol, in a
+    single pass.
+
+    Parameters
+    ----------
+    rows : iterable
+        (areasymbol, spatialver, featsym, featname, featdesc) rows
+    folder : str
+        Output folder
+    featkey : str
+        Value of the featkey column
+
+    Returns
+    -------
+    dict
+        AREASYMBOL: path of the file written
+    """
+    files = dict()
+    paths = dict()
+    try:
+        for row in rows:
+            areasymbol, spatialver, featsym, featname, featdesc = [
+                '' if v is None else v for v in row
+            ]
+            ssa = str(areasymbol).upper()
+            if ssa not in files:
+                paths[ssa] = os.path.join(folder,
+                                          f"soilsf_t_{ssa.lower()}.txt")
+                files[ssa] = open(paths[ssa], 'w')
+            files[ssa].write(
+                f'"{areasymbol}"|{spatialver}|"{featsym}"|"{featname}"|'
+                f'"{featdesc}"|"{featkey}"\n'
+            )
+    finally:
+        for f in files.values():
+            f.close()
+    return paths
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO geometry helpers
+Reads OGC well-known binary (WKB), as returned by the arcpy.da cursor token
+SHAPE@WKB, straight into numpy coordinate arrays without building arcpy
+geometry objects. It does not import arcpy.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import struct
+import numpy as np
+
+# WKB geometry type codes
+wkbPoint = 1
+wkbLineString = 2
+wkbPolygon = 3
+wkbMultiPoint = 4
+wkbMultiLineString = 5
+wkbMultiPolygon = 6
+
+
+def _header(wkb, pos):
+    """Byte order, base geometry type and coordinate dimension of the
+    geometry starting at pos. Handles ISO (1000s) and EWKB flag types."""
+    bo = '<' if wkb[pos] == 1 else '>'
+    t, = struct.unpack_from(bo + 'I', wkb, pos + 1)
+    dim = 2
+    if t & 0x80000000:      # EWKB Z flag
+        dim += 1
+    if t & 0x40000000:      # EWKB M flag
+        dim += 1
+    t &= 0x0FFFFFFF
+    dim += (0, 1, 1, 2)[t // 1000]
+    return bo, t % 1000, dim
+
+
+def _rings(wkb, pos, bo, dim):
+    """Rings of one polygon starting after its header at pos."""
+    nR, = struct.unpack_from(bo + 'I', wkb, pos)
+    pos += 4
+    rings = []
+    for r in range(nR):
+        nP, = struct.unpack_from(bo + 'I', wkb, pos)
+        pos += 4
+        xy = np.frombuffer(wkb, dtype=bo + 'f8', count=nP * dim, offset=pos)
+        rings.append(xy.reshape((nP, dim))[:, :2])
+        pos += nP * dim * 8
+    return rings, pos
+
+
+def wkbParts(wkb):
+    """Parses a polygon or multipolygon WKB.
+
+    Parameters
+    ----------
+    wkb : bytes or bytearray
+        Well-known binary, e.g. from SHAPE@WKB
+
+    Returns
+    -------
+    list
+        One list of rings per part, each ring an (n, 2) float array. An
+        empty list for null or empty geometries.
+    """
+    if not wkb:
+        return []
+    bo, t, dim = _header(wkb, 0)
+    if t == wkbPolygon:
+        rings, pos = _rings(wkb, 5, bo, dim)
+        return [rings] if rings else []
+    elif t == wkbMultiPolygon:
+        nParts, = struct.unpack_from(bo + 'I', wkb, 5)
+        pos = 9
+        parts = []
+        for p in range(nParts):
+            bo_p, t_p, dim_p = _header(wkb, pos)
+            rings, pos = _rings(wkb, pos + 5, bo_p, dim_p)
+            parts.append(rings)
+        return parts
+    raise ValueError(f"WKB geometry type {t} is not a polygon")
+
+
+def _path(wkb, pos, bo, dim):
+    """Coordinates of one linestring starting after its header at pos."""
+    nP, = struct.unpack_from(bo + 'I', wkb, pos)
+    xy = np.frombuffer(wkb, dtype=bo + 'f8', count=nP * dim, offset=pos + 4)
+    return xy.reshape((nP, dim))[:, :2], pos + 4 + nP * dim * 8
+
+
+def wkbPaths(wkb):
+    """Parses a point, multipoint, linestring or multilinestring WKB.
+
+    Returns
+    -------
+    list
+        One (n, 2) float array per linestring; for points and multipoints
+        a single array of all the points. An empty list for null or empty
+        geometries.
+    """
+    if not wkb:
+        return []
+    bo, t, dim = _header(wkb, 0)
+    if t == wkbPoint:
+        xy = np.frombuffer(wkb, dtype=bo + 'f8', count=dim, offset=5)[:2]
+        return [] if np.isnan(xy).all() else [xy.reshape((1, 2))]
+    elif t == wkbLineString:
+        xy, pos = _path(wkb, 5, bo, dim)
+        return [xy] if xy.shape[0] else []
+    elif t in (wkbMultiPoint, wkbMultiLineString):
+        n, = struct.unpack_from(bo + 'I', wkb, 5)
+        pos = 9
+        paths = []
+        for p in range(n):
+            bo_p, t_p, dim_p = _header(wkb, pos)
+            if t_p == wkbPoint:
+                xy = np.frombuffer(wkb, dtype=bo_p + 'f8', count=dim_p,
+                                   offset=pos + 5)[:2].reshape((1, 2))
+                pos += 5 + dim_p * 8
+            else:
+                xy, pos = _path(wkb, pos + 5, bo_p, dim_p)
+            paths.append(xy)
+        if t == wkbMultiPoint:
+            return [np.concatenate(paths)] if paths else []
+        return paths
+    raise ValueError(f"WKB geometry type {t} is not a point or line")
+
+
+def wkbPartCount(wkb):
+    """Number of parts of a polygon or multipolygon WKB read from its
+    header alone, as Polygon.partCount. 0 for null or empty geometries."""
+    if not wkb:
+        return 0
+    bo, t, dim = _header(wkb, 0)
+    n, = struct.unpack_from(bo + 'I', wkb, 5)
+    if t == wkbPolygon:
+        return 1 if n else 0
+    elif t == wkbMultiPolygon:
+        return n
+    raise ValueError(f"WKB geometry type {t} is not a polygon")
+
+
+def wkbCounts(wkb):
+    """Vertex and ring counts of a polygon or multipolygon WKB, taken from
+    the ring headers without decoding any coordinates. Vertices include
+    the closing vertex of each ring, as Polygon.pointCount.
+
+    Returns
+    -------
+    tuple
+        vertices, rings. (0, 0) for null or empty geometries.
+    """
+    if not wkb:
+        return 0, 0
+    bo, t, dim = _header(wkb, 0)
+    if t == wkbPolygon:
+        nPolys = 1
+        pos = 0
+    elif t == wkbMultiPolygon:
+        nPolys, = struct.unpack_from(bo + 'I', wkb, 5)
+        pos = 9
+    else:
+        raise ValueError(f"WKB geometry type {t} is not a polygon")
+    unpack = struct.unpack_from
+    points = rings = 0
+    for p in range(nPolys):
+        bo, t_p, dim = _header(wkb, pos)
+        nR, = unpack(bo + 'I', wkb, pos + 5)
+        pos += 9
+        rings += nR
+        for r in range(nR):
+            nP, = unpack(bo + 'I', wkb, pos)
+            points += nP
+            pos += 4 + nP * dim * 8
+    return points, rings
+
+
+def quantize(xy, res):
+    """Snaps coordinates to integer multiples of the xy resolution so
+    they can be compared and hashed exactly."""
+    return np.rint(np.asarray(xy) / res).astype(np.int64)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO index plan
+The attribute and spatial indexes of the SSURGO feature classes and tables,
+declared in one place. Loading tools build them once every load is done,
+so the indexes are not maintained through later inserts. indexPlan diffs
+the plan against the geodatabase with one Describe per table and
+buildIndexes builds what is missing table by table, reporting the time
+each table took.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import os
+import time
+import arcpy
+
+# table or feature class: fields given an attribute index
+ssurgoIndexes = {
+    'MUPOLYGON': ['AREASYMBOL', 'MUSYM'],
+    'MULINE': ['AREASYMBOL', 'MUSYM'],
+    'MUPOINT': ['AREASYMBOL', 'MUSYM'],
+    'SAPOLYGON': ['AREASYMBOL'],
+    'FEATPOINT': ['AREASYMBOL', 'FEATSYM'],
+    'FEATLINE': ['AREASYMBOL', 'FEATSYM'],
+    'mapunit': ['musym', 'muname', 'mukind', 'farmlndcl'],
+    'component': [
+        'comppct_r', 'compname', 'compkind', 'majcompflag', 'slope_r',
+        'taxorder', 'taxsuborder', 'taxgrtgroup', 'taxsubgrp', 'taxpartsize'
+    ],
+    'muaggatt': [
+        'musym', 'muname', 'mustatus', 'flodfreqdcd', 'drclassdcd',
+        'hydgrpdcd', 'hydclprs'
+    ]
+}
+
+# feature classes given a spatial index
+spatialIndexes = (
+    'MUPOLYGON', 'MULINE', 'MUPOINT', 'SAPOLYGON', 'FEATPOINT', 'FEATLINE'
+)
+
+
+def indexPlan(gdb, plan=None, spatial=spatialIndexes):
+    """Finds the indexes of the plan that gdb lacks.
+
+    Parameters
+    ----------
+    gdb : str
+        Path of the geodatabase, feature datasets are searched too
+    plan : dict
+        table name: fields to index, ssurgoIndexes if None. Names are
+        matched without regard to case.
+    spatial : tuple
+        Feature class names that should have a spatial index
+
+    Returns
+    -------
+    list
+        (table path, fields to index, True if it needs a spatial index,
+        planned fields the table does not have) for each table of the
+        plan found in gdb that is missing an index or field
+    """
+    if plan is None:
+        plan = ssurgoIndexes
+    wanted = {name.upper(): fields for name, fields in plan.items()}
+    spatial = {name.upper() for name in spatial}
+    todo = []
+    for dirpath, dirnames, filenames in arcpy.da.Walk(
+            gdb, datatype=['FeatureClass', 'Table']):
+        for name in filenames:
+            key = name.upper()
+            if key not in wanted and key not in spatial:
+                continue
+            path = os.path.join(dirpath, name)
+            desc = arcpy.da.Describe(path)
+            fields = {fld.name.upper() for fld in desc['fields']}
+            indexed = {
+                fld.name.upper()
+                for index in desc['indexes'] for fld in index.fields
+            }
+            add_l = [fld for fld in wanted.get(key, [])
+                     if fld.upper() in fields and fld.upper() not in indexed]
+            absent_l = [fld for fld in wanted.get(key, [])
+                        if fld.upper() not in fields]
+            bSpatial = key in spatial and not desc.get('hasSpatialIndex', True)
+            if add_l or bSpatial or absent_l:
+                todo.append((path, add_l, bSpatial, absent_l))
+    return todo
+
+
+def buildIndexes(todo, msg=arcpy.AddMessage):
+    """Builds the indexes found missing by indexPlan, table by table.
+
+    Parameters
+    ----------
+    todo : list
+        Output of indexPlan
+    msg : function
+        Reports each table and its build time
+
+    Returns
+    -------
+    dict
+        table path: seconds spent building its indexes
+    """
+    times = {}
+    for path, add_l, bSpatial, absent_l in todo:
+        name = os.path.basename(path)
+        for fld in absent_l:
+            msg(f"\tAttribute index cannot be created for {name}.{fld}, "
+                "the field does not exist")
+        if not add_l and not bSpatial:
+            continue
+        t = time.perf_counter()
+        for fld in add_l:
+            arcpy.management.AddIndex(
+                path, fld, f"IDX_{fld}", "NON_UNIQUE", "ASCENDING"
+            )
+        if bSpatial:
+            arcpy.management.AddSpatialIndex(path)
+        times[path] = time.perf_counter() - t
+        built = add_l + (['spatial'] if bSpatial else [])
+        msg(f"\t{name}: {', '.join(built)} ({times[path]:.1f} seconds)")
+    return times
+
+
+def applyIndexPlan(gdb, plan=None, spatial=spatialIndexes,
+                   msg=arcpy.AddMessage):
+    """indexPlan and buildIndexes in one call, for the end of a load.
+
+    Returns
+    -------
+    dict
+        table path: seconds spent building its indexes
+    """
+    return buildIndexes(indexPlan(gdb, plan, spatial), msg)
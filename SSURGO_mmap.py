@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO memory-mapped text tables
+Reads the pipe delimited SSURGO text files through a memory map instead of
+a Python file object, so a several hundred MB cointerp.txt or chorizon.txt
+is paged in by the operating system rather than copied into the process,
+and is read once however many times its records are visited.
+
+Record and field boundaries are found with numpy a block at a time: a pipe
+or newline only counts when an even number of quotes precedes it, which
+respects quoted pipes and embedded newlines (a doubled quote inside a
+quoted value toggles twice and changes nothing). ranges hands out the byte
+offsets of each field without copying, and splits divides a file into
+byte ranges that start and end on record boundaries, so records can be
+parsed by several workers, each mapping the file itself.
+
+rows yields the same lists of strings as csv.reader(delimiter='|',
+quotechar='"'), less blank lines, parsing a block of records at a time.
+Values are decoded as open() decoded the text files before, with the
+platform default encoding (cp1252 in ArcGIS Pro), and bytes it cannot
+decode raise UnicodeDecodeError unless another errors policy is given.
+It does not import arcpy.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import io
+import os
+import sys
+import csv
+import mmap
+import locale
+import numpy as np
+
+BLOCK = 1 << 24
+# csv field size limit, some memo fields are very large
+FIELDLIMIT = min(sys.maxsize, 2147483646)
+PIPE, QUOTE, LF, CR = 124, 34, 10, 13
+# encoding of the SSURGO text files and the codecs errors policy
+ENCODING = locale.getpreferredencoding(False)
+ERRORS = 'strict'
+
+
+class MappedTable:
+    """A memory-mapped SSURGO text file.
+
+    Parameters
+    ----------
+    path : str
+        Pipe delimited text file
+    encoding : str
+        Encoding of the values, the platform default if omitted
+    errors : str
+        codecs errors policy of the decoding, i.e. 'strict' or 'replace'
+    """
+
+    def __init__(self, path, encoding=ENCODING, errors=ERRORS):
+        self.path = path
+        self.encoding = encoding
+        self.errors = errors
+        self.size = os.path.getsize(path)
+        csv.field_size_limit(FIELDLIMIT)
+        self._f = open(path, 'rb')
+        # an empty file cannot be mapped
+        self.mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) \
+            if self.size else b''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self.size:
+            self.mm.close()
+        self._f.close()
+
+    def _quoted(self, offset):
+        """True if offset falls inside a quoted value."""
+        parity = 0
+        for a in range(0, offset, BLOCK):
+            b = min(a + BLOCK, offset)
+            arr = np.frombuffer(self.mm, np.uint8, b - a, a)
+            parity ^= int(np.count_nonzero(arr == QUOTE)) & 1
+        return bool(parity)
+
+    def _recordStart(self, offset):
+        """First record boundary at or after offset."""
+        if offset <= 0:
+            return 0
+        if offset >= self.size:
+            return self.size
+        # a newline just before offset makes offset a record start
+        inside = self._quoted(offset - 1)
+        for a in range(offset - 1, self.size, BLOCK):
+            b = min(a + BLOCK, self.size)
+            arr = np.frombuffer(self.mm, np.uint8, b - a, a)
+            q = np.cumsum(arr == QUOTE, dtype=np.uint8) & 1
+            if inside:
+                q ^= 1
+            hit = np.flatnonzero((arr == LF) & (q == 0))
+            if hit.size:
+                return a + int(hit[0]) + 1
+            inside = bool(q[-1])
+        return self.size
+
+    def splits(self, n):
+        """Byte ranges dividing the file into about n parts of whole
+        records.
+
+        Returns
+        -------
+        list
+            (start, end) byte offsets
+        """
+        cuts = sorted({self._recordStart(self.size * i // n)
+                       for i in range(n)} | {self.size})
+        return [(a, b) for a, b in zip(cuts[:-1], cuts[1:]) if b > a]
+
+    def _boundaries(self, start, end, fields=True):
+        """Offsets of the pipes and newlines outside quotes in start:end,
+        which must begin on a record boundary, block by block. The pipes
+        are left out unless fields."""
+        parity = 0
+        for a in range(start, end, BLOCK):
+            b = min(a + BLOCK, end)
+            arr = np.frombuffer(self.mm, np.uint8, b - a, a)
+            q = np.cumsum(arr == QUOTE, dtype=np.uint8) & 1
+            q ^= parity
+            outside = q == 0
+            pipes = np.flatnonzero((arr == PIPE) & outside) + a \
+                if fields else None
+            lines = np.flatnonzero((arr == LF) & outside) + a
+            parity = int(q[-1])
+            yield pipes, lines
+
+    def ranges(self, start=0, end=None):
+        """Byte offsets of the fields of each record, nothing is copied.
+
+        Parameters
+        ----------
+        start, end : int
+            Byte range on record boundaries, i.e. from splits, the whole
+            file if omitted
+
+        Yields
+        ------
+        list
+            (start, end) offsets of each field of a record, quotes
+            included. Blank lines are skipped.
+        """
+        end = self.size if end is None else end
+        recStart = start
+        pending = []
+        for pipes, lines in self._boundaries(start, end):
+            # pipes of each record, by the newline that ends it
+            idx = np.searchsorted(pipes, lines)
+            prev = 0
+            for line, i in zip(lines.tolist(), idx.tolist()):
+                cuts = pending + pipes[prev:i].tolist()
+                pending = []
+                prev = i
+                recEnd = line - 1 if line > recStart and \
+                    self.mm[line - 1] == CR else line
+                if recEnd > recStart or cuts:
+                    yield self._fields(recStart, recEnd, cuts)
+                recStart = line + 1
+            pending += pipes[prev:].tolist()
+        if recStart < end:
+            recEnd = end - 1 if self.mm[end - 1] == CR else end
+            if recEnd > recStart or pending:
+                yield self._fields(recStart, recEnd, pending)
+
+    @staticmethod
+    def _fields(recStart, recEnd, cuts):
+        bounds = [recStart - 1] + cuts + [recEnd]
+        return [(a + 1, b) for a, b in zip(bounds[:-1], bounds[1:])]
+
+    def value(self, start, end):
+        """Text of a field, quotes removed and doubled quotes undone."""
+        raw = self.mm[start:end]
+        if raw[:1] == b'"' and raw[-1:] == b'"' and len(raw) > 1:
+            raw = raw[1:-1].replace(b'""', b'"')
+        return raw.decode(self.encoding, self.errors)
+
+    def rows(self, start=0, end=None):
+        """Records as lists of strings, like csv.reader. The records of
+        each block are decoded together and parsed by csv, so no more than
+        about a block of text is held at a time."""
+        end = self.size if end is None else end
+        pos = start
+        for pipes, lines in self._boundaries(start, end, False):
+            cut = int(lines[-1]) + 1 if lines.size else pos
+            if cut > pos:
+                yield from self._parse(pos, cut)
+                pos = cut
+        if pos < end:
+            yield from self._parse(pos, end)
+
+    def _parse(self, start, end):
+        text = self.mm[start:end].decode(self.encoding, self.errors)
+        for row in csv.reader(io.StringIO(text, newline=''), delimiter='|',
+                              quotechar='"'):
+            if row:
+                yield row
+
+    def count(self, start=0, end=None):
+        """Number of records, blank lines excepted, without parsing."""
+        end = self.size if end is None else end
+        n = 0
+        recStart = start
+        for pipes, lines in self._boundaries(start, end, False):
+            if not lines.size:
+                continue
+            starts = np.empty_like(lines)
+            starts[0] = recStart
+            starts[1:] = lines[:-1] + 1
+            length = lines - starts
+            n += int(np.count_nonzero(length > 1))
+            # a line of one character is blank if it is a carriage return
+            n += sum(self.mm[a] != CR for a in starts[length == 1].tolist())
+            recStart = int(lines[-1]) + 1
+        if end - recStart > 1 or (end - recStart == 1
+                                  and self.mm[recStart] != CR):
+            n += 1
+        return n
+
+
+def readRows(path, encoding=ENCODING, errors=ERRORS):
+    """Records of a text file as lists of strings, in place of
+    csv.reader(open(path), delimiter='|', quotechar='"')."""
+    with MappedTable(path, encoding, errors) as table:
+        yield from table.rows()
+
+
+def _countJob(args):
+    path, start, end = args
+    with MappedTable(path) as table:
+        return table.count(start, end)
+
+
+def countRecords(path, nProc=1):
+    """Number of records of a text file, counted in nProc byte ranges."""
+    with MappedTable(path) as table:
+        if nProc <= 1 or table.size < BLOCK:
+            return table.count()
+        jobs = [(path, a, b) for a, b in table.splits(nProc)]
+    import multiprocessing as mp
+    with mp.Pool(min(nProc, len(jobs))) as pool:
+        return sum(pool.map(_countJob, jobs))
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO spatial ordering
+Space-filling curve keys for ordering surveys and features before they are
+appended to a geodatabase. Records appended in Hilbert (or Morton) order
+land near their spatial neighbors on disk, so a map extent or a QA query
+reads a few contiguous runs of the table instead of records scattered
+across it, and the spatial index grid cells fill evenly.
+
+Coordinates are scaled to a 2**bits grid over their extent and keyed with
+the curve. Ties are broken by input order, so the order is deterministic.
+It does not import arcpy.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import numpy as np
+
+
+def hilbertKeys(x, y, bits=16):
+    """Hilbert curve distance of integer grid coordinates.
+
+    Parameters
+    ----------
+    x, y : numpy.ndarray
+        Integer coordinates from 0 to 2**bits - 1
+    bits : int
+        Grid resolution, at most 32
+
+    Returns
+    -------
+    numpy.ndarray
+        uint64 curve distance of each coordinate
+    """
+    x = np.asarray(x, dtype=np.uint64).copy()
+    y = np.asarray(y, dtype=np.uint64).copy()
+    n1 = np.uint64((1 << bits) - 1)
+    d = np.zeros(x.shape, dtype=np.uint64)
+    s = 1 << (bits - 1)
+    while s > 0:
+        S = np.uint64(s)
+        rx = (x & S) > 0
+        ry = (y & S) > 0
+        d += S * S * ((3 * rx) ^ ry).astype(np.uint64)
+        # rotate the quadrant so the curve joins up
+        flip = ~ry & rx
+        x[flip] = n1 - x[flip]
+        y[flip] = n1 - y[flip]
+        swap = ~ry
+        x[swap], y[swap] = y[swap], x[swap].copy()
+        s >>= 1
+    return d
+
+
+def _spread(v):
+    """Spreads the low 32 bits of v to the even bits of a uint64."""
+    v = np.asarray(v, dtype=np.uint64) & np.uint64(0xFFFFFFFF)
+    for shift, mask in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF),
+                        (4, 0x0F0F0F0F0F0F0F0F), (2, 0x3333333333333333),
+                        (1, 0x5555555555555555)):
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+    return v
+
+
+def mortonKeys(x, y, bits=16):
+    """Morton (Z-order) key of integer grid coordinates, bits of x and y
+    interleaved. Cheaper than Hilbert but with jumps between quadrants."""
+    return _spread(x) | (_spread(y) << np.uint64(1))
+
+
+def curveKeys(xy, extent=None, bits=16, method='hilbert'):
+    """Curve keys of coordinates.
+
+    Parameters
+    ----------
+    xy : numpy.ndarray
+        (n, 2) coordinates
+    extent : tuple
+        (xmin, ymin, xmax, ymax) of the grid, the extent of xy if None
+    bits : int
+        Grid resolution per axis
+    method : str
+        'hilbert' or 'morton'
+
+    Returns
+    -------
+    numpy.ndarray
+        uint64 key per coordinate
+    """
+    xy = np.asarray(xy, dtype=np.float64).reshape((-1, 2))
+    if not xy.shape[0]:
+        return np.zeros(0, dtype=np.uint64)
+    # null geometries (NaN) key as the lower left corner
+    finite = np.isfinite(xy).all(axis=1)
+    if extent is None:
+        if not finite.any():
+            return np.zeros(xy.shape[0], dtype=np.uint64)
+        extent = (*xy[finite].min(axis=0), *xy[finite].max(axis=0))
+    xmin, ymin, xmax, ymax = extent
+    # one scale for both axes keeps the cells square
+    span = max(xmax - xmin, ymax - ymin) or 1.0
+    n = (1 << bits) - 1
+    g = np.zeros(xy.shape)
+    g[finite] = np.clip(np.rint((xy[finite] - (xmin, ymin)) / span * n), 0, n)
+    if method == 'morton':
+        return mortonKeys(g[:, 0], g[:, 1], bits)
+    return hilbertKeys(g[:, 0], g[:, 1], bits)
+
+
+def curveOrder(xy, extent=None, bits=16, method='hilbert'):
+    """Indices that put xy in curve order, stable for equal keys."""
+    return np.argsort(curveKeys(xy, extent, bits, method), kind='stable')
+
+
+def spatialOrder(boxes, bits=16, method='hilbert'):
+    """Orders surveys (or any keyed extents) by the curve key of the
+    center of their box.
+
+    Parameters
+    ----------
+    boxes : dict
+        key: (xmin, ymin, xmax, ymax), e.g. areasymbol: shapefile header
+        box. Empty boxes, all zero or not finite, go last.
+
+    Returns
+    -------
+    list
+        keys in curve order
+    """
+    keys = list(boxes)
+    b = np.array([boxes[k] for k in keys], dtype=np.float64).reshape((-1, 4))
+    valid = np.isfinite(b).all(axis=1) & b.any(axis=1)
+    if not valid.any():
+        return keys
+    extent = (*b[valid, :2].min(axis=0), *b[valid, 2:].max(axis=0))
+    centers = (b[valid, :2] + b[valid, 2:]) / 2
+    order = curveOrder(centers, extent, bits, method)
+    ordered = [k for k, v in zip(keys, valid) if v]
+    return [ordered[i] for i in order] + [k for k, v in zip(keys, valid)
+                                          if not v]
@@ -0,0 +1,241 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SSURGO spatial ordering benchmark
+Compares the append orders of SSURGO_order.py with the former orders,
+surveys sorted by the product of their center coordinates and a row sweep
+from the upper right as Sort "UR" gives.
+
+By default it runs without arcpy on a synthetic region of county sized
+surveys and reports, for random map windows, how many storage pages and
+contiguous runs of records each order has to read, and how many pages lie
+between the first and last record read (the span a reader seeks across).
+The features of a synthetic survey are listed map sheet by map sheet, so
+they are clustered within the survey as digitized surveys are, but not in
+curve order. The survey order shows mostly in the span, of windows that
+straddle surveys.
+
+    python SSURGO_order_benchmark.py --surveys 400 --features 2000
+
+With --gdb it copies a feature class (e.g. the MUPOLYGON of a regional
+transactional FGDB) into a scratch FGDB once per order, adds a spatial
+index and times the same random window queries in arcpy. The spatial
+filter of arcpy.da.SearchCursor needs ArcGIS Pro 3.2 or later.
+
+    python SSURGO_order_benchmark.py --gdb C:/RTSD/RTSD_R11.gdb/FD_RTSD/MUPOLYGON
+        --scratch C:/temp
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+from SSURGO_order import spatialOrder, curveOrder
+
+orders = ('listed', 'product', 'UR', 'hilbert', 'hilbert+features')
+
+
+def orderRecords(ssa, xy, method):
+    """Record order of one method.
+
+    Parameters
+    ----------
+    ssa : numpy.ndarray
+        Survey of each record, records of a survey together as they are in
+        the downloads
+    xy : numpy.ndarray
+        (n, 2) centroid of each record
+    method : str
+        One of orders
+
+    Returns
+    -------
+    numpy.ndarray
+        Record indices in storage order
+    """
+    surveys, first = np.unique(ssa, return_index=True)
+    listed = surveys[np.argsort(first)]
+    if method == 'listed':
+        return np.arange(ssa.size)
+    if method == 'UR':
+        # north to south, then east to west
+        return np.lexsort((-xy[:, 0], -xy[:, 1]))
+    boxes = {
+        s: (*xy[ssa == s].min(axis=0), *xy[ssa == s].max(axis=0))
+        for s in listed
+    }
+    if method == 'product':
+        seq = sorted(listed, key=lambda s: ((boxes[s][0] + boxes[s][2]) / 2)
+                     * ((boxes[s][1] + boxes[s][3]) / 2))
+    else:
+        seq = spatialOrder(boxes)
+    idx = []
+    for s in seq:
+        i = np.where(ssa == s)[0]
+        if method == 'hilbert+features':
+            i = i[curveOrder(xy[i])]
+        idx.append(i)
+    return np.concatenate(idx)
+
+
+def region(nSurveys, nFeatures, seed, sheets=4):
+    """Synthetic region: a grid of surveys listed in random order, as
+    areasymbols are. Each survey is split into sheets x sheets map sheets
+    listed in random order, with the features of a sheet together at random
+    centroids within it."""
+    rng = np.random.default_rng(seed)
+    C = max(int(np.sqrt(nSurveys)), 1)
+    R = -(-nSurveys // C)
+    cells = rng.permutation(R * C)[:nSurveys]
+    ssa, xy = [], []
+    size = 40000.0      # county width in meters
+    w = size / sheets   # map sheet width
+    k = sheets * sheets
+    for s, c in enumerate(cells):
+        x0, y0 = (c % C) * size, (c // C) * size
+        n = int(rng.integers(nFeatures // 2, nFeatures * 3 // 2))
+        for sheet, m in zip(rng.permutation(k),
+                            rng.multinomial(n, np.full(k, 1 / k))):
+            sx, sy = x0 + (sheet % sheets) * w, y0 + (sheet // sheets) * w
+            xy.append(rng.uniform((sx, sy), (sx + w, sy + w), (m, 2)))
+        ssa.append(np.full(n, s))
+    return np.concatenate(ssa), np.concatenate(xy)
+
+
+def windows(xy, nQueries, frac, seed):
+    """Random square windows covering frac of the region width."""
+    rng = np.random.default_rng(seed + 1)
+    lo, hi = xy.min(axis=0), xy.max(axis=0)
+    w = (hi - lo).max() * frac
+    ll = rng.uniform(lo, hi - w, (nQueries, 2))
+    return np.hstack((ll, ll + w))
+
+
+def locality(xy, order, wins, page):
+    """Mean pages, contiguous runs and pages spanned per window query."""
+    pos = np.empty(order.size, dtype=np.int64)
+    pos[order] = np.arange(order.size)
+    pages, runs, spans = [], [], []
+    for x0, y0, x1, y1 in wins:
+        hit = np.sort(pos[(xy[:, 0] >= x0) & (xy[:, 0] <= x1)
+                          & (xy[:, 1] >= y0) & (xy[:, 1] <= y1)])
+        pages.append(np.unique(hit // page).size)
+        runs.append(int((np.diff(hit) > 1).sum()) + 1 if hit.size else 0)
+        spans.append(int(hit[-1] // page - hit[0] // page) + 1
+                     if hit.size else 0)
+    return float(np.mean(pages)), float(np.mean(runs)), float(np.mean(spans))
+
+
+def gdbBenchmark(fc, scratch, wins, repeat):
+    """Copies fc in each order into a scratch FGDB and times window
+    queries that read every geometry.
+
+    Returns
+    -------
+    dict
+        order: seconds for all queries, best of repeat
+    """
+    import arcpy
+
+    arcpy.env.overwriteOutput = True
+    gdb = os.path.join(scratch, 'order_benchmark.gdb')
+    if not arcpy.Exists(gdb):
+        arcpy.CreateFileGDB_management(scratch, 'order_benchmark.gdb')
+    desc = arcpy.da.Describe(fc)
+    sr = desc['spatialReference']
+    fld_l = [fld.name for fld in desc['fields']
+             if fld.type not in ('OID', 'Geometry')
+             and fld.name.upper() not in ('SHAPE_LENGTH', 'SHAPE_AREA')]
+    with arcpy.da.SearchCursor(
+            fc, ['AREASYMBOL', 'SHAPE@XY', 'SHAPE@'] + fld_l) as sCur:
+        rows = [row for row in sCur]
+    ssa = np.array([row[0] for row in rows])
+    xy = np.array([row[1] if row[1][0] is not None else (np.nan, np.nan)
+                   for row in rows], dtype=np.float64)
+
+    times = {}
+    for method in orders:
+        name = 'bench_' + method.replace('+', '_')
+        out = os.path.join(gdb, name)
+        arcpy.CreateFeatureclass_management(
+            gdb, name, desc['shapeType'].upper(), fc, spatial_reference=sr
+        )
+        with arcpy.da.InsertCursor(out, ['SHAPE@'] + fld_l) as iCur:
+            for i in orderRecords(ssa, xy, method):
+                iCur.insertRow(rows[i][2:])
+        arcpy.management.AddSpatialIndex(out)
+
+        best = np.inf
+        for r in range(repeat):
+            t = time.perf_counter()
+            for x0, y0, x1, y1 in wins:
+                ext = arcpy.Extent(x0, y0, x1, y1, spatial_reference=sr)
+                with arcpy.da.SearchCursor(
+                        out, ['OID@', 'SHAPE@'], spatial_filter=ext.polygon
+                    ) as sCur:
+                    for row in sCur:
+                        pass
+            best = min(best, time.perf_counter() - t)
+        times[method] = best
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--surveys', type=int, default=400)
+    parser.add_argument('--features', type=int, default=2000,
+                        help='mean features per survey')
+    parser.add_argument('--sheets', type=int, default=4,
+                        help='map sheets across a synthetic survey')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--window', type=float, default=0.02,
+                        help='window width as a fraction of the region')
+    parser.add_argument('--page', type=int, default=64,
+                        help='records per storage page')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--gdb', default=None,
+                        help='feature class to benchmark in arcpy')
+    parser.add_argument('--scratch', default=None,
+                        help='folder for the scratch FGDB of --gdb')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.gdb:
+        import arcpy
+        ext = arcpy.Describe(args.gdb).extent
+        corners = np.array([[ext.XMin, ext.YMin], [ext.XMax, ext.YMax]])
+        wins = windows(corners, args.queries, args.window, args.seed)
+        scratch = args.scratch or os.path.dirname(os.path.abspath(__file__))
+        times = gdbBenchmark(args.gdb, scratch, wins, args.repeat)
+        print(f"{'order':<18}{'sec':>9}{'ms/query':>10}")
+        for method, sec in times.items():
+            print(f"{method:<18}{sec:>9.3f}{sec / args.queries * 1000:>10.2f}")
+        return 0
+
+    ssa, xy = region(args.surveys, args.features, args.seed, args.sheets)
+    wins = windows(xy, args.queries, args.window, args.seed)
+    print(f"{ssa.size} features in {args.surveys} surveys, "
+          f"{args.queries} windows, {args.page} records per page")
+    print(f"{'order':<18}{'pages/query':>12}{'runs/query':>12}"
+          f"{'span/query':>12}{'sec':>8}")
+    for method in orders:
+        t = time.perf_counter()
+        order = orderRecords(ssa, xy, method)
+        t = time.perf_counter() - t
+        pages, runs, span = locality(xy, order, wins, args.page)
+        print(f"{method:<18}{pages:>12.1f}{runs:>12.1f}{span:>12.1f}"
+              f"{t:>8.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO tabular pre-flight
+Checks the pipe delimited text files of SSURGO surveys against the schema
+catalog (SSURGO_catalog.py) before anything is written, so a survey with a
+malformed file is rejected whole instead of half loaded. Surveys are
+checked in parallel, one per process.
+
+For every table it counts the records and the records with the wrong
+number of columns, the numeric values that do not parse and the strings
+longer than their field, which the importers truncate. The record counts
+of a report stand in for the importers' own count of each file.
+
+Files are read through a memory map (SSURGO_mmap.py). A table larger than
+SPLITSIZE is checked in byte ranges of whole records by several processes
+when a single survey is checked. It does not import arcpy.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import os
+import csv
+
+from SSURGO_mmap import MappedTable
+
+integerTypes = ('Integer', 'SmallInteger', 'BigInteger')
+floatTypes = ('Double', 'Single')
+# issues listed per table, the rest are only counted
+MAXISSUES = 5
+# tables split across processes, in bytes
+SPLITSIZE = 1 << 26
+
+
+def checkTable(txtPath, columns, start=0, end=None, first=1):
+    """Checks one text file against the columns of its table.
+
+    Parameters
+    ----------
+    txtPath : str
+        Pipe delimited text file
+    columns : list
+        [name, type, length] of the table's fields, as in the catalog
+    start, end : int
+        Byte range of whole records to check, the whole file if omitted
+    first : int
+        Record number of the first record of the range
+
+    Returns
+    -------
+    dict
+        'rows', 'badRows' (wrong number of columns), 'notNumeric',
+        'truncated' and 'issues', descriptions of the first few
+    """
+    n = len(columns)
+    checks = []
+    for i, (name, fldType, length) in enumerate(columns):
+        if fldType in integerTypes:
+            checks.append((i, name, int, 0))
+        elif fldType in floatTypes:
+            checks.append((i, name, float, 0))
+        elif fldType == 'String' and length:
+            checks.append((i, name, None, length))
+
+    report = {'rows': 0, 'badRows': 0, 'notNumeric': 0, 'truncated': 0,
+              'issues': []}
+    issues = report['issues']
+    try:
+        with MappedTable(txtPath) as txtTable:
+            for line, row in enumerate(txtTable.rows(start, end), first):
+                report['rows'] += 1
+                if len(row) != n:
+                    report['badRows'] += 1
+                    if len(issues) < MAXISSUES:
+                        issues.append(f"record {line}: {len(row)} columns, "
+                                      f"{n} expected")
+                    continue
+                for i, name, parse, length in checks:
+                    value = row[i]
+                    if value == '':
+                        continue
+                    if parse:
+                        try:
+                            parse(value)
+                        except ValueError:
+                            report['notNumeric'] += 1
+                            if len(issues) < MAXISSUES:
+                                issues.append(f"record {line}: {name} "
+                                              f"'{value[:20]}' is not numeric")
+                    elif len(value) > length:
+                        report['truncated'] += 1
+                        if len(issues) < MAXISSUES:
+                            issues.append(f"record {line}: {name} is "
+                                          f"{len(value)} characters, "
+                                          f"truncated to {length}")
+    except (csv.Error, UnicodeDecodeError) as e:
+        report['badRows'] += 1
+        issues.append(f"record {first + report['rows']}: {e}")
+    return report
+
+
+def _tableJob(args):
+    return checkTable(*args)
+
+
+def checkSplit(txtPath, columns, pool, n):
+    """Checks one text file in n byte ranges of whole records on a pool.
+
+    Returns
+    -------
+    dict
+        checkTable report of the whole file
+    """
+    jobs = []
+    first = 1
+    with MappedTable(txtPath) as txtTable:
+        for start, end in txtTable.splits(n):
+            jobs.append((txtPath, columns, start, end, first))
+            first += txtTable.count(start, end)
+    report = {'rows': 0, 'badRows': 0, 'notNumeric': 0, 'truncated': 0,
+              'issues': []}
+    for part in pool.map(_tableJob, jobs):
+        for k in ('rows', 'badRows', 'notNumeric', 'truncated'):
+            report[k] += part[k]
+        report['issues'].extend(
+            part['issues'][:max(MAXISSUES - len(report['issues']), 0)]
+        )
+    return report
+
+
+def checkSurvey(tabularFolder, catalog, files=None, skip=('month',),
+                tables=None, nProc=1):
+    """Checks the text files of one survey.
+
+    Parameters
+    ----------
+    tabularFolder : str
+        Tabular folder of the survey
+    catalog : dict
+        SSURGO schema catalog
+    files : dict
+        table: text file, for files outside the tabular folder, i.e.
+        {'featdesc': spatial/soilsf_t_wi025.txt}
+    skip : tuple
+        iefilenames the importers do not import
+    tables : list
+        Tables to check, every table of the catalog if None
+    nProc : int
+        Number of processes checking a table larger than SPLITSIZE
+
+    Returns
+    -------
+    dict
+        'folder', 'tables': table: checkTable report, 'missing': tables
+        without a text file, 'ok': False if any record has the wrong number
+        of columns or a numeric value that does not parse
+    """
+    files = files or dict()
+    report = {'folder': tabularFolder, 'tables': dict(), 'missing': [],
+              'ok': True}
+    pool = None
+    for tab, tbl in catalog['tables'].items():
+        if tbl['iefilename'] in skip or (tables and tab not in tables):
+            continue
+        txtPath = files.get(
+            tab, os.path.join(tabularFolder, tbl['iefilename'] + ".txt")
+        )
+        if not os.path.exists(txtPath):
+            report['missing'].append(tab)
+            continue
+        if nProc > 1 and os.path.getsize(txtPath) > SPLITSIZE:
+            if pool is None:
+                import multiprocessing as mp
+                pool = mp.Pool(nProc)
+            tabReport = checkSplit(txtPath, tbl['columns'], pool, nProc)
+        else:
+            tabReport = checkTable(txtPath, tbl['columns'])
+        report['tables'][tab] = tabReport
+        if tabReport['badRows'] or tabReport['notNumeric']:
+            report['ok'] = False
+    if pool is not None:
+        pool.close()
+        pool.join()
+    return report
+
+
+def _checkJob(args):
+    key, tabularFolder, catalog, files = args
+    return key, checkSurvey(tabularFolder, catalog, files)
+
+
+def checkSurveys(surveys, catalog, nProc=1):
+    """Checks surveys, nProc at a time.
+
+    Parameters
+    ----------
+    surveys : dict
+        key, i.e. areasymbol: (tabular folder, files as in checkSurvey)
+    catalog : dict
+        SSURGO schema catalog
+    nProc : int
+        Number of processes, the surveys are checked in parallel or the
+        large tables of a single survey in byte ranges. Tool scripts
+        running in ArcGIS Pro must set the multiprocessing executable
+        first.
+
+    Returns
+    -------
+    dict
+        key: checkSurvey report
+    """
+    args = [(key, folder, catalog, files)
+            for key, (folder, files) in surveys.items()]
+    if len(args) == 1:
+        key, folder, catalog, files = args[0]
+        return {key: checkSurvey(folder, catalog, files, nProc=nProc)}
+    if nProc > 1 and len(args) > 1:
+        import multiprocessing as mp
+        with mp.Pool(min(nProc, len(args))) as pool:
+            return dict(pool.imap_unordered(_checkJob, args))
+    return dict(map(_checkJob, args))
+
+
+def summary(report):
+    """Lines describing the problems of a survey report."""
+    lines = []
+    for tab, tabReport in sorted(report['tables'].items()):
+        counts = [
+            f"{tabReport[k]} {label}" for k, label in
+            (('badRows', 'malformed records'),
+             ('notNumeric', 'non-numeric values'),
+             ('truncated', 'values to truncate'))
+            if tabReport[k]
+        ]
+        if counts:
+            lines.append(f"{tab}: {', '.join(counts)}")
+            lines.extend("\t" + issue for issue in tabReport['issues'])
+    return lines
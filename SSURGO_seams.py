@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO seams
+In-process survey boundary analysis for the edge match QA tools. Survey
+boundaries are found as the soil polygon edges used only once within a
+survey, coordinates are quantized to the xy resolution so edges and
+vertices can be compared exactly, and nodes are matched across survey
+seams with a KD-tree instead of a chain of in_memory geoprocessing.
+
+It does not import arcpy; the calling tools read SHAPE@WKB with arcpy.da
+cursors and hand the bytes over.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from SSURGO_geometry import wkbParts, quantize
+
+
+def uniqueRows(a):
+    """np.unique(a, axis=0) for integer arrays, with index, inverse and
+    counts. Sorting the columns with lexsort is much faster than the void
+    view np.unique falls back to.
+
+    Returns
+    -------
+    tuple
+        unique rows, index of first occurrence, inverse, counts
+    """
+    if not a.shape[0]:
+        e = np.zeros(0, np.int64)
+        return a, e, e, e
+    order = np.lexsort(a.T[::-1])
+    s = a[order]
+    new = np.ones(s.shape[0], bool)
+    new[1:] = (s[1:] != s[:-1]).any(axis=1)
+    grp = np.cumsum(new) - 1
+    inv = np.empty(a.shape[0], np.int64)
+    inv[order] = grp
+    starts = np.flatnonzero(new)
+    cnt = np.diff(np.append(starts, s.shape[0]))
+    return s[starts], order[starts], inv, cnt
+
+
+def polygonEdges(polys, res):
+    """Quantized edges of a set of polygons.
+
+    Parameters
+    ----------
+    polys : iterable
+        (polygon id, WKB) pairs
+    res : float
+        xy resolution
+
+    Returns
+    -------
+    tuple
+        edges: (m, 4) int64 array x1, y1, x2, y2 with the lesser vertex
+            first, zero length edges dropped
+        pids: (m,) polygon id of each edge
+    """
+    rings = []
+    rpid = []
+    for pid, wkb in polys:
+        for part in wkbParts(wkb):
+            rings.extend(part)
+            rpid.extend([pid] * len(part))
+    if not rings:
+        return np.zeros((0, 4), np.int64), np.zeros(0, np.int64)
+    n = np.array([r.shape[0] for r in rings])
+    q = quantize(np.concatenate(rings), res)
+    pids = np.repeat(np.array(rpid, dtype=np.int64), n)[:-1]
+    edges = np.concatenate((q[:-1], q[1:]), axis=1)
+    # drop the edges joining one ring to the next and zero length edges
+    keep = (edges[:, :2] != edges[:, 2:]).any(axis=1)
+    keep[np.cumsum(n)[:-1] - 1] = False
+    edges, pids = edges[keep], pids[keep]
+    # orient each edge lesser vertex first so shared edges compare equal
+    swap = ((edges[:, 0] > edges[:, 2])
+            | ((edges[:, 0] == edges[:, 2]) & (edges[:, 1] > edges[:, 3])))
+    edges[swap] = edges[swap][:, [2, 3, 0, 1]]
+    return edges, pids
+
+
+def boundaryEdges(edges, pids):
+    """Edges used only once, the outer boundary of the polygon set."""
+    if not edges.shape[0]:
+        return edges, pids
+    uniq, first, inv, cnt = uniqueRows(edges)
+    once = first[cnt == 1]
+    return edges[once], pids[once]
+
+
+def boundaryNodes(bEdges, bPids):
+    """Boundary vertices where the edges of two or more polygons meet,
+    the nodes BCore finds with PolygonToLine and PairwiseDissolve.
+
+    Returns
+    -------
+    numpy.ndarray
+        (k, 2) quantized node coordinates
+    """
+    if not bEdges.shape[0]:
+        return np.zeros((0, 2), np.int64)
+    pts = np.concatenate((bEdges[:, :2], bEdges[:, 2:]))
+    p = np.concatenate((bPids, bPids))
+    xyp = uniqueRows(np.column_stack((pts, p)))[0]
+    xy, first, inv, cnt = uniqueRows(xyp[:, :2])
+    return xy[cnt > 1]
+
+
+def surveySeams(saPolys, res, targets):
+    """Seams between survey areas from SAPOLYGON, targets and neighbors.
+
+    Parameters
+    ----------
+    saPolys : iterable
+        (survey code, WKB) pairs, codes are non-negative integers
+    res : float
+        xy resolution
+    targets : set
+        Codes of the surveys being checked
+
+    Returns
+    -------
+    tuple
+        segs: (k, 2, 2) float seam segments adjoining a target survey
+        junctions: (j, 2) float points where seams meet each other or the
+            outer boundary
+        neighbors: set of non-target codes sharing a seam with a target
+    """
+    edges, codes = polygonEdges(saPolys, res)
+    if not edges.shape[0]:
+        return np.zeros((0, 2, 2)), np.zeros((0, 2)), set()
+    uniq, first, inv, cnt = uniqueRows(edges)
+    lo = np.full(uniq.shape[0], codes.max() + 1, dtype=np.int64)
+    hi = np.full(uniq.shape[0], -1, dtype=np.int64)
+    np.minimum.at(lo, inv, codes)
+    np.maximum.at(hi, inv, codes)
+    # edges used twice by one survey are internal to a multipart survey
+    inner = (lo == hi) & (cnt > 1)
+    uniq, lo, hi = uniq[~inner], lo[~inner], hi[~inner]
+    hi[lo == hi] = -1       # outer boundary
+    tgt = np.array(sorted(targets), dtype=np.int64)
+    seam = (hi != -1) & (np.isin(lo, tgt) | np.isin(hi, tgt))
+    neighbors = (set(lo[seam].tolist()) | set(hi[seam].tolist())) - targets
+
+    # junctions, vertices with edges of more than one label
+    label = lo * (codes.max() + 2) + hi + 1
+    pts = np.concatenate((uniq[:, :2], uniq[:, 2:]))
+    lab = np.concatenate((label, label))
+    xyl = uniqueRows(np.column_stack((pts, lab)))[0]
+    xy, first, inv, cnt = uniqueRows(xyl[:, :2])
+    junctions = xy[cnt > 1]
+    seamPts = np.concatenate((uniq[seam, :2], uniq[seam, 2:]))
+    # only junctions on a seam of interest
+    both = uniqueRows(np.concatenate((junctions, uniqueRows(seamPts)[0])))
+    junctions = both[0][both[3] > 1]
+    segs = uniq[seam].reshape((-1, 2, 2)) * res
+    return segs, junctions * res, neighbors
+
+
+def segmentPairs(points, segs, tol):
+    """Point, segment pairs within tol of each other.
+
+    Long segments are split so a KD-tree of segment midpoints can find
+    the candidates, then exact point to segment distances are computed
+    for those candidate pairs only.
+
+    Returns
+    -------
+    tuple
+        point index, segment index, arrays of equal length
+    """
+    e = np.zeros(0, np.int64)
+    if not (points.shape[0] and segs.shape[0]):
+        return e, e
+    a, b = segs[:, 0, :], segs[:, 1, :]
+    idx = np.arange(segs.shape[0])
+    length = np.hypot(*(b - a).T)
+    step = max(float(np.median(length)) * 4, tol * 10)
+    k = np.maximum(np.ceil(length / step), 1).astype(np.int64)
+    if (k > 1).any():
+        idx = np.repeat(idx, k)
+        j = np.arange(idx.size) - np.repeat(np.cumsum(k) - k, k)
+        t0 = (j / k[idx])[:, None]
+        t1 = ((j + 1) / k[idx])[:, None]
+        d = b[idx] - a[idx]
+        a, b = a[idx] + d * t0, a[idx] + d * t1
+    mid = (a + b) / 2
+    half = float(np.hypot(*(b - a).T).max()) / 2
+    pairs = cKDTree(points).sparse_distance_matrix(
+        cKDTree(mid), half + tol, output_type='ndarray'
+    )
+    if not pairs.size:
+        return e, e
+    i, s = pairs['i'], pairs['j']
+    ab = b[s] - a[s]
+    ap = points[i] - a[s]
+    denom = np.einsum('ij,ij->i', ab, ab)
+    t = np.clip(np.einsum('ij,ij->i', ap, ab) / np.where(denom, denom, 1),
+                0, 1)
+    dist = np.hypot(*(ap - ab * t[:, None]).T)
+    # a point can pair with more than one piece of a split segment
+    ps = uniqueRows(np.column_stack((i, idx[s]))[dist <= tol])[0]
+    return ps[:, 0], ps[:, 1]
+
+
+def nearSegments(points, segs, tol):
+    """Flags points within tol of any segment."""
+    near = np.zeros(points.shape[0], bool)
+    i, s = segmentPairs(points, segs, tol)
+    near[i] = True
+    return near
+
+
+def unmatched(points, codes, tol):
+    """Points with no point of a different code within tol.
+
+    One KD-tree query_pairs call finds every pair within tol, pairs within
+    the same survey are ignored.
+    """
+    if not points.shape[0]:
+        return np.zeros(0, bool)
+    pairs = cKDTree(points).query_pairs(tol, output_type='ndarray')
+    matched = np.zeros(points.shape[0], bool)
+    if pairs.size:
+        cross = pairs[codes[pairs[:, 0]] != codes[pairs[:, 1]]]
+        matched[cross.ravel()] = True
+    return ~matched
+
+
+def seamErrors(soilPolys, seams, targets, res, tol, reach=None):
+    """Edge match errors: boundary nodes along a seam without a node of the
+    adjoining survey within tol.
+
+    Parameters
+    ----------
+    soilPolys : dict
+        survey code: list of (polygon id, WKB), for the targets and
+        the neighbors
+    seams : tuple
+        segs, junctions, neighbors as returned by surveySeams
+    targets : set
+        Codes of the surveys being checked
+    res : float
+        xy resolution used to quantize coordinates
+    tol : float
+        Distance within which two nodes are considered a match
+    reach : float
+        Distance from the SAPOLYGON seam within which a soil node is
+        considered on the seam, defaults to tol
+
+    Returns
+    -------
+    tuple
+        xy: (e, 2) error locations
+        codes: (e,) survey code of each error
+        stats: dict of counts per step
+    """
+    reach = tol if reach is None else reach
+    segs, junctions, neighbors = seams
+    nodes = []
+    codes = []
+    for code in targets | neighbors:
+        polys = soilPolys.get(code)
+        if not polys:
+            continue
+        e, p = polygonEdges(polys, res)
+        n = boundaryNodes(*boundaryEdges(e, p))
+        nodes.append(n * res)
+        codes.append(np.full(n.shape[0], code, dtype=np.int64))
+    stats = {'seams': segs.shape[0], 'junctions': junctions.shape[0],
+             'neighbors': len(neighbors)}
+    if not nodes:
+        stats.update(nodes=0, seamNodes=0, errors=0)
+        return np.zeros((0, 2)), np.zeros(0, np.int64), stats
+    nodes = np.concatenate(nodes)
+    codes = np.concatenate(codes)
+    keep = nearSegments(nodes, segs, reach)
+    if junctions.shape[0]:
+        keep &= ~nearSegments(
+            nodes, np.stack((junctions, junctions), axis=1), reach
+        )
+    sNodes, sCodes = nodes[keep], codes[keep]
+    bad = unmatched(sNodes, sCodes, tol)
+    stats.update(nodes=nodes.shape[0], seamNodes=sNodes.shape[0],
+                 errors=int(bad.sum()))
+    return sNodes[bad], sCodes[bad], stats
+
+
+def crackEdges(edges, codes, points, pcodes):
+    """Splits edges at the points of another survey lying on them, so
+    a seam vertex present on only one side still yields matching edges.
+
+    Parameters
+    ----------
+    edges : numpy.ndarray
+        (m, 4) quantized edges, lesser vertex first
+    codes : numpy.ndarray
+        (m,) survey code of each edge
+    points : numpy.ndarray
+        (k, 2) quantized points
+    pcodes : numpy.ndarray
+        (k,) survey code of each point
+
+    Returns
+    -------
+    tuple
+        edges, codes with the split edges replaced by their pieces, and
+        the number of edges split
+    """
+    segs = edges.reshape((-1, 2, 2)).astype(np.float64)
+    i, s = segmentPairs(points.astype(np.float64), segs, 0.5)
+    other = pcodes[i] != codes[s]
+    i, s = i[other], s[other]
+    if not i.size:
+        return edges, codes, 0
+    # position of each point along its edge, the edge's ends at 0 and 1
+    a = segs[s, 0]
+    ab = segs[s, 1] - a
+    t = (np.einsum('ij,ij->i', points[i] - a, ab)
+         / np.einsum('ij,ij->i', ab, ab))
+    cut = np.unique(s)
+    sAll = np.concatenate((s, cut, cut))
+    tAll = np.concatenate((t, np.zeros(cut.size), np.ones(cut.size)))
+    xy = np.concatenate((points[i], edges[cut, :2], edges[cut, 2:]))
+    order = np.lexsort((tAll, sAll))
+    sAll, xy = sAll[order], xy[order]
+    link = sAll[1:] == sAll[:-1]
+    pieces = np.concatenate((xy[:-1], xy[1:]), axis=1)[link]
+    pS = sAll[:-1][link]
+    nz = (pieces[:, :2] != pieces[:, 2:]).any(axis=1)
+    pieces, pS = pieces[nz], pS[nz]
+    swap = ((pieces[:, 0] > pieces[:, 2])
+            | ((pieces[:, 0] == pieces[:, 2]) & (pieces[:, 1] > pieces[:, 3])))
+    pieces[swap] = pieces[swap][:, [2, 3, 0, 1]]
+    keep = ~np.isin(np.arange(edges.shape[0]), cut)
+    return (np.concatenate((edges[keep], pieces)),
+            np.concatenate((codes[keep], codes[pS])), cut.size)
+
+
+def danglingNodes(soilPolys, res):
+    """Survey join errors without a dissolve: the boundary of each survey
+    is the set of its polygon edges used only once, the seams are the
+    boundary edges shared by two surveys (a hash join on quantized edges).
+    With the seams removed, a soil line that ends at a seam without a
+    line continuing from the adjoining survey leaves a dangling vertex.
+
+    Parameters
+    ----------
+    soilPolys : dict
+        survey code: list of (polygon id, WKB)
+    res : float
+        xy resolution used to quantize coordinates
+
+    Returns
+    -------
+    tuple
+        xy: (e, 2) dangling vertices
+        codes: (e,) survey code of each dangle
+        stats: dict of counts per step
+    """
+    edges, codes, bnd = [], [], []
+    for code, polys in soilPolys.items():
+        e, p = polygonEdges(polys, res)
+        uniq, first, inv, cnt = uniqueRows(e)
+        edges.append(uniq)
+        codes.append(np.full(uniq.shape[0], code, dtype=np.int64))
+        bnd.append(cnt == 1)
+    stats = dict.fromkeys(('edges', 'boundary', 'cracked', 'seams',
+                           'dangles'), 0)
+    if not edges:
+        return np.zeros((0, 2)), np.zeros(0, np.int64), stats
+    edges = np.concatenate(edges)
+    codes = np.concatenate(codes)
+    bnd = np.concatenate(bnd)
+    bE, bC = edges[bnd], codes[bnd]
+
+    # boundary vertices of one survey that are not vertices of another
+    pts = np.concatenate((bE[:, :2], bE[:, 2:]))
+    xyc = uniqueRows(np.column_stack((pts, np.concatenate((bC, bC)))))[0]
+    xy, first, inv, cnt = uniqueRows(xyc[:, :2])
+    lone = xyc[cnt[inv] == 1]
+    bE, bC, cracked = crackEdges(bE, bC, lone[:, :2], lone[:, 2])
+
+    # seams, boundary edges of two surveys
+    uniq, first, inv, cnt = uniqueRows(bE)
+    rest = np.concatenate((edges[~bnd], uniq[cnt == 1]))
+    rCodes = np.concatenate((codes[~bnd], bC[first[cnt == 1]]))
+    rest, first = uniqueRows(rest)[:2]
+    rCodes = rCodes[first]
+    pts = np.concatenate((rest[:, :2], rest[:, 2:]))
+    xy, first, inv, deg = uniqueRows(pts)
+    dangle = deg == 1
+    stats.update(edges=edges.shape[0], boundary=int(bnd.sum()),
+                 cracked=cracked, seams=int((cnt > 1).sum()),
+                 dangles=int(dangle.sum()))
+    pc = np.concatenate((rCodes, rCodes))
+    return xy[dangle] * res, pc[first[dangle]], stats
@@ -0,0 +1,491 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO shapefile helpers
+Reads what the QA tools need from shapefiles straight from the binary
+files: record offsets from the .shx index, part and point counts from the
+.shp record headers (coordinates are never read) and single columns of the
+.dbf. Files are memory mapped so only the bytes touched are read. Text is
+decoded with the code page of the .cpg, as ShapeWriter writes it, or the
+platform default without one.
+
+shapefileInfo returns shape type, bounding box and record count from the
+.shp and .dbf headers alone. The headers of every shapefile in a folder are
+read together on the first request and cached, so validating a survey's
+spatial folder costs one directory scan instead of a Describe or GetCount
+per shapefile.
+
+ShapeWriter streams features of the SSURGO export schemas (_a, _b, _c, _d,
+_l, _p) to .shp/.shx/.dbf/.prj/.cpg in one pass, tallying the feature
+count, extent, blank attribute values and the schema as it goes so the
+output need not be opened again to be checked. It does not import arcpy.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import os
+import codecs
+import struct
+import datetime
+import numpy as np
+
+from SSURGO_geometry import wkbParts, wkbPaths
+from SSURGO_mmap import ENCODING, ERRORS
+
+# shapefile shape types
+shpNull = 0
+shpPoint = 1
+shpPolyline = 3
+shpPolygon = 5
+shpMultipoint = 8
+shapeTypes = {'Point': shpPoint, 'Multipoint': shpMultipoint,
+              'Polyline': shpPolyline, 'Line': shpPolyline,
+              'Polygon': shpPolygon}
+
+# ESRI well-known text of GCS_WGS_1984, the SSURGO export coordinates
+WGS84_PRJ = (
+    'GEOGCS["GCS_WGS_1984",DATUM["D_WGS_1984",'
+    'SPHEROID["WGS_1984",6378137.0,298.257223563]],'
+    'PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]]'
+)
+
+# files of a shapefile ShapeWriter does not write, i.e. spatial and attribute
+# indexes and metadata of an earlier export, stale once it is rewritten
+SIDECARS = ('.sbn', '.sbx', '.qix', '.fbn', '.fbx', '.ain', '.aih', '.atx',
+            '.shp.xml')
+
+
+def shxRecords(shx):
+    """Byte offsets and content lengths of each .shp record from the .shx
+    index, both converted from 16-bit words to bytes."""
+    idx = np.fromfile(shx, dtype='>i4', offset=100).reshape((-1, 2))
+    return idx[:, 0].astype(np.int64) * 2, idx[:, 1].astype(np.int64) * 2
+
+
+def recordCount(shp):
+    """Number of records, from the size of the .shx index."""
+    shx = os.path.splitext(shp)[0] + '.shx'
+    return (os.path.getsize(shx) - 100) // 8
+
+
+def shpHeader(shp):
+    """Shape type and bounding box from the 100 byte .shp main header.
+
+    Returns
+    -------
+    tuple
+        shape type, (xmin, ymin, xmax, ymax)
+    """
+    with open(shp, 'rb') as f:
+        head = f.read(100)
+    if len(head) < 100 or struct.unpack('>i', head[:4])[0] != 9994:
+        raise ValueError(f"{shp} is not a shapefile")
+    shapeType, = struct.unpack('<i', head[32:36])
+    return shapeType, struct.unpack('<4d', head[36:68])
+
+
+def dbfCount(dbf):
+    """Number of records from the .dbf header."""
+    with open(dbf, 'rb') as f:
+        return struct.unpack('<I', f.read(8)[4:8])[0]
+
+
+# folder: {file name: (signature, (shape type, box, count))}
+_headers = {}
+
+
+def _signature(path, st):
+    """Size and time of the .shp and of its .dbf and .prj, None for a file
+    that is missing."""
+    sig = [(st.st_size, st.st_mtime_ns)]
+    base = os.path.splitext(path)[0]
+    for ext in ('.dbf', '.prj'):
+        try:
+            s = os.stat(base + ext)
+            sig.append((s.st_size, s.st_mtime_ns))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+def _info(path, st):
+    """Header details of one shapefile, the .dbf count if there is one."""
+    sig = _signature(path, st)
+    shapeType, box = shpHeader(path)
+    dbf = os.path.splitext(path)[0] + '.dbf'
+    count = dbfCount(dbf) if sig[1] else recordCount(path)
+    return sig, (shapeType, box, count)
+
+
+def folderHeaders(folder):
+    """Reads and caches the headers of every shapefile in folder.
+
+    Returns
+    -------
+    dict
+        lower case file name: (shape type, (xmin, ymin, xmax, ymax),
+        record count)
+    """
+    infos = {}
+    with os.scandir(folder) as entries:
+        for e in entries:
+            if e.name.lower().endswith('.shp') and e.is_file():
+                infos[e.name.lower()] = _info(e.path, e.stat())
+    _headers[os.path.normcase(os.path.abspath(folder))] = infos
+    return {name: info for name, (sig, info) in infos.items()}
+
+
+def shapefileInfo(shp):
+    """Shape type, bounding box and record count of a shapefile read from
+    its headers. The first request for a folder reads the headers of all
+    its shapefiles; later requests only check the .shp, .dbf and .prj have
+    not changed.
+
+    Returns
+    -------
+    tuple
+        shape type, (xmin, ymin, xmax, ymax), record count
+
+    Raises
+    ------
+    FileNotFoundError
+        The shapefile does not exist
+    """
+    folder, name = os.path.split(os.path.abspath(shp))
+    key = os.path.normcase(folder)
+    name = name.lower()
+    try:
+        st = os.stat(shp)
+    except OSError:
+        if key in _headers:
+            _headers[key].pop(name, None)
+        raise FileNotFoundError(f"Shapefile {shp} does not exist") from None
+    if key not in _headers:
+        folderHeaders(folder)
+    infos = _headers[key]
+    if name not in infos or infos[name][0] != _signature(shp, st):
+        infos[name] = _info(shp, st)
+    return infos[name][1]
+
+
+def _int32(mm, pos):
+    """Little-endian int32 at each byte position pos of a uint8 map."""
+    pos = np.minimum(pos, mm.size - 4)
+    return mm[pos[:, None] + np.arange(4)].view('<i4').ravel()
+
+
+def shpCounts(shp, start=0, stop=None):
+    """Part and point counts of records start to stop of a polygon or
+    polyline .shp, read from the record headers only. The parts of a
+    shapefile polygon are its rings; points include the closing vertex of
+    each ring. Null shapes count 0.
+
+    Returns
+    -------
+    tuple
+        parts, points int64 arrays, one element per record
+    """
+    off, length = shxRecords(os.path.splitext(shp)[0] + '.shx')
+    off, length = off[start:stop], length[start:stop]
+    if not off.size:
+        e = np.zeros(0, np.int64)
+        return e, e
+    mm = np.memmap(shp, dtype=np.uint8, mode='r')
+    # record header (8), shape type (4), box (32), NumParts, NumPoints
+    valid = (length >= 44) & (_int32(mm, off + 8) != 0)
+    parts = np.where(valid, _int32(mm, off + 44), 0).astype(np.int64)
+    points = np.where(valid, _int32(mm, off + 48), 0).astype(np.int64)
+    del mm
+    return parts, points
+
+
+def _dbfDescriptors(dbf):
+    """Record count, header length, record length and a list of (name,
+    type, size, decimals) of the fields of a .dbf, in order."""
+    with open(dbf, 'rb') as f:
+        head = f.read(32)
+        nRec, hLen, rLen = struct.unpack('<IHH', head[4:12])
+        desc = f.read(hLen - 32)
+    fields = []
+    for i in range(0, len(desc) - 31, 32):
+        d = desc[i: i + 32]
+        if d[0] == 0x0D:
+            break
+        name = d[:11].split(b'\x00')[0].decode('ascii')
+        fields.append((name, chr(d[11]), d[16], d[17]))
+    return nRec, hLen, rLen, fields
+
+
+def dbfFields(dbf):
+    """Field descriptors of a .dbf.
+
+    Returns
+    -------
+    tuple
+        record count, header length, record length and a dictionary of
+        upper case field name: (type, byte offset in record, size,
+        decimals)
+    """
+    nRec, hLen, rLen, desc = _dbfDescriptors(dbf)
+    fields = {}
+    pos = 1     # deletion flag
+    for name, t, size, dec in desc:
+        fields[name.upper()] = (t, pos, size, dec)
+        pos += size
+    return nRec, hLen, rLen, fields
+
+
+def dbfSchema(dbf):
+    """Schema of a shapefile as its .dbf header describes it, in the form
+    of SSURGOFieldInfo. Character fields are String, other dBase types are
+    given by their type letter.
+
+    Returns
+    -------
+    tuple
+        record count and the list of (name, length, precision, scale,
+        type), FID and Shape first
+    """
+    nRec, hLen, rLen, desc = _dbfDescriptors(dbf)
+    schema = [("FID", 4, 0, 0, "OID"), ("Shape", 0, 0, 0, "Geometry")]
+    for name, t, size, dec in desc:
+        schema.append((name, size, 0, dec, "String" if t == 'C' else t))
+    return nRec, schema
+
+
+def dbfEncoding(dbf):
+    """Encoding of a .dbf from its .cpg, i.e. 'UTF-8' or '1252', the
+    platform default if there is none."""
+    cpg = os.path.splitext(dbf)[0] + '.cpg'
+    if not os.path.exists(cpg):
+        return ENCODING
+    with open(cpg, 'r') as f:
+        page = f.read().strip()
+    if page.isdigit():
+        page = f"cp{page}"
+    try:
+        return codecs.lookup(page).name
+    except LookupError:
+        return ENCODING
+
+
+def dbfColumn(dbf, field, start=0, stop=None, encoding=None, errors=ERRORS):
+    """Values of one character field for records start to stop, stripped
+    of padding. Decoded with the encoding of the .cpg if encoding is None.
+
+    Returns
+    -------
+    numpy.ndarray
+        unicode array, one element per record
+    """
+    nRec, hLen, rLen, fields = dbfFields(dbf)
+    if field.upper() not in fields:
+        raise KeyError(f"{field} is not a field of {dbf}")
+    t, pos, size, dec = fields[field.upper()]
+    stop = nRec if stop is None else min(stop, nRec)
+    if stop <= start:
+        return np.zeros(0, dtype='U1')
+    mm = np.memmap(dbf, dtype=np.uint8, mode='r', offset=hLen + start * rLen,
+                   shape=(stop - start, rLen))
+    col = np.ascontiguousarray(mm[:, pos: pos + size]).view(f'S{size}')
+    del mm
+    encoding = encoding or dbfEncoding(dbf)
+    return np.char.strip(np.char.decode(col.ravel(), encoding, errors))
+
+
+def ringArea(ring):
+    """Shoelace area of a closed ring, positive when clockwise."""
+    x = ring[:, 0] - ring[0, 0]
+    y = ring[:, 1] - ring[0, 1]
+    return float((x[1:] * y[:-1] - x[:-1] * y[1:]).sum() / 2)
+
+
+def _header(fileLength, shapeType, box):
+    """100 byte main file header of a .shp or .shx."""
+    return (struct.pack('>7i', 9994, 0, 0, 0, 0, 0, fileLength // 2)
+            + struct.pack('<2i4d4d', 1000, shapeType, *box, 0, 0, 0, 0))
+
+
+class ShapeWriter:
+    """Streams features to a new shapefile, or appends to one it wrote.
+
+    Parameters
+    ----------
+    path : str
+        Output .shp
+    schema : list
+        SSURGOFieldInfo field descriptions, (name, length, precision,
+        scale, type). Only String attribute fields are supported, as in
+        the SSURGO export schemas.
+    shapeType : str
+        Polygon, Polyline, Point or Multipoint
+    prj : str
+        Well-known text of the coordinate system, GCS_WGS_1984 by default
+    append : bool
+        Open an existing shapefile written by ShapeWriter to add features
+    stats : dict
+        Tallies kept across appends, a new one if None. See the stats
+        attribute.
+    tally : tuple
+        Fields whose distinct values are collected in stats['values']
+
+    Attributes
+    ----------
+    stats : dict
+        count: features written
+        extent: xmin, ymin, xmax, ymax
+        blanks: field: FIDs with a NULL, empty or space containing value
+        values: field: set of distinct values of the tally fields
+        schema: the output schema as SSURGOFieldInfo describes it
+    """
+    def __init__(self, path, schema, shapeType, prj=WGS84_PRJ, append=False,
+                 stats=None, tally=()):
+        self.base = os.path.splitext(path)[0]
+        self.shapeType = shapeTypes[shapeType]
+        self.fields = [(name, length) for name, length, p, s, ftype in schema
+                       if ftype not in ('OID', 'Geometry')]
+        for name, length, p, s, ftype in schema:
+            if ftype not in ('OID', 'Geometry', 'String'):
+                raise ValueError(f"{name}: {ftype} fields are not supported")
+        self.recLen = 1 + sum(length for name, length in self.fields)
+        if stats is None:
+            stats = {}
+        stats.setdefault('count', 0)
+        stats.setdefault('extent', [np.inf, np.inf, -np.inf, -np.inf])
+        stats.setdefault('blanks', {name: [] for name, length in self.fields})
+        stats.setdefault('values', {name: set() for name in tally})
+        stats['schema'] = (
+            [("FID", 4, 0, 0, "OID"), ("Shape", 0, 0, 0, "Geometry")]
+            + [(name, length, 0, 0, "String") for name, length in self.fields]
+        )
+        self.stats = stats
+
+        if append:
+            self.shp = open(self.base + '.shp', 'r+b')
+            self.shx = open(self.base + '.shx', 'r+b')
+            self.dbf = open(self.base + '.dbf', 'r+b')
+            self.shp.seek(0, 2)
+            self.shx.seek(0, 2)
+            self.n = (self.shx.tell() - 100) // 8
+            nRec, hLen, rLen, fields = dbfFields(self.base + '.dbf')
+            # overwrite the end of file marker
+            self.dbf.seek(hLen + nRec * rLen)
+        else:
+            self.n = 0
+            for ext in SIDECARS:
+                if os.path.exists(self.base + ext):
+                    os.remove(self.base + ext)
+            self.shp = open(self.base + '.shp', 'wb')
+            self.shx = open(self.base + '.shx', 'wb')
+            self.dbf = open(self.base + '.dbf', 'wb')
+            box = (0, 0, 0, 0)
+            self.shp.write(_header(100, self.shapeType, box))
+            self.shx.write(_header(100, self.shapeType, box))
+            self.dbf.write(self._dbfHeader())
+            with open(self.base + '.prj', 'w') as f:
+                f.write(prj)
+            with open(self.base + '.cpg', 'w') as f:
+                f.write('UTF-8')
+
+    def _dbfHeader(self):
+        today = datetime.date.today()
+        head = struct.pack(
+            '<4BIHH20x', 3, today.year - 1900, today.month, today.day,
+            self.n, 32 + 32 * len(self.fields) + 1, self.recLen
+        )
+        for name, length in self.fields:
+            head += struct.pack('<11sc4xBB14x', name.encode('ascii'), b'C',
+                                length, 0)
+        return head + b'\r'
+
+    def _content(self, parts):
+        """Record content from coordinate arrays."""
+        if not parts:
+            return struct.pack('<i', shpNull), None
+        xy = np.concatenate(parts)
+        box = (xy[:, 0].min(), xy[:, 1].min(),
+               xy[:, 0].max(), xy[:, 1].max())
+        if self.shapeType == shpPoint:
+            return struct.pack('<i2d', shpPoint, *xy[0]), box
+        if self.shapeType == shpMultipoint:
+            return (struct.pack('<i4di', shpMultipoint, *box, xy.shape[0])
+                    + np.ascontiguousarray(xy, '<f8').tobytes()), box
+        starts = np.cumsum([0] + [p.shape[0] for p in parts[:-1]])
+        return (struct.pack('<i4d2i', self.shapeType, *box, len(parts),
+                            xy.shape[0])
+                + starts.astype('<i4').tobytes()
+                + np.ascontiguousarray(xy, '<f8').tobytes()), box
+
+    def writeCoords(self, parts, values):
+        """Writes one feature from coordinate buffers.
+
+        Parameters
+        ----------
+        parts : list
+            (n, 2) arrays: the rings of a polygon, outer rings clockwise
+            and holes counter-clockwise; the paths of a polyline; a single
+            array of the points of a point or multipoint. Empty for a
+            NULL shape.
+        values : list
+            Attribute values in schema order
+        """
+        content, box = self._content(parts)
+        offset = self.shp.tell()
+        self.n += 1
+        self.shp.write(struct.pack('>2i', self.n, len(content) // 2))
+        self.shp.write(content)
+        self.shx.write(struct.pack('>2i', offset // 2, len(content) // 2))
+
+        fid = self.n - 1
+        stats = self.stats
+        rec = [b' ']
+        for (name, length), v in zip(self.fields, values):
+            if v is None or not str(v).strip() or ' ' in str(v):
+                stats['blanks'][name].append(fid)
+            v = '' if v is None else str(v)
+            if name in stats['values']:
+                stats['values'][name].add(v)
+            # truncated on a character boundary
+            b = v.encode('utf-8')[:length]
+            b = b.decode('utf-8', 'ignore').encode('utf-8')
+            rec.append(b.ljust(length, b' '))
+        self.dbf.write(b''.join(rec))
+
+        stats['count'] += 1
+        if box is not None:
+            e = stats['extent']
+            e[:] = (min(e[0], box[0]), min(e[1], box[1]),
+                    max(e[2], box[2]), max(e[3], box[3]))
+
+    def write(self, shape, values):
+        """Writes one feature from its WKB (SHAPE@WKB), None for NULL."""
+        if self.shapeType == shpPolygon:
+            parts = []
+            for rings in wkbParts(shape):
+                for i, ring in enumerate(rings):
+                    # outer ring clockwise, holes counter-clockwise
+                    if (ringArea(ring) > 0) != (i == 0):
+                        ring = ring[::-1]
+                    parts.append(ring)
+        else:
+            parts = wkbPaths(shape)
+        self.writeCoords(parts, values)
+
+    def close(self):
+        """Completes the file headers and closes the files."""
+        e = self.stats['extent']
+        box = tuple(e) if self.stats['count'] and np.isfinite(e).all() \
+            else (0, 0, 0, 0)
+        for f in (self.shp, self.shx):
+            length = f.tell()
+            f.seek(0)
+            f.write(_header(length, self.shapeType, box))
+            f.close()
+        self.dbf.write(b'\x1a')
+        self.dbf.seek(0)
+        self.dbf.write(self._dbfHeader()[:12])
+        self.dbf.close()
@@ -14,8 +14,16 @@ and ammend some acute vertices.
 
 @modified 04/03/2026
     @by: Alexnder Stum
-@version: 2.11
+@version: 2.12
 
+# ---
+Update 2.12; 10/19/2026
+- Optional stage instrumentation (parameter 12) with wall/cpu time, peak heap
+and peak RSS per named stage and per survey counters (arcs, nodes, vertices,
+collapsed polygons). Written as JSON and CSV next to the Diet Summary.
+- Optional cProfile dump per survey (parameter 13)
+- Moved the numpy kernels (node build, angles, rdps, tweezer's arc pass,
+ring walk) to Shoehorn_kernels so they can be benchmarked without arcpy
 # ---
 Update 2.11; 04/03/2026
 - It seems there is a difference in how PairwiseInegrate and Snap interpret 
@@ -65,7 +73,7 @@ Update 2.8c
 - Added snapping of boundary nodes to survery boundaries VERTEX 
     and EDGE for sparse areas
 """
-v = '2.11'
+v = '2.12'
 
 # import modules
 import arcpy
@@ -82,6 +90,8 @@ import Shoehorn_multi2_9_3
 import importlib
 importlib.reload(Shoehorn_multi2_9_3)
 from Shoehorn_multi2_9_3 import *
+import Shoehorn_instrument
+from Shoehorn_kernels import NodeBuild, nodeAngles, tweezArc
 
 warnings.filterwarnings("ignore")
 
@@ -160,78 +170,6 @@ def get_install_path():
     # https://www.e-education.psu.edu/geog489/node/2263
 
 
-def rdpi(M, epsilon=0, hopper={}):
-    """Helper function for rdps function, 
-    implementing Douglas-Peucker Method."""
-    try:
-        if not hopper:
-            hopper = {0: M.shape[0] - 1}
-        dump = np.ones(M.shape[0], bool)
-        while hopper:
-            i, f = hopper.popitem()
-            start, end = M[(i, f),]
-            vec = end - start
-            dists = (np.absolute(np.cross(vec, start - M[i:f + 1,])) 
-                     / np.linalg.norm(vec))
-            imax = np.argmax(dists)
-            dmax = dists[imax]
-            imax += i         
-            if dmax > epsilon:
-                if imax - i > 1:
-                    hopper[i] = imax
-                if f - imax > 1:
-                    hopper[imax] = f
-            else:
-                dump[i + 1:f,] = False
-        return dump
-    except arcpy.ExecuteError:
-        func = sys._getframe().f_code.co_name
-        arcpy.AddError(arcpyErr(func))
-        raise
-    except:
-        func = sys._getframe().f_code.co_name
-        arcpy.AddError(pyErr(func))
-        raise
-        
-
-def rdps(M, E=1):
-    """Implementation of the Douglas-Peuker Methodology."""
-    try:
-        close = np.ones(M.shape[0], bool)
-        # offset by 2
-        v = M[2:,] - M[:-2,]
-        dist = (np.abs(np.cross(v, M[:-2,] - M[1:-1])) 
-                / np.linalg.norm(v, axis=1))
-        close[1:-1] = dist >= E
-        inrow = ~(close[1:] | close[:-1])
-        if inrow.any():
-            contigI = np.ones(M.shape[0], bool)
-            contigI[1:-1] = inrow[:-1] | inrow[1:]  # is there a neighbor?
-            contig = np.where(contigI[1:-1])[0] + 1
-            # realm of contiguous occurences
-            neigh = set(range(contig[0] - 1, contig[-1] + 2))
-            inter = neigh - set(contig)
-            iS = [j for j in inter if j + 1 in contig]
-            fS = [i + 1 for i in contig if i + 1 in inter]
-            if (len(fS) < 2) and (fS[0] > dist.size): # if enclosed
-                far = np.argmax(dist) +1
-                iS.append(far)
-                fS.append(far)
-            iS.sort()
-            fS.sort()
-            dump = rdpi(M, E, dict(zip(iS, fS)))
-            close[contigI] = dump[contigI]
-        return M[close,]
-    except arcpy.ExecuteError:
-        func = sys._getframe().f_code.co_name
-        arcpy.AddError(arcpyErr(func))
-        raise
-    except:
-        func = sys._getframe().f_code.co_name
-        arcpy.AddError(pyErr(func))
-        raise
-
-
 def BNodes(SA_, MU, nodes, dec, sr):
     try:
         # ======= Variables  ==========
@@ -317,7 +255,6 @@ def tweezer(arcs, inter, v0, MUpoly_, N, cutV, weakEggs ,min_angle, dec, polys):
 
         ###Localize function calls
         frombuffer  = np.frombuffer
-        arccos      = np.arccos
         concatenate = np.concatenate
         Point       = arcpy.Point
         f64         = np.float64
@@ -325,8 +262,6 @@ def tweezer(arcs, inter, v0, MUpoly_, N, cutV, weakEggs ,min_angle, dec, polys):
         ein         = np.einsum
         sqrt        = np.sqrt
 
-        eS = '...i,...i'
-        eS2 = 'ij,ij->i'
         eS2t = 'ijk,ijk->ij'
         shapes = {}
         cut = [[], []]
@@ -347,40 +282,17 @@ def tweezer(arcs, inter, v0, MUpoly_, N, cutV, weakEggs ,min_angle, dec, polys):
             npGeom = npGeom.reshape((npGeom.size//2, 2))   # pair up x,y coords
 
             # Ralfs law, inner1d computes cross product of an array of vectors
-            # angle = arccos((v1.v2)/(|v1||v2|))
-            # sqrt(ein(eS2, v1, v1)) is eqivalent to ((v1*v1).sum(axis=1))**.5
             # https://math.stackexchange.com/questions/11346/how-to-compute-the-angle-between-two-vectors-expressed-in-the-spherical-coordina # noqa
             # https://stackoverflow.com/questions/9171158/how-do-you-get-the-magnitude-of-a-vector-in-numpy # noqa
-            # Create an array of vector pairs
-            v1 = npGeom[:-2, ] - npGeom[1:-1, ]
-            v2 = npGeom[2:, ] - npGeom[1:-1, ]
-            angles = arccos(ein(eS, v1, v2) / sqrt(ein(eS2, v1, v1)) /
-                            sqrt(ein(eS2, v2, v2)))
-            acuteI = angles > min_angle
-            # Find all vertices less than min angle
-            newCore = npGeom[1:-1, ][acuteI]
-
-            if (newCore.size // 2 > 1) or ((NiH != NiT) and newCore.size):
-                if RLiT + 1:  # Not along survey boundary
-                    # Snap Nodes
-                    newGeom = concatenate((v0[NiH], newCore, v0[NiT]), axis=0)
-                    newGeom = rdps(newGeom)
-                    shapes[fid] = newGeom
-                    if (~acuteI).any():
-                        # the rejects
-                        cut[0] += list(npGeom[1:-1, ][~acuteI])
-                        cut[1] += list(angles[~acuteI])
-                else:
-                    # Snap Nodes
-                    newGeom = concatenate(
-                        (v0[NiH], npGeom[1:-1], v0[NiT]), axis=0
-                    )
-                    shapes[fid] = newGeom
-                v3[NiH, v3iH] = newGeom[1, ]   # vertex second from start
-                v3[NiT, v3iT] = newGeom[-2, ]  # vertex second from last
-            elif NiH != NiT:  # only were two vertices
-                newGeom = concatenate((v0[NiH], v0[NiT]), axis=0) # npGeom[1:-1]
+            newGeom, rejects, rejectAngles = tweezArc(
+                npGeom, NiH, NiT, RLiT, v0, min_angle
+            )
+
+            if newGeom is not None:
                 shapes[fid] = newGeom
+                # the rejects
+                cut[0] += list(rejects)
+                cut[1] += list(rejectAngles)
                 v3[NiH, v3iH] = newGeom[1, ]   # vertex second from start
                 v3[NiT, v3iT] = newGeom[-2, ]  # vertex second from last
             else:   # line collapsed to point
@@ -399,24 +311,8 @@ def tweezer(arcs, inter, v0, MUpoly_, N, cutV, weakEggs ,min_angle, dec, polys):
 
         ### arc-Node position
         # Calculate Angles at Nodes 3 positions
-        angles = np.zeros((N, 3, 1), dtype=np.float32)
         v3v = v3-v0
-
-        angles[:, 0, 0] = arccos(
-            ein(eS, v3v[:, 1, :], v3v[:, 2, :]) /
-            sqrt(ein(eS2, v3v[:, 1, :], v3v[:, 1, :])) /
-            sqrt(ein(eS2, v3v[:, 2, :], v3v[:, 2, :]))
-        )
-        angles[:, 1, 0] = arccos(
-            ein(eS, v3v[:, 0, :], v3v[:, 2, :]) /
-            sqrt(ein(eS2, v3v[:, 0, :], v3v[:, 0, :])) /
-            sqrt(ein(eS2, v3v[:, 2, :], v3v[:, 2, :]))
-        )
-        angles[:, 2, 0] = arccos(
-            ein(eS, v3v[:, 0, :], v3v[:, 1, :]) /
-            sqrt(ein(eS2, v3v[:, 0, :], v3v[:, 0, :])) /
-            sqrt(ein(eS2, v3v[:, 1, :], v3v[:, 1, :]))
-        )
+        angles = nodeAngles(v3v)
 
         acute = angles < min_angle
         acute[0, :, :] = False
@@ -644,6 +540,9 @@ def main():
         excel = os.path.join(excel_p, excel_n+'.xls')
         retain = arcpy.GetParameter(10)
         BT = arcpy.GetParameter(11)
+        argc = arcpy.GetArgumentCount()
+        instrument = arcpy.GetParameter(12) if argc > 12 else False
+        profile = arcpy.GetParameter(13) if argc > 13 else False
 
         # %%% Variables
         start           = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
@@ -719,6 +618,11 @@ def main():
         badE            = "polygon_errors"
         weakEggs        = {'Tweezer':[],'Reassembly':[],'Cluster Tolerance':[]}
         badEggs         = {'Exception':[],'Reassembly':[]}
+        L               = Shoehorn_instrument.ledger(
+            instrument or profile,
+            os.path.join(excel_p, excel_n + '_profiles') if profile else None
+        )
+        stage           = L.stage
 
         # %%% General Setup
         
@@ -946,69 +850,79 @@ def main():
         arcpy.AddMessage(
             '{}: Survey {} of {}'.format(areaSym, status//3+1, nSurvs)
         )
+        L.survey(areaSym)
 
         arcpy.management.Delete('in_memory/')
         arcpy.MakeFeatureLayer_management(MUin, survey, 
                                         areaField+" = '{}'".format(areaSym))
         ws.write(rowID, 0, areaSym, textStyle)
-        ws.write(rowID, 1, int(arcpy.management.GetCount(survey)[0]), intStyle)
+        prePoly = int(arcpy.management.GetCount(survey)[0])
+        ws.write(rowID, 1, prePoly, intStyle)
         # collapse slivers and self-intersections per OGC
         # arcpy.Integrate_management(survey,T)
         # %%%% Geoprocessing
         try:
             q = "AREASYMBOL = '" + areaSym + "'"
-            arcpy.management.PolygonToLine(survey, MUpoly)
-            arcpy.management.MakeFeatureLayer(
-                MUpoly, MUpoly_L, "RIGHT_FID = -1"
-            )
-            if arcpy.management.GetCount(MUpoly_L).getOutput(0):
-                uCur = arcpy.da.UpdateCursor(
-                    MUpoly_L, ['RIGHT_FID', 'LEFT_FID']
+            with stage('PolygonToLine'):
+                arcpy.management.PolygonToLine(survey, MUpoly)
+                arcpy.management.MakeFeatureLayer(
+                    MUpoly, MUpoly_L, "RIGHT_FID = -1"
                 )
-                for RF, LF in uCur:
-                    uCur.updateRow([LF, -1])
-                del uCur
+                if arcpy.management.GetCount(MUpoly_L).getOutput(0):
+                    uCur = arcpy.da.UpdateCursor(
+                        MUpoly_L, ['RIGHT_FID', 'LEFT_FID']
+                    )
+                    for RF, LF in uCur:
+                        uCur.updateRow([LF, -1])
+                    del uCur
 
-            arcpy.management.MakeFeatureLayer(MUpoly, MUpoly_L, "LEFT_FID = -1")
+            with stage('Snap & Split'):
+                arcpy.management.MakeFeatureLayer(
+                    MUpoly, MUpoly_L, "LEFT_FID = -1"
+                )
 
-            arcpy.management.MakeFeatureLayer(SARsplit, SARline_L, q)
-            arcpy.management.MakeFeatureLayer(bNodes, bound_L)
-            arcpy.management.SelectLayerByLocation(
-                bound_L, "WITHIN_A_DISTANCE", SARline_L, T
-            )
-            arcpy.edit.Snap(MUpoly_L, [[bound_L, 'VERTEX', BT]])
-            # arcpy.Snap_edit(MUpoly_L, [[bound_L, 'EDGE', BT]])
-            arcpy.management.SplitLineAtPoint(
-                MUpoly_L, bound_L, MUsplit, BT* 2**0.5
-            )
+                arcpy.management.MakeFeatureLayer(SARsplit, SARline_L, q)
+                arcpy.management.MakeFeatureLayer(bNodes, bound_L)
+                arcpy.management.SelectLayerByLocation(
+                    bound_L, "WITHIN_A_DISTANCE", SARline_L, T
+                )
+                arcpy.edit.Snap(MUpoly_L, [[bound_L, 'VERTEX', BT]])
+                # arcpy.Snap_edit(MUpoly_L, [[bound_L, 'EDGE', BT]])
+                arcpy.management.SplitLineAtPoint(
+                    MUpoly_L, bound_L, MUsplit, BT* 2**0.5
+                )
 
-            arcpy.management.FeatureVerticesToPoints(MUsplit, mid, "MID")
-            arcpy.analysis.SpatialJoin(
-                SARline_L, mid , MUinter, "JOIN_ONE_TO_ONE", "KEEP_ALL", '', 
-                "CLOSEST", BT
-            )
+            with stage('SpatialJoin'):
+                arcpy.management.FeatureVerticesToPoints(MUsplit, mid, "MID")
+                arcpy.analysis.SpatialJoin(
+                    SARline_L, mid , MUinter, "JOIN_ONE_TO_ONE", "KEEP_ALL",
+                    '', "CLOSEST", BT
+                )
 
-            arcpy.management.MakeFeatureLayer(
-                MUpoly, MUpoly_L, "LEFT_FID <> -1 AND LEFT_FID<>RIGHT_FID"
-            )
+            with stage('Arc Ends'):
+                arcpy.management.MakeFeatureLayer(
+                    MUpoly, MUpoly_L, "LEFT_FID <> -1 AND LEFT_FID<>RIGHT_FID"
+                )
 
-            mapping=('LEFT_FID "LEFT_FID" true true false 4 Long 0 0, First, '
-                     '#, MUpolyline_layer, LEFT_FID, -1, -1, '
-                     'MUinter, LEFT_FID, -1, -1;'
-                     'RIGHT_FID "RIGHT_FID" true true false 4 Long 0 0, First, '
-                     '#,MUpolyline_layer, RIGHT_FID,-1, -1,MUinter, RIGHT_FID, '
-                     '-1, -1')
-            arcpy.management.Merge([MUpoly_L, MUinter], MUpoly_, mapping)
-
-            arcpy.management.FeatureVerticesToPoints(MUpoly_, starts, "START")
-            arcpy.management.FeatureVerticesToPoints(MUpoly_, ends, "END")
-            arcpy.management.AddField(ends, 'tail', "SHORT")
-            arcpy.management.AddField(starts, 'tail', "SHORT")
-            arcpy.management.CalculateField(ends, "tail", "1")
-            arcpy.management.Merge(ends + ";" + starts, TheEnd)
-            # if ever the need arose, snapping ends to themselves might removed
-            # arcs less than BT
-            arcpy.edit.Snap(TheEnd, [[bound_L, 'VERTEX', BT]])
+                mapping=('LEFT_FID "LEFT_FID" true true false 4 Long 0 0, '
+                         'First, #, MUpolyline_layer, LEFT_FID, -1, -1, '
+                         'MUinter, LEFT_FID, -1, -1;'
+                         'RIGHT_FID "RIGHT_FID" true true false 4 Long 0 0, '
+                         'First, #,MUpolyline_layer, RIGHT_FID,-1, -1,'
+                         'MUinter, RIGHT_FID, -1, -1')
+                arcpy.management.Merge([MUpoly_L, MUinter], MUpoly_, mapping)
+
+                arcpy.management.FeatureVerticesToPoints(
+                    MUpoly_, starts, "START"
+                )
+                arcpy.management.FeatureVerticesToPoints(MUpoly_, ends, "END")
+                arcpy.management.AddField(ends, 'tail', "SHORT")
+                arcpy.management.AddField(starts, 'tail', "SHORT")
+                arcpy.management.CalculateField(ends, "tail", "1")
+                arcpy.management.Merge(ends + ";" + starts, TheEnd)
+                # if ever the need arose, snapping ends to themselves might
+                # removed arcs less than BT
+                arcpy.edit.Snap(TheEnd, [[bound_L, 'VERTEX', BT]])
 
             arcpy.management.Delete(bound_L)
             arcpy.management.Delete(SARline_L)
@@ -1037,94 +951,57 @@ def main():
             # Computationally leaner than FID-1
             # number of intersections (Nodes)
             N = int(arcpy.GetCount_management(TheEnd).getOutput(0))//2+1
-            # indexed by MUpoly_: Node fid, 
-            # v3 position (realtive intersection ID),
-            # Right then Left FID, head then tail
-            arcs = np.zeros((n, 2), dtype=([('Ni', '<i4'), ('v3i', '<i4'),
-                                        ('RLi', '<i4')]))
-            polys = {}
-            # Tally of the number of intersecting arcs at a Node, 
-            # used in tweezer
-            inter = np.zeros((N), dtype=np.int8)
-            # Node coordinates, used in tweezer
-            v0 = np.zeros((N, 1, 2), dtype=np.float64)
 
             #### Populating the arcs array, the key relational table
+            # arcs indexed by MUpoly_: Node fid, 
+            # v3 position (realtive intersection ID),
+            # Right then Left FID, head then tail
             # TARGET_FID: Node ID, ORIG_FID: MUpolyline fid (arc id)
-            Round = np.round
-            Ndex = {}
-            Nid = 1
-            sCur = arcpy.da.SearchCursor(
-                TheEnd, ['SHAPE@XY', 'ORIG_FID',
-                'RIGHT_FID', 'LEFT_FID', 'tail']
-            )
-            try:
-                for xy, Ai, Ri, Li, t in sCur:
-                    strxy = str(xy)
-                    if strxy in Ndex:
-                        Ni = Ndex[strxy]
-                    else:
-                        Nid += 1
-                        Ndex[strxy] = Nid
-                        Ni = Nid
-                        v0[Ni] = Round(xy, dec)
-        
-                    i = inter[Ni]    # number of intersections
-                    # v3 index, constrained 0-2. If greater than 2, cap at 2
-                    I = (abs(i) >= 2)*2 or abs(i)
-                    if not t:
-                        # add boolean True or demerit 1
-                        inter[Ni] += i >= 0 or -1
-                        arcs[Ai, 0] = (Ni, I, Ri)
-                        if Ri in polys:
-                            polys[Ri][0].append((Ai, 1))
-                        else:
-                            polys[Ri] = [[(Ai, 1)], '']
-                    elif Li+1:
-                        inter[Ni] += i >= 0 or -1
-                        arcs[Ai, 1] = (Ni, I, Li)
-                        if Li in polys:
-                            polys[Li][0].append((Ai, -1))
-                        else:
-                            polys[Li] = [[(Ai, -1)], '']
-                    else: # Node on border
-                        arcs[Ai, 1] = (Ni, I, Li)
-                        inter[Ni] = abs(inter[Ni])*-1
-            except:
-                if not Li:
+            with stage('Node Build'):
+                sCur = arcpy.da.SearchCursor(
+                    TheEnd, ['SHAPE@XY', 'ORIG_FID',
+                    'RIGHT_FID', 'LEFT_FID', 'tail']
+                )
+                try:
+                    arcs, polys, inter, v0, Nid = NodeBuild(sCur, n, N, dec)
+                except TypeError:
+                    # A null LEFT_FID from the SpatialJoin
                     arcpy.AddError(
                         "It is likely the input soil polygon feature is "
-                        "incongruent with the transactional SAPOLYGON feature"
+                        "incongruent with the transactional SAPOLYGON "
+                        "feature"
                     )
                     arcpy.AddError(
-                        "Either amend the input soil polygon feature or update "
-                        "the transactaional SAPOLYGON feature."
+                        "Either amend the input soil polygon feature or "
+                        "update the transactaional SAPOLYGON feature."
                     )
                     arcpy.MakeFeatureLayer_management(
                         MUinter, MUinter_L, "'LEFT_FID' IS NULL"
                     )
                     arcpy.CopyFeatures_management(MUinter_L, SAmis)
                     arcpy.AddError(
-                        f"See feature {SAmis} to see where they're incongruent"
+                        f"See feature {SAmis} to see where they're "
+                        "incongruent"
                     )
                     sys.exit(1)
-            del sCur, Ndex
+            del sCur
             N = Nid+1
-            inter = inter[:N]
-            v0 = v0[:N, :, :]
-            sCur = arcpy.da.SearchCursor(survey, ['OID@', muField, 'SHAPE@'])
-            preV = 0
-            for FID, mu, shp in sCur:
-                if FID in polys:
-                    polys[FID][1] = mu
-                else:
-                    weakEggs['Cluster Tolerance'].append(str(FID))
-                try: # Catch null geometries
-                    preV += shp.pointCount
-                except:
-                    arcpy.AddMessage("Null geometries in input removed")
-                    weakEggs['Cluster Tolerance'].append(str(FID))
-                    polys.pop(FID)
+            with stage('Vertex Count'):
+                sCur = arcpy.da.SearchCursor(
+                    survey, ['OID@', muField, 'SHAPE@']
+                )
+                preV = 0
+                for FID, mu, shp in sCur:
+                    if FID in polys:
+                        polys[FID][1] = mu
+                    else:
+                        weakEggs['Cluster Tolerance'].append(str(FID))
+                    try: # Catch null geometries
+                        preV += shp.pointCount
+                    except:
+                        arcpy.AddMessage("Null geometries in input removed")
+                        weakEggs['Cluster Tolerance'].append(str(FID))
+                        polys.pop(FID)
         except:
             arcpy.AddError("Failed while setting up Relational Tabels")
             arcpy.AddError("Unexpected error on line: " + 
@@ -1137,8 +1014,10 @@ def main():
         arcpy.SetProgressor('step',msg)
         arcpy.SetProgressorPosition(int(f*status+f))
         # shapes is a dictionary, polyline FID: polyline geometry (arc)
-        shapes, weakEggs = tweezer(arcs, inter, v0, MUpoly_, N, cutV, weakEggs,
-                                min_angle, dec, polys)
+        nTweezed = len(weakEggs['Tweezer'])
+        with stage('Tweezer'):
+            shapes, weakEggs = tweezer(arcs, inter, v0, MUpoly_, N, cutV,
+                                       weakEggs, min_angle, dec, polys)
         # P = arcpy.Point
         # allLines = [arcpy.Polyline(arcpy.Array([P(*p) for p in line])) 
         # for line in shapes.values()]
@@ -1155,10 +1034,11 @@ def main():
                 iCur = arcpy.da.InsertCursor(
                     MUout, [areaField, muField, 'SHAPE@']
                 )
-                postV, count, weakEggs, badEggs = Reassemble(
-                    iCur, arcs, polys, shapes, weakEggs, badEggs, pCores, 
-                    areaSym, SFDS
-                )
+                with stage('Reassemble'):
+                    postV, count, weakEggs, badEggs = Reassemble(
+                        iCur, arcs, polys, shapes, weakEggs, badEggs, pCores, 
+                        areaSym, SFDS
+                    )
                 del iCur
                 edit.stopOperation()
                 edit.stopEditing(True)
@@ -1179,10 +1059,11 @@ def main():
 
         else:
             iCur = arcpy.da.InsertCursor(MUout, [areaField, muField, 'SHAPE@'])
-            postV, count, weakEggs, badEggs = Reassemble(
-                iCur, arcs, polys, shapes, weakEggs, badEggs, pCores, 
-                areaSym, SFDS
-            )
+            with stage('Reassemble'):
+                postV, count, weakEggs, badEggs = Reassemble(
+                    iCur, arcs, polys, shapes, weakEggs, badEggs, pCores, 
+                    areaSym, SFDS
+                )
             del iCur
 
         # %%%% Msg
@@ -1194,6 +1075,11 @@ def main():
         ws.write(rowID, 4, postV, intStyle)
         ws.write(rowID, 5, (preV-postV)/preV, perStyle)
         ws.write(rowID, 2, count, intStyle)
+        # node ids are assigned from 2 to Nid
+        L.count(arcs=len(oid), nodes=Nid - 1, preVertex=preV, postVertex=postV,
+                prePoly=prePoly, postPoly=count,
+                collapsed=len(weakEggs['Tweezer']) - nTweezed)
+        L.close()
 
     # %%% Wrap-up
     try:
@@ -1298,6 +1184,11 @@ def main():
             arcpy.Delete_management(SARsplit)
         # %%%% Clean up and save
         arcpy.Delete_management('in_memory/')
+        try:
+            for log in L.save(os.path.join(excel_p, excel_n)):
+                arcpy.AddMessage(f"Stage log: {log}")
+        except:
+            arcpy.AddWarning("Failed to save the stage instrumentation log")
         try:
             wb.save(excel)
             os.startfile(excel)
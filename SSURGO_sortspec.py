@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO sort specifications
+Rows of the SYSTEM - Mapunit Sort Specifications and SYSTEM - INTERP DEPTH
+SEQUENCE tables of a SSURGO template database, built from the text files of
+the survey rather than from the database once they are imported. Legend
+and mapunit are joined on lkey in a dictionary and every map unit symbol
+gets its natural sort key once, so 'A10' sorts after 'A9'.
+
+Column positions come from the schema catalog (SSURGO_catalog.py), the
+text files carry the columns of their table in order. It does not import
+arcpy.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import os
+import re
+
+from SSURGO_mmap import readRows
+
+_digits = re.compile(r'([0-9]+)')
+
+
+def naturalKey(text):
+    """Sort key splitting text into lower case text and integers,
+    i.e. '10B' -> ['', 10, 'b']"""
+    return [int(c) if c.isdigit() else c.lower() for c in _digits.split(text)]
+
+
+def readColumns(tabularFolder, catalog, table, columns):
+    """Reads some columns of the text file of a table.
+
+    Parameters
+    ----------
+    tabularFolder : str
+        Tabular folder of a SSURGO download
+    catalog : dict
+        SSURGO schema catalog
+    table : str
+        Physical table name, i.e. cointerp
+    columns : list
+        Column names to read
+
+    Yields
+    ------
+    tuple
+        Values of the columns, '' for blanks, for each record
+    """
+    tbl = catalog['tables'][table]
+    names = [col[0].lower() for col in tbl['columns']]
+    idx = [names.index(col.lower()) for col in columns]
+    txtPath = os.path.join(tabularFolder, tbl['iefilename'] + ".txt")
+    for row in readRows(txtPath):
+        yield tuple(row[i] for i in idx)
+
+
+def mapunitSort(tabularFolder, catalog):
+    """Rows of SYSTEM - Mapunit Sort Specifications, surveys sorted by
+    areasymbol and their map units in natural order of musym.
+
+    Returns
+    -------
+    list
+        (lseq, museq, lkey, mukey) tuples
+    """
+    areas = dict(
+        (lkey, areaSym) for areaSym, lkey in
+        readColumns(tabularFolder, catalog, 'legend', ['areasymbol', 'lkey'])
+    )
+    surveys = dict()
+    for musym, mukey, lkey in readColumns(
+            tabularFolder, catalog, 'mapunit', ['musym', 'mukey', 'lkey']):
+        surveys.setdefault(lkey, []).append((naturalKey(musym), musym, mukey))
+
+    rows = []
+    museq = 0
+    lkeys = sorted(surveys, key=lambda lkey: areas.get(lkey, ''))
+    for lseq, lkey in enumerate(lkeys, 1):
+        for sortKey, musym, mukey in sorted(surveys[lkey]):
+            museq += 1
+            rows.append((lseq, museq, lkey, mukey))
+    return rows
+
+
+def interpDepthSequence(tabularFolder, catalog, ruledepth='1'):
+    """Rows of SYSTEM - INTERP DEPTH SEQUENCE, the cointerpkey and seqnum
+    of the cointerp records at ruledepth, in file order.
+
+    Returns
+    -------
+    list
+        (cointerpkey, depthseq) tuples
+    """
+    return [
+        (cointerpkey, seqnum or None) for cointerpkey, seqnum, depth in
+        readColumns(tabularFolder, catalog, 'cointerp',
+                    ['cointerpkey', 'seqnum', 'ruledepth'])
+        if depth == ruledepth
+    ]
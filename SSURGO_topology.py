@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""
+SSURGO topology validation by survey
+Validates the topology of a SSURGO feature dataset one survey extent
+(tile) at a time, and only the tiles edited since they were last
+validated, instead of the whole region after every edit.
+
+A tile is the extent of a survey's SAPOLYGON features. It is dirty when it
+has never been validated, when the latest editor tracking date
+(Last_Edit_Date) of its features is newer than the one recorded when it
+was validated, or when it is named in the edit log of the caller, i.e.
+the surveys a refresh deleted and appended again. Deleted features leave
+no tracking date, so tools that delete features must name their surveys.
+
+Tiles are validated in Hilbert curve order, each as the visible extent,
+which run from a script is the extent environment, set to the tile. Run
+from ArcGIS Pro the visible extent is that of the active map view, which
+can not be confined to a tile, so the whole topology is validated at once
+and every tile recorded: slower, but a tile is never recorded as valid
+without having been validated. Each topology error is counted in the one
+tile whose center is nearest of those containing it. The error count, time and tracking date of each tile are
+kept in a topology_tiles table of the geodatabase, so a rerun after an
+interruption or a small edit skips the clean tiles. A file geodatabase
+topology is locked by its validation, so tiles are validated one after
+the other.
+
+Run as a tool: parameter 0 the topology, 1 (optional) surveys to validate
+regardless, 2 (optional) validate every tile.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import os
+import time
+import arcpy
+from datetime import datetime
+
+from SSURGO_order import spatialOrder
+
+TILETABLE = 'topology_tiles'
+TRACKED = ('MUPOLYGON', 'MULINE', 'MUPOINT', 'FEATLINE', 'FEATPOINT',
+           'SAPOLYGON')
+
+
+def _union(a, b):
+    if a is None or b is None:
+        return a or b
+    return (min(a[0], b[0]), min(a[1], b[1]),
+            max(a[2], b[2]), max(a[3], b[3]))
+
+
+def surveyTiles(fd_p, surveys=None, feature='SAPOLYGON'):
+    """Extent of each survey's features.
+
+    Parameters
+    ----------
+    fd_p : str
+        Feature dataset
+    surveys : list
+        Areasymbols, all if None
+    feature : str
+        Feature class with an AREASYMBOL field
+
+    Returns
+    -------
+    dict
+        areasymbol: (xmin, ymin, xmax, ymax)
+    """
+    q = None
+    if surveys:
+        q = "AREASYMBOL IN ({})".format(
+            ", ".join(f"'{ssa}'" for ssa in surveys)
+        )
+    tiles = dict()
+    with arcpy.da.SearchCursor(
+            f"{fd_p}/{feature}", ['AREASYMBOL', 'SHAPE@'], q) as sCur:
+        for ssa, geom in sCur:
+            e = geom.extent
+            tiles[ssa] = _union(tiles.get(ssa),
+                                (e.XMin, e.YMin, e.XMax, e.YMax))
+    return tiles
+
+
+def lastEdits(fd_p, features=TRACKED, field='Last_Edit_Date'):
+    """Latest editor tracking date of each survey's features. Feature
+    classes without the field are skipped.
+
+    Returns
+    -------
+    dict
+        areasymbol: datetime
+    """
+    edits = dict()
+    for feat in features:
+        feat_p = f"{fd_p}/{feat}"
+        if not arcpy.Exists(feat_p):
+            continue
+        if field.lower() not in {
+                fld.name.lower() for fld in arcpy.ListFields(feat_p)}:
+            continue
+        with arcpy.da.SearchCursor(
+                feat_p, ['AREASYMBOL', field], f"{field} IS NOT NULL"
+            ) as sCur:
+            for ssa, edited in sCur:
+                if ssa not in edits or edited > edits[ssa]:
+                    edits[ssa] = edited
+    return edits
+
+
+def readTiles(gdb_p):
+    """Validation state of each tile.
+
+    Returns
+    -------
+    dict
+        areasymbol: {'edited', 'validated', 'errors', 'seconds'}, empty if
+        the geodatabase has no topology_tiles table
+    """
+    tab_p = f"{gdb_p}/{TILETABLE}"
+    if not arcpy.Exists(tab_p):
+        return dict()
+    fields = ['areasymbol', 'edited', 'validated', 'errors', 'seconds']
+    with arcpy.da.SearchCursor(tab_p, fields) as sCur:
+        return {row[0]: dict(zip(fields[1:], row[1:])) for row in sCur}
+
+
+def writeTiles(gdb_p, state):
+    """Records the validation state of tiles, created if missing, replacing
+    their previous state."""
+    tab_p = f"{gdb_p}/{TILETABLE}"
+    if not arcpy.Exists(tab_p):
+        arcpy.CreateTable_management(gdb_p, TILETABLE)
+        arcpy.AddField_management(tab_p, 'areasymbol', 'TEXT',
+                                  field_length=20)
+        arcpy.AddField_management(tab_p, 'edited', 'DATE')
+        arcpy.AddField_management(tab_p, 'validated', 'DATE')
+        arcpy.AddField_management(tab_p, 'errors', 'LONG')
+        arcpy.AddField_management(tab_p, 'seconds', 'DOUBLE')
+    with arcpy.da.UpdateCursor(tab_p, ['areasymbol']) as uCur:
+        for ssa, in uCur:
+            if ssa in state:
+                uCur.deleteRow()
+    fields = ['areasymbol', 'edited', 'validated', 'errors', 'seconds']
+    with arcpy.da.InsertCursor(tab_p, fields) as iCur:
+        for ssa, tile in sorted(state.items()):
+            iCur.insertRow([ssa] + [tile.get(k) for k in fields[1:]])
+
+
+def dirtyTiles(tiles, edits, state, surveys=()):
+    """Tiles to validate, in the order of tiles.
+
+    Parameters
+    ----------
+    tiles : list
+        Areasymbols of the tiles
+    edits : dict
+        areasymbol: latest editor tracking date, as from lastEdits
+    state : dict
+        Validation state, as from readTiles
+    surveys : list
+        Areasymbols to validate regardless, i.e. of deleted features
+    """
+    dirty = []
+    for ssa in tiles:
+        tile = state.get(ssa)
+        if (ssa in surveys or tile is None or tile['validated'] is None
+                or (edits.get(ssa) and (tile['edited'] is None
+                                        or edits[ssa] > tile['edited']))):
+            dirty.append(ssa)
+    return dirty
+
+
+def extentHonored():
+    """Whether Visible_Extent validates the extent environment, i.e. run
+    from a script, False within ArcGIS Pro where it is the map view."""
+    try:
+        arcpy.mp.ArcGISProject('CURRENT')
+        return False
+    except (OSError, RuntimeError):
+        return True
+
+
+def validateExtent(topo_p, box):
+    """Validates a topology within an extent, from a script only (see
+    extentHonored).
+
+    ValidateTopology has no extent parameter; Visible_Extent is the extent
+    environment, set to box and restored.
+
+    Parameters
+    ----------
+    topo_p : str
+        Topology
+    box : tuple
+        (xmin, ymin, xmax, ymax)
+    """
+    extent = arcpy.Extent(*box)
+    extent.spatialReference = arcpy.Describe(topo_p).spatialReference
+    with arcpy.EnvManager(extent=extent):
+        arcpy.ValidateTopology_management(topo_p, "Visible_Extent")
+
+
+def countErrors(topo_p, tiles):
+    """Number of topology errors, exceptions excepted, in each tile. An
+    error is counted once, in the tile whose center is nearest its extent
+    center of the tiles containing it, so where tiles overlap it is not
+    counted again.
+
+    Parameters
+    ----------
+    topo_p : str
+        Topology
+    tiles : dict
+        areasymbol: (xmin, ymin, xmax, ymax)
+
+    Returns
+    -------
+    dict
+        areasymbol: error count
+    """
+    counts = dict.fromkeys(tiles, 0)
+    base = 'topo_tiles'
+    arcpy.ExportTopologyErrors_management(topo_p, 'memory', base)
+    try:
+        for kind in ('point', 'line', 'poly'):
+            err_p = f"memory/{base}_{kind}"
+            if not arcpy.Exists(err_p):
+                continue
+            with arcpy.da.SearchCursor(
+                    err_p, ['SHAPE@', 'isException']) as sCur:
+                for geom, exception in sCur:
+                    if exception:
+                        continue
+                    e = geom.extent
+                    x = (e.XMin + e.XMax) / 2
+                    y = (e.YMin + e.YMax) / 2
+                    near, d = None, None
+                    for ssa, (x0, y0, x1, y1) in tiles.items():
+                        if x0 <= x <= x1 and y0 <= y <= y1:
+                            dd = ((x - (x0 + x1) / 2) ** 2
+                                  + (y - (y0 + y1) / 2) ** 2)
+                            if d is None or dd < d:
+                                near, d = ssa, dd
+                    if near is not None:
+                        counts[near] += 1
+    finally:
+        for kind in ('point', 'line', 'poly'):
+            if arcpy.Exists(f"memory/{base}_{kind}"):
+                arcpy.Delete_management(f"memory/{base}_{kind}")
+    return counts
+
+
+def scheduleValidation(topo_p, surveys=(), extents=None, full=False,
+                       msg=None):
+    """Validates the dirty tiles of a topology one at a time and records
+    their state.
+
+    Parameters
+    ----------
+    topo_p : str
+        Topology, in a feature dataset with SAPOLYGON
+    surveys : list
+        Areasymbols to validate regardless of their tracking dates
+    extents : dict
+        areasymbol: (xmin, ymin, xmax, ymax) added to a survey's tile,
+        i.e. its extent before its features were deleted
+    full : bool
+        Validate the whole topology at once and record every tile, i.e.
+        after it is created. Always so within ArcGIS Pro, where a tile's
+        extent can not be validated alone.
+    msg : function
+        Reports each tile, i.e. arcpy.AddMessage
+
+    Returns
+    -------
+    dict
+        areasymbol: state of the tiles validated
+    """
+    fd_p = os.path.dirname(topo_p)
+    gdb_p = os.path.dirname(fd_p)
+    tiles = surveyTiles(fd_p)
+    for ssa, box in (extents or dict()).items():
+        tiles[ssa] = _union(tiles.get(ssa), box)
+    edits = lastEdits(fd_p)
+    state = readTiles(gdb_p)
+    # a margin of the cluster tolerance around each tile
+    tol = 2 * arcpy.Describe(topo_p).clusterTolerance
+    done = dict()
+    if not full and not extentHonored():
+        full = True
+        if msg:
+            msg("\tThe extent of a survey tile can not be validated alone "
+                "within ArcGIS Pro, validating the full extent")
+    try:
+        if full:
+            t = time.perf_counter()
+            arcpy.ValidateTopology_management(topo_p, "Full_Extent")
+            seconds = (time.perf_counter() - t) / max(len(tiles), 1)
+            for ssa in tiles:
+                done[ssa] = {'edited': edits.get(ssa),
+                             'validated': datetime.now(),
+                             'seconds': seconds}
+        else:
+            dirty = dirtyTiles(spatialOrder(tiles), edits, state, surveys)
+            if msg:
+                msg(f"\tValidating {len(dirty)} of {len(tiles)} survey "
+                    "tiles")
+            for ssa in dirty:
+                x0, y0, x1, y1 = tiles[ssa]
+                t = time.perf_counter()
+                validateExtent(topo_p, (x0 - tol, y0 - tol,
+                                        x1 + tol, y1 + tol))
+                done[ssa] = {'edited': edits.get(ssa),
+                             'validated': datetime.now(),
+                             'seconds': time.perf_counter() - t}
+                if msg:
+                    msg(f"\t\t{ssa}: {done[ssa]['seconds']:.1f} seconds")
+    finally:
+        # tiles validated are recorded even if a later one failed
+        if done:
+            # every tile competes for an error, so one in the overlap of a
+            # validated tile and another is not counted in both
+            counts = countErrors(topo_p, tiles)
+            for ssa, tile in done.items():
+                tile['errors'] = counts[ssa]
+            writeTiles(gdb_p, done)
+    if msg:
+        errors = {ssa: tile['errors'] for ssa, tile in done.items()
+                  if tile['errors']}
+        msg(f"\tTopology errors by survey: {errors or 'none'}")
+    return done
+
+
+if __name__ == '__main__':
+    topo_p = arcpy.GetParameterAsText(0)
+    surveys = []
+    if arcpy.GetArgumentCount() > 1 and arcpy.GetParameterAsText(1):
+        surveys = arcpy.GetParameterAsText(1).split(';')
+    full = arcpy.GetArgumentCount() > 2 and arcpy.GetParameter(2)
+    try:
+        t = time.perf_counter()
+        scheduleValidation(topo_p, surveys, full=full, msg=arcpy.AddMessage)
+        arcpy.AddMessage(
+            f"\nValidated in {time.perf_counter() - t:.1f} seconds"
+        )
+    except arcpy.ExecuteError:
+        arcpy.AddError(arcpy.GetMessages(2))
@@ -0,0 +1,203 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shoehorn benchmark
+Runs the arcpy-free Shoehorn kernels (Shoehorn_kernels.py) on synthetic
+tessellations (Shoehorn_synthetic.py) and reports throughput and memory per
+stage, so regressions in the arc/node build, tweezer's arc pass (acute angle
+removal and Douglas-Peucker, tweezArc) and ring reassembly (ShapeUp) are
+caught before a regional run. These are the kernels SSURGO_shoehorn calls;
+the cursor reads and the realignment of acute Nodes, which need arcpy, are
+not timed. Runs on any python with numpy, arcpy is not needed.
+
+    python Shoehorn_benchmark.py --polys 20000 --surveys 4 --out bench
+
+The exit status is 1 if any polygon fails to reassemble or its area drifts
+more than the --drift tolerance.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import sys
+import math
+import argparse
+import numpy as np
+
+import Shoehorn_instrument
+from Shoehorn_kernels import NodeBuild, nodeAngles, tweezArc, Rings
+from Shoehorn_synthetic import Tessellation, ringArea
+
+
+def tweeze(coords, arcs, v0, min_angle):
+    """The arc pass of tweezer as SSURGO_shoehorn.tweezer runs it: tweezArc
+    on every arc, then the Node angles from the vectors to the second
+    vertex of each arc at a Node.
+
+    Returns
+    -------
+    tuple
+        shapes (arc id: coordinates), number of vertices removed, number of
+        acute Nodes, number of arcs collapsed to a point
+    """
+    N = v0.shape[0]
+    v3 = np.zeros((N, 3, 2), dtype=np.float64)
+    shapes = {}
+    cut = 0
+    collapsed = 0
+    for fid, npGeom in coords.items():
+        ((NiH, v3iH, RLiH), (NiT, v3iT, RLiT)) = arcs[fid]
+        newGeom, rejects, rejectAngles = tweezArc(
+            npGeom, NiH, NiT, RLiT, v0, min_angle
+        )
+        if newGeom is None:
+            collapsed += 1
+            continue
+        shapes[fid] = newGeom
+        cut += rejects.shape[0]
+        v3[NiH, v3iH] = newGeom[1, ]
+        v3[NiT, v3iT] = newGeom[-2, ]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        angles = nodeAngles(v3 - v0)
+    acute = angles < min_angle
+    acute[0, :, :] = False
+    return shapes, cut, int(acute.any(axis=1).sum()), collapsed
+
+
+def reassemble(arcs, polys, shapes):
+    """Ring reassembly of every polygon, as Reassemble/ShapeUp does.
+
+    Returns
+    -------
+    dict
+        FID: list of rings, or None if reassembly failed
+    """
+    out = {}
+    for FID, [ai, mu] in polys.items():
+        # arcs collapsed by tweezer are dropped from their polygons
+        ai = [(i, j) for i, j in ai if i in shapes]
+        if not ai:
+            out[FID] = None
+            continue
+        a0, a1 = zip(*((i, (j-1)//-2) for i, j in ai))
+        parcs = arcs[a0, :]
+        parcs2 = arcs[a0, a1]
+        rings, err = Rings(parcs, parcs2, ai,
+                           {k: shapes[k] for k in a0}, FID)
+        out[FID] = rings
+    return out
+
+
+def run(T, L, min_angle):
+    """Benchmarks each survey of tessellation T into ledger L.
+
+    Returns
+    -------
+    list
+        (areasymbol, failed polygons, max relative area drift) per survey
+    """
+    results = []
+    for s, areaSym in enumerate(T.areasymbols):
+        coords, ends, pids = T.surveyView(s)
+        preArea = {}
+        preV = 0
+        for pid, a, mu, rings in T.polygons(s):
+            preArea[pid] = sum(ringArea(r) for r in rings)
+            preV += sum(r.shape[0] for r in rings)
+        L.survey(areaSym)
+
+        with L.stage('Node Build'):
+            n = max(coords) + 1
+            N = len(ends) // 2 + 1
+            arcs, polys, inter, v0, Nid = NodeBuild(ends, n, N, T.dec)
+        with L.stage('Tweezer'):
+            shapes, cut, acuteN, collapsed = tweeze(coords, arcs, v0,
+                                                    min_angle)
+        with L.stage('Reassemble'):
+            out = reassemble(arcs, polys, shapes)
+
+        failed = [FID for FID, rings in out.items() if rings is None]
+        drift = 0.0
+        postV = 0
+        for FID, rings in out.items():
+            if rings is None:
+                continue
+            postV += sum(r.shape[0] for r in rings)
+            a = ringArea(rings[0]) - sum(ringArea(r) for r in rings[1:])
+            if preArea.get(FID):
+                drift = max(drift, abs(a - preArea[FID]) / preArea[FID])
+        L.count(polys=len(pids), arcs=len(coords), nodes=Nid - 1,
+                preVertex=preV, postVertex=postV, cutVertex=cut,
+                acuteNodes=acuteN, collapsedArcs=collapsed,
+                failed=len(failed))
+        results.append((areaSym, failed, drift))
+    L.close()
+    return results
+
+
+def report(L):
+    """Prints throughput per stage and survey."""
+    print(f"{'survey':<10}{'stage':<17}{'sec':>9}{'arcs/s':>11}"
+          f"{'vert/s':>12}{'heap MB':>9}{'rss MB':>8}")
+    for rec in L.records:
+        c = rec['counters']
+        for name, st in rec['stages'].items():
+            sec = st['seconds'] or 1e-9
+            print(f"{rec['areasym']:<10}{name:<17}{st['seconds']:>9.3f}"
+                  f"{c.get('arcs', 0) / sec:>11.0f}"
+                  f"{c.get('preVertex', 0) / sec:>12.0f}"
+                  f"{st['peak_heap'] / 2**20:>9.1f}"
+                  f"{st['peak_rss'] / 2**20:>8.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--polys', type=int, default=5000)
+    parser.add_argument('--density', type=float, default=0.1,
+                        help='interior vertices per meter of arc')
+    parser.add_argument('--acute', type=float, default=0.02,
+                        help='fraction of arcs with an acute spike')
+    parser.add_argument('--surveys', type=int, default=2)
+    parser.add_argument('--seam', type=float, default=0.0,
+                        help='fraction of seam Nodes offset across surveys')
+    parser.add_argument('--degrees', type=float, default=10.0,
+                        help='minimum angle, as the Shoehorn parameter')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--drift', type=float, default=0.05,
+                        help='allowed relative change in polygon area')
+    parser.add_argument('--out', default=None,
+                        help='write <out>_stages.json/.csv')
+    parser.add_argument('--trace', action='store_true',
+                        help='sample peak python heap with tracemalloc, '
+                        'slows the python loops considerably')
+    parser.add_argument('--profile', default=None,
+                        help='folder for a cProfile dump per survey')
+    args = parser.parse_args(argv)
+
+    L = Shoehorn_instrument.Ledger(args.trace, args.profile)
+    L.survey('synthetic')
+    with L.stage('Generate'):
+        T = Tessellation(args.polys, args.density, args.acute, args.surveys,
+                         args.seam, seed=args.seed)
+    L.close()
+    print(f"{T.nPolys} polygons, {T.arcNodes.shape[0]} arcs, "
+          f"{T.nSpikes} spikes, {T.seamArcs.size} seam arcs")
+    results = run(T, L, math.radians(args.degrees))
+    report(L)
+    status = 0
+    for areaSym, failed, drift in results:
+        if failed or drift > args.drift:
+            print(f"{areaSym}: {len(failed)} polygons failed to reassemble, "
+                  f"max area drift {drift:.2%}")
+            status = 1
+    if args.out:
+        L.save(args.out)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Shoehorn instrumentation
+Stage timers, memory sampling and per-survey counters for SSURGO Shoehorn.
+Records are written as JSON and CSV next to the xlwt "Diet Summary" workbook
+so that slow surveys can be traced to a specific stage (PolygonToLine,
+SpatialJoin, node building, tweezer, Reassemble, ...).
+
+This module does not import arcpy so that it can also be used by the
+benchmark harness outside of ArcGIS.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import os
+import csv
+import sys
+import json
+import time
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def peakRSS() -> int:
+    """Returns the peak resident set size of this process in bytes.
+    Returns 0 if it can't be determined on this platform."""
+    try:
+        if psutil is not None:
+            mi = psutil.Process().memory_info()
+            # peak_wset on Windows, otherwise settle for current rss
+            return int(getattr(mi, 'peak_wset', mi.rss))
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+        return int(peak if sys.platform == 'darwin' else peak * 1024)
+    except:
+        return 0
+
+
+class Ledger:
+    """Collects stage timings and counters, one record per survey.
+
+    Parameters
+    ----------
+    trace : bool
+        If True, tracemalloc is used to sample the peak python heap
+        allocation within each stage. This has some overhead.
+    profile_dir : str
+        If given, a cProfile dump is saved to this folder for each survey
+        as <areasymbol>.prof
+    """
+    def __init__(self, trace: bool=True, profile_dir: str=None):
+        self.trace = trace
+        self.profile_dir = profile_dir
+        self.records = []
+        self.current = None
+        self._profiler = None
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def survey(self, areaSym: str):
+        """Opens a new survey record, closing any that is still open."""
+        self.close()
+        self.current = {
+            'areasym': areaSym, 'start': time.time(), 'seconds': 0.0,
+            'stages': {}, 'counters': {}
+        }
+        if self.profile_dir:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self.current
+
+    @contextmanager
+    def stage(self, name: str):
+        """Context manager that times a named stage of the current survey.
+        Repeated stage names within a survey are accumulated."""
+        if self.trace:
+            tracemalloc.reset_peak()
+            heap0 = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        c0 = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - t0
+            cpu = time.process_time() - c0
+            heap = (tracemalloc.get_traced_memory()[1] - heap0
+                    if self.trace else 0)
+            rec = self.current
+            if rec is None:
+                rec = self.survey('')
+            st = rec['stages'].setdefault(
+                name, {'seconds': 0.0, 'cpu': 0.0, 'calls': 0,
+                       'peak_heap': 0, 'peak_rss': 0}
+            )
+            st['seconds'] += wall
+            st['cpu'] += cpu
+            st['calls'] += 1
+            st['peak_heap'] = max(st['peak_heap'], heap)
+            st['peak_rss'] = max(st['peak_rss'], peakRSS())
+
+    def count(self, **counters):
+        """Sets counters (arcs, nodes, preVertex, ...) on the current
+        survey record."""
+        if self.current is None:
+            self.survey('')
+        self.current['counters'].update(counters)
+
+    def close(self):
+        """Finalizes the current survey record and its cProfile dump."""
+        rec = self.current
+        if rec is None:
+            return
+        rec['seconds'] = time.time() - rec['start']
+        if self._profiler is not None:
+            self._profiler.disable()
+            try:
+                os.makedirs(self.profile_dir, exist_ok=True)
+                self._profiler.dump_stats(
+                    os.path.join(self.profile_dir, f"{rec['areasym']}.prof")
+                )
+            except OSError:
+                pass
+            self._profiler = None
+        self.records.append(rec)
+        self.current = None
+
+    def rows(self):
+        """Flattens records into one dictionary per survey stage."""
+        for rec in self.records:
+            base = {'areasym': rec['areasym'],
+                    'survey_seconds': round(rec['seconds'], 3)}
+            base.update(rec['counters'])
+            for name, st in rec['stages'].items():
+                row = dict(base)
+                row['stage'] = name
+                row.update(st)
+                yield row
+
+    def save(self, path: str) -> list:
+        """Writes <path>.json and <path>.csv. The path is typically the
+        Diet Summary workbook path without its extension.
+
+        Returns
+        -------
+        list
+            Paths of the files written
+        """
+        self.close()
+        if self.trace and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        jpath = path + '_stages.json'
+        cpath = path + '_stages.csv'
+        with open(jpath, 'w') as f:
+            json.dump(
+                {'created': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime()),
+                 'surveys': self.records},
+                f, indent=1
+            )
+        rows = list(self.rows())
+        hdr = []
+        for row in rows:
+            hdr.extend(k for k in row if k not in hdr)
+        with open(cpath, 'w', newline='') as f:
+            w = csv.DictWriter(f, hdr)
+            w.writeheader()
+            w.writerows(rows)
+        return [jpath, cpath]
+
+
+class _NullLedger:
+    """Stand-in when instrumentation is off; every call is a no-op."""
+    records = []
+
+    def survey(self, areaSym):
+        return None
+
+    @contextmanager
+    def stage(self, name):
+        yield
+
+    def count(self, **counters):
+        pass
+
+    def close(self):
+        pass
+
+    def save(self, path):
+        return []
+
+
+def ledger(enabled: bool, profile_dir: str=None):
+    """Returns a Ledger if enabled, otherwise a no-op stand-in so that the
+    calling code does not have to branch around every stage."""
+    if enabled:
+        return Ledger(True, profile_dir)
+    return _NullLedger()
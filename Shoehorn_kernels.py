@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+Shoehorn kernels
+The numpy portions of SSURGO Shoehorn that do not need arcpy: the arc/node
+relational build, tweezer's arc pass with the vertex and node angles it uses,
+the Douglas-Peucker generalization and polygon ring reassembly. Keeping them free of arcpy lets
+the benchmark harness (Shoehorn_benchmark.py) run them on Linux.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import sys
+import numpy as np
+
+# relational table of arcs, indexed by arc id, head then tail
+arcType = np.dtype([('Ni', '<i4'), ('v3i', '<i4'), ('RLi', '<i4')])
+
+
+def NodeBuild(ends, n, N, dec):
+    """Populates the arc-node relational tables from arc end points.
+
+    Parameters
+    ----------
+    ends : iterable
+        (xy, arc id, right fid, left fid, tail) for the start (tail=0) and
+        end (tail=1) of every arc, e.g. a SearchCursor on The_Ends
+    n : int
+        One more than the largest arc id
+    N : int
+        Upper bound on the number of Nodes, plus one
+    dec : int
+        Number of decimals coordinates are rounded to
+
+    Returns
+    -------
+    tuple
+        arcs, polys, inter, v0, Nid
+        Row 0 of arcs, inter and v0 is a dummy row as there are no FID=0.
+    """
+    arcs = np.zeros((n, 2), dtype=arcType)
+    polys = {}
+    # Tally of the number of intersecting arcs at a Node, used in tweezer
+    inter = np.zeros((N), dtype=np.int8)
+    # Node coordinates, used in tweezer
+    v0 = np.zeros((N, 1, 2), dtype=np.float64)
+    Round = np.round
+    Ndex = {}
+    Nid = 1
+    for xy, Ai, Ri, Li, t in ends:
+        strxy = str(xy)
+        if strxy in Ndex:
+            Ni = Ndex[strxy]
+        else:
+            Nid += 1
+            Ndex[strxy] = Nid
+            Ni = Nid
+            v0[Ni] = Round(xy, dec)
+
+        i = inter[Ni]    # number of intersections
+        # v3 index, constrained 0-2. If greater than 2, cap at 2
+        I = (abs(i) >= 2)*2 or abs(i)
+        if not t:
+            # add boolean True or demerit 1
+            inter[Ni] += i >= 0 or -1
+            arcs[Ai, 0] = (Ni, I, Ri)
+            if Ri in polys:
+                polys[Ri][0].append((Ai, 1))
+            else:
+                polys[Ri] = [[(Ai, 1)], '']
+        elif Li+1:
+            inter[Ni] += i >= 0 or -1
+            arcs[Ai, 1] = (Ni, I, Li)
+            if Li in polys:
+                polys[Li][0].append((Ai, -1))
+            else:
+                polys[Li] = [[(Ai, -1)], '']
+        else: # Node on border
+            arcs[Ai, 1] = (Ni, I, Li)
+            inter[Ni] = abs(inter[Ni])*-1
+    N = Nid + 1
+    return arcs, polys, inter[:N], v0[:N, :, :], Nid
+
+
+def vertexAngles(npGeom):
+    """Interior angle (radians) at each vertex of a polyline, excluding its
+    end points."""
+    ein = np.einsum
+    sqrt = np.sqrt
+    # angle = arccos((v1.v2)/(|v1||v2|))
+    # sqrt(ein(eS2, v1, v1)) is eqivalent to ((v1*v1).sum(axis=1))**.5
+    v1 = npGeom[:-2, ] - npGeom[1:-1, ]
+    v2 = npGeom[2:, ] - npGeom[1:-1, ]
+    return np.arccos(ein('...i,...i', v1, v2) / sqrt(ein('ij,ij->i', v1, v1))
+                     / sqrt(ein('ij,ij->i', v2, v2)))
+
+
+def nodeAngles(v3v):
+    """Angles between the (up to) three arcs incident to each Node.
+
+    Parameters
+    ----------
+    v3v : numpy.ndarray
+        (N, 3, 2) vectors from each Node to the second vertex of its arcs
+
+    Returns
+    -------
+    numpy.ndarray
+        (N, 3, 1) angle opposite each of the three vectors
+    """
+    ein = np.einsum
+    sqrt = np.sqrt
+    eS = '...i,...i'
+    eS2 = 'ij,ij->i'
+    angles = np.zeros((v3v.shape[0], 3, 1), dtype=np.float32)
+    for k, (a, b) in enumerate(((1, 2), (0, 2), (0, 1))):
+        angles[:, k, 0] = np.arccos(
+            ein(eS, v3v[:, a, :], v3v[:, b, :]) /
+            sqrt(ein(eS2, v3v[:, a, :], v3v[:, a, :])) /
+            sqrt(ein(eS2, v3v[:, b, :], v3v[:, b, :]))
+        )
+    return angles
+
+
+def rdpi(M, epsilon=0, hopper={}):
+    """Helper function for rdps function,
+    implementing Douglas-Peucker Method."""
+    if not hopper:
+        hopper = {0: M.shape[0] - 1}
+    dump = np.ones(M.shape[0], bool)
+    while hopper:
+        i, f = hopper.popitem()
+        start, end = M[(i, f),]
+        vec = end - start
+        dists = (np.absolute(np.cross(vec, start - M[i:f + 1,]))
+                 / np.linalg.norm(vec))
+        imax = np.argmax(dists)
+        dmax = dists[imax]
+        imax += i
+        if dmax > epsilon:
+            if imax - i > 1:
+                hopper[i] = imax
+            if f - imax > 1:
+                hopper[imax] = f
+        else:
+            dump[i + 1:f,] = False
+    return dump
+
+
+def rdps(M, E=1):
+    """Implementation of the Douglas-Peuker Methodology."""
+    close = np.ones(M.shape[0], bool)
+    # offset by 2
+    v = M[2:,] - M[:-2,]
+    dist = (np.abs(np.cross(v, M[:-2,] - M[1:-1]))
+            / np.linalg.norm(v, axis=1))
+    close[1:-1] = dist >= E
+    inrow = ~(close[1:] | close[:-1])
+    if inrow.any():
+        contigI = np.ones(M.shape[0], bool)
+        contigI[1:-1] = inrow[:-1] | inrow[1:]  # is there a neighbor?
+        contig = np.where(contigI[1:-1])[0] + 1
+        # realm of contiguous occurences
+        neigh = set(range(contig[0] - 1, contig[-1] + 2))
+        inter = neigh - set(contig)
+        iS = [j for j in inter if j + 1 in contig]
+        fS = [i + 1 for i in contig if i + 1 in inter]
+        if (len(fS) < 2) and (fS[0] > dist.size): # if enclosed
+            far = np.argmax(dist) +1
+            iS.append(far)
+            fS.append(far)
+        iS.sort()
+        fS.sort()
+        dump = rdpi(M, E, dict(zip(iS, fS)))
+        close[contigI] = dump[contigI]
+    return M[close,]
+
+
+def tweezArc(npGeom, NiH, NiT, RLiT, v0, min_angle):
+    """The arc pass of tweezer on one arc: drops vertices with an interior
+    angle under min_angle, snaps the arc ends to their Nodes and, if the arc
+    is not along the survey boundary, generalizes it (rdps). Arcs along the
+    boundary keep their vertices.
+
+    Parameters
+    ----------
+    npGeom : numpy.ndarray
+        (n, 2) rounded coordinates of the arc
+    NiH, NiT : int
+        Head and tail Node ids
+    RLiT : int
+        Polygon FID on the tail side, -1 along the survey boundary
+    v0 : numpy.ndarray
+        Node coordinates, as from NodeBuild
+    min_angle : float
+        Minimum angle, radians
+
+    Returns
+    -------
+    tuple
+        new coordinates, None if the arc collapsed to a point, and the
+        vertices removed with their angles
+    """
+    cat = np.concatenate
+    angles = vertexAngles(npGeom)
+    acuteI = angles > min_angle
+    # Find all vertices less than min angle
+    newCore = npGeom[1:-1, ][acuteI]
+    rejects = ~acuteI
+
+    if (newCore.size // 2 > 1) or ((NiH != NiT) and newCore.size):
+        if RLiT + 1:  # Not along survey boundary
+            # Snap Nodes
+            newGeom = rdps(cat((v0[NiH], newCore, v0[NiT]), axis=0))
+            return newGeom, npGeom[1:-1, ][rejects], angles[rejects]
+        # Snap Nodes
+        newGeom = cat((v0[NiH], npGeom[1:-1], v0[NiT]), axis=0)
+    elif NiH != NiT:  # only were two vertices
+        newGeom = cat((v0[NiH], v0[NiT]), axis=0)
+    else:   # line collapsed to point
+        newGeom = None
+    return newGeom, npGeom[:0], angles[:0]
+
+
+def Rings(parcs, parcs2, ai, shapes, FID):
+    """Walks the arcs of a polygon, Node to Node, into closed rings.
+
+    Parameters
+    ----------
+    parcs : numpy.ndarray
+        Subset of the arcs table for the arcs of this polygon
+    parcs2 : numpy.ndarray
+        For each arc in parcs, the end it is entered from
+    ai : list
+        (arc id, orientation) pairs, 1 for head-first, -1 for tail-first
+    shapes : dict
+        arc id: coordinate array
+    FID : int
+        Polygon id, used to report failures
+
+    Returns
+    -------
+    tuple
+        (rings, None) with the outer ring (greatest extent) first, or
+        (None, failure list) in the form ShapeUp reports failures
+    """
+    try:
+        complete = []
+        #fid: arc ID; FID: polygon ID;
+        ###Localize function calls
+        compAdd = complete.append
+        where = np.where
+        cat = np.concatenate
+
+        picnic = ai.copy()  # subset of arc id's and orientation: consumed
+        nonSimp = {}     #Nodes involved with non-simple intersections
+        try:
+            # fid represents arc id; pj is the Head/Tail orientation
+            fid, o = picnic.pop(0)
+        except:
+            return (None, [FID])
+
+        pi = 0          # pi is the address of the arc fid within parc
+        N0c, N1 = parcs['Ni'][pi, ::o]     #Ring inception
+        N0 = [N0c]    #list of initiated Nodes in play
+        partial = {N0c:shapes[fid][::o]}
+        parcs2['Ni'][0] = 0
+
+        while picnic:
+            if N1 not in N0:    #ring not closed
+                pi = where(parcs2['Ni'] == N1)[0]
+                if pi.size == 1:
+                    fid,o = ai[pi[0]]
+                    partial[N0c]=cat((partial[N0c],shapes[fid][-1 + o or 1::o]))
+                elif pi.size > 1:  #Node associated more than one ring
+                    nonSimp[N0c * -1] = N1
+                    partial[N0c * -1] = partial.pop(N0c)
+                    N0.append(N1)
+                    N0c = N1
+                    fid,o = ai[pi[0]]
+                    partial[N0c] = shapes[fid][::o]
+                else:
+                    return (None, [FID * -1])
+
+                parcs2['Ni'][pi[0]] = 0
+                N1 = parcs['Ni'][pi[0],::o * -1][0]
+                picnic.remove((fid, o))
+
+            elif N1 == N0c:  #completion of simple ring
+                compAdd(partial.pop(N0c))
+                N0.remove(N0c)
+                fid, o = picnic.pop(0)
+                pi = [ai.index((fid, o))]
+                N0c, N1 = parcs['Ni'][pi[0], ::o]
+                N0.append(N0c)
+                parcs2['Ni'][pi[0]] = 0
+                partial[N0c] = shapes[fid][::o]
+
+            else : #non-simple ring
+                N0.remove(N1)
+                nonSimp[N0c * -1] = nonSimp.pop(N1 * -1)
+                if nonSimp[N0c*-1] == N0c: #non-simple complete
+                    compAdd(cat((partial.pop(N0c), partial.pop(N1 * -1))))
+                    N0.remove(N0c)
+                    nonSimp.pop(N0c * -1)
+                else:
+                    partial[N0c*-1] = cat(
+                        (partial.pop(N0c), partial.pop(N1 * -1))
+                    )
+                fid, o = picnic.pop(0)
+                pi = [ai.index((fid, o))]
+                N0c, N1 = parcs['Ni'][pi[0], ::o]
+                N0.append(N0c)
+                parcs2['Ni'][pi[0]] = 0
+                partial[N0c] = shapes[fid][::o]
+
+        if N1 == N0c and partial: #if the last arc popped was a single-arc ring
+            compAdd(partial.pop(N0c))
+            Sc = set()
+        else:
+            Sc = {N0c, N1}
+
+        while nonSimp and partial:
+            N0a,N1a = nonSimp.popitem()
+            Sa = {N0a * -1, N1a}
+            if Sa==Sc:  #complete
+                compAdd(cat((partial.pop(N0a), partial.pop(N0c))))
+            elif N1a in Sc:
+                partial[N0a] = cat((partial[N0a], partial.pop(N0c)))
+                N1a = N1
+                Sa = {N0a * -1, N1a}
+            elif N1 in Sa:
+                partial[N0c] = cat((partial.pop(N0c), partial.pop(N0a)))
+                N0a = N0c
+                Sa = {N0a, N1a}
+
+            nsX = []
+            for N0b,N1b in nonSimp.items():
+                Sb = {N0b * -1, N1b}
+                if Sa==Sb:  #complete
+                    compAdd(cat((partial.pop(N0a), partial.pop(N0b))))
+                    nsX.append(N0b)
+                    continue
+                elif N1a in Sb:
+                    partial[N0a] = cat((partial[N0a], partial.pop(N0b)))
+                    N1a = nonSimp[N0b]
+                    nsX.append(N0b)
+                    Sa = {abs(N0a), N1b}
+                elif N1b in Sa:
+                    partial[N0b] = cat((partial[N0b], partial.pop(N0a)))
+                    nsX.append(N0b)
+                    Sa = {N0b * -1, N1a}
+                    N0a = N0b
+
+                if Sa==Sc:  #complete
+                    compAdd(cat((partial.pop(N0a), partial.pop(N0c))))
+                elif N1a in Sc:
+                    partial[N0a] = cat((partial[N0a], partial.pop(N0c)))
+                elif N1 in Sa:
+                    partial[N0c * -1] = cat(
+                        (partial.pop(N0c), partial.pop(N0a))
+                    )
+
+            list(map(nonSimp.pop, nsX))
+
+        if partial or not complete:
+            return (None, [FID * -1])
+
+        if len(complete) > 1:
+            # Find the part with greatest extent range,
+            # corresponds to outside ring
+            extAreas = [(array.T[0].max() - array.T[0].min()) * # delta x
+                        (array.T[1].max() - array.T[1].min()) # delta y
+                        for array in complete]
+            oi = extAreas.index(max(extAreas)) # index of outside ring
+            complete.insert(0, complete.pop(oi))
+        return (complete, None)
+    except:
+        s1 =  sys.exc_info()[-1].tb_lineno
+        s2 = sys.exc_info()[0]
+        s3 = sys.exc_info()[1]
+        return (None, [FID * -1, list(partial.keys()), [N0c, N1],
+                       f"{s1}\n{s2}\n{s3}"])
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic SSURGO tessellations
+Generates map unit tessellations that look enough like SSURGO MUPOLYGON to
+exercise Shoehorn and the edge-match QA without arcpy or real data.
+
+Cells follow a jittered honeycomb (brick) layout, so like a Voronoi diagram
+every interior Node has three arcs. The following can be controlled:
+    - polygon count
+    - vertex density along arcs (vertices per meter) and their wiggle
+    - acute-angle frequency (spikes inserted along arcs)
+    - survey-boundary seams, straight north-south lines split the cells
+      into survey areas with soil lines continuing across them (four arcs
+      per seam Node), a fraction of seam Nodes can be offset in the eastern
+      survey to mimic edge-match errors
+
+Output is plain numpy coordinate arrays, Shoehorn style arc-end rows and
+polygon WKB.
+
+@maintainer: Alexander Stum
+    @title:  GIS Specialist & Soil Scientist
+    @organization: National Soil Survey Center, USDA-NRCS
+    @email: alexander.stum@usda.gov
+
+@version: 1.0
+"""
+
+import math
+import struct
+import bisect
+import numpy as np
+
+
+class Tessellation:
+    """A synthetic, topologically clean map unit tessellation.
+
+    Parameters
+    ----------
+    polys : int
+        Approximate number of polygons
+    density : float
+        Interior vertices per meter of arc
+    acute : float
+        Probability an arc carries an acute spike
+    surveys : int
+        Number of survey areas, split west to east
+    seam_offset : float
+        Fraction of seam Nodes offset in the eastern survey
+    cell : float
+        Nominal cell width in meters
+    wiggle : float
+        Amplitude (m) of the perpendicular noise on interior vertices
+    jitter : float
+        Node jitter as a fraction of the cell size, keep under 0.2
+    seed : int
+        Random seed, the same seed always yields the same tessellation
+    origin : tuple
+        Lower left coordinate, a UTM-like origin by default
+    """
+    def __init__(self, polys=1000, density=0.1, acute=0.02, surveys=2,
+                 seam_offset=0.0, cell=100.0, wiggle=1.5, jitter=0.15,
+                 seed=0, origin=(500000.0, 4000000.0)):
+        rng = np.random.default_rng(seed)
+        self.cell = cell
+        self.dec = 4
+        C = max(int(math.sqrt(polys)), 1)
+        R = max(-(-polys // C), 1)
+        self.shape = (R, C)
+        x0, y0 = origin
+
+        # %% Cells, row r spans y=r to r+1, odd rows offset by half a cell
+        S = max(min(surveys, C), 1)
+        seamX = {float(round(C * s / S)) for s in range(1, S)}
+        rowX = []           # sorted x of the verticals in each row
+        self.cellRow = []   # per row: list of (x0, x1, pid)
+        pid = 0
+        for r in range(R):
+            off = 0.5 * (r % 2)
+            xs = sorted({0.0, float(C)} | seamX |
+                        {c + off for c in range(C) if 0 < c + off < C})
+            rowX.append(xs)
+            cells = []
+            for a, b in zip(xs[:-1], xs[1:]):
+                pid += 1
+                cells.append((a, b, pid))
+            self.cellRow.append(cells)
+        self.nPolys = pid
+        self.areasymbols = [f'XX{s + 1:03d}' for s in range(S)]
+        survey = np.zeros(pid + 1, dtype=np.int32)
+        bounds = sorted(seamX)
+        for cells in self.cellRow:
+            for a, b, p in cells:
+                survey[p] = bisect.bisect_right(bounds, (a + b) / 2)
+        survey[0] = -1
+        self.survey = survey
+        self.musym = [''] + [str(m) for m in rng.integers(1, 60, pid)]
+
+        # %% Nodes, keyed by (2x, line)
+        key = {}
+        pts = []
+        lineX = []          # sorted x of the Nodes on each line
+        for r in range(R + 1):
+            xs = set()
+            if r > 0:
+                xs.update(rowX[r - 1])
+            if r < R:
+                xs.update(rowX[r])
+            lineX.append(sorted(xs))
+            for x in lineX[-1]:
+                key[(int(x * 2), r)] = len(pts)
+                pts.append((x, float(r)))
+        pts = np.array(pts, dtype=np.float64)
+        jit = rng.uniform(-jitter, jitter, pts.shape)
+        # boundary Nodes only slide along the boundary
+        jit[(pts[:, 0] == 0) | (pts[:, 0] == C), 0] = 0
+        jit[(pts[:, 1] == 0) | (pts[:, 1] == R), 1] = 0
+        self.nodes = np.round((pts + jit) * cell + (x0, y0), self.dec)
+
+        # %% Arcs, polygon on the right walking head to tail
+        ends, right, left = [], [], []
+
+        def cellAt(r, x):
+            if r < 0 or r >= R:
+                return -1
+            i = bisect.bisect_right(rowX[r], x) - 1
+            return self.cellRow[r][i][2]
+
+        for r, xs in enumerate(lineX):
+            for a, b in zip(xs[:-1], xs[1:]):
+                m = (a + b) / 2
+                ends.append((key[(int(a * 2), r)], key[(int(b * 2), r)]))
+                # heading east, below is on the right
+                right.append(cellAt(r - 1, m))
+                left.append(cellAt(r, m))
+        for r in range(R):
+            for x in rowX[r]:
+                ends.append((key[(int(x * 2), r)], key[(int(x * 2), r + 1)]))
+                # heading north, east is on the right
+                right.append(cellAt(r, x + 0.25) if x < C else -1)
+                left.append(cellAt(r, x - 0.25) if x > 0 else -1)
+        ends = np.array(ends, dtype=np.int64)
+        right = np.array(right, dtype=np.int32)
+        left = np.array(left, dtype=np.int32)
+        # like the RIGHT_FID = -1 fix in Shoehorn, outside is always left
+        flip = right == -1
+        ends[flip] = ends[flip][:, ::-1]
+        right[flip], left[flip] = left[flip], right[flip].copy()
+        self.arcNodes = ends
+        self.right = right
+        self.left = left
+
+        # %% Interior vertices
+        self.interior = []
+        nSpike = 0
+        for h, t in ends:
+            p0, p1 = self.nodes[h], self.nodes[t]
+            vec = p1 - p0
+            length = float(np.hypot(*vec))
+            k = int(length * density)
+            ts = np.sort(rng.uniform(0.02, 0.98, k))
+            unit = vec / length
+            norm = np.array((-unit[1], unit[0]))
+            amp = rng.uniform(-wiggle, wiggle, k)
+            mids = p0 + np.outer(ts, vec) + np.outer(amp, norm)
+            if rng.random() < acute:
+                # spike: out and straight back makes a sliver angle
+                s = rng.uniform(0.2, 0.8)
+                spike = np.array([p0 + vec * s + norm * cell * 0.1,
+                                  p0 + vec * (s + 0.005)])
+                i = np.searchsorted(ts, s)
+                mids = np.concatenate((mids[:i], spike, mids[i:]))
+                nSpike += 1
+            self.interior.append(np.round(mids, self.dec))
+        self.nSpikes = nSpike
+
+        # %% Seams
+        seam = ((right != -1) & (left != -1)
+                & (survey[right] != survey[np.maximum(left, 0)]))
+        self.seamArcs = np.where(seam)[0]
+        seamNodes = np.unique(ends[self.seamArcs])
+        # offset Nodes in the eastern (higher index) survey
+        self.shifted = {s: {} for s in range(S)}
+        if seam_offset and seamNodes.size:
+            pick = seamNodes[rng.random(seamNodes.size) < seam_offset]
+            for n in pick:
+                arcsN = np.where((ends == n).any(axis=1))[0]
+                polysN = np.concatenate((right[arcsN], left[arcsN]))
+                s = survey[polysN[polysN > 0]].max()
+                shift = rng.uniform(0.5, 2.0) * rng.choice((-1, 1), 2)
+                self.shifted[s][int(n)] = np.round(
+                    self.nodes[n] + shift, self.dec
+                )
+        self.seamNodes = seamNodes
+
+    # %% Views
+    def arcCoords(self, a, s=None):
+        """Coordinates of arc a, head to tail, as seen by survey s."""
+        h, t = self.arcNodes[a]
+        shifted = self.shifted.get(s, {})
+        p0 = shifted.get(int(h), self.nodes[h])
+        p1 = shifted.get(int(t), self.nodes[t])
+        return np.concatenate(([p0], self.interior[a], [p1]))
+
+    def surveyArcs(self, s=None):
+        """Arc ids with at least one side in survey s (all if None)."""
+        if s is None:
+            return np.arange(self.arcNodes.shape[0])
+        sv = self.survey
+        return np.where((sv[self.right] == s)
+                        | ((self.left != -1)
+                           & (sv[np.maximum(self.left, 0)] == s)))[0]
+
+    def surveyView(self, s):
+        """Shoehorn's per-survey inputs for survey s.
+
+        Returns
+        -------
+        tuple
+            coords: dict arc id (1-based): coordinate array
+            ends: rows of (xy, arc id, RIGHT_FID, LEFT_FID, tail) as read
+                from The_Ends, end points first then start points
+            polys: set of polygon ids within the survey
+        """
+        sv = self.survey
+        coords = {}
+        rows = []
+        tails = []
+        for i, a in enumerate(self.surveyArcs(s), 1):
+            g = self.arcCoords(a, s)
+            R, L = int(self.right[a]), int(self.left[a])
+            if L != -1 and sv[L] != s:
+                L = -1
+            if sv[R] != s:
+                # only the left is in the survey, flip like Shoehorn does
+                g, R, L = g[::-1], L, -1
+            coords[i] = g
+            tails.append((tuple(g[-1]), i, R, L, 1))
+            rows.append((tuple(g[0]), i, R, L, 0))
+        polys = {int(p) for p in np.where(sv == s)[0]}
+        return coords, tails + rows, polys
+
+    def polygons(self, s=None, shift=True):
+        """Yields (pid, areasymbol, musym, rings) for each polygon,
+        rings are closed coordinate arrays, outer ring clockwise.
+        With shift False the seam Node offsets are not applied, as for
+        a SAPOLYGON built from the original linework."""
+        byPoly = {}
+        for a in self.surveyArcs(s):
+            for p, o in ((self.right[a], 1), (self.left[a], -1)):
+                if p != -1 and (s is None or self.survey[p] == s):
+                    byPoly.setdefault(int(p), []).append((int(a), o))
+        for p in sorted(byPoly):
+            ss = int(self.survey[p])
+            link = {}
+            for a, o in byPoly[p]:
+                h, t = self.arcNodes[a][::o]
+                link[int(h)] = (a, o, int(t))
+            start = next(iter(link))
+            ring = []
+            n = start
+            while True:
+                a, o, t = link.pop(n)
+                g = self.arcCoords(a, ss if shift else None)[::o]
+                ring.append(g if not ring else g[1:])
+                n = t
+                if n == start:
+                    break
+            yield p, self.areasymbols[ss], self.musym[p], \
+                [np.concatenate(ring)]
+
+
+# %% WKB
+def toWKB(rings):
+    """Little-endian OGC WKB polygon from a list of closed rings."""
+    parts = [struct.pack('<BII', 1, 3, len(rings))]
+    for ring in rings:
+        ring = np.ascontiguousarray(ring, dtype='<f8')
+        parts.append(struct.pack('<I', ring.shape[0]))
+        parts.append(ring.tobytes())
+    return b''.join(parts)
+
+
+def ringArea(ring):
+    """Shoelace area, positive for clockwise rings."""
+    x, y = ring[:, 0] - ring[0, 0], ring[:, 1] - ring[0, 1]
+    return float((x[1:] * y[:-1] - x[:-1] * y[1:]).sum() / 2)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+19 October 2026
+
+ArcGIS Pro compatible
+
+The VCore function counts the polygons, vertices and rings of a range of
+OIDs of a featureclass by AREASYMBOL. Only the ring headers of SHAPE@WKB
+(or of the .shp records of a shapefile) are read, no geometry objects are
+built. Like BCore it is kept in its own module so it can be handed to a
+multiprocessing pool.
+"""
+
+import arcpy, os, sys
+import numpy as np
+from SSURGO_geometry import wkbCounts
+from SSURGO_shapefile import shpCounts, dbfColumn
+
+def VCore(fc, lo=None, hi=None, field=None):
+    """Counts OIDs lo to hi (hi excluded) of fc, all features if lo is None.
+    A shapefile path is read directly from its .shp/.dbf, for shapefiles
+    the OID (FID) is the record number.
+
+    Returns
+    -------
+    tuple
+        dictionary of AREASYMBOL ('' without field): [polygons, vertices,
+        rings] and a list of the OIDs with NULL geometry.
+        An error string if the count failed.
+    """
+    try:
+        counts = {}
+        nulls = []
+        if isinstance(fc, str) and fc.lower().endswith('.shp'):
+            start = lo or 0
+            rings, points = shpCounts(fc, start, hi)
+            if field:
+                dbf = os.path.splitext(fc)[0] + '.dbf'
+                syms = dbfColumn(dbf, field, start, hi)
+            else:
+                syms = np.full(points.size, '')
+            valid = points > 0
+            nulls = (np.flatnonzero(~valid) + start).tolist()
+            for sym in np.unique(syms[valid]):
+                m = valid & (syms == sym)
+                counts[str(sym)] = [int(m.sum()), int(points[m].sum()),
+                                    int(rings[m].sum())]
+        else:
+            if lo is None:
+                where = None
+            else:
+                oid = arcpy.Describe(fc).OIDFieldName
+                where = f"{oid} >= {lo} AND {oid} < {hi}"
+            fields = ['OID@', field or 'OID@', 'SHAPE@WKB']
+            with arcpy.da.SearchCursor(fc, fields, where) as sCur:
+                for fid, sym, wkb in sCur:
+                    if wkb is None:
+                        nulls.append(fid)
+                        continue
+                    points, rings = wkbCounts(wkb)
+                    c = counts.setdefault(sym if field else '', [0, 0, 0])
+                    c[0] += 1
+                    c[1] += points
+                    c[2] += rings
+        return counts, nulls
+    except:
+        s1 =  sys.exc_info()[-1].tb_lineno
+        s2 = sys.exc_info()[0]
+        s3 = sys.exc_info()[1]
+        return(f"VCore {lo}-{hi}: {s1}\n{s2}\n{s3}")
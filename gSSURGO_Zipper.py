@@ -17,6 +17,16 @@
 # phone: 608.662.4422 ext. 216
 #-------------------------------------------------------------------------------
 
+# ==========================================================================================
+# Updated  10/19/2026
+#
+# - Archives are built by SSURGO_archive.py, several at a time in worker processes.
+#   Archives whose geodatabase is unchanged since the last run, according to the
+#   zip_manifest.json kept in the output directory, are skipped.
+# - The compression level and number of processes are asked for; blank keeps the defaults.
+# - Archives are deterministic and written with ZIP64 records for large state datasets.
+#   A new archive replaces the old one only once it is complete.
+
 
 # ================================================================================================================
 def errorMsg():
@@ -33,7 +43,8 @@ def errorMsg():
 
 ## ===================================================================================
 # Import system modules
-import sys, os, traceback, zipfile, glob
+import sys, os, traceback, glob
+from SSURGO_archive import buildArchives
 
 if __name__ == '__main__':
 
@@ -46,44 +57,38 @@ if __name__ == '__main__':
 
         rootDir = input("Enter Root Directory containing gSSURGO Datasets to Zip: ")
         outDirectory = input("Enter Root Directory where gSSURGO Datasets will be Zipped: ")
+        level = int(input("Enter Compression Level 0-9 [6]: ") or 6)
+        nProc = int(input(f"Enter Number of Datasets to Zip at a Time [{os.cpu_count()}]: ") or os.cpu_count())
 
         gSSURGOList = glob.glob(f"{rootDir}\gSSURGO_*.gdb")
         successfulZips = 0
 
         print(f"\nThere are {len(gSSURGOList)} gSSURGO Datasets that will be zipped.")
 
-        # Iterate through every SSA path and zip up
-        for gSSURGO in gSSURGOList:
-            print(f"\nCreating zip archive for {os.path.basename(gSSURGO)}")
-
-            try:
-                zipName = os.path.basename(gSSURGO).split('.')[0] + '.zip'
-                zipFilePath = outDirectory + os.sep + zipName
-
-                if os.path.exists(zipFilePath):
-                    print(f"\t{zipName} Exists. Deleting file")
-                    os.remove(zipFilePath)
-
-                with zipfile.ZipFile(zipFilePath, 'w', zipfile.ZIP_DEFLATED) as outZip:
-                    print(f"\tCreating: {zipName}")
+        # Zip up every gSSURGO dataset, nProc at a time
+        jobs = [(gSSURGO, outDirectory + os.sep + os.path.basename(gSSURGO).split('.')[0] + '.zip',
+                 os.path.basename(gSSURGO)) for gSSURGO in gSSURGOList]
+        unchangedZips = 0
 
-                    for dirpath, dirnames, filenames in os.walk(gSSURGO):
+        for zipFilePath, status, msg in buildArchives(jobs, level, nProc):
+            zipName = os.path.basename(zipFilePath)
 
-                        for filename in filenames:
-                            outZip.write(os.path.join(dirpath, filename), os.path.basename(gSSURGO) + os.sep + filename)
+            if status == 'built':
+                print(f"\tSuccessfully Archived: {zipName} ({msg})")
+                successfulZips+=1
 
-                        successfulZips+=1
-                    print(f"\tSuccessfully Archived: {zipName}")
+            elif status == 'unchanged':
+                print(f"\t{zipName} is up to date")
+                unchangedZips+=1
 
-                outZip.close()
+            else:
+                print(f"\tProblems zipping up {zipName}\n\t{msg}")
 
-            except:
-                print("Problems zipping up " + gSSURGO)
-                errorMsg()
-                continue
+        if successfulZips > 0:
+            print("\nSuccessfully zipped " + str(successfulZips) + " gSSURGO datasets")
 
-            if successfulZips > 0:
-                print("\tSuccessfully zipped " + str(successfulZips) + " SSURGO export datasets")
+        if unchangedZips > 0:
+            print(str(unchangedZips) + " gSSURGO archives were already up to date")
 
         peaceOut = input("\nDone:  Hit Enter to quit")
 